@@ -9,6 +9,7 @@ import logging
 import io
 from rich.console import Console
 from rich.markdown import Markdown
+from askai.shared.utils import timed
 
 from .base_display_formatter import BaseDisplayFormatter
 
@@ -51,6 +52,7 @@ class TerminalFormatter(BaseDisplayFormatter):
         super().__init__(logger)
         self.use_colors = use_colors and self._supports_colors()
 
+    @timed("output.format")
     def format(self, content: str, content_type: str = 'text',
               highlight_code: bool = True, **kwargs) -> str:
         """Format content for terminal output with optional syntax highlighting.
@@ -4,6 +4,7 @@ Chain of Responsibility coordinator for file writers.
 
 import os
 from typing import List, Optional, Dict, Any
+from askai.shared.utils import timed
 from .base_writer import BaseWriter
 from .text_writer import TextWriter
 from .html_writer import HtmlWriter
@@ -27,6 +28,7 @@ class FileWriterChain:
             TextWriter()  # TextWriter should be last as it's the fallback
         ]
 
+    @timed("output.write")
     def write_file(self, content: str, file_path: str, content_type: str,
                    additional_params: Optional[Dict[str, Any]] = None) -> bool:
         """Write content using the appropriate writer from the chain.
@@ -8,12 +8,14 @@ import json
 import re
 import logging
 from typing import Optional, Dict, List, Any, Union
+from askai.shared.utils import timed
 
 logger = logging.getLogger(__name__)
 
 class ContentExtractor:
     """Extracts structured content from AI responses."""
 
+    @timed("output.extract")
     def extract_structured_data(self, response: Union[str, Dict]) -> Dict[str, Any]:
         """Extract structured data from AI response.
 
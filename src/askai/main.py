@@ -4,9 +4,11 @@ Orchestrates the different components to provide AI assistance via command line.
 """
 
 # Standard library imports
+import contextlib
 import json
 import os
 import sys
+import time
 
 # Add the src directory to the path when running the script directly
 # This allows the script to work both when installed as a package and when run directly
@@ -16,24 +18,18 @@ src_dir = os.path.dirname(script_dir)  # Go up from src/askai to src
 if src_dir not in sys.path:
     sys.path.insert(0, src_dir)
 
-# Local application imports - grouped by package
-# pylint: disable=wrong-import-position
-from askai.infrastructure.output.output_coordinator import OutputCoordinator
-
-from askai.modules.ai import AIService
-from askai.modules.chat import ChatManager
-from askai.modules.messaging import MessageBuilder
-from askai.modules.patterns import PatternManager
-from askai.modules.questions import QuestionProcessor
-
-from askai.presentation.cli import CommandHandler
+# Only what every command needs is imported here. Modules used by a single
+# command (AI client, pattern and chat managers, output system, TUI) are
+# imported where that command runs, so e.g. `askai -lp` or `askai -lc` do not
+# pay for requests, rich or Textual. See tests/performance/bench_startup.py.
+# pylint: disable=wrong-import-position,import-outside-toplevel
 from askai.presentation.cli.cli_parser import CLIParser
-from askai.presentation.tui import is_tui_available
-from askai.presentation.tui.apps.tabbed_tui_app import run_tabbed_tui
 
 from askai.shared.config import load_config
-from askai.shared.logging import setup_logger
+from askai.shared.logging import LogPayload, setup_logger
 from askai.shared.utils import print_error_or_warnings
+
+
 def display_help_fast():
     """
     Display help information with minimal imports.
@@ -42,6 +38,126 @@ def display_help_fast():
     cli_parser = CLIParser()
     cli_parser.parse_arguments()  # This will display help and exit
 
+def _print_delta(delta):
+    """Write a streamed response delta to stdout immediately."""
+    sys.stdout.write(delta)
+    sys.stdout.flush()
+
+def _run_batch(args, config, logger):
+    """Run batch question mode and return the process exit code."""
+    from askai.modules.questions import BatchQuestionProcessor
+
+    # Both streams close on every path; stdin and stdout are left open
+    with contextlib.ExitStack() as stack:
+        try:
+            input_stream = sys.stdin if args.batch == '-' else stack.enter_context(
+                open(args.batch, encoding='utf-8')
+            )
+        except OSError as e:
+            print_error_or_warnings(f"Cannot read batch file: {e}")
+            return 1
+
+        try:
+            output_stream = stack.enter_context(
+                open(args.batch_output, 'w', encoding='utf-8')
+            ) if args.batch_output else sys.stdout
+        except OSError as e:
+            print_error_or_warnings(f"Cannot write batch output: {e}")
+            return 1
+
+        processor = BatchQuestionProcessor(config, logger, debug=args.debug)
+        summary = processor.process_batch(input_stream, output_stream, args.concurrency)
+
+    print(
+        f"Batch complete: {summary['succeeded']} succeeded, {summary['failed']} failed "
+        f"of {summary['total']} in {summary['elapsed_seconds']}s",
+        file=sys.stderr
+    )
+    return 0 if summary['failed'] == 0 else 1
+
+def _run_pattern_batch(args, pattern_manager, logger, config=None):
+    """Run a pattern over every file in --batch-dir and return the process exit code."""
+    pattern_id = args.use_pattern
+    if pattern_id == 'new':
+        pattern_id = pattern_manager.select_pattern()
+        if pattern_id is None:
+            print("Pattern selection cancelled.")
+            return 0
+
+    from askai.modules.questions import BatchPatternProcessor
+    from askai.modules.questions.map_reduce import get_cli_overrides
+
+    output_dir = args.batch_output or f"{os.path.normpath(args.batch_dir)}-output"
+    try:
+        processor = BatchPatternProcessor(pattern_manager, logger, debug=args.debug, config=config,
+                                          map_reduce_overrides=get_cli_overrides(args))
+        manifest = processor.process_directory(
+            pattern_id, args.batch_dir, output_dir,
+            pattern_input=args.pattern_input, concurrency=args.concurrency
+        )
+    except (OSError, ValueError) as e:
+        print_error_or_warnings(f"Batch pattern run failed: {e}")
+        return 1
+
+    print(
+        f"Batch complete: {manifest['succeeded']} succeeded, {manifest['failed']} failed "
+        f"of {manifest['total']} in {manifest['elapsed_seconds']}s "
+        f"({manifest['usage']['total_tokens']} tokens). Results in {output_dir}",
+        file=sys.stderr
+    )
+    return 0 if manifest['failed'] == 0 else 1
+
+def _start_profiler(args):
+    """Start a cProfile profiler if --profile-dump was given."""
+    if not getattr(args, 'profile_dump', None):
+        return None
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+def _report_timings(args, started, profiler=None):
+    """Log the stage timings of a run and print them with --profile."""
+    from askai.shared.logging import get_logger
+    from askai.shared.utils import format_span_report, get_span_summary
+
+    wall_ms = (time.perf_counter() - started) * 1000
+    summary = get_span_summary()
+    get_logger().info(json.dumps({
+        "log_message": "Run timings",
+        "wall_ms": round(wall_ms, 2),
+        "stage_ms": {name: stats["total_ms"] for name, stats in summary.items()},
+        "stages": summary
+    }))
+
+    if getattr(args, 'profile', False) or profiler is not None:
+        print(f"\n{format_span_report(summary, wall_ms)}", file=sys.stderr)
+    if profiler is not None:
+        profiler.disable()
+        try:
+            profiler.dump_stats(args.profile_dump)
+            print(f"cProfile data written to {args.profile_dump} (python -m pstats {args.profile_dump})",
+                  file=sys.stderr)
+        except OSError as e:
+            print_error_or_warnings(f"Cannot write profile: {e}", warning_only=True)
+
+def _warm_up_daemon():
+    """Import and initialize what commands share, once for the daemon's lifetime."""
+    # pylint: disable=unused-import
+    from askai.infrastructure.output.output_coordinator import OutputCoordinator
+    from askai.modules.ai import AIService, get_session
+    from askai.modules.chat import ChatManager
+    from askai.modules.patterns import PatternManager
+    from askai.modules.questions import QuestionProcessor
+
+    config = load_config()
+    logger = setup_logger(config, False)
+    base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    # Fill the parsed pattern cache and index, and open the pooled HTTP session
+    PatternManager(base_path, config).list_patterns()
+    get_session(config)
+    return logger
+
 def main():
     """Main entry point for the AskAI CLI application."""
     # Check if this is a help request (before any heavy initialization)
@@ -50,6 +166,10 @@ def main():
         display_help_fast()
         return  # Exit after displaying help
 
+    if '--daemon' in sys.argv[1:]:
+        from askai.presentation.cli.daemon import serve
+        sys.exit(serve(main, warm_up=_warm_up_daemon))
+
     # Handle no parameters case - check default_mode config
     if len(sys.argv) == 1:
         try:
@@ -60,7 +180,13 @@ def main():
             if default_mode == 'tui':
                 # Try to launch TUI mode
                 try:
+                    from askai.presentation.tui import is_tui_available
                     if is_tui_available():
+                        from askai.modules.chat import ChatManager
+                        from askai.modules.patterns import PatternManager
+                        from askai.modules.questions import QuestionProcessor
+                        from askai.presentation.tui.apps.tabbed_tui_app import run_tabbed_tui
+
                         # Initialize minimal components for TUI
                         base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
                         logger = setup_logger(config, False)
@@ -94,6 +220,25 @@ def main():
     cli_parser = CLIParser()
     args = cli_parser.parse_arguments()
 
+    # Hand the command to a warm daemon (askai --daemon) if one is running
+    from askai.presentation.cli.daemon import can_forward, forward
+    if can_forward(args):
+        exit_code = forward(sys.argv[1:])
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    # Time the stages of the run; --profile prints them and the log always records them
+    from askai.shared.utils import reset_spans
+    reset_spans()
+    started = time.perf_counter()
+    profiler = _start_profiler(args)
+    try:
+        _run_command(cli_parser, args)
+    finally:
+        _report_timings(args, started, profiler)
+
+def _run_command(cli_parser, args):
+    """Run a parsed command."""
     # Now load configuration (needed for most commands)
     config = load_config()
     base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -117,12 +262,16 @@ def main():
         args.openrouter is not None
     )
 
+    from askai.presentation.cli.command_handler import CommandHandler
+
     if simple_commands:
-        # For simple commands, we only need specific managers
+        # For simple commands, we only need (and only import) specific managers
         if args.list_patterns or args.view_pattern is not None:
+            from askai.modules.patterns import PatternManager
             pattern_manager = PatternManager(base_path, config)
 
         if args.list_chats or args.view_chat is not None:
+            from askai.modules.chat import ChatManager
             chat_manager = ChatManager(config, logger)
 
         # Create the command handler with only what's needed
@@ -130,16 +279,18 @@ def main():
         command_handler = CommandHandler(pattern_manager, chat_manager, logger)
     else:
         # Full command execution requires all components
+        from askai.modules.ai import AIService
+        from askai.modules.chat import ChatManager
+        from askai.modules.messaging import MessageBuilder
+        from askai.modules.patterns import PatternManager
+
         pattern_manager = PatternManager(base_path, config)
         chat_manager = ChatManager(config, logger)
         # Note: question_processor will be created on-demand in the handler if needed for TUI
         command_handler = CommandHandler(pattern_manager, chat_manager, logger)
-        message_builder = MessageBuilder(pattern_manager, logger)
+        message_builder = MessageBuilder(pattern_manager, logger, config)
         ai_service = AIService(logger)
 
-    # Initialize output handler
-    output_handler = OutputCoordinator()
-
     # Check for incompatible combinations of pattern and chat commands
     using_pattern = args.use_pattern is not None
 
@@ -158,6 +309,12 @@ def main():
     # Validate arguments
     cli_parser.validate_arguments(args, logger)
 
+    # Batch modes run a whole JSONL file of questions or directory of pattern inputs and exit
+    if args.batch is not None:
+        sys.exit(_run_batch(args, config, logger))
+    if args.batch_dir is not None:
+        sys.exit(_run_pattern_batch(args, pattern_manager, logger, config))
+
     # Determine which mode we're operating in: pattern mode or chat/question mode
     using_pattern = args.use_pattern is not None
 
@@ -185,69 +342,89 @@ def main():
     # Create separate flows for pattern vs. chat processing
     if using_pattern:
         # === PATTERN MODE ===
+        from askai.infrastructure.output.output_coordinator import OutputCoordinator
+        from askai.modules.questions.map_reduce import MapReduceProcessor, get_cli_overrides
+
+        # Initialize output handler
+        output_handler = OutputCoordinator()
+
         # Make sure we have the required components
         if pattern_manager is None:
             pattern_manager = PatternManager(base_path)
         if message_builder is None:
-            message_builder = MessageBuilder(pattern_manager, logger)
+            message_builder = MessageBuilder(pattern_manager, logger, config)
         if ai_service is None:
             ai_service = AIService(logger)
 
-        # Build messages for pattern and get the resolved pattern_id (after selection)
-        messages, resolved_pattern_id = message_builder.build_messages(
-            question=None,
-            file_input=None,
-            pattern_id=args.use_pattern,
-            pattern_input=args.pattern_input,
-            response_format="rawtext",  # Use default format with patterns
-            url=None,
-            image=None,
-            pdf=None,
-            image_url=None,
-            pdf_url=None
-        )
-
-        # Check if message building was cancelled
-        if messages is None:
+        # Resolve the pattern (after selection); file inputs larger than a chunk use map-reduce
+        map_reduce = MapReduceProcessor(message_builder, ai_service, logger, config,
+                                        debug=args.debug, overrides=get_cli_overrides(args))
+        job = map_reduce.prepare_pattern(pattern_manager, args.use_pattern, args.pattern_input)
+        if job is None:
             sys.exit(0)
-
-        # Debug log the final messages
-        logger.debug(json.dumps({"log_message": "Pattern messages content", "messages": messages}))
-
-        # Get AI response for pattern
-        response = ai_service.get_ai_response(
-            messages=messages,
-            model_name=None,  # Don't override model for patterns
-            pattern_id=resolved_pattern_id,
-            debug=args.debug,
-            pattern_manager=pattern_manager,
-            enable_url_search=False
-        )
+        resolved_pattern_id = job.pattern_id
+
+        if job.chunked_input:
+            try:
+                response = map_reduce.process_pattern(job, pattern_manager)
+            except ValueError as e:
+                print_error_or_warnings(f"Map-reduce failed: {e}")
+                sys.exit(1)
+        else:
+            # Build messages for pattern
+            messages, _ = message_builder.build_messages(
+                question=None,
+                file_input=None,
+                pattern_id=resolved_pattern_id,
+                pattern_input=job.pattern_input,
+                response_format="rawtext",  # Use default format with patterns
+                url=None,
+                image=None,
+                pdf=None,
+                image_url=None,
+                pdf_url=None,
+                pattern_data=job.pattern_data
+            )
+
+            # Check if message building was cancelled
+            if messages is None:
+                sys.exit(0)
+
+            # Debug log the final messages
+            logger.debug(LogPayload({"log_message": "Pattern messages content", "messages": messages}))
+
+            # Get AI response for pattern
+            response = ai_service.get_ai_response(
+                messages=messages,
+                model_name=None,  # Don't override model for patterns
+                pattern_id=resolved_pattern_id,
+                debug=args.debug,
+                pattern_manager=pattern_manager,
+                enable_url_search=False,
+                pattern_data=job.pattern_data
+            )
 
         # No chat history for patterns
 
     else:
         # === CHAT/QUESTION MODE ===
         # Use the dedicated question processor
+        from askai.modules.questions import QuestionProcessor
+
         question_processor = QuestionProcessor(config, logger, base_path)
-        response_obj = question_processor.process_question(args)
+        on_delta = _print_delta if getattr(args, 'stream', False) else None
+        response_obj = question_processor.process_question(args, on_delta=on_delta)
 
         # The question processor returns a QuestionResponse object
         formatted_output = response_obj.content
         created_files = response_obj.created_files
 
+        # Streamed answers are already on screen, only finish the line
+        if response_obj.streamed:
+            formatted_output = ""
+
     # Process output based on mode
     if using_pattern:
-        # Get pattern outputs for auto-execution handling
-        if resolved_pattern_id:
-            # Make sure pattern_manager is initialized
-            if pattern_manager is None:
-                pattern_manager = PatternManager(base_path, config)
-
-            pattern_data = pattern_manager.get_pattern_content(resolved_pattern_id)
-            if pattern_data:
-                _ = pattern_data.get('outputs', [])
-
         # Check if the response is already a properly formatted JSON with a 'results' field
         try:
             if isinstance(response, dict) and 'content' in response:
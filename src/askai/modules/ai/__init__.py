@@ -6,5 +6,12 @@ for various AI providers, currently focusing on OpenRouter.
 """
 from .ai_service import AIService
 from .openrouter_client import OpenRouterClient
+from .async_openrouter_client import AsyncOpenRouterClient, close_async_http_clients
+from .http_session import get_session, close_sessions
+from .response_cache import get_response_cache, get_cache_stats
+from .model_catalog import ModelSearchIndex, get_model_catalog
+from .credits_monitor import get_credits_monitor
 
-__all__ = ['AIService', 'OpenRouterClient']
+__all__ = ['AIService', 'OpenRouterClient', 'AsyncOpenRouterClient', 'close_async_http_clients',
+           'get_session', 'close_sessions', 'get_response_cache', 'get_cache_stats', 'ModelSearchIndex',
+           'get_model_catalog', 'get_credits_monitor']
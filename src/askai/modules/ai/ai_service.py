@@ -5,11 +5,20 @@ Manages AI response generation and model configuration logic.
 
 import json
 import threading
-from askai.shared.utils import tqdm_spinner
+from askai.shared.logging import LogPayload
+from askai.shared.metrics import inc
+from askai.shared.utils import timed, tqdm_spinner
 from askai.shared.config import load_config
 from askai.modules.patterns.pattern_configuration import ModelConfiguration, ModelProvider
 from .openrouter_client import OpenRouterClient
+from .async_openrouter_client import AsyncOpenRouterClient
+from .model_catalog import get_model_catalog
 
+# Context lengths by model name from /models when the model catalogue is disabled,
+# kept once a request succeeded
+_context_lengths = {}
+_context_lengths_loaded = False
+_context_lengths_lock = threading.Lock()
 
 
 class AIService:
@@ -82,8 +91,114 @@ class AIService:
             model_name=config["default_model"]
         )
 
+    def get_context_length(self, model_name, config=None):
+        """Return the context length of a model from the /models metadata.
+
+        With the model catalogue enabled the length comes from its on-disk
+        index; the list is only fetched when there is no catalogue yet. Without
+        it the list is requested until one request succeeds in this process.
+        None is returned if the list cannot be loaded or does not have the model.
+
+        Args:
+            model_name: OpenRouter model name
+            config: Optional configuration, loaded if not given
+
+        Returns:
+            int or None: Context length in tokens
+        """
+        global _context_lengths_loaded  # pylint: disable=global-statement
+        config = config or load_config()
+        catalog = get_model_catalog(config)
+        if catalog is not None:
+            if catalog.is_stale():
+                # Fetches a missing catalogue; a stale one is revalidated in the background
+                self._get_available_models(config)
+            return catalog.context_length(model_name)
+
+        with _context_lengths_lock:
+            if _context_lengths_loaded:
+                return _context_lengths.get(model_name)
+        # Fetched without holding the lock, so other threads are not stalled by the request
+        models = self._get_available_models(config)
+        if models is None:
+            return None
+        with _context_lengths_lock:
+            for model in models:
+                if model.get('id') and model.get('context_length'):
+                    _context_lengths[model['id']] = int(model['context_length'])
+            _context_lengths_loaded = True
+            return _context_lengths.get(model_name)
+
+    def _get_available_models(self, config):
+        """Return the model list, or None (logged) if it cannot be loaded."""
+        try:
+            return OpenRouterClient(config=config, logger=self.logger).get_available_models()
+        except Exception as e:
+            self.logger.warning(json.dumps({
+                "log_message": "Could not load model context lengths",
+                "error": str(e)
+            }))
+            return None
+
+    def _resolve_request_options(self, model_name=None, pattern_id=None,
+                                 pattern_manager=None, enable_url_search=False,
+                                 pattern_data=None):
+        """Resolve config, model configuration and web search settings for a request.
+
+        Args:
+            model_name: Optional model name to override default
+            pattern_id: Optional pattern ID to get pattern-specific configuration
+            pattern_manager: PatternManager instance for accessing pattern data
+            enable_url_search: Whether to enable web search for URL analysis
+            pattern_data: Optional already parsed pattern content
+
+        Returns:
+            tuple: (config, model_config, web_search_options, web_plugin_config)
+        """
+        # Get configuration from the proper source
+        config = load_config()
+        if pattern_data is None and pattern_id and pattern_manager is not None:
+            pattern_data = pattern_manager.get_pattern_content(pattern_id)
+
+            # The format instructions are now generated dynamically from output definitions
+            # and consistently handled by the output handler, so no special validators are needed here
+
+        model_config = self.get_model_configuration(model_name, config, pattern_data)
+
+        # Determine web search configuration
+        web_search_options = None
+        web_plugin_config = None
+
+        # Priority 1: System-specific web search configuration
+        if hasattr(model_config, 'get_web_search_options'):
+            web_search_options = model_config.get_web_search_options()
+
+        if hasattr(model_config, 'get_web_plugin_config'):
+            web_plugin_config = model_config.get_web_plugin_config()
+
+        # Priority 2: Global configuration or URL search override
+        if web_search_options is None and web_plugin_config is None:
+            web_config = config.get('web_search', {})
+
+            # Enable web search if explicitly requested for URL or globally enabled
+            if enable_url_search or web_config.get('enabled', False):
+                if web_config.get('method', 'plugin') == 'plugin':
+                    web_plugin_config = {
+                        "max_results": web_config.get('max_results', 5)
+                    }
+                    if web_config.get('search_prompt'):
+                        web_plugin_config["search_prompt"] = web_config['search_prompt']
+                else:
+                    web_search_options = {
+                        "search_context_size": web_config.get('context_size', 'medium')
+                    }
+
+        return config, model_config, web_search_options, web_plugin_config
+
+    @timed("ai.response")
     def get_ai_response(self, messages, model_name=None, pattern_id=None,
-                       debug=False, pattern_manager=None, enable_url_search=False):
+                       debug=False, pattern_manager=None, enable_url_search=False,
+                       on_delta=None, show_spinner=True, pattern_data=None):
         """Get response from AI model with progress spinner.
 
         Args:
@@ -93,69 +208,113 @@ class AIService:
             debug: Whether to enable debug mode
             pattern_manager: PatternManager instance for accessing pattern data
             enable_url_search: Whether to enable web search for URL analysis
+            on_delta: Optional callable receiving content deltas as they stream in.
+                When given, the completion is streamed and the spinner stops at
+                the first token. The assembled response is returned either way.
+            show_spinner: Whether to show the console spinner (disabled for
+                batch workers running many requests in parallel)
+            pattern_data: Optional already parsed pattern content, used instead
+                of looking the pattern up through pattern_manager
         """
         stop_spinner = threading.Event()
         spinner = threading.Thread(target=tqdm_spinner, args=(stop_spinner,))
-        spinner.start()
+        if show_spinner:
+            spinner.start()
 
         try:
             self.logger.info(json.dumps({"log_message": "Messages sending to ai"}))
 
-            # Get configuration from the proper source
-            config = load_config()
-            pattern_data = None
-            if pattern_id and pattern_manager is not None:
-                pattern_data = pattern_manager.get_pattern_content(pattern_id)
-
-                # The format instructions are now generated dynamically from output definitions
-                # and consistently handled by the output handler, so no special validators are needed here
-
-            model_config = self.get_model_configuration(model_name, config, pattern_data)
-
-            # Determine web search configuration
-            web_search_options = None
-            web_plugin_config = None
-
-            # Priority 1: System-specific web search configuration
-            if hasattr(model_config, 'get_web_search_options'):
-                web_search_options = model_config.get_web_search_options()
-
-            if hasattr(model_config, 'get_web_plugin_config'):
-                web_plugin_config = model_config.get_web_plugin_config()
-
-            # Priority 2: Global configuration or URL search override
-            if web_search_options is None and web_plugin_config is None:
-                web_config = config.get('web_search', {})
-
-                # Enable web search if explicitly requested for URL or globally enabled
-                if enable_url_search or web_config.get('enabled', False):
-                    if web_config.get('method', 'plugin') == 'plugin':
-                        web_plugin_config = {
-                            "max_results": web_config.get('max_results', 5)
-                        }
-                        if web_config.get('search_prompt'):
-                            web_plugin_config["search_prompt"] = web_config['search_prompt']
-                    else:
-                        web_search_options = {
-                            "search_context_size": web_config.get('context_size', 'medium')
-                        }
+            config, model_config, web_search_options, web_plugin_config = self._resolve_request_options(
+                model_name, pattern_id, pattern_manager, enable_url_search, pattern_data
+            )
 
             # Create OpenRouter client and get response
             openrouter_client = OpenRouterClient(config=config, logger=self.logger)
-            response = openrouter_client.request_completion(
+            request_kwargs = {
+                "messages": messages,
+                "model_config": model_config,
+                "debug": debug,
+                "web_search_options": web_search_options,
+                "web_plugin_config": web_plugin_config
+            }
+
+            if on_delta is None:
+                response = openrouter_client.request_completion(**request_kwargs)
+            else:
+                stream = openrouter_client.stream_completion(**request_kwargs)
+                for delta in stream:
+                    if not stop_spinner.is_set():
+                        stop_spinner.set()
+                        if show_spinner:
+                            spinner.join()
+                    on_delta(delta)
+                response = stream.result
+
+            self.logger.debug(LogPayload({
+                "log_message": "Response from ai",
+                "response": response
+            }))
+            self.logger.info(json.dumps({
+                "log_message": "Response received from ai",
+                "streamed": on_delta is not None
+            }))
+            _count_pattern_execution(pattern_id, response)
+            return response
+        except Exception:
+            _count_pattern_execution(pattern_id, None)
+            raise
+        finally:
+            stop_spinner.set()
+            if show_spinner:
+                spinner.join()
+
+    async def get_ai_response_async(self, messages, model_name=None, pattern_id=None,
+                                    debug=False, pattern_manager=None, enable_url_search=False):
+        """Get response from AI model without blocking the event loop.
+
+        Async counterpart of get_ai_response for TUI workers and async API
+        servers; no console spinner is shown.
+
+        Args:
+            messages: List of message dictionaries
+            model_name: Optional model name to override default
+            pattern_id: Optional pattern ID to get pattern-specific configuration
+            debug: Whether to enable debug mode
+            pattern_manager: PatternManager instance for accessing pattern data
+            enable_url_search: Whether to enable web search for URL analysis
+        """
+        self.logger.info(json.dumps({"log_message": "Messages sending to ai (async)"}))
+
+        config, model_config, web_search_options, web_plugin_config = self._resolve_request_options(
+            model_name, pattern_id, pattern_manager, enable_url_search
+        )
+
+        try:
+            # Requests share the running loop's connection pool (see close_async_http_clients)
+            client = AsyncOpenRouterClient(config=config, logger=self.logger)
+            response = await client.request_completion(
                 messages=messages,
                 model_config=model_config,
                 debug=debug,
                 web_search_options=web_search_options,
                 web_plugin_config=web_plugin_config
             )
+        except Exception:
+            _count_pattern_execution(pattern_id, None)
+            raise
+        _count_pattern_execution(pattern_id, response)
 
-            self.logger.debug(json.dumps({
-                "log_message": "Response from ai",
-                "response": str(response)
-            }))
-            self.logger.info(json.dumps({"log_message": "Response received from ai"}))
-            return response
-        finally:
-            stop_spinner.set()
-            spinner.join()
+        self.logger.debug(LogPayload({
+            "log_message": "Response from ai",
+            "response": response
+        }))
+        self.logger.info(json.dumps({"log_message": "Response received from ai"}))
+        return response
+
+
+def _count_pattern_execution(pattern_id, response):
+    """Count an AI request made for a pattern by outcome (no-op without a pattern)."""
+    if not pattern_id:
+        return
+    failed = not response or bool((response.get("full_response") or {}).get("error"))
+    inc("askai_pattern_executions_total", {"pattern_id": pattern_id, "outcome": "error" if failed else "success"})
@@ -0,0 +1,309 @@
+"""
+Asyncio-native OpenRouter API client.
+
+AsyncOpenRouterClient mirrors the public request methods of
+OpenRouterClient as coroutines so that event-loop driven callers (the
+Textual TUI, async API servers) can run many calls concurrently without
+blocking. Payload construction and response handling are shared with the
+synchronous client, so both produce identical results.
+
+When ``httpx`` is installed the requests are issued on its async
+connection pool. One ``httpx.AsyncClient`` is shared per event loop and
+pool configuration, so concurrent calls on a loop reuse keep-alive
+connections; close_async_http_clients() closes them before the loop ends.
+Without it, the synchronous pooled client runs in the
+loop's default executor, which keeps the event loop responsive with no
+extra dependency.
+"""
+
+import asyncio
+import functools
+import json
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+from askai.shared.config import load_config
+from askai.shared.metrics import observe
+from .credits_monitor import get_credits_monitor
+from .http_session import get_http_settings
+from .model_catalog import get_model_catalog
+from .openrouter_client import OpenRouterClient
+from .resilience import get_resilience_policy, get_timeouts
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    httpx = None
+    HTTPX_AVAILABLE = False
+
+# Connection failures before a completion was sent, safe to retry
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout) if HTTPX_AVAILABLE else ()
+
+# httpx clients are bound to the loop they were created on: one pool per loop and configuration
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[Any, ...], Any]]" = \
+    weakref.WeakKeyDictionary()
+_async_clients_lock = threading.Lock()
+
+
+def get_async_http_client(config: Optional[Dict[str, Any]] = None):
+    """Return the running loop's shared ``httpx.AsyncClient`` for the given pool configuration.
+
+    Args:
+        config: Optional configuration dict containing ``http`` and ``resilience`` blocks
+
+    Returns:
+        httpx.AsyncClient: Client shared by all AsyncOpenRouterClients on this loop
+    """
+    settings = get_http_settings(config)
+    connect_timeout, read_timeout = get_timeouts(config)
+    key = tuple(settings[name] for name in sorted(settings)) + (connect_timeout, read_timeout)
+
+    loop = asyncio.get_running_loop()
+    with _async_clients_lock:
+        clients = _async_clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=int(settings["pool_maxsize"]),
+                    max_keepalive_connections=int(settings["pool_maxsize"])
+                ),
+                # No transport retries: they replay POST connect errors on top of
+                # the resilience policy
+                transport=httpx.AsyncHTTPTransport(retries=0),
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout)
+            )
+            clients[key] = client
+        return client
+
+
+async def close_async_http_clients() -> None:
+    """Close and forget the running loop's shared HTTP clients (on shutdown and in tests)."""
+    with _async_clients_lock:
+        clients = list(_async_clients.pop(asyncio.get_running_loop(), {}).values())
+    for client in clients:
+        await client.aclose()
+
+
+class _AsyncResponse:
+    """Expose an httpx response through the requests.Response attributes we use."""
+
+    def __init__(self, response):
+        self._response = response
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.text = response.text
+        self.ok = response.is_success
+
+    def json(self):
+        """Decode the JSON body."""
+        return self._response.json()
+
+
+class AsyncOpenRouterClient:
+    """Async client for interacting with the OpenRouter API."""
+
+    def __init__(self, config=None, logger=None, http_client=None):
+        """Initialize the async OpenRouter client.
+
+        Args:
+            config: Optional configuration dict. If not provided, will load from config.
+            logger: Optional logger instance. If not provided, will create one.
+            http_client: Optional ``httpx.AsyncClient`` to issue requests with
+        """
+        self.config = config or load_config()
+        self._sync_client = OpenRouterClient(config=self.config, logger=logger)
+        self._http_client = http_client
+
+    @property
+    def logger(self):
+        """Logger shared with the synchronous client."""
+        return self._sync_client.logger
+
+    @property
+    def base_url(self):
+        """Normalized API base URL."""
+        return self._sync_client.base_url
+
+    @property
+    def uses_native_async(self) -> bool:
+        """Whether requests run on an async HTTP stack rather than an executor."""
+        return self._http_client is not None or HTTPX_AVAILABLE
+
+    def _get_http_client(self):
+        """Return the given httpx client, or the running loop's shared one."""
+        if self._http_client is not None:
+            return self._http_client
+        return get_async_http_client(self.config)
+
+    async def _run_sync(self, func, *args, **kwargs):
+        """Run a synchronous client method without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+    async def _send(self, method: str, endpoint: str,
+                    payload: Optional[Dict[str, Any]] = None) -> _AsyncResponse:
+        """Issue one request on the async HTTP stack, recording its latency and status."""
+        start = time.perf_counter()
+        status = "error"
+        try:
+            response = await self._get_http_client().request(
+                method,
+                f"{self.base_url}{endpoint}",
+                headers=self._sync_client._get_headers(),  # pylint: disable=protected-access
+                json=payload
+            )
+            status = str(response.status_code)
+            return _AsyncResponse(response)
+        finally:
+            observe("askai_upstream_request_duration_seconds", time.perf_counter() - start,
+                    {"endpoint": endpoint, "status": status})
+
+    async def _request(self, method: str, endpoint: str, logger: Any,
+                       payload: Optional[Dict[str, Any]] = None, retry: bool = False) -> _AsyncResponse:
+        """Issue a request on the async HTTP stack, wrapping transport errors.
+
+        With retry set (completions) failed attempts are retried under the
+        resilience policy and the request may be hedged.
+        """
+        send = functools.partial(self._send, method, endpoint, payload)
+        policy = get_resilience_policy(self.config) if retry else None
+        try:
+            if policy is None:
+                return await send()
+            return await policy.call_async(send, logger, key=(payload or {}).get("model"), hedge=True,
+                                           retryable=RETRYABLE_ERRORS)
+        except RETRYABLE_ERRORS as e:
+            logger.critical(json.dumps({
+                "log_message": f"Connection error when calling OpenRouter API endpoint {endpoint}",
+                "error": str(e)
+            }))
+            raise Exception(f"Connection error when calling OpenRouter API: {str(e)}") from e
+        except Exception as e:
+            logger.critical(json.dumps({
+                "log_message": f"Unexpected error when calling OpenRouter API endpoint {endpoint}",
+                "error": str(e)
+            }))
+            raise Exception(f"Error communicating with OpenRouter API: {str(e)}") from e
+
+    async def request_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        model_config: Optional[Any] = None,
+        debug: bool = False,
+        web_search_options: Optional[Dict[str, Any]] = None,
+        web_plugin_config: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Send a chat completion request to the OpenRouter API.
+
+        Args:
+            messages: List of message dictionaries to send
+            model_config: Optional ModelConfiguration instance to override defaults
+            debug: Whether to enable debug logging
+            web_search_options: Optional dict with web search configuration for non-plugin search
+            web_plugin_config: Optional dict with web plugin configuration
+
+        Returns:
+            dict: The full API response including message content and annotations
+        """
+        if not self.uses_native_async:
+            return await self._run_sync(
+                self._sync_client.request_completion,
+                messages, model_config, debug, web_search_options, web_plugin_config
+            )
+
+        # pylint: disable=protected-access
+        logger = self._sync_client._setup_logger(debug)
+        payload, content_info = self._sync_client._build_completion_payload(
+            messages, model_config, logger, web_search_options, web_plugin_config
+        )
+        cache, cache_key, cached = self._sync_client._lookup_cached_completion(payload, logger)
+        if cached is not None:
+            return cached
+
+        response = await self._request("POST", "chat/completions", logger, payload, retry=True)
+        result = self._sync_client._handle_api_response(response, logger, content_info)
+        self._sync_client._store_cached_completion(cache, cache_key, result, logger)
+        return result
+
+    async def _get_json(self, endpoint: str, debug: bool, error_message: str) -> Dict[str, Any]:
+        """GET an endpoint and return its decoded JSON body."""
+        logger = self._sync_client._setup_logger(debug)  # pylint: disable=protected-access
+        response = await self._request("GET", endpoint, logger)
+        if not response.ok:
+            logger.critical(json.dumps({
+                "log_message": f"{error_message} {response.status_code}: {response.text}"
+            }))
+            raise Exception(f"{error_message}: {response.text}")
+        logger.debug(json.dumps({
+            "log_message": f"API request to {endpoint} successful"
+        }))
+        return response.json()
+
+    async def get_credit_balance(self, debug: bool = False, refresh: bool = False) -> Dict[str, Any]:
+        """Get the current credit balance from OpenRouter.
+
+        With the credits monitor enabled the synchronous client answers from
+        the shared cache in the executor.
+
+        Args:
+            debug: Whether to enable debug logging
+            refresh: Fetch the balance before returning it
+
+        Returns:
+            dict: Credit balance information containing total_credits and total_usage
+        """
+        if not self.uses_native_async or get_credits_monitor(self._sync_client.config) is not None:
+            return await self._run_sync(self._sync_client.get_credit_balance, debug, refresh)
+
+        data = await self._get_json("credits", debug, "API Error getting credit balance")
+        return data.get("data", {})
+
+    def start_credit_polling(self, debug: bool = False):
+        """Keep the cached credit balance fresh on a background thread.
+
+        Returns:
+            Optional[CreditsMonitor]: The polling monitor, or None when disabled
+        """
+        return self._sync_client.start_credit_polling(debug)
+
+    async def get_available_models(self, debug: bool = False, refresh: bool = False) -> List[Dict[str, Any]]:
+        """Get the list of available models from OpenRouter.
+
+        With the model catalogue enabled the synchronous client answers from
+        disk in the executor; a fetch only happens for a missing catalogue
+        or a requested refresh.
+
+        Args:
+            debug: Whether to enable debug logging
+            refresh: Revalidate the cached list before returning it
+
+        Returns:
+            list: List of available models with their information
+        """
+        if not self.uses_native_async or get_model_catalog(self._sync_client.config) is not None:
+            return await self._run_sync(self._sync_client.get_available_models, debug, refresh)
+
+        models_data = await self._get_json("models", debug, "API Error getting available models")
+        self.logger.debug(json.dumps({
+            "log_message": "Available models retrieved successfully",
+            "model_count": len(models_data.get("data", []))
+        }))
+        return models_data.get("data", [])
+
+    async def aclose(self) -> None:
+        """Release the client.
+
+        Connections belong to the loop's shared pool (closed by
+        close_async_http_clients()) or to the caller that passed http_client,
+        so nothing is closed here.
+        """
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
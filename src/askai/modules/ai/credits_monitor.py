@@ -0,0 +1,209 @@
+"""
+Shared, background-refreshed cache of the OpenRouter credit balance.
+
+The TUI credits tab and screen, ``/api/v1/openrouter/credits`` and
+``askai -or check-credits`` each used to make a blocking /credits request
+on demand. The monitor keeps the latest balance with its timestamp in a
+file in the local cache directory, so every front-end reads it instantly.
+A balance older than the poll interval is returned as is and refreshed
+on a background thread; long-running front-ends (the TUI) can also poll
+continuously. Each refresh appends a (timestamp, usage, credits) sample
+to a short series used to show the spend rate. Each API key gets its own
+file (a hash of the key is added to the configured name), so switching
+keys never shows another key's balance.
+
+Configured by the optional ``credits`` block:
+
+    credits:
+      enabled: true                     # Cache the balance and poll in the background
+      path: "~/.askai/credits.json"     # Shared cache file (suffixed per API key)
+      poll_interval_seconds: 300        # Refresh balances older than this
+      history_size: 288                 # Usage samples kept for the spend rate
+"""
+
+import hashlib
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .shared_state_file import SharedStateFile
+
+DEFAULT_CREDITS_SETTINGS: Dict[str, Any] = {
+    "enabled": True,
+    "path": "~/.askai/credits.json",
+    "poll_interval_seconds": 300,
+    "history_size": 288,
+}
+
+# fetch() -> credit data as returned by /credits (total_credits, total_usage)
+Fetcher = Callable[[], Dict[str, Any]]
+
+_monitors: Dict[Tuple[Any, ...], "CreditsMonitor"] = {}
+_monitors_lock = threading.Lock()
+
+
+def get_credits_settings(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Merge the ``credits`` config block with the default settings.
+
+    Args:
+        config: Optional configuration dict
+
+    Returns:
+        dict: Effective credits monitor settings
+    """
+    settings = dict(DEFAULT_CREDITS_SETTINGS)
+    credits_config = (config or {}).get("credits") or {}
+    if isinstance(credits_config, dict):
+        for key in DEFAULT_CREDITS_SETTINGS:
+            if credits_config.get(key) is not None:
+                settings[key] = credits_config[key]
+    return settings
+
+
+class CreditsMonitor(SharedStateFile):
+    """Latest credit balance and usage series, shared between processes through a file."""
+
+    thread_name = "askai-credits"
+
+    def __init__(self, path: str, poll_interval_seconds: float = DEFAULT_CREDITS_SETTINGS["poll_interval_seconds"],
+                 history_size: int = DEFAULT_CREDITS_SETTINGS["history_size"]):
+        """Initialize the monitor.
+
+        Args:
+            path: Shared cache file (created on the first fetch)
+            poll_interval_seconds: Age after which the balance is refreshed
+            history_size: Number of usage samples kept
+        """
+        super().__init__(path, poll_interval_seconds)
+        self.history_size = int(history_size)
+        self._poller: Optional[threading.Thread] = None
+        self._stop_polling = threading.Event()
+
+    @property
+    def poll_interval_seconds(self) -> float:
+        """Age after which the balance is refreshed."""
+        return self.max_age_seconds
+
+    def _validate(self, state: Dict[str, Any]) -> None:
+        if not isinstance(state.get("data"), dict):
+            raise ValueError("no credit data")
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Return the cached ``data`` and its ``fetched_at`` timestamp, or None if never fetched."""
+        state = self._load()
+        if state is None:
+            return None
+        return {"data": state["data"], "fetched_at": state.get("fetched_at")}
+
+    def history(self) -> List[List[float]]:
+        """Return the usage series as [timestamp, total_usage, total_credits] samples, oldest first."""
+        state = self._load()
+        return list(state.get("history", [])) if state else []
+
+    def spend_rate(self, window_seconds: Optional[float] = None) -> Optional[float]:
+        """Return the spend in credits per hour over the series (or its last window_seconds).
+
+        Returns:
+            float or None: None until two samples some time apart exist
+        """
+        samples = self.history()
+        if window_seconds is not None and samples:
+            samples = [sample for sample in samples if sample[0] >= samples[-1][0] - window_seconds]
+        if len(samples) < 2 or samples[-1][0] <= samples[0][0]:
+            return None
+        spent = max(0.0, samples[-1][1] - samples[0][1])
+        return spent / ((samples[-1][0] - samples[0][0]) / 3600)
+
+    def _next_state(self, fetch: Fetcher, current: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        data = fetch()
+        history = list(current.get("history", [])) if current else []
+        history.append([time.time(), float(data.get("total_usage") or 0), float(data.get("total_credits") or 0)])
+        return {"data": data, "history": history[-self.history_size:]}
+
+    def refresh(self, fetch: Fetcher) -> Dict[str, Any]:
+        """Fetch the balance now and append it to the usage series.
+
+        Args:
+            fetch: Callable requesting /credits
+
+        Returns:
+            dict: The credit data
+        """
+        return self._refresh_state(fetch)["data"]
+
+    def get_balance(self, fetch: Fetcher, refresh: bool = False, background: bool = True) -> Dict[str, Any]:
+        """Return the credit data, fetching it only when none is cached yet.
+
+        A balance older than the poll interval is returned as is and
+        refreshed in the background for the next call.
+
+        Args:
+            fetch: Callable requesting /credits
+            refresh: Fetch before returning (e.g. a user-requested refresh)
+            background: Refresh a stale balance in the background; short-lived
+                processes (the CLI) pass False to refresh it before returning
+
+        Returns:
+            dict: Credit data with total_credits and total_usage
+        """
+        return self._current_state(fetch, refresh, background)["data"]
+
+    def start_polling(self, fetch: Fetcher) -> None:
+        """Keep the balance fresh on a daemon thread until stop_polling().
+
+        A poll is skipped while the shared file is younger than the poll
+        interval, so several front-ends polling at once fetch only once.
+        """
+        with self._thread_lock:
+            if self._poller is not None and self._poller.is_alive():
+                return
+            self._stop_polling.clear()
+            self._poller = threading.Thread(target=self._poll, args=(fetch,), name="askai-credits-poller",
+                                            daemon=True)
+            self._poller.start()
+
+    def stop_polling(self) -> None:
+        """Stop the polling thread."""
+        self._stop_polling.set()
+
+    def _poll(self, fetch: Fetcher) -> None:
+        while not self._stop_polling.is_set():
+            age = self._age(self._load())
+            if age is None or age >= self.poll_interval_seconds:
+                self._background_refresh(fetch)
+                age = 0.0
+            # Wake up when the newest balance, possibly fetched elsewhere, expires
+            self._stop_polling.wait(self.poll_interval_seconds - age)
+
+
+def _keyed_path(path: str, api_key: Optional[str]) -> str:
+    """Return the cache file for an API key, e.g. credits-<hash>.json."""
+    if not api_key:
+        return path
+    digest = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+    root, ext = os.path.splitext(path)
+    return f"{root}-{digest}{ext}"
+
+
+def get_credits_monitor(config: Optional[Dict[str, Any]] = None) -> Optional[CreditsMonitor]:
+    """Return the shared credits monitor, or None when it is disabled.
+
+    Args:
+        config: Optional configuration dict containing a ``credits`` block
+
+    Returns:
+        Optional[CreditsMonitor]: Monitor instance shared by all clients of the same API key
+    """
+    settings = get_credits_settings(config)
+    if not settings["enabled"]:
+        return None
+
+    path = _keyed_path(settings["path"], (config or {}).get("api_key"))
+    key = tuple(settings[name] for name in sorted(settings)) + (path,)
+    with _monitors_lock:
+        monitor = _monitors.get(key)
+        if monitor is None:
+            monitor = CreditsMonitor(path, settings["poll_interval_seconds"], settings["history_size"])
+            _monitors[key] = monitor
+        return monitor
@@ -0,0 +1,120 @@
+"""
+Shared HTTP session management for the OpenRouter client.
+
+Every OpenRouterClient used to call the module-level ``requests`` helpers,
+which opens a fresh TCP/TLS connection per call. This module keeps one
+keep-alive ``requests.Session`` per process and pool configuration so that
+all clients (CLI, API workers, TUI tabs) reuse pooled connections.
+
+Pool settings are read from the optional ``http`` block of the config:
+
+    http:
+      pool_connections: 10   # Number of host pools to cache
+      pool_maxsize: 10       # Max connections kept alive per host
+      max_retries: 2         # Status retries for idempotent requests
+      backoff_factor: 0.5    # Backoff between retries (seconds)
+"""
+
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+DEFAULT_HTTP_SETTINGS: Dict[str, Any] = {
+    "pool_connections": 10,
+    "pool_maxsize": 10,
+    "max_retries": 2,
+    "backoff_factor": 0.5,
+}
+
+# Statuses worth retrying for idempotent requests (GET /models, GET /credits)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+_sessions: Dict[Tuple[Any, ...], requests.Session] = {}
+_sessions_pid = os.getpid()
+_sessions_lock = threading.Lock()
+
+
+def get_http_settings(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Merge the ``http`` config block with the default pool settings.
+
+    Args:
+        config: Optional configuration dict
+
+    Returns:
+        dict: Effective HTTP pool settings
+    """
+    settings = dict(DEFAULT_HTTP_SETTINGS)
+    http_config = (config or {}).get("http") or {}
+    if isinstance(http_config, dict):
+        for key in DEFAULT_HTTP_SETTINGS:
+            if http_config.get(key) is not None:
+                settings[key] = http_config[key]
+    return settings
+
+
+def _build_session(settings: Dict[str, Any]) -> requests.Session:
+    """Create a session with pooled, retrying adapters mounted."""
+    retry = Retry(
+        total=int(settings["max_retries"]),
+        backoff_factor=float(settings["backoff_factor"]),
+        # Connect errors are retried for every method, POST included, so they
+        # are left to the resilience layer; it owns completion retries
+        connect=0,
+        status_forcelist=RETRY_STATUS_CODES,
+        # POST completions are never replayed on a bad status here either
+        allowed_methods=frozenset(["GET", "HEAD", "OPTIONS"]),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=int(settings["pool_connections"]),
+        pool_maxsize=int(settings["pool_maxsize"]),
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session(config: Optional[Dict[str, Any]] = None) -> requests.Session:
+    """Return the process-wide session for the given pool configuration.
+
+    Sessions are created lazily and are discarded after a fork, so that
+    pre-forking servers such as gunicorn never share sockets between workers.
+
+    Args:
+        config: Optional configuration dict containing an ``http`` block
+
+    Returns:
+        requests.Session: Shared keep-alive session
+    """
+    global _sessions_pid  # pylint: disable=global-statement
+
+    settings = get_http_settings(config)
+    key = tuple(settings[name] for name in sorted(settings))
+
+    with _sessions_lock:
+        if _sessions_pid != os.getpid():
+            # Inherited from the parent process: drop without closing sockets
+            _sessions.clear()
+            _sessions_pid = os.getpid()
+
+        session = _sessions.get(key)
+        if session is None:
+            session = _build_session(settings)
+            _sessions[key] = session
+        return session
+
+
+def close_sessions() -> None:
+    """Close and forget all shared sessions (used on shutdown and in tests)."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,248 @@
+"""
+Persistent catalogue of the OpenRouter model list.
+
+The /models list has several hundred entries with long descriptions and was
+downloaded by every model listing (TUI model tab and browser, API endpoint,
+``askai -or list-models``). The catalogue keeps the last list on disk and
+answers from it immediately. Once the list is older than the TTL it is
+refreshed on a background thread; the refresh sends the stored ETag and
+Last-Modified validators so an unchanged list costs a 304 and no body.
+
+Next to the list the catalogue stores lowercase search text per model and
+context-length and pricing indexes, so filters and lookups do not rebuild
+them on every keystroke. ModelSearchIndex turns the search text into an
+inverted token index with prefix matching for as-you-type filtering.
+
+Configured by the optional ``model_catalog`` block:
+
+    model_catalog:
+      enabled: true                           # Cache the model list on disk
+      path: "~/.askai/model_catalog.json"     # Catalogue file
+      ttl_seconds: 3600                       # Refresh in the background after this age
+"""
+
+import bisect
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .shared_state_file import SharedStateFile
+
+DEFAULT_MODEL_CATALOG_SETTINGS: Dict[str, Any] = {
+    "enabled": True,
+    "path": "~/.askai/model_catalog.json",
+    "ttl_seconds": 3600,
+}
+
+# fetch(validators) -> (models, validators); models is None when the list is unchanged (304)
+Fetcher = Callable[[Dict[str, Optional[str]]], Tuple[Optional[List[Dict[str, Any]]], Dict[str, Optional[str]]]]
+
+_TOKEN_RE = re.compile(r"\w+")
+
+_catalogs: Dict[Tuple[Any, ...], "ModelCatalog"] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_model_catalog_settings(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Merge the ``model_catalog`` config block with the default settings.
+
+    Args:
+        config: Optional configuration dict
+
+    Returns:
+        dict: Effective catalogue settings
+    """
+    settings = dict(DEFAULT_MODEL_CATALOG_SETTINGS)
+    catalog_config = (config or {}).get("model_catalog") or {}
+    if isinstance(catalog_config, dict):
+        for key in DEFAULT_MODEL_CATALOG_SETTINGS:
+            if catalog_config.get(key) is not None:
+                settings[key] = catalog_config[key]
+    return settings
+
+
+def _price(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def search_text(model: Dict[str, Any]) -> str:
+    """Return the lowercase text a model is found by (id, name and description)."""
+    return " ".join(str(model.get(field) or "") for field in ("id", "name", "description")).lower()
+
+
+class ModelSearchIndex:
+    """Inverted token index over model search texts with prefix matching."""
+
+    def __init__(self, models: List[Dict[str, Any]], texts: Optional[List[str]] = None):
+        """Build the index.
+
+        Args:
+            models: Model entries in display order
+            texts: Precomputed search texts (as stored in the catalogue), or
+                None to derive them from the models
+        """
+        self.models = models
+        postings: Dict[str, Set[int]] = {}
+        for position, text in enumerate(texts if texts is not None else map(search_text, models)):
+            for token in _TOKEN_RE.findall(text):
+                postings.setdefault(token, set()).add(position)
+        self._postings = postings
+        self._vocabulary = sorted(postings)
+
+    def match(self, query: str) -> List[int]:
+        """Return the positions of the models containing every query word as a word prefix."""
+        matches: Optional[Set[int]] = None
+        for token in set(_TOKEN_RE.findall(query.lower())):
+            token_matches: Set[int] = set()
+            position = bisect.bisect_left(self._vocabulary, token)
+            while position < len(self._vocabulary) and self._vocabulary[position].startswith(token):
+                token_matches |= self._postings[self._vocabulary[position]]
+                position += 1
+            matches = token_matches if matches is None else matches & token_matches
+            if not matches:
+                return []
+        if matches is None:
+            return list(range(len(self.models)))
+        return sorted(matches)
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """Return the matching models in display order (all models for an empty query)."""
+        return [self.models[position] for position in self.match(query)]
+
+
+def build_index(models: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Precompute search text and context-length and pricing lookups.
+
+    Args:
+        models: Model entries as returned by /models
+
+    Returns:
+        dict: ``search`` (lowercase text per model, in list order),
+        ``context_length`` and ``pricing`` (by model id)
+    """
+    search = []
+    context_length: Dict[str, int] = {}
+    pricing: Dict[str, Dict[str, Optional[float]]] = {}
+    for model in models:
+        model_id = model.get("id") or ""
+        search.append(search_text(model))
+        if model_id and model.get("context_length"):
+            context_length[model_id] = int(model["context_length"])
+        if model_id and model.get("pricing"):
+            pricing[model_id] = {
+                "prompt": _price(model["pricing"].get("prompt")),
+                "completion": _price(model["pricing"].get("completion")),
+            }
+    return {"search": search, "context_length": context_length, "pricing": pricing}
+
+
+class ModelCatalog(SharedStateFile):
+    """On-disk model list with TTL, background revalidation and lookup indexes."""
+
+    thread_name = "askai-model-catalog"
+
+    def __init__(self, path: str, ttl_seconds: float = DEFAULT_MODEL_CATALOG_SETTINGS["ttl_seconds"]):
+        """Initialize the catalogue.
+
+        Args:
+            path: Catalogue file (created on the first fetch)
+            ttl_seconds: Age after which the list is refreshed in the background
+        """
+        super().__init__(path, ttl_seconds)
+        self._search_index: Optional[ModelSearchIndex] = None
+
+    @property
+    def ttl_seconds(self) -> float:
+        """Age after which the list is refreshed."""
+        return self.max_age_seconds
+
+    def _validate(self, state: Dict[str, Any]) -> None:
+        if len(state["index"]["search"]) != len(state["models"]):
+            raise ValueError("index does not match the model list")
+
+    def _next_state(self, fetch: Fetcher, current: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        validators = {"etag": None, "last_modified": None}
+        if current is not None:
+            validators = {key: current.get(key) for key in validators}
+        models, new_validators = fetch(validators)
+
+        if models is None and current is not None:
+            data = dict(current)
+        else:
+            models = models or []
+            data = {"models": models, "index": build_index(models)}
+        data.update(new_validators)
+        return data
+
+    def refresh(self, fetch: Fetcher) -> Dict[str, Any]:
+        """Revalidate the list now, sending the stored validators.
+
+        Args:
+            fetch: Callable requesting /models with the given validators
+
+        Returns:
+            dict: The refreshed catalogue
+        """
+        return self._refresh_state(fetch)
+
+    def get_models(self, fetch: Fetcher, refresh: bool = False, background: bool = True) -> List[Dict[str, Any]]:
+        """Return the model list, fetching it only when there is none yet.
+
+        A list older than the TTL is returned as is and refreshed in the
+        background for the next call.
+
+        Args:
+            fetch: Callable requesting /models with the given validators
+            refresh: Revalidate before returning (e.g. a user-requested refresh)
+            background: Revalidate a stale list in the background; short-lived
+                processes (the CLI) pass False to revalidate it before returning
+
+        Returns:
+            list: Model entries as returned by /models
+        """
+        return self._current_state(fetch, refresh, background)["models"]
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """Return the models containing every word of the query as a word prefix."""
+        data = self._load()
+        if data is None:
+            return []
+        index = self._search_index
+        if index is None or index.models is not data["models"]:
+            index = self._search_index = ModelSearchIndex(data["models"], data["index"]["search"])
+        return index.search(query)
+
+    def context_length(self, model_id: str) -> Optional[int]:
+        """Return the context length of a model, or None if unknown."""
+        data = self._load()
+        return data["index"]["context_length"].get(model_id) if data else None
+
+    def pricing(self, model_id: str) -> Optional[Dict[str, Optional[float]]]:
+        """Return the prompt and completion price per token of a model, or None if unknown."""
+        data = self._load()
+        return data["index"]["pricing"].get(model_id) if data else None
+
+
+def get_model_catalog(config: Optional[Dict[str, Any]] = None) -> Optional[ModelCatalog]:
+    """Return the shared model catalogue, or None when it is disabled.
+
+    Args:
+        config: Optional configuration dict containing a ``model_catalog`` block
+
+    Returns:
+        Optional[ModelCatalog]: Catalogue instance shared by all clients
+    """
+    settings = get_model_catalog_settings(config)
+    if not settings["enabled"]:
+        return None
+
+    key = tuple(settings[name] for name in sorted(settings))
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            catalog = ModelCatalog(settings["path"], settings["ttl_seconds"])
+            _catalogs[key] = catalog
+        return catalog
@@ -8,30 +8,54 @@ Features include:
 - Web search capabilities
 - Plugin system for extending functionality
 - Credit balance tracking
+- Pooled keep-alive connections shared across client instances
+- Streaming (SSE) completions
+- Optional on-disk cache of identical completions
+- Retries with backoff and optional hedging of completions
 """
 
+import functools
 import json
-from typing import List, Dict, Any, Optional, Callable
+import time
+from typing import List, Dict, Any, Optional, Callable, Tuple
 
 import requests
 
 from askai.shared.config import load_config
-from askai.shared.logging import setup_logger
-from askai.shared.utils import print_error_or_warnings
+from askai.shared.logging import LogPayload, setup_logger
+from askai.shared.metrics import observe
+from askai.shared.utils import print_error_or_warnings, timed
+from . import credits_monitor, model_catalog, resilience, response_cache
+from .http_session import get_session
+from .streaming import CompletionStream, record_usage
+
+# Data URL headers ("data:<mime>;base64,") are short; the payload after them can be megabytes
+DATA_URL_HEADER_LIMIT = 256
+
+
+def _url_header(url):
+    """Return the part of a URL that tells its media type, without scanning a data URL payload."""
+    if url.startswith("data:"):
+        comma = url.find(",", 0, DATA_URL_HEADER_LIMIT)
+        return url[:comma] if comma != -1 else url[:DATA_URL_HEADER_LIMIT]
+    return url
 
 
 class OpenRouterClient:
     """Client for interacting with the OpenRouter API."""
 
-    def __init__(self, config=None, logger=None):
+    def __init__(self, config=None, logger=None, session=None):
         """Initialize the OpenRouter client.
 
         Args:
             config: Optional configuration dict. If not provided, will load from config.
             logger: Optional logger instance. If not provided, will create one.
+            session: Optional requests.Session. If not provided, the shared
+                pooled session for this process is used.
         """
         self.config = config or load_config()
         self.logger = logger
+        self.session = session or get_session(self.config)
         self.base_url = self.config["base_url"]
 
         # Ensure base_url ends with a slash
@@ -99,7 +123,7 @@ class OpenRouterClient:
                 if item.get("type") == "image_url":
                     result["has_multimodal"] = True
                     image_url = item.get("image_url", {}).get("url", "")
-                    if "application/pdf" in image_url:
+                    if "application/pdf" in _url_header(image_url):
                         result["has_pdf"] = True
                         result["pdf_details"].append({
                             "type": "image_url",
@@ -118,7 +142,7 @@ class OpenRouterClient:
                                       file_data.lower().endswith(".pdf"))
 
                         # Check for base64 PDFs
-                        is_pdf_base64 = "application/pdf" in file_data
+                        is_pdf_base64 = "application/pdf" in _url_header(file_data)
 
                         if is_pdf_url or is_pdf_base64:
                             result["has_multimodal"] = True
@@ -285,12 +309,13 @@ class OpenRouterClient:
         """
         if response.ok:
             response_data = response.json()
+            record_usage(response_data)
             choice = response_data["choices"][0]
             message = choice["message"]
 
             # Log web search annotations if present
             if "annotations" in message:
-                logger.debug(json.dumps({
+                logger.debug(LogPayload({
                     "log_message": "Received web search annotations",
                     "annotation_count": len(message["annotations"])
                 }))
@@ -301,9 +326,11 @@ class OpenRouterClient:
                 "full_response": response_data
             }
 
-        logger.critical(
-            json.dumps({"log_message": "API Error %d: %s"}) % (response.status_code, response.text)
-        )
+        logger.critical(LogPayload({
+            "log_message": "API Error",
+            "status_code": response.status_code,
+            "response": response.text
+        }))
 
         # Special handling for PDF parsing errors
         if response.status_code == 422:
@@ -363,7 +390,120 @@ class OpenRouterClient:
             dict: The full API response including message content and annotations
         """
         logger = self._setup_logger(debug)
-        headers = self._get_headers()
+        payload, content_info = self._build_completion_payload(
+            messages, model_config, logger, web_search_options, web_plugin_config
+        )
+
+        cache, cache_key, cached = self._lookup_cached_completion(payload, logger)
+        if cached is not None:
+            return cached
+
+        # Step 9: Make the API request and handle response
+        response = self._post_completion(payload, logger)
+        try:
+            result = self._handle_api_response(response, logger, content_info)
+            self._store_cached_completion(cache, cache_key, result, logger)
+            return result
+        except Exception as e:
+            logger.critical(json.dumps({
+                "log_message": "Unexpected error when calling OpenRouter API",
+                "error": str(e)
+            }))
+            raise Exception(f"Error communicating with OpenRouter API: {str(e)}") from e
+
+    def stream_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        model_config: Optional[Any] = None,
+        debug: bool = False,
+        web_search_options: Optional[Dict[str, Any]] = None,
+        web_plugin_config: Optional[Dict[str, Any]] = None
+    ) -> CompletionStream:
+        """Send a streaming (SSE) chat completion request to the OpenRouter API.
+
+        Iterating the returned stream yields content deltas as they arrive;
+        ``stream.result`` holds the assembled response dict afterwards.
+
+        Args:
+            messages: List of message dictionaries to send
+            model_config: Optional ModelConfiguration instance to override defaults
+            debug: Whether to enable debug logging
+            web_search_options: Optional dict with web search configuration for non-plugin search
+            web_plugin_config: Optional dict with web plugin configuration
+
+        Returns:
+            CompletionStream: Iterable of content deltas
+        """
+        logger = self._setup_logger(debug)
+        payload, content_info = self._build_completion_payload(
+            messages, model_config, logger, web_search_options, web_plugin_config
+        )
+
+        # Cached results replay as a single delta; fresh streams are not stored
+        _, _, cached = self._lookup_cached_completion(payload, logger)
+        if cached is not None:
+            return CompletionStream.from_result(cached, logger)
+
+        payload["stream"] = True
+
+        response = self._post_completion(payload, logger, stream=True)
+        if not response.ok:
+            # Error bodies are plain JSON, reuse the regular error handling
+            return CompletionStream.from_result(
+                self._handle_api_response(response, logger, content_info), logger
+            )
+        return CompletionStream(response, logger)
+
+    def _lookup_cached_completion(self, payload: Dict[str, Any], logger: Any):
+        """Look a completion payload up in the optional response cache.
+
+        Args:
+            payload: Final chat completion payload
+            logger: Logger instance
+
+        Returns:
+            tuple: (cache, key, cached_result) as returned by response_cache.lookup
+        """
+        cache, key, cached = response_cache.lookup(self.config, payload)
+        if cache is not None:
+            logger.debug(LogPayload({
+                "log_message": "Response cache hit" if cached is not None else "Response cache miss",
+                "key": key,
+                "stats": response_cache.get_cache_stats()
+            }))
+        return cache, key, cached
+
+    def _store_cached_completion(self, cache, key: Optional[str], result: Dict[str, Any],
+                                 logger: Any) -> None:
+        """Store a successful completion result in the response cache."""
+        if cache is None or (result.get("full_response") or {}).get("error"):
+            return
+        cache.put(key, result)
+        logger.debug(LogPayload({
+            "log_message": "Response stored in cache",
+            "key": key
+        }))
+
+    def _build_completion_payload(
+        self,
+        messages: List[Dict[str, Any]],
+        model_config: Optional[Any],
+        logger: Any,
+        web_search_options: Optional[Dict[str, Any]] = None,
+        web_plugin_config: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Build the chat completion payload.
+
+        Args:
+            messages: List of message dictionaries to send
+            model_config: Optional ModelConfiguration instance to override defaults
+            logger: Logger instance
+            web_search_options: Optional dict with web search configuration for non-plugin search
+            web_plugin_config: Optional dict with web plugin configuration
+
+        Returns:
+            tuple: (payload, content_info)
+        """
         payload: Dict[str, Any] = {}
 
         # Step 1: Configure basic model settings
@@ -391,7 +531,7 @@ class OpenRouterClient:
                     "pdf_engine": "mistral-ocr",
                     "file_format": f"Using 'file' type with 'file_data' containing {file_format_desc}"
                 }
-                logger.debug(json.dumps(log_message))
+                logger.debug(LogPayload(log_message))
             else:
                 self._configure_multimodal_handling(payload)
 
@@ -402,7 +542,7 @@ class OpenRouterClient:
                         "Using default visual model as no specific model configured"
                     )
 
-                logger.debug(json.dumps({
+                logger.debug(LogPayload({
                     "log_message": "Detected image content, using vision-capable model",
                     "selected_model": payload["model"],
                     "content_type": "image"
@@ -411,7 +551,7 @@ class OpenRouterClient:
         # Step 4: Add web search configuration if provided
         if web_search_options:
             self._configure_web_search(payload, web_search_options)
-            logger.debug(json.dumps({
+            logger.debug(LogPayload({
                 "log_message": "Added web search options to payload",
                 "web_search_options": web_search_options
             }))
@@ -419,7 +559,7 @@ class OpenRouterClient:
         # Step 5: Add web plugin configuration if provided
         if web_plugin_config:
             self._configure_web_plugin(payload, web_plugin_config)
-            logger.debug(json.dumps({
+            logger.debug(LogPayload({
                 "log_message": "Added web plugin to payload",
                 "web_plugin_config": web_plugin_config
             }))
@@ -432,7 +572,7 @@ class OpenRouterClient:
             # If model_config is provided, respect the model that was specified
             respect_model = model_config is not None
             self._configure_pdf_handling(payload, respect_existing_model=respect_model)
-            logger.debug(json.dumps({
+            logger.debug(LogPayload({
                 "log_message": "Configured for PDF URL processing" +
                               (" (keeping pattern-specified model)" if respect_model else ""),
                 "model": payload["model"],
@@ -440,17 +580,39 @@ class OpenRouterClient:
             }))
 
         # Step 8: Log final payload configuration
-        logger.debug(json.dumps({
+        logger.debug(LogPayload({
             "log_message": "Final OpenRouter API payload",
             "plugins": payload.get("plugins", []),
             "model": payload.get("model", "unknown"),
             "has_pdf_elements": content_info["has_pdf"]
         }))
 
-        # Step 9: Make the API request and handle response
+        return payload, content_info
+
+    @timed("http.completion")
+    def _post_completion(self, payload: Dict[str, Any], logger: Any, stream: bool = False) -> requests.Response:
+        """Post a completion payload through the shared session.
+
+        Failed attempts are retried under the resilience policy, and
+        non-streamed completions may be hedged.
+
+        Args:
+            payload: The API payload
+            logger: Logger instance
+            stream: Whether to stream the response body
+
+        Returns:
+            requests.Response: The raw API response
+        """
+        send = functools.partial(
+            self._send, "POST", "chat/completions",
+            headers=self._get_headers(), json=payload, timeout=resilience.get_timeouts(self.config), stream=stream
+        )
+        policy = resilience.get_resilience_policy(self.config)
         try:
-            response = requests.post(f"{self.base_url}chat/completions", headers=headers, json=payload, timeout=30)
-            return self._handle_api_response(response, logger, content_info)
+            if policy is None:
+                return send()
+            return policy.call(send, logger, key=payload.get("model"), hedge=not stream)
         except requests.exceptions.ConnectionError as e:
             logger.critical(json.dumps({
                 "log_message": "Connection error when calling OpenRouter API",
@@ -464,19 +626,66 @@ class OpenRouterClient:
             }))
             raise Exception(f"Error communicating with OpenRouter API: {str(e)}") from e
 
-    def get_credit_balance(self, debug: bool = False) -> Dict[str, Any]:
+    def _send(self, method: str, endpoint: str, **kwargs: Any) -> requests.Response:
+        """Send a request through the shared session, recording its latency and status.
+
+        Streamed responses are timed until their headers arrive.
+        """
+        start = time.perf_counter()
+        status = "error"
+        try:
+            send = self.session.get if method == "GET" else self.session.post
+            response = send(f"{self.base_url}{endpoint}", **kwargs)
+            status = str(response.status_code)
+            return response
+        finally:
+            observe("askai_upstream_request_duration_seconds", time.perf_counter() - start,
+                    {"endpoint": endpoint, "status": status})
+
+    def get_credit_balance(self, debug: bool = False, refresh: bool = False,
+                           background: bool = True) -> Dict[str, Any]:
         """Get the current credit balance from OpenRouter.
 
+        With the credits monitor enabled the balance is answered from the
+        shared cache and refreshed in the background once it is older than
+        the poll interval.
+
         Args:
             debug: Whether to enable debug logging
+            refresh: Fetch the balance before returning it
+            background: Refresh a stale cached balance in the background
+                rather than before returning
 
         Returns:
             dict: Credit balance information containing total_credits and total_usage
         """
         logger = self._setup_logger(debug)
+        monitor = credits_monitor.get_credits_monitor(self.config)
+        if monitor is not None:
+            return monitor.get_balance(lambda: self._fetch_credit_balance(logger), refresh=refresh,
+                                       background=background)
+        return self._fetch_credit_balance(logger)
+
+    def start_credit_polling(self, debug: bool = False) -> Optional[credits_monitor.CreditsMonitor]:
+        """Keep the cached credit balance fresh in the background.
+
+        Args:
+            debug: Whether to enable debug logging
+
+        Returns:
+            Optional[CreditsMonitor]: The polling monitor, or None when disabled
+        """
+        monitor = credits_monitor.get_credits_monitor(self.config)
+        if monitor is not None:
+            logger = self._setup_logger(debug)
+            monitor.start_polling(lambda: self._fetch_credit_balance(logger))
+        return monitor
+
+    def _fetch_credit_balance(self, logger: Any) -> Dict[str, Any]:
+        """Request /credits and return its data."""
         headers = self._get_headers()
 
-        logger.debug(json.dumps({
+        logger.debug(LogPayload({
             "log_message": "Requesting credit balance from OpenRouter API"
         }))
 
@@ -513,13 +722,13 @@ class OpenRouterClient:
         Returns:
             The processed API response
         """
-        url = f"{self.base_url}{endpoint}"
+        timeout = resilience.get_timeouts(self.config)
 
         try:
             if method.upper() == "GET":
-                response = requests.get(url, headers=headers, timeout=30)
+                response = self._send("GET", endpoint, headers=headers, timeout=timeout)
             elif method.upper() == "POST":
-                response = requests.post(url, headers=headers, json=data, timeout=30)
+                response = self._send("POST", endpoint, headers=headers, json=data, timeout=timeout)
             else:
                 raise ValueError(f"Unsupported HTTP method: {method}")
 
@@ -527,7 +736,7 @@ class OpenRouterClient:
                 if success_handler:
                     result = success_handler(response)
                     if logger:
-                        logger.debug(json.dumps({
+                        logger.debug(LogPayload({
                             "log_message": f"API request to {endpoint} successful"
                         }))
                     return result
@@ -553,29 +762,67 @@ class OpenRouterClient:
                 }))
             raise Exception(f"Error communicating with OpenRouter API: {str(e)}") from e
 
-    def get_available_models(self, debug: bool = False) -> List[Dict[str, Any]]:
+    @timed("http.models")
+    def get_available_models(self, debug: bool = False, refresh: bool = False,
+                             background: bool = True) -> List[Dict[str, Any]]:
         """Get the list of available models from OpenRouter.
 
+        With the model catalogue enabled the list is answered from disk and
+        revalidated in the background once it is older than its TTL.
+
         Args:
             debug: Whether to enable debug logging
+            refresh: Revalidate the cached list before returning it
+            background: Revalidate a stale cached list in the background
+                rather than before returning
 
         Returns:
             list: List of available models with their information
         """
         logger = self._setup_logger(debug)
-        headers = self._get_headers()
+        catalog = model_catalog.get_model_catalog(self.config)
+        if catalog is not None:
+            return catalog.get_models(lambda validators: self._fetch_models(logger, validators), refresh=refresh,
+                                      background=background)
+        return self._fetch_models(logger)[0] or []
+
+    def _fetch_models(self, logger: Any, validators: Optional[Dict[str, Optional[str]]] = None
+                      ) -> Tuple[Optional[List[Dict[str, Any]]], Dict[str, Optional[str]]]:
+        """Request /models, conditionally when validators of a cached list are given.
+
+        Args:
+            logger: Logger instance
+            validators: Optional ``etag`` and ``last_modified`` of the cached list
 
-        logger.debug(json.dumps({
-            "log_message": "Requesting available models from OpenRouter API"
+        Returns:
+            tuple: (models, validators); models is None when the list is unchanged
+        """
+        headers = self._get_headers()
+        validators = validators or {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        logger.debug(LogPayload({
+            "log_message": "Requesting available models from OpenRouter API",
+            "conditional": "If-None-Match" in headers or "If-Modified-Since" in headers
         }))
 
         def handle_models_response(response):
+            new_validators = {
+                "etag": response.headers.get("ETag") or validators.get("etag"),
+                "last_modified": response.headers.get("Last-Modified") or validators.get("last_modified")
+            }
+            if response.status_code == 304:
+                logger.debug(LogPayload({"log_message": "Available models unchanged"}))
+                return None, new_validators
             models_data = response.json()
-            logger.debug(json.dumps({
+            logger.debug(LogPayload({
                 "log_message": "Available models retrieved successfully",
                 "model_count": len(models_data.get("data", []))
             }))
-            return models_data.get("data", [])
+            return models_data.get("data", []), new_validators
 
         return self._make_api_request(
             endpoint="models",
@@ -0,0 +1,456 @@
+"""
+Timeouts, retries and hedged requests for upstream chat completions.
+
+A completion used to be a single POST with a fixed 30 second timeout, so
+a 429 or 502 from OpenRouter or a dropped connection surfaced as an error
+and a long generation timed out. Requests now use separate connect and
+read timeouts, and a completion that fails with a retryable status or
+because no connection could be established is retried with exponential
+backoff and full jitter. A connection dropped after the request was sent
+is not retried, as OpenRouter may already be generating (and billing) it.
+A ``Retry-After`` header replaces the backoff. Retries draw from a
+process-wide budget that grows with every completion, so an outage cannot
+multiply the load on OpenRouter. Optionally, a non-streamed completion
+still running after the usual latency of its model (a percentile of the
+recent ones) is sent a second time, and whichever answer arrives first is
+used. A hedge is billed like any other request and draws from the same
+budget.
+
+GET requests (/models, /credits) use the timeouts but keep the retries of
+the shared session (see http_session).
+
+Configured by the optional ``resilience`` block:
+
+    resilience:
+      enabled: true              # Retry and hedge completions
+      connect_timeout: 5         # Seconds to establish a connection
+      read_timeout: 120          # Seconds to wait for the response (between bytes when streaming)
+      max_attempts: 3            # Attempts per completion, including the first
+      backoff_base: 0.5          # First backoff ceiling in seconds, doubled per retry
+      backoff_max: 30            # Longest backoff and longest Retry-After waited for
+      retry_budget_ratio: 0.2    # Retries earned per completion
+      retry_budget_burst: 10     # Retries available at once
+      hedge: false               # Send a duplicate of slow completions
+      hedge_percentile: 95       # Latency percentile (per model) after which to hedge
+      hedge_min_samples: 20      # Latencies needed per model before hedging
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple, Type
+
+import requests
+from urllib3.exceptions import ConnectTimeoutError
+
+from askai.shared.metrics import inc
+
+DEFAULT_RESILIENCE_SETTINGS: Dict[str, Any] = {
+    "enabled": True,
+    "connect_timeout": 5,
+    "read_timeout": 120,
+    "max_attempts": 3,
+    "backoff_base": 0.5,
+    "backoff_max": 30,
+    "retry_budget_ratio": 0.2,
+    "retry_budget_burst": 10,
+    "hedge": False,
+    "hedge_percentile": 95,
+    "hedge_min_samples": 20,
+}
+
+# Statuses after which a completion is worth sending again
+RETRY_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+
+# Errors that may mean the request never reached OpenRouter; see is_unsent_error()
+RETRYABLE_EXCEPTIONS: Tuple[Type[BaseException], ...] = (requests.exceptions.ConnectionError,)
+
+# Latencies kept per model for the hedging threshold
+LATENCY_WINDOW = 200
+
+_policies: Dict[Tuple[Any, ...], "ResiliencePolicy"] = {}
+_policies_lock = threading.Lock()
+
+
+def get_resilience_settings(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Merge the ``resilience`` config block with the default settings.
+
+    Args:
+        config: Optional configuration dict
+
+    Returns:
+        dict: Effective resilience settings
+    """
+    settings = dict(DEFAULT_RESILIENCE_SETTINGS)
+    resilience_config = (config or {}).get("resilience") or {}
+    if isinstance(resilience_config, dict):
+        for key in DEFAULT_RESILIENCE_SETTINGS:
+            if resilience_config.get(key) is not None:
+                settings[key] = resilience_config[key]
+    return settings
+
+
+def get_timeouts(config: Optional[Dict[str, Any]] = None) -> Tuple[float, float]:
+    """Return the (connect, read) timeouts for upstream requests.
+
+    Args:
+        config: Optional configuration dict containing a ``resilience`` block
+
+    Returns:
+        tuple: Connect and read timeout in seconds
+    """
+    settings = get_resilience_settings(config)
+    return float(settings["connect_timeout"]), float(settings["read_timeout"])
+
+
+def is_unsent_error(error: BaseException) -> bool:
+    """Whether a requests error happened before the request was sent.
+
+    Only a connection that could not be established (refused, unresolvable
+    or timed out) is safe to retry. requests also reports a connection
+    dropped after the body was sent (RemoteDisconnected, ProtocolError)
+    and read timeouts as ConnectionError or Timeout, but the completion
+    may then already be generating and billed, so those are not retried.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(error, requests.exceptions.ConnectionError) or not error.args:
+        return False
+    # urllib3's NewConnectionError and NameResolutionError derive from ConnectTimeoutError
+    return isinstance(getattr(error.args[0], "reason", error.args[0]), ConnectTimeoutError)
+
+
+def parse_retry_after(value: Any) -> Optional[float]:
+    """Parse a Retry-After header (seconds or an HTTP date) into seconds from now.
+
+    Returns:
+        float or None: Seconds to wait, or None if the header is missing or invalid
+    """
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RetryBudget:
+    """Token bucket that limits retries and hedges to a share of all requests."""
+
+    def __init__(self, ratio: float, burst: float):
+        """Initialize the budget.
+
+        Args:
+            ratio: Tokens earned per request; each retry or hedge spends one
+            burst: Tokens available at the start and at most
+        """
+        self.ratio = float(ratio)
+        self.burst = float(burst)
+        self._balance = self.burst
+        self._lock = threading.Lock()
+
+    @property
+    def balance(self) -> float:
+        """Tokens currently available."""
+        return self._balance
+
+    def deposit(self) -> None:
+        """Earn tokens for a request."""
+        with self._lock:
+            self._balance = min(self.burst, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Spend a token for a retry or hedge, returning False when the budget is exhausted."""
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+class LatencyTracker:
+    """Recent successful request latencies per key (the model)."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples: Dict[str, Deque[float]] = {}
+        self._window = window
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float) -> None:
+        """Add a latency sample."""
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self._window)).append(seconds)
+
+    def percentile(self, key: str, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """Return the nearest-rank percentile of the samples, or None with fewer than min_samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if not samples or len(samples) < min_samples:
+            return None
+        rank = max(1, -(-len(samples) * percentile // 100))
+        return samples[min(len(samples), int(rank)) - 1]
+
+
+def _close(response: Any) -> None:
+    close = getattr(response, "close", None)
+    if callable(close):
+        close()
+
+
+def _close_result(future) -> None:
+    """Release the connection of a hedge that lost the race."""
+    if not future.cancelled() and future.exception() is None:
+        _close(future.result())
+
+
+class ResiliencePolicy:
+    """Retry, backoff and hedging policy shared by all clients with the same settings."""
+
+    def __init__(self, settings: Dict[str, Any]):
+        """Initialize the policy.
+
+        Args:
+            settings: Effective settings from get_resilience_settings()
+        """
+        self.max_attempts = max(1, int(settings["max_attempts"]))
+        self.backoff_base = float(settings["backoff_base"])
+        self.backoff_max = float(settings["backoff_max"])
+        self.hedge = bool(settings["hedge"])
+        self.hedge_percentile = float(settings["hedge_percentile"])
+        self.hedge_min_samples = int(settings["hedge_min_samples"])
+        self.budget = RetryBudget(settings["retry_budget_ratio"], settings["retry_budget_burst"])
+        self.latencies = LatencyTracker()
+
+    def backoff(self, retry: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """Return the delay before a retry (1 for the first), or None to give up.
+
+        A Retry-After longer than backoff_max gives up instead of waiting.
+        """
+        if retry_after is not None:
+            return retry_after if retry_after <= self.backoff_max else None
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (retry - 1)))
+
+    def hedge_delay(self, key: Optional[str]) -> Optional[float]:
+        """Return how long to wait before hedging a request for key, or None not to hedge."""
+        if not self.hedge or key is None:
+            return None
+        return self.latencies.percentile(key, self.hedge_percentile, self.hedge_min_samples)
+
+    def _retry_delay(self, attempt: int, response: Any, error: Optional[BaseException],
+                     logger: Any, key: Optional[str]) -> Optional[float]:
+        """Decide whether a failed attempt is retried and after how long."""
+        if attempt >= self.max_attempts:
+            return None
+        retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+        delay = self.backoff(attempt, retry_after)
+        if delay is None:
+            return None
+        reason = str(response.status_code) if response is not None else "connection"
+        if not self.budget.withdraw():
+            logger.warning(json.dumps({
+                "log_message": "Retry budget exhausted, not retrying upstream request",
+                "model": key,
+                "reason": reason
+            }))
+            return None
+        logger.warning(json.dumps({
+            "log_message": "Retrying upstream request",
+            "model": key,
+            "attempt": attempt + 1,
+            "reason": reason,
+            "error": str(error) if error else None,
+            "delay_seconds": round(delay, 3)
+        }))
+        inc("askai_upstream_retries_total", {"reason": reason})
+        return delay
+
+    def call(self, send: Callable[[], Any], logger: Any, key: Optional[str] = None,
+             hedge: bool = False) -> Any:
+        """Send a request, retrying retryable failures.
+
+        Args:
+            send: Callable issuing one attempt and returning its response
+            logger: Logger instance
+            key: Latency key for hedging (the model)
+            hedge: Whether this request may be hedged
+
+        Returns:
+            The first response that is not retried
+        """
+        self.budget.deposit()
+        attempt = 1
+        while True:
+            start = time.perf_counter()
+            response, error = None, None
+            try:
+                response = self._hedged(send, logger, key) if hedge else send()
+            except RETRYABLE_EXCEPTIONS as e:
+                if not is_unsent_error(e):
+                    raise
+                error = e
+            if response is not None and response.status_code not in RETRY_STATUS_CODES:
+                if response.ok and key is not None:
+                    self.latencies.record(key, time.perf_counter() - start)
+                return response
+
+            delay = self._retry_delay(attempt, response, error, logger, key)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            _close(response)
+            time.sleep(delay)
+            attempt += 1
+
+    def _hedged(self, send: Callable[[], Any], logger: Any, key: Optional[str]) -> Any:
+        """Send a request and, if it is slower than usual, a duplicate; return the first answer."""
+        delay = self.hedge_delay(key)
+        if delay is None:
+            return send()
+
+        pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="askai-hedge")
+        try:
+            primary = pool.submit(send)
+            done, _ = wait([primary], timeout=delay)
+            if done or not self.budget.withdraw():
+                return primary.result()
+
+            logger.info(json.dumps({
+                "log_message": "Hedging slow upstream request",
+                "model": key,
+                "after_seconds": round(delay, 3)
+            }))
+            inc("askai_upstream_hedges_total")
+            pending = {primary, pool.submit(send)}
+            fallback, error = None, None
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is not None:
+                        error = future.exception()
+                        continue
+                    response = future.result()
+                    if response.status_code not in RETRY_STATUS_CODES:
+                        for other in pending:
+                            other.add_done_callback(_close_result)
+                        if fallback is not None:
+                            _close(fallback)
+                        return response
+                    if fallback is not None:
+                        _close(fallback)
+                    fallback = response
+            if fallback is None:
+                raise error
+            return fallback
+        finally:
+            pool.shutdown(wait=False)
+
+    async def call_async(self, send: Callable[[], Awaitable[Any]], logger: Any, key: Optional[str] = None,
+                         hedge: bool = False,
+                         retryable: Tuple[Type[BaseException], ...] = RETRYABLE_EXCEPTIONS) -> Any:
+        """Coroutine version of call() for async HTTP stacks.
+
+        Args:
+            send: Coroutine function issuing one attempt and returning its response
+            logger: Logger instance
+            key: Latency key for hedging (the model)
+            hedge: Whether this request may be hedged
+            retryable: Exception types raised only before the request was sent
+
+        Returns:
+            The first response that is not retried
+        """
+        self.budget.deposit()
+        attempt = 1
+        while True:
+            start = time.perf_counter()
+            response, error = None, None
+            try:
+                response = await (self._hedged_async(send, logger, key) if hedge else send())
+            except retryable as e:
+                error = e
+            if response is not None and response.status_code not in RETRY_STATUS_CODES:
+                if response.ok and key is not None:
+                    self.latencies.record(key, time.perf_counter() - start)
+                return response
+
+            delay = self._retry_delay(attempt, response, error, logger, key)
+            if delay is None:
+                if error is not None:
+                    raise error
+                return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _hedged_async(self, send: Callable[[], Awaitable[Any]], logger: Any, key: Optional[str]) -> Any:
+        """Coroutine version of _hedged(); the losing request is cancelled."""
+        delay = self.hedge_delay(key)
+        if delay is None:
+            return await send()
+
+        primary = asyncio.ensure_future(send())
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not self.budget.withdraw():
+            return await primary
+
+        logger.info(json.dumps({
+            "log_message": "Hedging slow upstream request",
+            "model": key,
+            "after_seconds": round(delay, 3)
+        }))
+        inc("askai_upstream_hedges_total")
+        pending = {primary, asyncio.ensure_future(send())}
+        fallback, error = None, None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    response = task.result()
+                    if response.status_code not in RETRY_STATUS_CODES:
+                        return response
+                    fallback = response
+            if fallback is None:
+                raise error
+            return fallback
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+def get_resilience_policy(config: Optional[Dict[str, Any]] = None) -> Optional[ResiliencePolicy]:
+    """Return the shared resilience policy, or None when it is disabled.
+
+    Args:
+        config: Optional configuration dict containing a ``resilience`` block
+
+    Returns:
+        Optional[ResiliencePolicy]: Policy shared by all clients, so its retry
+        budget and latency samples cover every completion of the process
+    """
+    settings = get_resilience_settings(config)
+    if not settings["enabled"]:
+        return None
+
+    key = tuple(settings[name] for name in sorted(settings))
+    with _policies_lock:
+        policy = _policies.get(key)
+        if policy is None:
+            policy = ResiliencePolicy(settings)
+            _policies[key] = policy
+        return policy
@@ -0,0 +1,270 @@
+"""
+Content-addressed on-disk cache for chat completion results.
+
+Identical requests (same model, temperature, messages and plugins) are
+common in automation, e.g. CI jobs asking to explain the same failure log.
+The cache stores each successful completion result under the SHA-256 of
+the final request payload, so a repeated request is answered from disk
+without an API call.
+
+The cache is opt-in and configured by the optional ``cache`` block:
+
+    cache:
+      enabled: false            # Turn the response cache on
+      path: "~/.askai/cache"    # Cache directory
+      ttl_seconds: 86400        # Entries older than this are ignored
+      max_bytes: 104857600      # LRU eviction keeps the cache below this size
+      force: false              # Also cache requests with temperature > 0
+
+Sampling with a temperature above zero is meant to vary, so such requests
+bypass the cache unless ``force`` is set. Requests without an explicit
+temperature use the provider default of 1.0.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from askai.shared.metrics import inc
+
+DEFAULT_CACHE_SETTINGS: Dict[str, Any] = {
+    "enabled": False,
+    "path": "~/.askai/cache",
+    "ttl_seconds": 86400,
+    "max_bytes": 100 * 1024 * 1024,
+    "force": False,
+}
+
+# Temperature the API applies when the payload does not set one
+PROVIDER_DEFAULT_TEMPERATURE = 1.0
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, int] = {
+    "hits": 0,
+    "misses": 0,
+    "skipped": 0,
+    "stores": 0,
+    "evictions": 0,
+    "bytes_saved": 0,
+}
+
+_caches: Dict[Tuple[Any, ...], "ResponseCache"] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache_settings(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Merge the ``cache`` config block with the default cache settings.
+
+    Args:
+        config: Optional configuration dict
+
+    Returns:
+        dict: Effective cache settings
+    """
+    settings = dict(DEFAULT_CACHE_SETTINGS)
+    cache_config = (config or {}).get("cache") or {}
+    if isinstance(cache_config, dict):
+        for key in DEFAULT_CACHE_SETTINGS:
+            if cache_config.get(key) is not None:
+                settings[key] = cache_config[key]
+    return settings
+
+
+def _record(**counters: int) -> None:
+    """Add to the process-wide cache counters."""
+    with _stats_lock:
+        for name, value in counters.items():
+            _stats[name] += value
+    for name, value in counters.items():
+        inc("askai_cache_events_total", {"cache": "response", "event": name}, value)
+
+
+def get_cache_stats() -> Dict[str, int]:
+    """Return a snapshot of the process-wide cache counters."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_cache_stats() -> None:
+    """Reset the process-wide cache counters (used in tests)."""
+    with _stats_lock:
+        for name in _stats:
+            _stats[name] = 0
+
+
+def payload_key(payload: Dict[str, Any]) -> str:
+    """Hash a completion payload into a stable cache key.
+
+    Args:
+        payload: Final chat completion payload
+
+    Returns:
+        str: Hex SHA-256 digest of the canonical JSON payload
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Directory of completion results keyed by payload hash, bounded by TTL and size."""
+
+    def __init__(self, path: str, ttl_seconds: float = DEFAULT_CACHE_SETTINGS["ttl_seconds"],
+                 max_bytes: int = DEFAULT_CACHE_SETTINGS["max_bytes"], force: bool = False):
+        """Initialize the cache.
+
+        Args:
+            path: Cache directory (created on first store)
+            ttl_seconds: Maximum age of an entry in seconds
+            max_bytes: Size bound enforced by least-recently-used eviction
+            force: Whether to cache requests with temperature > 0
+        """
+        self.path = os.path.expanduser(path)
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_bytes = int(max_bytes)
+        self.force = bool(force)
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    def accepts(self, payload: Dict[str, Any]) -> bool:
+        """Whether a payload is deterministic enough to be cached."""
+        if self.force:
+            return True
+        temperature = payload.get("temperature", PROVIDER_DEFAULT_TEMPERATURE)
+        return temperature is not None and float(temperature) <= 0
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for a key, or None on a miss or expiry."""
+        entry_path = self._entry_path(key)
+        try:
+            stat = os.stat(entry_path)
+            if time.time() - stat.st_mtime > self.ttl_seconds:
+                self._remove(entry_path, stat.st_size)
+                _record(misses=1)
+                return None
+            with open(entry_path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+            # Touching the entry on read turns mtime into the LRU order
+            os.utime(entry_path, None)
+        except (OSError, ValueError):
+            _record(misses=1)
+            return None
+
+        _record(hits=1, bytes_saved=stat.st_size)
+        return result
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a result and evict old entries when the size bound is exceeded."""
+        data = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        entry_path = self._entry_path(key)
+        tmp_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            # Atomic rename so concurrent readers never see a partial entry
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        _record(stores=1)
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan()[1]
+            else:
+                self._total_bytes += len(data)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _scan(self):
+        """List entries as (mtime, size, path), oldest first, with their total size."""
+        entries = []
+        try:
+            with os.scandir(self.path) as it:
+                for entry in it:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return [], 0
+        entries.sort()
+        return entries, sum(size for _, size, _ in entries)
+
+    def _evict(self) -> None:
+        """Remove expired and least recently used entries until under the bound."""
+        entries, total = self._scan()
+        now = time.time()
+        evicted = 0
+        for mtime, size, entry_path in entries:
+            if total <= self.max_bytes and now - mtime <= self.ttl_seconds:
+                break
+            if self._remove(entry_path):
+                total -= size
+                evicted += 1
+        self._total_bytes = total
+        _record(evictions=evicted)
+
+    def _remove(self, entry_path: str, size: int = 0) -> bool:
+        try:
+            os.remove(entry_path)
+        except OSError:
+            return False
+        if size and self._total_bytes is not None:
+            with self._lock:
+                self._total_bytes -= size
+        return True
+
+
+def get_response_cache(config: Optional[Dict[str, Any]] = None) -> Optional[ResponseCache]:
+    """Return the shared response cache, or None when caching is disabled.
+
+    Args:
+        config: Optional configuration dict containing a ``cache`` block
+
+    Returns:
+        Optional[ResponseCache]: Cache instance shared by all clients
+    """
+    settings = get_cache_settings(config)
+    if not settings["enabled"]:
+        return None
+
+    key = tuple(settings[name] for name in sorted(settings))
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = ResponseCache(
+                settings["path"], settings["ttl_seconds"], settings["max_bytes"], settings["force"]
+            )
+            _caches[key] = cache
+        return cache
+
+
+def lookup(config: Optional[Dict[str, Any]], payload: Dict[str, Any]):
+    """Look a payload up in the configured cache.
+
+    Args:
+        config: Configuration dict
+        payload: Final chat completion payload
+
+    Returns:
+        tuple: (cache, key, cached_result). cache and key are None when the
+        payload must not be cached; cached_result is None on a miss.
+    """
+    cache = get_response_cache(config)
+    if cache is None:
+        return None, None, None
+    if not cache.accepts(payload):
+        _record(skipped=1)
+        return None, None, None
+
+    key = payload_key(payload)
+    return cache, key, cache.get(key)
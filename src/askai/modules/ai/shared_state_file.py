@@ -0,0 +1,134 @@
+"""
+JSON state shared between processes through a file, refreshed in the background.
+
+The model catalogue and the credits monitor both keep an upstream response
+in a local file that every front-end (CLI, API workers, TUI) reads. This
+base class holds the common mechanics: re-reading the file only when
+another process replaced it, atomic saves, staleness by ``fetched_at``
+age and a single background refresh at a time. Subclasses validate the
+loaded state and build the next state from a fetch.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class SharedStateFile:  # pylint: disable=too-few-public-methods
+    """File-backed JSON state with mtime reload, atomic saves and background refresh."""
+
+    # Name of the background refresh thread
+    thread_name = "askai-shared-state"
+
+    def __init__(self, path: str, max_age_seconds: float):
+        """Initialize the shared state.
+
+        Args:
+            path: State file (created on the first refresh)
+            max_age_seconds: Age after which the state is refreshed
+        """
+        self.path = os.path.expanduser(path)
+        self.max_age_seconds = float(max_age_seconds)
+        self._state: Optional[Dict[str, Any]] = None
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    def _validate(self, state: Dict[str, Any]) -> None:
+        """Raise ValueError, KeyError or TypeError when a loaded state is unusable."""
+
+    def _next_state(self, fetch: Callable[..., Any], current: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Fetch upstream and return the state to store; called under the refresh lock."""
+        raise NotImplementedError
+
+    def _load(self) -> Optional[Dict[str, Any]]:
+        """Return the state, re-reading the file when another process replaced it."""
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return self._state
+        if mtime != self._mtime:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+                if not isinstance(state, dict):
+                    raise TypeError("state is not an object")
+                self._validate(state)
+            except (OSError, ValueError, KeyError, TypeError):
+                return self._state
+            self._state, self._mtime = state, mtime
+        return self._state
+
+    def _save(self, state: Dict[str, Any]) -> None:
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False)
+            # Atomic rename so concurrent readers never see a partial file
+            os.replace(tmp_path, self.path)
+            self._mtime = os.stat(self.path).st_mtime
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _age(self, state: Optional[Dict[str, Any]]) -> Optional[float]:
+        """Return the seconds since the state was fetched, or None without a state."""
+        return time.time() - state.get("fetched_at", 0) if state else None
+
+    def is_stale(self) -> bool:
+        """Whether the state is missing or older than the maximum age."""
+        return self._is_stale(self._load())
+
+    def _is_stale(self, state: Optional[Dict[str, Any]]) -> bool:
+        age = self._age(state)
+        return age is None or age > self.max_age_seconds
+
+    def _refresh_state(self, fetch: Callable[..., Any]) -> Dict[str, Any]:
+        """Fetch and store the next state now."""
+        with self._lock:
+            state = self._next_state(fetch, self._load())
+            state["fetched_at"] = time.time()
+            self._state = state
+            self._save(state)
+            return state
+
+    def _refresh_in_background(self, fetch: Callable[..., Any]) -> None:
+        with self._thread_lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(
+                target=self._background_refresh, args=(fetch,), name=self.thread_name, daemon=True
+            )
+            self._refresh_thread.start()
+
+    def _background_refresh(self, fetch: Callable[..., Any]) -> None:
+        try:
+            self._refresh_state(fetch)
+        except Exception:  # pylint: disable=broad-exception-caught
+            pass  # The stale state stays in use; the next call tries again
+
+    def _current_state(self, fetch: Callable[..., Any], refresh: bool = False,
+                       background: bool = True) -> Dict[str, Any]:
+        """Return the state, fetching it only when there is none yet.
+
+        A stale state is returned as is and refreshed in the background for
+        the next call, unless background is False.
+
+        Args:
+            fetch: Callable passed to _next_state
+            refresh: Fetch before returning
+            background: Refresh a stale state in the background; short-lived
+                processes pass False to refresh it before returning
+        """
+        state = self._load()
+        if state is None or refresh or (not background and self._is_stale(state)):
+            return self._refresh_state(fetch)
+        if self._is_stale(state):
+            self._refresh_in_background(fetch)
+        return state
@@ -0,0 +1,195 @@
+"""
+Server-sent events (SSE) handling for streamed chat completions.
+
+OpenRouter streams completions as ``data: {json}`` lines terminated by
+``data: [DONE]``; lines starting with ``:`` are keep-alive comments.
+CompletionStream yields the text deltas as they arrive and assembles the
+same ``{"content", "annotations", "full_response"}`` dict that the
+non-streaming request path returns, so callers can store chat history
+unchanged once the stream is exhausted.
+"""
+
+import json
+from typing import Any, Dict, Iterator, List, Optional
+
+import requests
+
+from askai.shared.metrics import inc
+
+
+def record_usage(full_response: Dict[str, Any]) -> None:
+    """Count the prompt and completion tokens of an upstream response.
+
+    Called for responses fresh from OpenRouter only, never for cache hits.
+    """
+    usage = full_response.get("usage") or {}
+    model = full_response.get("model") or "unknown"
+    for kind in ("prompt", "completion"):
+        if usage.get(f"{kind}_tokens"):
+            inc("askai_tokens_total", {"model": model, "type": kind}, usage[f"{kind}_tokens"])
+
+
+class CompletionStream:
+    """Iterable over the content deltas of a streamed chat completion."""
+
+    def __init__(self, response: Optional[requests.Response], logger: Any,
+                 result: Optional[Dict[str, Any]] = None):
+        """Initialize the stream.
+
+        Args:
+            response: Streaming HTTP response (``stream=True``), or None
+                when the result is already known (e.g. an API error)
+            logger: Logger instance
+            result: Pre-built result for streams without a response body
+        """
+        self.response = response
+        self.logger = logger
+        self._content: List[str] = []
+        self._annotations: List[Dict[str, Any]] = []
+        self._meta: Dict[str, Any] = {}
+        self._finish_reason: Optional[str] = None
+        self._usage: Optional[Dict[str, Any]] = None
+        self._result = result
+        self._started = False
+
+    @classmethod
+    def from_result(cls, result: Dict[str, Any], logger: Any = None) -> "CompletionStream":
+        """Create a stream that yields an already assembled result once.
+
+        Args:
+            result: Completion result dict
+            logger: Optional logger instance
+
+        Returns:
+            CompletionStream: Stream over the given result
+        """
+        return cls(None, logger, result=result)
+
+    def __iter__(self) -> Iterator[str]:
+        if self._started:
+            return
+        self._started = True
+
+        if self.response is None:
+            if self._result and self._result.get("content"):
+                yield self._result["content"]
+            return
+
+        try:
+            for raw_line in self.response.iter_lines():
+                if not raw_line:
+                    continue
+                line = raw_line.decode("utf-8") if isinstance(raw_line, bytes) else raw_line
+
+                # Comment lines (": OPENROUTER PROCESSING") keep the connection alive
+                if line.startswith(":") or not line.startswith("data:"):
+                    continue
+
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+
+                delta = self._consume_event(data)
+                if delta:
+                    yield delta
+        except (requests.exceptions.RequestException, ValueError) as e:
+            if self.logger:
+                self.logger.critical(json.dumps({
+                    "log_message": "Stream interrupted when calling OpenRouter API",
+                    "error": str(e)
+                }))
+            raise Exception(f"Error communicating with OpenRouter API: {str(e)}") from e
+        finally:
+            self.response.close()
+
+    def _consume_event(self, data: str) -> Optional[str]:
+        """Parse a single SSE data payload and return its content delta."""
+        try:
+            chunk = json.loads(data)
+        except json.JSONDecodeError:
+            if self.logger:
+                self.logger.warning(json.dumps({
+                    "log_message": "Skipping malformed stream chunk",
+                    "chunk": data[:200]
+                }))
+            return None
+
+        # Errors after the stream started arrive as a regular data event
+        if "error" in chunk:
+            error = chunk["error"]
+            message = error.get("message", str(error)) if isinstance(error, dict) else str(error)
+            if self.logger:
+                self.logger.critical(json.dumps({
+                    "log_message": "OpenRouter API error during stream",
+                    "error": message
+                }))
+            self._meta["error"] = message
+            delta = f"Error: {message}"
+            self._content.append(delta)
+            return delta
+
+        for key in ("id", "model", "created", "provider"):
+            if key in chunk and key not in self._meta:
+                self._meta[key] = chunk[key]
+        if chunk.get("usage"):
+            self._usage = chunk["usage"]
+
+        choices = chunk.get("choices") or []
+        if not choices:
+            return None
+
+        choice = choices[0]
+        if choice.get("finish_reason"):
+            self._finish_reason = choice["finish_reason"]
+
+        delta = choice.get("delta") or {}
+        if delta.get("annotations"):
+            self._annotations.extend(delta["annotations"])
+
+        content = delta.get("content")
+        if content:
+            self._content.append(content)
+        return content
+
+    @property
+    def result(self) -> Dict[str, Any]:
+        """Assembled completion, consuming any remaining deltas first.
+
+        Returns:
+            dict: ``content``, ``annotations`` and ``full_response`` in the
+            same shape as ``OpenRouterClient.request_completion``
+        """
+        if self._result is not None:
+            return self._result
+
+        for _ in self:
+            pass
+
+        content = "".join(self._content)
+        full_response = {key: value for key, value in self._meta.items() if key != "error"}
+        full_response["choices"] = [{
+            "message": {
+                "role": "assistant",
+                "content": content,
+                "annotations": self._annotations
+            },
+            "finish_reason": self._finish_reason
+        }]
+        if self._usage is not None:
+            full_response["usage"] = self._usage
+            record_usage(full_response)
+        if "error" in self._meta:
+            full_response["error"] = self._meta["error"]
+
+        if self._annotations and self.logger:
+            self.logger.debug(json.dumps({
+                "log_message": "Received web search annotations",
+                "annotation_count": len(self._annotations)
+            }))
+
+        self._result = {
+            "content": content,
+            "annotations": self._annotations,
+            "full_response": full_response
+        }
+        return self._result
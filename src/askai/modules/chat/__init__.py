@@ -4,5 +4,7 @@ Chat management package for AskAI CLI.
 This package handles chat interactions, message management, and conversation state.
 """
 from .chat_manager import ChatManager
+from .chat_store import JsonlChatStore
+from .context_budget import ContextBudget, BudgetReport, get_context_budget_settings
 
-__all__ = ['ChatManager']
+__all__ = ['ChatManager', 'JsonlChatStore', 'ContextBudget', 'BudgetReport', 'get_context_budget_settings']
@@ -1,16 +1,19 @@
 """
 Unified chat management and persistence.
 Handles chat history and context building in a simple logbook format.
+Chats are stored as append-only JSONL logs (see chat_store) or, optionally,
+in a SQLite database (see sqlite_store).
 Includes functionality for chat repair and management.
 """
 
 import os
-import json
 import uuid
 import sys
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from askai.shared.utils import print_error_or_warnings
+from .chat_store import JsonlChatStore
+from .context_budget import ContextBudget, SummaryCache
 
 
 class ChatManager:
@@ -30,38 +33,40 @@ class ChatManager:
         self.max_history = chat_config.get('max_history', 10)
         self.logger = logger
         os.makedirs(self.storage_path, exist_ok=True)
+        self.summary_cache = SummaryCache(os.path.join(self.storage_path, 'summaries'))
+
+        backend = chat_config.get('backend', 'jsonl')
+        if backend == 'sqlite':
+            from .sqlite_store import SqliteChatStore, DEFAULT_DATABASE_NAME  # pylint: disable=import-outside-toplevel
+            database_path = os.path.expanduser(
+                chat_config.get('database_path') or os.path.join(self.storage_path, DEFAULT_DATABASE_NAME)
+            )
+            self.store = SqliteChatStore(database_path, self.storage_path, logger)
+        else:
+            if backend != 'jsonl' and self.logger:
+                self.logger.warning("Unknown chat backend '%s', using jsonl", backend)
+            self.store = JsonlChatStore(self.storage_path, logger)
 
     def _generate_chat_id(self) -> str:
         """Generate a short unique chat ID."""
         return str(uuid.uuid4())[:8]
 
-    def _get_chat_file_path(self, chat_id: str) -> str:
-        """Get the full path for a chat file."""
-        return os.path.join(self.storage_path, f"{chat_id}.json")
-
     def create_chat(self) -> str:
         """Create a new chat file with a unique ID."""
         chat_id = self._generate_chat_id()
-        chat_file = self._get_chat_file_path(chat_id)
-
-        chat_data = {
-            "chat_id": chat_id,
-            "created_at": datetime.now().isoformat(),
-            "conversations": []
-        }
-
-        with open(chat_file, 'w', encoding='utf-8') as f:
-            json.dump(chat_data, f, indent=2)
-
+        self.store.create(chat_id, datetime.now().isoformat())
         return chat_id
 
     def add_conversation(self, chat_id: str, messages: List[Dict[str, str]],
                         response: str, outputs: Optional[List[Dict[str, Any]]] = None,
                         system_outputs: Optional[List] = None,
                         system_config: Optional[Any] = None) -> None:
-        """Add a new conversation to the chat history."""
-        chat_file = self._get_chat_file_path(chat_id)
-        if not os.path.exists(chat_file):
+        """Add a new conversation to the chat history.
+
+        The conversation is appended to the chat log, so the cost does not
+        depend on the length of the chat.
+        """
+        if not self.store.exists(chat_id):
             raise ValueError(f"Chat {chat_id} does not exist")
 
         # Validate outputs if provided
@@ -70,9 +75,6 @@ class ChatManager:
             if not valid:
                 raise ValueError(f"Invalid outputs: {error}")
 
-        with open(chat_file, 'r', encoding='utf-8') as f:
-            chat_data = json.load(f)
-
         # Extract only the new messages (not from history)
         current_messages = []
 
@@ -123,33 +125,19 @@ class ChatManager:
                 if self.logger:
                     self.logger.warning("Could not serialize system config: %s", e)
 
-        chat_data['conversations'].append(conversation)
-
-        with open(chat_file, 'w', encoding='utf-8') as f:
-            json.dump(chat_data, f, indent=2)
+        self.store.append(chat_id, conversation)
 
     def get_chat_history(self, chat_id: str,
                         max_conversations: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Get the conversation history for a chat."""
-        chat_file = self._get_chat_file_path(chat_id)
-        if not os.path.exists(chat_file):
+        """Get the conversation history for a chat.
+
+        With max_conversations only the end of the chat log is read.
+        """
+        if not self.store.exists(chat_id):
             raise ValueError(f"Chat {chat_id} does not exist")
 
         try:
-            with open(chat_file, 'r', encoding='utf-8') as f:
-                try:
-                    chat_data = json.load(f)
-                except json.JSONDecodeError as e:
-                    error_msg = f"Chat file {chat_id} is corrupted: {str(e)}"
-                    if self.logger:
-                        self.logger.error(error_msg)
-                    raise ValueError(error_msg) from e
-
-            conversations = chat_data['conversations']
-            if max_conversations:
-                conversations = conversations[-max_conversations:]
-
-            return conversations
+            return self.store.read(chat_id, max_conversations)
         except Exception as e:
             if self.logger:
                 self.logger.error("Error reading chat history for %s: %s", chat_id, str(e))
@@ -158,95 +146,64 @@ class ChatManager:
     def repair_chat_file(self, chat_id: str) -> bool:
         """Attempt to repair a corrupted chat file.
 
+        Unreadable conversations are dropped from the chat log; a backup of
+        the original file is kept next to it.
+
         Args:
             chat_id: The ID of the chat to repair
 
         Returns:
             bool: True if repair was successful, False otherwise
         """
-        chat_file = self._get_chat_file_path(chat_id)
-        if not os.path.exists(chat_file):
-            return False
-
         try:
-            # First, make a backup
-            backup_file = f"{chat_file}.bak"
-            with open(chat_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            with open(backup_file, 'w', encoding='utf-8') as f:
-                f.write(content)
-
-            # Try to parse and fix JSON content
-            try:
-                # Find last valid JSON object
-                valid_content = "{\n"
-                valid_content += '  "chat_id": "' + chat_id + '",\n'
-                valid_content += '  "created_at": "' + datetime.now().isoformat() + '",\n'
-                valid_content += '  "conversations": []\n'
-                valid_content += "}\n"
-
-                # Create new file with valid JSON
-                with open(chat_file, 'w', encoding='utf-8') as f:
-                    f.write(valid_content)
+            return self.store.repair(chat_id)
+        except Exception as e:
+            if self.logger:
+                self.logger.error("Error during chat file repair for %s: %s", chat_id, str(e))
+            return False
 
-                # Verify it's valid
-                with open(chat_file, 'r', encoding='utf-8') as f:
-                    json.load(f)
+    def list_chats(self, page: int = 1, page_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """List available chats, newest first.
 
-                if self.logger:
-                    self.logger.info("Successfully repaired chat file %s", chat_id)
-                return True
+        Args:
+            page: One-based page number
+            page_size: Chats per page, or None for all chats
 
-            except Exception as e:
-                # Restore backup if repair failed
-                with open(backup_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
+        Returns:
+            List[Dict[str, Any]]: chat_id, created_at and conversation_count per chat
+        """
+        return self.store.list_chats(page, page_size)
 
-                with open(chat_file, 'w', encoding='utf-8') as f:
-                    f.write(content)
+    def count_chats(self) -> int:
+        """Return the number of available chats."""
+        return self.store.count_chats()
 
-                if self.logger:
-                    self.logger.error("Failed to repair chat file %s: %s", chat_id, str(e))
-                return False
+    def get_chat_info(self, chat_id: str) -> Dict[str, Any]:
+        """Get chat_id, created_at and conversation_count of one chat.
 
-        except Exception as e:
-            if self.logger:
-                self.logger.error("Error during chat file repair for %s: %s", chat_id, str(e))
-            return False
-
-    def list_chats(self) -> List[Dict[str, Any]]:
-        """List all available chat files."""
-        chats = []
-        corrupted_files = []
+        Raises:
+            ValueError: If the chat does not exist
+        """
+        header = self.store.get_header(chat_id)
+        return {
+            'chat_id': header['chat_id'],
+            'created_at': header['created_at'],
+            'conversation_count': header['conversation_count']
+        }
 
-        for filename in os.listdir(self.storage_path):
-            if filename.endswith('.json'):
-                file_path = os.path.join(self.storage_path, filename)
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        try:
-                            chat_data = json.load(f)
-                            chats.append({
-                                'chat_id': chat_data['chat_id'],
-                                'created_at': chat_data['created_at'],
-                                'conversation_count': len(chat_data['conversations'])
-                            })
-                        except json.JSONDecodeError as e:
-                            corrupted_files.append((filename, str(e)))
-                            if self.logger:
-                                self.logger.error("Corrupted chat file %s: %s", filename, str(e))
-                            continue
-                except Exception as e:
-                    if self.logger:
-                        self.logger.error("Error reading chat file %s: %s", filename, str(e))
-                    continue
+    def search_chats(self, query: str, page: int = 1, page_size: int = 20) -> Dict[str, Any]:
+        """Search the questions and responses of all chats.
 
-        # Report corrupted files if any
-        if corrupted_files and self.logger:
-            self.logger.warning("Found %d corrupted chat files", len(corrupted_files))
+        Args:
+            query: Search text; every word must match
+            page: One-based page number
+            page_size: Results per page
 
-        return sorted(chats, key=lambda x: x['created_at'], reverse=True)
+        Returns:
+            Dict[str, Any]: 'results' (chat_id, timestamp, question, response),
+            'total' matches, 'page' and 'page_size'
+        """
+        return self.store.search(query, page, page_size)
 
     def select_chat(self, allow_new: bool = True) -> Optional[str]:
         """Display an interactive chat selection menu."""
@@ -257,9 +214,9 @@ class ChatManager:
 
             # Check if there might be corrupted files
             try:
-                all_files = [f for f in os.listdir(self.storage_path) if f.endswith('.json')]
-                if all_files and len(all_files) > len(chats):
-                    print(f"WARNING: Found {len(all_files) - len(chats)} potentially corrupted chat files.")
+                corrupted_files = self.scan_corrupted_chat_files()
+                if corrupted_files:
+                    print(f"WARNING: Found {len(corrupted_files)} potentially corrupted chat files.")
                     print("You may need to manually fix or delete these files in:")
                     print(f"  {self.storage_path}")
             except Exception:
@@ -303,12 +260,22 @@ class ChatManager:
             except ValueError:
                 print("Please enter a valid number or 'q' to quit")
 
-    def build_context_messages(self, chat_id: str) -> List[Dict[str, str]]:
-        """Build context messages from chat history."""
-        context_messages = []
-        conversations = self.get_chat_history(chat_id, self.max_history)
+    def build_context_messages(self, chat_id: str, budget: Optional[ContextBudget] = None,
+                               fixed_messages: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, str]]:
+        """Build context messages from chat history.
+
+        The last max_history conversations are considered. With a budget only
+        the newest of them that fit the model context next to fixed_messages
+        (the system prompt and question of the request) are kept.
+        """
+        context_messages, _ = self._fit_context(chat_id, budget, fixed_messages or [])
+        return context_messages
 
-        for conv in conversations:
+    def _fit_context(self, chat_id: str, budget: Optional[ContextBudget],
+                     fixed_messages: List[Dict[str, Any]]):
+        """Return the context messages of a chat and the budget report, if any."""
+        turns = []
+        for conv in self.get_chat_history(chat_id, self.max_history):
             # Only include the user question and AI response for context
             user_message = None
             for msg in conv['messages']:
@@ -316,27 +283,29 @@ class ChatManager:
                     user_message = msg
 
             if user_message:
-                context_messages.append(user_message)
-                context_messages.append({
-                    "role": "assistant",
-                    "content": conv['response']
+                turns.append({
+                    "user": user_message,
+                    "assistant": {"role": "assistant", "content": conv['response']},
+                    "timestamp": conv.get('timestamp')
                 })
 
-        return context_messages
+        if budget is not None:
+            return budget.fit(turns, fixed_messages, chat_id)
+
+        context_messages = []
+        for turn in turns:
+            context_messages.extend([turn['user'], turn['assistant']])
+        return context_messages, None
 
     def display_chat(self, chat_id: str) -> None:
         """Display chat history in a readable format."""
-        chat_file = self._get_chat_file_path(chat_id)
-        if not os.path.exists(chat_file):
-            raise ValueError(f"Chat {chat_id} does not exist")
-
-        with open(chat_file, 'r', encoding='utf-8') as f:
-            chat_data = json.load(f)
+        header = self.store.get_header(chat_id)
+        conversations = self.store.read(chat_id)
 
-        print(f"\nChat ID: {chat_data['chat_id']}")
-        print(f"Created: {chat_data['created_at']}\n")
+        print(f"\nChat ID: {header['chat_id']}")
+        print(f"Created: {header['created_at']}\n")
 
-        for i, conv in enumerate(chat_data['conversations'], 1):
+        for i, conv in enumerate(conversations, 1):
             print(f"\nConversation {i} - {conv['timestamp']}")
             print("-" * 50)
 
@@ -353,8 +322,11 @@ class ChatManager:
             print("=" * 50)
 
     # Service-level methods (from chat_service.py)
-    def handle_persistent_chat(self, args, messages):
-        """Handle persistent chat setup and context loading."""
+    def handle_persistent_chat(self, args, messages, budget: Optional[ContextBudget] = None):
+        """Handle persistent chat setup and context loading.
+
+        With a budget the chat history is trimmed to the model context.
+        """
         chat_id = None
 
         # Check if we're using a pattern - chat persistence isn't compatible with patterns
@@ -391,11 +363,15 @@ class ChatManager:
             # If we have a chat_id, load its context
             if chat_id:
                 try:
-                    context_messages = self.build_context_messages(chat_id)
                     system_messages = [msg for msg in messages if msg['role'] == 'system']
                     user_messages = [msg for msg in messages if msg['role'] == 'user']
+                    context_messages, report = self._fit_context(chat_id, budget, system_messages + user_messages)
                     messages = system_messages + context_messages + user_messages
                     print(f"\nContinuing chat: {chat_id}")
+                    if report is not None and report.trimmed:
+                        summarized = " (older ones summarized)" if report.summarized_turns else ""
+                        print(f"Context: newest {report.kept_turns} of {report.turns} conversations{summarized}, "
+                              f"~{report.prompt_tokens:,} of {report.context_length:,} tokens")
                 except ValueError as e:
                     print_error_or_warnings(str(e))
                     sys.exit(1)
@@ -496,22 +472,7 @@ class ChatManager:
         Returns:
             List[str]: List of corrupted chat file IDs
         """
-        corrupted_files = []
-
-        for filename in os.listdir(self.storage_path):
-            if filename.endswith('.json'):
-                chat_id = filename[:-5]  # Remove .json extension
-                file_path = os.path.join(self.storage_path, filename)
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        try:
-                            json.load(f)
-                        except json.JSONDecodeError:
-                            corrupted_files.append(chat_id)
-                except Exception:
-                    corrupted_files.append(chat_id)
-
-        return corrupted_files
+        return self.store.scan_corrupted()
 
     def delete_chat(self, chat_id: str) -> bool:
         """Delete a chat file.
@@ -522,13 +483,9 @@ class ChatManager:
         Returns:
             bool: True if deletion was successful, False otherwise
         """
-        chat_file = self._get_chat_file_path(chat_id)
-        if not os.path.exists(chat_file):
-            return False
-
         try:
-            os.remove(chat_file)
-            return True
+            self.summary_cache.delete(chat_id)
+            return self.store.delete(chat_id)
         except Exception as e:
             if self.logger:
                 self.logger.error("Failed to delete chat file %s: %s", chat_id, str(e))
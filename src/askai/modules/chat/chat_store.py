@@ -0,0 +1,456 @@
+"""
+Append-only chat storage.
+
+Each chat is stored as a JSONL log (``<chat_id>.jsonl``) with one
+conversation per line. Adding a conversation is a single append followed by
+an fsync, so its cost does not grow with the chat length and a crash can at
+most leave a torn last line instead of corrupting the whole chat.
+
+A small header file (``<chat_id>.meta``) holds the chat metadata and the
+conversation count so chats can be listed without reading their logs. The
+header records the log size it describes; when the sizes disagree (e.g. after
+a crash between the append and the header update) it is rebuilt from the log.
+
+Chats in the previous whole-file JSON format (``<chat_id>.json``) are
+migrated to the log format automatically.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+LOG_SUFFIX = ".jsonl"
+HEADER_SUFFIX = ".meta"
+LEGACY_SUFFIX = ".json"
+MIGRATED_SUFFIX = ".json.migrated"
+
+# Block size used when reading a log backwards
+TAIL_BLOCK_SIZE = 64 * 1024
+
+
+class JsonlChatStore:
+    """Chat persistence as append-only JSONL logs with small header files."""
+
+    def __init__(self, storage_path: str, logger=None):
+        """Initialize the store.
+
+        Args:
+            storage_path: Directory holding the chat files
+            logger: Optional logger instance
+        """
+        self.storage_path = storage_path
+        self.logger = logger
+        self._lock = threading.Lock()
+
+    def log_path(self, chat_id: str) -> str:
+        """Path of the conversation log of a chat."""
+        return os.path.join(self.storage_path, f"{chat_id}{LOG_SUFFIX}")
+
+    def header_path(self, chat_id: str) -> str:
+        """Path of the header file of a chat."""
+        return os.path.join(self.storage_path, f"{chat_id}{HEADER_SUFFIX}")
+
+    def legacy_path(self, chat_id: str) -> str:
+        """Path of a chat in the previous whole-file JSON format."""
+        return os.path.join(self.storage_path, f"{chat_id}{LEGACY_SUFFIX}")
+
+    def exists(self, chat_id: str) -> bool:
+        """Whether the chat exists, migrating a legacy chat file on first access."""
+        if os.path.exists(self.log_path(chat_id)):
+            return True
+        if os.path.exists(self.legacy_path(chat_id)):
+            return self.migrate(chat_id)
+        return False
+
+    def create(self, chat_id: str, created_at: Optional[str] = None) -> None:
+        """Create an empty chat.
+
+        Args:
+            chat_id: ID of the new chat
+            created_at: Creation timestamp (defaults to now)
+        """
+        with open(self.log_path(chat_id), 'wb') as f:
+            os.fsync(f.fileno())
+        self._write_header(chat_id, {
+            "chat_id": chat_id,
+            "created_at": created_at or datetime.now().isoformat(),
+            "conversation_count": 0,
+            "size": 0,
+        })
+
+    def append(self, chat_id: str, conversation: Dict[str, Any]) -> None:
+        """Append one conversation to a chat with a single write and fsync.
+
+        Args:
+            chat_id: ID of the chat
+            conversation: Conversation record to store
+
+        Raises:
+            ValueError: If the chat does not exist
+        """
+        if not self.exists(chat_id):
+            raise ValueError(f"Chat {chat_id} does not exist")
+
+        data = json.dumps(conversation, ensure_ascii=False).encode('utf-8') + b"\n"
+        with self._lock:
+            header = self._read_header(chat_id)
+            fd = os.open(self.log_path(chat_id), os.O_WRONLY | os.O_APPEND)
+            try:
+                size_before = os.fstat(fd).st_size
+                # Keep a torn last line (from a crash) from swallowing this record
+                if size_before and self._last_byte(chat_id, size_before) != b"\n":
+                    data = b"\n" + data
+                os.write(fd, data)
+                os.fsync(fd)
+                size_after = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+
+            if header is None or header.get("size") != size_before:
+                self._rebuild_header(chat_id, header)
+            else:
+                header["conversation_count"] += 1
+                header["size"] = size_after
+                header["updated_at"] = conversation.get("timestamp", datetime.now().isoformat())
+                self._write_header(chat_id, header)
+
+    def read(self, chat_id: str, last: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Read the conversations of a chat.
+
+        Args:
+            chat_id: ID of the chat
+            last: Only read the last N conversations, without parsing the rest
+
+        Returns:
+            List[Dict[str, Any]]: Conversations, oldest first
+
+        Raises:
+            ValueError: If the chat does not exist
+        """
+        if not self.exists(chat_id):
+            raise ValueError(f"Chat {chat_id} does not exist")
+
+        if last:
+            return self._read_tail(chat_id, last)
+
+        with open(self.log_path(chat_id), 'rb') as f:
+            lines = f.read().splitlines()
+
+        conversations = []
+        for line in lines:
+            conversation = self._parse_line(chat_id, line)
+            if conversation is not None:
+                conversations.append(conversation)
+        return conversations
+
+    def get_header(self, chat_id: str, repair: bool = True) -> Dict[str, Any]:
+        """Return the up-to-date header of a chat.
+
+        Args:
+            chat_id: ID of the chat
+            repair: Rewrite a header that does not match the log; otherwise it
+                is only recounted in memory and the files are left untouched
+
+        Raises:
+            ValueError: If the chat does not exist
+        """
+        if not self.exists(chat_id):
+            raise ValueError(f"Chat {chat_id} does not exist")
+        return self._current_header(chat_id, repair)
+
+    def list_chats(self, page: int = 1, page_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """List chats from their headers, newest first.
+
+        Args:
+            page: One-based page number
+            page_size: Chats per page, or None for all
+
+        Returns:
+            List[Dict[str, Any]]: chat_id, created_at and conversation_count per chat
+        """
+        self.migrate_all()
+
+        chats = []
+        for filename in os.listdir(self.storage_path):
+            if not filename.endswith(LOG_SUFFIX):
+                continue
+            chat_id = filename[:-len(LOG_SUFFIX)]
+            try:
+                header = self._current_header(chat_id)
+            except OSError as e:
+                if self.logger:
+                    self.logger.error("Error reading chat file %s: %s", filename, str(e))
+                continue
+            chats.append({
+                'chat_id': header['chat_id'],
+                'created_at': header['created_at'],
+                'conversation_count': header['conversation_count']
+            })
+
+        chats.sort(key=lambda x: x['created_at'], reverse=True)
+        if page_size:
+            start = (max(1, page) - 1) * page_size
+            chats = chats[start:start + page_size]
+        return chats
+
+    def count_chats(self) -> int:
+        """Return the number of chats."""
+        self.migrate_all()
+        return sum(1 for filename in os.listdir(self.storage_path) if filename.endswith(LOG_SUFFIX))
+
+    def search(self, query: str, page: int = 1, page_size: int = 20) -> Dict[str, Any]:
+        """Search questions and responses for every word of query (case-insensitive).
+
+        This scans all chat logs; the SQLite backend uses a full-text index.
+
+        Returns:
+            dict: results (chat_id, timestamp, question, response), total, page and page_size
+        """
+        words = query.lower().split()
+        matches = []
+        if words:
+            for chat in self.list_chats():
+                for conversation in self.read(chat['chat_id']):
+                    user_messages = [msg for msg in conversation.get('messages', []) if msg.get('role') == 'user']
+                    question = str(user_messages[-1].get('content', '')) if user_messages else ''
+                    response = str(conversation.get('response', ''))
+                    text = f"{question}\n{response}".lower()
+                    if all(word in text for word in words):
+                        matches.append({
+                            'chat_id': chat['chat_id'],
+                            'timestamp': conversation.get('timestamp'),
+                            'question': question,
+                            'response': response
+                        })
+
+        page = max(1, page)
+        start = (page - 1) * page_size
+        return {'results': matches[start:start + page_size], 'total': len(matches),
+                'page': page, 'page_size': page_size}
+
+    def delete(self, chat_id: str) -> bool:
+        """Delete a chat.
+
+        Returns:
+            bool: True if the chat existed and was deleted
+        """
+        paths = [self.log_path(chat_id), self.header_path(chat_id), self.legacy_path(chat_id)]
+        existing = [path for path in paths if os.path.exists(path)]
+        if not any(path != self.header_path(chat_id) for path in existing):
+            return False
+        for path in existing:
+            os.remove(path)
+        return True
+
+    def scan_corrupted(self) -> List[str]:
+        """Return IDs of chats with a torn last line or an unreadable legacy file."""
+        corrupted = []
+        for filename in os.listdir(self.storage_path):
+            if filename.endswith(LOG_SUFFIX):
+                chat_id = filename[:-len(LOG_SUFFIX)]
+                try:
+                    size = os.path.getsize(self.log_path(chat_id))
+                    if size and self._last_byte(chat_id, size) != b"\n":
+                        corrupted.append(chat_id)
+                except OSError:
+                    corrupted.append(chat_id)
+            elif filename.endswith(LEGACY_SUFFIX):
+                # Legacy files that are still present could not be migrated
+                corrupted.append(filename[:-len(LEGACY_SUFFIX)])
+        return corrupted
+
+    def repair(self, chat_id: str) -> bool:
+        """Drop unreadable lines from a chat log, keeping a backup.
+
+        A legacy chat file that cannot be parsed is backed up and replaced by
+        an empty chat with the same ID.
+
+        Returns:
+            bool: True if the chat is readable afterwards
+        """
+        log_path = self.log_path(chat_id)
+        legacy_path = self.legacy_path(chat_id)
+
+        if not os.path.exists(log_path):
+            if not os.path.exists(legacy_path):
+                return False
+            if self.migrate(chat_id):
+                return True
+            os.replace(legacy_path, f"{legacy_path}.bak")
+            self.create(chat_id)
+            return True
+
+        with self._lock:
+            with open(log_path, 'rb') as f:
+                content = f.read()
+            with open(f"{log_path}.bak", 'wb') as f:
+                f.write(content)
+
+            valid_lines = [line for line in content.splitlines()
+                           if line.strip() and self._parse_line(chat_id, line) is not None]
+            self._write_log(log_path, valid_lines)
+            self._rebuild_header(chat_id, self._read_header(chat_id))
+
+        if self.logger:
+            self.logger.info("Repaired chat file %s, kept %d conversations", chat_id, len(valid_lines))
+        return True
+
+    def migrate_all(self) -> int:
+        """Migrate every legacy chat file in the storage directory.
+
+        Returns:
+            int: Number of migrated chats
+        """
+        migrated = 0
+        for filename in os.listdir(self.storage_path):
+            if filename.endswith(LEGACY_SUFFIX):
+                chat_id = filename[:-len(LEGACY_SUFFIX)]
+                if not os.path.exists(self.log_path(chat_id)) and self.migrate(chat_id):
+                    migrated += 1
+        return migrated
+
+    def migrate(self, chat_id: str) -> bool:
+        """Convert a legacy ``<chat_id>.json`` chat into the log format.
+
+        The legacy file is kept as ``<chat_id>.json.migrated``.
+
+        Returns:
+            bool: True if the chat was migrated
+        """
+        legacy_path = self.legacy_path(chat_id)
+        try:
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                chat_data = json.load(f)
+            conversations = chat_data['conversations']
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            if self.logger:
+                self.logger.error("Could not migrate chat file %s: %s", chat_id, str(e))
+            return False
+
+        lines = [json.dumps(conversation, ensure_ascii=False).encode('utf-8')
+                 for conversation in conversations]
+        with self._lock:
+            self._write_log(self.log_path(chat_id), lines)
+            header = {
+                "chat_id": chat_data.get('chat_id', chat_id),
+                "created_at": chat_data.get('created_at') or datetime.now().isoformat(),
+            }
+            self._rebuild_header(chat_id, header)
+            os.replace(legacy_path, os.path.join(self.storage_path, f"{chat_id}{MIGRATED_SUFFIX}"))
+
+        if self.logger:
+            self.logger.info("Migrated chat %s to the append-only format", chat_id)
+        return True
+
+    def _parse_line(self, chat_id: str, line: bytes) -> Optional[Dict[str, Any]]:
+        if not line.strip():
+            return None
+        try:
+            return json.loads(line)
+        except ValueError:
+            if self.logger:
+                self.logger.warning("Skipping unreadable conversation in chat %s", chat_id)
+            return None
+
+    def _last_byte(self, chat_id: str, size: int) -> bytes:
+        with open(self.log_path(chat_id), 'rb') as f:
+            f.seek(size - 1)
+            return f.read(1)
+
+    def _read_tail(self, chat_id: str, count: int) -> List[Dict[str, Any]]:
+        """Return the last count readable conversations, oldest first, skipping torn lines."""
+        conversations = []
+        lines = self._reversed_lines(self.log_path(chat_id))
+        try:
+            for line in lines:
+                conversation = self._parse_line(chat_id, line)
+                if conversation is not None:
+                    conversations.append(conversation)
+                    if len(conversations) == count:
+                        break
+        finally:
+            lines.close()
+        conversations.reverse()
+        return conversations
+
+    @staticmethod
+    def _reversed_lines(path: str) -> Iterator[bytes]:
+        """Yield the non-empty lines of a file, last first, reading backwards in blocks."""
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            partial = b""
+            while position > 0:
+                read_size = min(TAIL_BLOCK_SIZE, position)
+                position -= read_size
+                f.seek(position)
+                lines = (f.read(read_size) + partial).split(b"\n")
+                # The first line may continue in the previous block
+                partial = lines.pop(0)
+                for line in reversed(lines):
+                    if line.strip():
+                        yield line
+            if partial.strip():
+                yield partial
+
+    @staticmethod
+    def _write_log(log_path: str, lines: List[bytes]) -> None:
+        """Atomically replace a log with the given lines."""
+        tmp_path = f"{log_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            for line in lines:
+                f.write(line + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, log_path)
+
+    def _read_header(self, chat_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.header_path(chat_id), 'r', encoding='utf-8') as f:
+                header = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return header if isinstance(header, dict) and 'conversation_count' in header else None
+
+    def _write_header(self, chat_id: str, header: Dict[str, Any]) -> None:
+        header_path = self.header_path(chat_id)
+        tmp_path = f"{header_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(header, f)
+        os.replace(tmp_path, header_path)
+
+    def _current_header(self, chat_id: str, repair: bool = True) -> Dict[str, Any]:
+        """Return the header, rebuilding it if it does not match the log."""
+        header = self._read_header(chat_id)
+        if header is not None and header.get('size') == os.path.getsize(self.log_path(chat_id)):
+            return header
+        with self._lock:
+            return self._rebuild_header(chat_id, header, write=repair)
+
+    def _rebuild_header(self, chat_id: str, header: Optional[Dict[str, Any]],
+                        write: bool = True) -> Dict[str, Any]:
+        """Recount the conversations in a log and (with write set) rewrite its header."""
+        log_path = self.log_path(chat_id)
+        count = 0
+        with open(log_path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                # Torn lines left by a crash are not conversations
+                try:
+                    json.loads(line)
+                except ValueError:
+                    continue
+                count += 1
+
+        header = dict(header or {})
+        header.setdefault("chat_id", chat_id)
+        if not header.get("created_at"):
+            header["created_at"] = datetime.fromtimestamp(os.path.getmtime(log_path)).isoformat()
+        header["conversation_count"] = count
+        header["size"] = os.path.getsize(log_path)
+        if write:
+            self._write_header(chat_id, header)
+        return header
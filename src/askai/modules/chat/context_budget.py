@@ -0,0 +1,213 @@
+"""
+Token budget for the chat history sent with a question.
+
+The newest conversations that fit the model context next to the current
+request are kept; older ones are dropped or, optionally, replaced by a
+summary that is cached per chat and extended as more turns fall out.
+"""
+
+import json
+import os
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from askai.shared.utils import TokenEstimator
+
+DEFAULT_CONTEXT_BUDGET_SETTINGS = {
+    "enabled": True,
+    "context_length": None,  # None: context length of the model from /models
+    "fallback_context_length": 8192,
+    "reserved_output_tokens": 4096,
+    "summarize": False,
+    "summary_tokens": 512,
+}
+
+SUMMARY_INSTRUCTION = (
+    "Summarize the following earlier part of a conversation between a user and an assistant "
+    "in at most {words} words. Keep facts, decisions, names, numbers and open questions that "
+    "later messages may refer to. Reply with the summary only."
+)
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+def get_context_budget_settings(config: Optional[Dict[str, Any]] = None,
+                                overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Merge the chat.context_budget config block and overrides onto the defaults."""
+    settings = dict(DEFAULT_CONTEXT_BUDGET_SETTINGS)
+    chat_config = (config or {}).get('chat') or {}
+    for source in (chat_config.get('context_budget') or {}, overrides or {}):
+        settings.update({key: value for key, value in source.items() if value is not None})
+    return settings
+
+
+@dataclass
+class BudgetReport:
+    """Outcome of fitting chat history into the context budget."""
+    context_length: int
+    reserved_output_tokens: int
+    prompt_tokens: int
+    turns: int
+    kept_turns: int
+    summarized_turns: int = 0
+
+    @property
+    def trimmed(self) -> bool:
+        """Whether older conversations were left out or summarized."""
+        return self.kept_turns < self.turns
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the report as a dictionary for logging."""
+        return asdict(self)
+
+
+class SummaryCache:
+    """Summaries of the older turns of each chat, one small JSON file per chat."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _file(self, chat_id: str) -> str:
+        return os.path.join(self.path, f"{chat_id}.json")
+
+    def get(self, chat_id: str) -> Optional[Dict[str, str]]:
+        """Return {'through': timestamp, 'summary': text} or None."""
+        try:
+            with open(self._file(chat_id), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if isinstance(entry, dict) and 'summary' in entry else None
+
+    def put(self, chat_id: str, through: str, summary: str) -> None:
+        """Store the summary of all turns up to and including the timestamp through."""
+        os.makedirs(self.path, exist_ok=True)
+        file_path = self._file(chat_id)
+        tmp_path = f"{file_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"through": through, "summary": summary}, f)
+        os.replace(tmp_path, file_path)
+
+    def delete(self, chat_id: str) -> None:
+        """Remove the summary of a chat."""
+        try:
+            os.remove(self._file(chat_id))
+        except FileNotFoundError:
+            pass
+
+
+class ContextBudget:
+    """Keeps the newest chat turns that fit the model context."""
+
+    def __init__(self, context_length: int, reserved_output_tokens: int,
+                 estimator: Optional[TokenEstimator] = None,
+                 summarizer: Optional[Callable[[List[Dict[str, str]]], Optional[str]]] = None,
+                 summary_tokens: int = 512, summary_cache: Optional[SummaryCache] = None, logger=None):
+        """Initialize the budget.
+
+        Args:
+            context_length: Context window of the model in tokens
+            reserved_output_tokens: Tokens kept free for the response
+            estimator: Token estimator for the model
+            summarizer: Optional callable answering summary request messages;
+                without it older turns are dropped
+            summary_tokens: Prompt tokens set aside for the summary
+            summary_cache: Cache of summaries so older turns are summarized once
+            logger: Optional logger instance
+        """
+        self.context_length = context_length
+        self.reserved_output_tokens = reserved_output_tokens
+        self.estimator = estimator or TokenEstimator()
+        self.summarizer = summarizer
+        self.summary_tokens = summary_tokens
+        self.summary_cache = summary_cache
+        self.logger = logger
+
+    @property
+    def prompt_budget(self) -> int:
+        """Tokens available for the prompt."""
+        return max(0, self.context_length - self.reserved_output_tokens)
+
+    def fit(self, turns: List[Dict[str, Any]], fixed_messages: List[Dict[str, Any]],
+            chat_id: Optional[str] = None) -> Tuple[List[Dict[str, Any]], BudgetReport]:
+        """Select the history messages to send with a request.
+
+        Args:
+            turns: Conversations, oldest first, each with 'user', 'assistant'
+                and 'timestamp' keys
+            fixed_messages: Messages always sent (system prompt and question)
+            chat_id: Chat the turns belong to, for the summary cache
+
+        Returns:
+            Tuple of the history messages in order and a BudgetReport
+        """
+        fixed_tokens = self.estimator.count_messages(fixed_messages)
+        available = self.prompt_budget - fixed_tokens
+        costs = [self.estimator.count_messages([turn['user'], turn['assistant']]) for turn in turns]
+
+        # Keep the newest turns without gaps, so the kept history reads as one conversation
+        kept, used = 0, 0
+        for cost in reversed(costs):
+            if used + cost > available:
+                break
+            kept, used = kept + 1, used + cost
+
+        summary = None
+        if kept < len(turns) and self.summarizer is not None:
+            while kept and used + self.summary_tokens > available:
+                kept, used = kept - 1, used - costs[len(turns) - kept]
+            summary = self._summary(turns[:len(turns) - kept], chat_id)
+
+        messages = []
+        if summary:
+            messages.append({"role": "system", "content": SUMMARY_PREFIX + summary})
+        for turn in turns[len(turns) - kept:]:
+            messages.extend([turn['user'], turn['assistant']])
+
+        report = BudgetReport(
+            context_length=self.context_length,
+            reserved_output_tokens=self.reserved_output_tokens,
+            prompt_tokens=fixed_tokens + self.estimator.count_messages(messages),
+            turns=len(turns),
+            kept_turns=kept,
+            summarized_turns=len(turns) - kept if summary else 0
+        )
+        if self.logger:
+            self.logger.info(json.dumps({"log_message": "Chat history fitted to context budget",
+                                         **report.to_dict()}))
+        return messages, report
+
+    def _summary(self, dropped: List[Dict[str, Any]], chat_id: Optional[str]) -> Optional[str]:
+        """Summarize dropped turns, extending the cached summary with new ones only."""
+        cached = self.summary_cache.get(chat_id) if self.summary_cache and chat_id else None
+        summary = cached['summary'] if cached else None
+        through = cached.get('through', '') if cached else ''
+        new_turns = [turn for turn in dropped if (turn.get('timestamp') or '') > through] if cached else dropped
+        if not new_turns:
+            return summary
+
+        transcript = [f"{SUMMARY_PREFIX}{summary}"] if summary else []
+        for turn in new_turns:
+            transcript.append(f"User: {turn['user'].get('content', '')}")
+            transcript.append(f"Assistant: {turn['assistant'].get('content', '')}")
+        text = "\n\n".join(transcript)
+        # The summary request itself has to fit the context; the newest dropped turns matter most
+        max_chars = int(self.prompt_budget * self.estimator.chars_per_token)
+        if len(text) > max_chars:
+            text = text[-max_chars:]
+
+        try:
+            new_summary = self.summarizer([
+                {"role": "system", "content": SUMMARY_INSTRUCTION.format(words=self.summary_tokens * 3 // 4)},
+                {"role": "user", "content": text}
+            ])
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(json.dumps({"log_message": "Chat history summary failed", "error": str(e)}))
+            return summary
+        if not new_summary:
+            return summary
+
+        if self.summary_cache and chat_id:
+            self.summary_cache.put(chat_id, new_turns[-1].get('timestamp') or '', new_summary)
+        return new_summary
@@ -0,0 +1,397 @@
+"""
+SQLite chat storage.
+
+An optional chat backend for users with many chats. Chats, conversations and
+messages live in indexed tables, so listing chats and reading the last
+conversations of a chat are single queries whose cost depends on the page
+size, not on the number or length of chats. Questions and responses are
+indexed for full-text search (FTS5 when the SQLite build provides it,
+otherwise a LIKE scan).
+
+Enabled in the ``chat`` config block:
+
+    chat:
+      backend: "sqlite"               # "jsonl" (default) or "sqlite"
+      database_path: ""               # Defaults to <storage_path>/chats.db
+
+When a new database is created, the existing chat files in the storage
+directory are imported into it. The files themselves are left untouched.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .chat_store import JsonlChatStore, LEGACY_SUFFIX, LOG_SUFFIX
+
+DEFAULT_DATABASE_NAME = "chats.db"
+
+# Seconds to wait for another process's write transaction before failing
+BUSY_TIMEOUT_SECONDS = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chats (
+    chat_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    updated_at TEXT,
+    conversation_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_chats_created_at ON chats (created_at);
+
+CREATE TABLE IF NOT EXISTS conversations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    chat_id TEXT NOT NULL REFERENCES chats (chat_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    timestamp TEXT,
+    question TEXT,
+    response TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_conversations_chat ON conversations (chat_id, position);
+
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    conversation_id INTEGER NOT NULL REFERENCES conversations (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_messages_conversation ON messages (conversation_id, position);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS conversations_fts USING fts5 (question, response);
+"""
+
+# Conversation keys stored in dedicated columns; everything else goes to ``extra``
+_CONVERSATION_COLUMNS = ("timestamp", "messages", "response")
+
+
+def _question(conversation: Dict[str, Any]) -> str:
+    """Return the last user message of a conversation."""
+    user_messages = [msg for msg in conversation.get('messages', []) if msg.get('role') == 'user']
+    content = user_messages[-1].get('content', '') if user_messages else ''
+    return content if isinstance(content, str) else json.dumps(content)
+
+
+def _fts_query(query: str) -> str:
+    """Turn free text into an FTS5 query matching every word as a prefix."""
+    terms = ['"' + word.replace('"', '""') + '"*' for word in query.split()]
+    return " ".join(terms)
+
+
+class SqliteChatStore:
+    """Chat persistence in a SQLite database with full-text search."""
+
+    def __init__(self, database_path: str, storage_path: Optional[str] = None, logger=None):
+        """Open (and if needed create) the chat database.
+
+        Args:
+            database_path: Path of the SQLite database file
+            storage_path: Directory with existing chat files to import into a new database
+            logger: Optional logger instance
+        """
+        self.database_path = database_path
+        self.logger = logger
+        self._lock = threading.Lock()
+
+        is_new = not os.path.exists(database_path)
+        os.makedirs(os.path.dirname(database_path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(database_path, timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self.has_fts = self._create_fts()
+
+        if is_new and storage_path:
+            self.import_files(storage_path)
+
+    def _create_fts(self) -> bool:
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            return True
+        except sqlite3.OperationalError:
+            if self.logger:
+                self.logger.info("SQLite FTS5 not available, chat search falls back to LIKE")
+            return False
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def exists(self, chat_id: str) -> bool:
+        """Whether the chat exists."""
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM chats WHERE chat_id = ?", (chat_id,)).fetchone()
+        return row is not None
+
+    def create(self, chat_id: str, created_at: Optional[str] = None) -> None:
+        """Create an empty chat."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO chats (chat_id, created_at, conversation_count) VALUES (?, ?, 0)",
+                (chat_id, created_at or datetime.now().isoformat())
+            )
+
+    def append(self, chat_id: str, conversation: Dict[str, Any]) -> None:
+        """Append one conversation to a chat in a single transaction.
+
+        The transaction takes the write lock before reading the conversation
+        count, so appends from other processes cannot claim the same position.
+
+        Raises:
+            ValueError: If the chat does not exist
+        """
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute(
+                "SELECT conversation_count FROM chats WHERE chat_id = ?", (chat_id,)
+            ).fetchone()
+            if row is None:
+                raise ValueError(f"Chat {chat_id} does not exist")
+            self._insert_conversation(chat_id, row['conversation_count'], conversation)
+
+    def _insert_conversation(self, chat_id: str, position: int, conversation: Dict[str, Any]) -> None:
+        """Insert a conversation, its messages and search entry (caller holds the transaction)."""
+        extra = {key: value for key, value in conversation.items() if key not in _CONVERSATION_COLUMNS}
+        question = _question(conversation)
+        response = conversation.get('response', '')
+        timestamp = conversation.get('timestamp') or datetime.now().isoformat()
+
+        cursor = self._conn.execute(
+            "INSERT INTO conversations (chat_id, position, timestamp, question, response, extra) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (chat_id, position, timestamp, question, response, json.dumps(extra) if extra else None)
+        )
+        conversation_id = cursor.lastrowid
+        self._conn.executemany(
+            "INSERT INTO messages (conversation_id, position, role, content) VALUES (?, ?, ?, ?)",
+            # Content is stored as JSON because it can be a list of parts (e.g. images)
+            [(conversation_id, index, msg.get('role', ''), json.dumps(msg.get('content')))
+             for index, msg in enumerate(conversation.get('messages', []))]
+        )
+        if self.has_fts:
+            self._conn.execute(
+                "INSERT INTO conversations_fts (rowid, question, response) VALUES (?, ?, ?)",
+                (conversation_id, question, response)
+            )
+        self._conn.execute(
+            "UPDATE chats SET conversation_count = conversation_count + 1, updated_at = ? WHERE chat_id = ?",
+            (timestamp, chat_id)
+        )
+
+    def read(self, chat_id: str, last: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Read the conversations of a chat, oldest first.
+
+        Args:
+            chat_id: ID of the chat
+            last: Only read the last N conversations
+
+        Raises:
+            ValueError: If the chat does not exist
+        """
+        if not self.exists(chat_id):
+            raise ValueError(f"Chat {chat_id} does not exist")
+
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, timestamp, response, extra FROM conversations WHERE chat_id = ? "
+                "ORDER BY position DESC LIMIT ?",
+                (chat_id, last if last else -1)
+            ).fetchall()
+            rows.reverse()
+
+            messages: Dict[int, List[Dict[str, Any]]] = {row['id']: [] for row in rows}
+            if rows:
+                placeholders = ",".join("?" * len(rows))
+                for message in self._conn.execute(
+                    f"SELECT conversation_id, role, content FROM messages "
+                    f"WHERE conversation_id IN ({placeholders}) ORDER BY conversation_id, position",
+                    list(messages)
+                ):
+                    messages[message['conversation_id']].append(
+                        {'role': message['role'], 'content': json.loads(message['content'])}
+                    )
+
+        conversations = []
+        for row in rows:
+            conversation = {
+                'timestamp': row['timestamp'],
+                'messages': messages[row['id']],
+                'response': row['response'],
+            }
+            if row['extra']:
+                conversation.update(json.loads(row['extra']))
+            conversations.append(conversation)
+        return conversations
+
+    def get_header(self, chat_id: str) -> Dict[str, Any]:
+        """Return chat_id, created_at and conversation_count of a chat.
+
+        Raises:
+            ValueError: If the chat does not exist
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT chat_id, created_at, conversation_count FROM chats WHERE chat_id = ?", (chat_id,)
+            ).fetchone()
+        if row is None:
+            raise ValueError(f"Chat {chat_id} does not exist")
+        return dict(row)
+
+    def list_chats(self, page: int = 1, page_size: Optional[int] = None) -> List[Dict[str, Any]]:
+        """List chats, newest first.
+
+        Args:
+            page: One-based page number
+            page_size: Chats per page, or None for all
+
+        Returns:
+            List[Dict[str, Any]]: chat_id, created_at and conversation_count per chat
+        """
+        limit = page_size or -1
+        offset = (max(1, page) - 1) * page_size if page_size else 0
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT chat_id, created_at, conversation_count FROM chats "
+                "ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                (limit, offset)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count_chats(self) -> int:
+        """Return the number of chats."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM chats").fetchone()[0]
+
+    def search(self, query: str, page: int = 1, page_size: int = 20) -> Dict[str, Any]:
+        """Full-text search over questions and responses.
+
+        Args:
+            query: Search text; every word must match (as a prefix with FTS5)
+            page: One-based page number
+            page_size: Results per page
+
+        Returns:
+            dict: results (chat_id, timestamp, question, response), total, page and page_size
+        """
+        page = max(1, page)
+        offset = (page - 1) * page_size
+        if not query.split():
+            return {'results': [], 'total': 0, 'page': page, 'page_size': page_size}
+
+        with self._lock:
+            if self.has_fts:
+                match = _fts_query(query)
+                total = self._conn.execute(
+                    "SELECT COUNT(*) FROM conversations_fts WHERE conversations_fts MATCH ?", (match,)
+                ).fetchone()[0]
+                rows = self._conn.execute(
+                    "SELECT c.chat_id, c.timestamp, c.question, c.response "
+                    "FROM conversations_fts JOIN conversations c ON c.id = conversations_fts.rowid "
+                    "WHERE conversations_fts MATCH ? ORDER BY rank LIMIT ? OFFSET ?",
+                    (match, page_size, offset)
+                ).fetchall()
+            else:
+                words = [f"%{word}%" for word in query.split()]
+                condition = " AND ".join(["(question LIKE ? OR response LIKE ?)"] * len(words))
+                params = [word for word in words for _ in range(2)]
+                total = self._conn.execute(
+                    f"SELECT COUNT(*) FROM conversations WHERE {condition}", params
+                ).fetchone()[0]
+                rows = self._conn.execute(
+                    f"SELECT chat_id, timestamp, question, response FROM conversations WHERE {condition} "
+                    f"ORDER BY timestamp DESC LIMIT ? OFFSET ?",
+                    params + [page_size, offset]
+                ).fetchall()
+
+        return {'results': [dict(row) for row in rows], 'total': total, 'page': page, 'page_size': page_size}
+
+    def delete(self, chat_id: str) -> bool:
+        """Delete a chat with its conversations and messages.
+
+        Returns:
+            bool: True if the chat existed
+        """
+        with self._lock, self._conn:
+            if self.has_fts:
+                self._conn.execute(
+                    "DELETE FROM conversations_fts WHERE rowid IN "
+                    "(SELECT id FROM conversations WHERE chat_id = ?)", (chat_id,)
+                )
+            cursor = self._conn.execute("DELETE FROM chats WHERE chat_id = ?", (chat_id,))
+        return cursor.rowcount > 0
+
+    def scan_corrupted(self) -> List[str]:
+        """Chats in the database cannot be partially written, so none are corrupted."""
+        return []
+
+    def repair(self, chat_id: str) -> bool:
+        """Nothing to repair in the database; succeeds if the chat exists."""
+        return self.exists(chat_id)
+
+    def import_files(self, directory: str) -> int:
+        """Import chat files (JSONL logs and legacy JSON) into the database.
+
+        Chats that already exist in the database are skipped.
+
+        Args:
+            directory: Chat storage directory
+
+        Returns:
+            int: Number of imported chats
+        """
+        try:
+            filenames = sorted(os.listdir(directory))
+        except OSError:
+            return 0
+
+        file_store = JsonlChatStore(directory, self.logger)
+        imported = 0
+        for filename in filenames:
+            if filename.endswith(LOG_SUFFIX):
+                chat_id = filename[:-len(LOG_SUFFIX)]
+            elif filename.endswith(LEGACY_SUFFIX):
+                chat_id = filename[:-len(LEGACY_SUFFIX)]
+                if os.path.exists(os.path.join(directory, f"{chat_id}{LOG_SUFFIX}")):
+                    continue
+            else:
+                continue
+            if self.exists(chat_id):
+                continue
+
+            try:
+                header, conversations = self._read_chat_file(file_store, directory, filename, chat_id)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                if self.logger:
+                    self.logger.error("Could not import chat file %s: %s", filename, str(e))
+                continue
+
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO chats (chat_id, created_at, conversation_count) VALUES (?, ?, 0)",
+                    (chat_id, header.get('created_at') or datetime.now().isoformat())
+                )
+                for position, conversation in enumerate(conversations):
+                    self._insert_conversation(chat_id, position, conversation)
+            imported += 1
+
+        if imported and self.logger:
+            self.logger.info("Imported %d chat files into %s", imported, self.database_path)
+        return imported
+
+    @staticmethod
+    def _read_chat_file(file_store: JsonlChatStore, directory: str, filename: str, chat_id: str):
+        """Read a chat file without migrating or modifying it."""
+        if filename.endswith(LOG_SUFFIX):
+            return file_store.get_header(chat_id, repair=False), file_store.read(chat_id)
+
+        with open(os.path.join(directory, filename), 'r', encoding='utf-8') as f:
+            chat_data = json.load(f)
+        return chat_data, chat_data['conversations']
@@ -5,5 +5,8 @@ Handles message construction and template processing.
 
 # Import main classes for backward compatibility
 from .builder import MessageBuilder
+from .attachment_cache import AttachmentCache, get_attachment_cache, get_attachment_cache_stats
+from .image_processing import get_image_processing_settings, get_image_processing_stats
 
-__all__ = ['MessageBuilder']
+__all__ = ['MessageBuilder', 'AttachmentCache', 'get_attachment_cache', 'get_attachment_cache_stats',
+           'get_image_processing_settings', 'get_image_processing_stats']
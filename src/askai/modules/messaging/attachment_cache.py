@@ -0,0 +1,319 @@
+"""
+On-disk cache of encoded image and PDF attachments.
+
+Pattern runs and batch jobs often attach the same PDF or screenshot to
+several requests in a row. The cache keeps the encoded data URL of each
+attachment, so a repeated attachment skips the base64 encode, and usually
+the file read as well:
+
+1. Fast path: the file's real path, mtime and size (plus the MIME type)
+   point to an entry via a small reference file. No file content is read.
+2. Content path: the file is hashed (SHA-256) and an entry with the same
+   content and MIME type is reused, e.g. for a copied or touched file.
+3. Miss: the file is encoded and stored.
+
+A ``variant`` (e.g. image processing settings) is part of both keys, so
+differently processed encodings of one file are kept apart.
+
+Each entry holds a JSON header line (MIME type, file size, content hash)
+followed by the data URL. Reads touch the entry, and least recently used
+entries are evicted above ``max_bytes``.
+
+Configured by the optional ``attachment_cache`` block:
+
+    attachment_cache:
+      enabled: true                   # Cache encoded attachments
+      path: "~/.askai/attachments"    # Cache directory
+      max_bytes: 268435456            # LRU eviction keeps the cache below this size
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from askai.shared.metrics import inc
+from askai.shared.utils import encode_file_to_data_url
+
+DEFAULT_ATTACHMENT_CACHE_SETTINGS: Dict[str, Any] = {
+    "enabled": True,
+    "path": "~/.askai/attachments",
+    "max_bytes": 256 * 1024 * 1024,
+}
+
+ENTRY_SUFFIX = ".att"
+REFS_DIR = "refs"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, int] = {
+    "path_hits": 0,
+    "content_hits": 0,
+    "misses": 0,
+    "stores": 0,
+    "evictions": 0,
+    "bytes_saved": 0,
+}
+
+_caches: Dict[Tuple[Any, ...], "AttachmentCache"] = {}
+_caches_lock = threading.Lock()
+
+
+def get_attachment_cache_settings(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Merge the ``attachment_cache`` config block with the defaults.
+
+    Args:
+        config: Optional configuration dict
+
+    Returns:
+        dict: Effective attachment cache settings
+    """
+    settings = dict(DEFAULT_ATTACHMENT_CACHE_SETTINGS)
+    cache_config = (config or {}).get("attachment_cache") or {}
+    if isinstance(cache_config, dict):
+        for key in DEFAULT_ATTACHMENT_CACHE_SETTINGS:
+            if cache_config.get(key) is not None:
+                settings[key] = cache_config[key]
+    return settings
+
+
+def _record(**counters: int) -> None:
+    """Add to the process-wide cache counters."""
+    with _stats_lock:
+        for name, value in counters.items():
+            _stats[name] += value
+    for name, value in counters.items():
+        inc("askai_cache_events_total", {"cache": "attachment", "event": name}, value)
+
+
+def get_attachment_cache_stats() -> Dict[str, int]:
+    """Return a snapshot of the process-wide attachment cache counters."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_attachment_cache_stats() -> None:
+    """Reset the process-wide attachment cache counters (used in tests)."""
+    with _stats_lock:
+        for name in _stats:
+            _stats[name] = 0
+
+
+def hash_file(file_path: str) -> str:
+    """Return the hex SHA-256 of a file's content, read without loading it whole."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                digest.update(mapped)
+        except (ValueError, OSError):
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AttachmentCache:
+    """Directory of encoded attachments keyed by content hash, bounded by size."""
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_ATTACHMENT_CACHE_SETTINGS["max_bytes"]):
+        """Initialize the cache.
+
+        Args:
+            path: Cache directory (created on first store)
+            max_bytes: Size bound enforced by least-recently-used eviction
+        """
+        self.path = os.path.expanduser(path)
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}{ENTRY_SUFFIX}")
+
+    def _ref_path(self, key: str) -> str:
+        return os.path.join(self.path, REFS_DIR, key)
+
+    @staticmethod
+    def _key(*parts: Any) -> str:
+        return hashlib.sha256("\0".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+    def get_data_url(self, file_path: str, mime_type: str, variant: str = "",
+                     encoder: Optional[Callable[[str], Optional[str]]] = None) -> Optional[str]:
+        """Return the data URL of a file, from the cache when possible.
+
+        Args:
+            file_path: Path to the attachment
+            mime_type: MIME type used in the data URL
+            variant: Optional key for encodings that transform the file
+            encoder: Optional callable(file_path) producing the data URL on a
+                miss; defaults to a plain base64 encoding of the file
+
+        Returns:
+            Optional[str]: Data URL, or None if the file cannot be read
+        """
+        if encoder is None:
+            def encoder(path):
+                return encode_file_to_data_url(path, mime_type)
+
+        try:
+            real_path = os.path.realpath(file_path)
+            stat = os.stat(real_path)
+        except OSError:
+            # Let the encoder report the problem
+            return encoder(file_path)
+
+        ref_key = self._key(real_path, stat.st_mtime_ns, stat.st_size, mime_type, variant)
+        entry_key = self._read_ref(ref_key)
+        if entry_key:
+            data_url = self._read_entry(entry_key)
+            if data_url is not None:
+                _record(path_hits=1, bytes_saved=stat.st_size)
+                return data_url
+
+        try:
+            content_hash = hash_file(real_path)
+        except OSError:
+            return encoder(file_path)
+        entry_key = self._key(content_hash, mime_type, variant)
+        data_url = self._read_entry(entry_key)
+        if data_url is not None:
+            self._write_ref(ref_key, entry_key)
+            _record(content_hits=1, bytes_saved=stat.st_size)
+            return data_url
+
+        _record(misses=1)
+        data_url = encoder(file_path)
+        if data_url is not None:
+            header = {"mime_type": mime_type, "size": stat.st_size, "sha256": content_hash, "variant": variant}
+            if self._write_entry(entry_key, header, data_url):
+                self._write_ref(ref_key, entry_key)
+        return data_url
+
+    def _read_ref(self, ref_key: str) -> Optional[str]:
+        try:
+            with open(self._ref_path(ref_key), "r", encoding="ascii") as f:
+                return f.read().strip()
+        except (OSError, ValueError):
+            return None
+
+    def _read_entry(self, entry_key: str) -> Optional[str]:
+        entry_path = self._entry_path(entry_key)
+        try:
+            with open(entry_path, "rb") as f:
+                json.loads(f.readline())
+                data_url = f.read().decode("ascii")
+            # Touching the entry on read turns mtime into the LRU order
+            os.utime(entry_path, None)
+        except (OSError, ValueError):
+            return None
+        return data_url or None
+
+    def _write_atomic(self, target: str, chunks) -> int:
+        """Write chunks to target via a temporary file and rename; returns bytes written."""
+        tmp_path = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        written = 0
+        try:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    written += len(chunk)
+            # Atomic rename so concurrent readers never see a partial entry
+            os.replace(tmp_path, target)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return 0
+        return written
+
+    def _write_ref(self, ref_key: str, entry_key: str) -> None:
+        self._write_atomic(self._ref_path(ref_key), [entry_key.encode("ascii")])
+
+    def _write_entry(self, entry_key: str, header: Dict[str, Any], data_url: str) -> bool:
+        header_line = (json.dumps(header) + "\n").encode("utf-8")
+        written = self._write_atomic(self._entry_path(entry_key), [header_line, data_url.encode("ascii")])
+        if not written:
+            return False
+
+        _record(stores=1)
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan()[1]
+            else:
+                self._total_bytes += written
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+        return True
+
+    def _scan(self):
+        """List entries as (mtime, size, path), oldest first, with their total size."""
+        entries = []
+        try:
+            with os.scandir(self.path) as it:
+                for entry in it:
+                    if entry.name.endswith(ENTRY_SUFFIX) and entry.is_file():
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return [], 0
+        entries.sort()
+        return entries, sum(size for _, size, _ in entries)
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until under the bound, then stale refs."""
+        entries, total = self._scan()
+        evicted = 0
+        for _, size, entry_path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(entry_path)
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+        self._total_bytes = total
+        _record(evictions=evicted)
+        if evicted:
+            self._prune_refs()
+
+    def _prune_refs(self) -> None:
+        """Remove references to entries that no longer exist."""
+        refs_dir = os.path.join(self.path, REFS_DIR)
+        try:
+            with os.scandir(refs_dir) as it:
+                for entry in it:
+                    entry_key = self._read_ref(entry.name)
+                    if not entry_key or not os.path.exists(self._entry_path(entry_key)):
+                        try:
+                            os.remove(entry.path)
+                        except OSError:
+                            pass
+        except OSError:
+            pass
+
+
+def get_attachment_cache(config: Optional[Dict[str, Any]] = None) -> Optional[AttachmentCache]:
+    """Return the shared attachment cache, or None when it is disabled.
+
+    Args:
+        config: Optional configuration dict containing an ``attachment_cache`` block
+
+    Returns:
+        Optional[AttachmentCache]: Cache instance shared by all message builders
+    """
+    settings = get_attachment_cache_settings(config)
+    if not settings["enabled"]:
+        return None
+
+    key = (settings["path"], settings["max_bytes"])
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = AttachmentCache(settings["path"], settings["max_bytes"])
+            _caches[key] = cache
+        return cache
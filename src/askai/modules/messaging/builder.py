@@ -3,10 +3,15 @@ Message building and processing logic.
 Handles construction of messages for AI interaction based on various inputs.
 """
 
+import functools
 import json
 import os
-from askai.shared.utils import (get_piped_input, get_file_input, build_format_instruction,
-                   encode_file_to_base64, generate_output_format_template)
+from askai.shared.logging import LogPayload
+from askai.shared.utils import (get_piped_input, get_file_input, build_format_instruction, timed,
+                   encode_file_to_data_url, generate_output_format_template)
+from .attachment_cache import get_attachment_cache, get_attachment_cache_stats
+from .image_processing import (PIL_AVAILABLE, get_image_processing_settings, get_image_processing_stats,
+                               process_image, settings_variant, bytes_to_data_url)
 
 
 class MessageBuilder:
@@ -33,13 +38,86 @@ class MessageBuilder:
 
                 messages.append(user_message)eraction from various input sources."""
 
-    def __init__(self, pattern_manager, logger):
+    def __init__(self, pattern_manager, logger, config=None):
+        """Initialize the message builder.
+
+        Args:
+            pattern_manager: PatternManager for pattern messages (may be None for questions only)
+            logger: Logger instance
+            config: Optional configuration dict; enables the attachment cache
+                (``attachment_cache`` block) for image and PDF files and image
+                pre-processing (``image_processing`` block)
+        """
         self.pattern_manager = pattern_manager
         self.logger = logger
+        self.config = config
+        self.attachment_cache = get_attachment_cache(config) if config is not None else None
+        self._pillow_warning_logged = False
+
+    @timed("messages.encode")
+    def _encode_attachment(self, file_path, mime_type, image_settings=None):
+        """Encode an image or PDF file as a data URL, reusing cached encodings.
+
+        Images are pre-processed first when image_settings enable it.
+        """
+        if image_settings and image_settings["enabled"] and mime_type.startswith("image/"):
+            variant = settings_variant(image_settings)
+            encoder = functools.partial(self._encode_image, mime_type=mime_type, image_settings=image_settings)
+        else:
+            variant = ""
+            encoder = None
+
+        if self.attachment_cache is None:
+            return encoder(file_path) if encoder else encode_file_to_data_url(file_path, mime_type)
+
+        data_url = self.attachment_cache.get_data_url(file_path, mime_type, variant, encoder)
+        self.logger.debug(LogPayload({
+            "log_message": "Attachment cache lookup",
+            "file_path": file_path,
+            "stats": get_attachment_cache_stats()
+        }))
+        return data_url
+
+    def _image_settings(self, pattern_data=None):
+        """Return image processing settings, with overrides from the pattern's model configuration."""
+        configuration = (pattern_data or {}).get('configuration')
+        model_config = getattr(configuration, 'model', None)
+        return get_image_processing_settings(self.config, getattr(model_config, 'image_processing', None))
+
+    def _encode_image(self, file_path, mime_type, image_settings):
+        """Encode a pre-processed image, falling back to the original file."""
+        if not PIL_AVAILABLE:
+            if not self._pillow_warning_logged:
+                self._pillow_warning_logged = True
+                self.logger.warning(json.dumps({
+                    "log_message": "Image processing is enabled but Pillow is not installed; "
+                                   "sending images unchanged"
+                }))
+            return encode_file_to_data_url(file_path, mime_type)
+
+        result = process_image(file_path, image_settings)
+        if result is None:
+            self.logger.debug(LogPayload({
+                "log_message": "Image sent unchanged",
+                "file_path": file_path
+            }))
+            return encode_file_to_data_url(file_path, mime_type)
+
+        data, processed_mime_type, report = result
+        self.logger.info(json.dumps({
+            "log_message": "Image pre-processed",
+            "file_path": file_path,
+            "mime_type": processed_mime_type,
+            **report,
+            "totals": get_image_processing_stats()
+        }))
+        return bytes_to_data_url(data, processed_mime_type)
 
+    @timed("messages.build")
     def build_messages(self, question=None, file_input=None, pattern_id=None,
                       pattern_input=None, response_format="rawtext", url=None, image=None,
-                      pdf=None, image_url=None, pdf_url=None):
+                      pdf=None, image_url=None, pdf_url=None, use_piped_input=True,
+                      pattern_data=None, interactive=True):
         """Builds the message list for OpenRouter.
 
         Args:
@@ -53,6 +131,11 @@ class MessageBuilder:
             pdf: Optional path to PDF file
             image_url: Optional URL to an image
             pdf_url: Optional URL to a PDF file
+            use_piped_input: Whether to add piped stdin as context (disabled
+                for batch items, where stdin is not meant for every message)
+            pattern_data: Optional already parsed pattern, reused instead of
+                re-reading the pattern file (batch runs parse it once)
+            interactive: Whether missing pattern inputs may be prompted for
 
         Returns:
             tuple: (messages, resolved_pattern_id)
@@ -61,7 +144,7 @@ class MessageBuilder:
         resolved_pattern_id = pattern_id
 
         # Handle piped input from terminal
-        if context := get_piped_input():
+        if use_piped_input and (context := get_piped_input()):
             self.logger.info(json.dumps({"log_message": "Piped input received"}))
             messages.append({
                 "role": "system",
@@ -118,8 +201,8 @@ class MessageBuilder:
             # Get the proper MIME type
             mime_type = mime_type_map.get(image_ext, "jpeg")
 
-            image_base64 = encode_file_to_base64(image)
-            if image_base64:
+            image_data_url = self._encode_attachment(image, f"image/{mime_type}", self._image_settings())
+            if image_data_url:
                 # For image inputs, we need to use the content list format for multimodal
                 # Create a default question if none provided
                 if not question:
@@ -135,7 +218,7 @@ class MessageBuilder:
                         {
                             "type": "image_url",
                             "image_url": {
-                                "url": f"data:image/{mime_type};base64,{image_base64}"
+                                "url": image_data_url
                             }
                         }
                     ]
@@ -144,7 +227,7 @@ class MessageBuilder:
                 question = None
 
                 # Log the message structure for debugging
-                self.logger.debug(json.dumps({
+                self.logger.debug(LogPayload({
                     "log_message": "Created multimodal message for image",
                     "message_structure": messages[-1]
                 }))
@@ -179,7 +262,7 @@ class MessageBuilder:
             question = None
 
             # Log the message structure for debugging
-            self.logger.debug(json.dumps({
+            self.logger.debug(LogPayload({
                 "log_message": "Created multimodal message for image URL",
                 "message_structure": messages[-1]
             }))
@@ -195,7 +278,7 @@ class MessageBuilder:
             pdf_filename = os.path.basename(pdf)
             file_ext = os.path.splitext(pdf_filename)[1].lower()
 
-            self.logger.debug(json.dumps({
+            self.logger.debug(LogPayload({
                 "log_message": "Processing PDF file",
                 "pdf_path": pdf,
                 "filename": pdf_filename,
@@ -218,21 +301,22 @@ class MessageBuilder:
                     # If no question provided, default to summarization
                     if not question:
                         question = "Please analyze and summarize the content of this file."
-                self.logger.debug(json.dumps({"log_message": "Treating file as text, not PDF"}))
+                self.logger.debug(LogPayload({"log_message": "Treating file as text, not PDF"}))
             else:
                 # This is an actual PDF file, encode it to base64
                 # Encode the PDF to base64
-                self.logger.debug(json.dumps({
+                self.logger.debug(LogPayload({
                     "log_message": "Attempting to encode PDF file",
                     "pdf_path": pdf
                 }))
 
-                pdf_base64 = encode_file_to_base64(pdf)
+                pdf_data_url = self._encode_attachment(pdf, "application/pdf")
 
-                if pdf_base64:
-                    self.logger.debug(json.dumps({
+                if pdf_data_url:
+                    base64_start = pdf_data_url.index(",") + 1
+                    self.logger.debug(LogPayload({
                         "log_message": "PDF encoding successful",
-                        "base64_length": len(pdf_base64)
+                        "base64_length": len(pdf_data_url) - base64_start
                     }))
 
                     # Create default question if none provided
@@ -244,13 +328,6 @@ class MessageBuilder:
                     # Create multimodal message with PDF content
                     # PDFs should be sent as 'file' type according to OpenRouter docs for Google models
                     # Format for Google Gemma models which have better PDF support
-                    pdf_data_url = f"data:application/pdf;base64,{pdf_base64}"
-
-                    # Print the first few characters of base64 data to verify format
-                    self.logger.debug(json.dumps({
-                        "log_message": "PDF base64 data sample",
-                        "prefix": pdf_base64[:50]
-                    }))
 
                     # Create a message structure that works with most OpenRouter models
                     try:
@@ -300,22 +377,21 @@ class MessageBuilder:
                     question = None
 
                     # Log details for debugging
-                    self.logger.debug(json.dumps({
+                    self.logger.debug(LogPayload({
                         "log_message": "PDF message details",
-                        "base64_prefix": pdf_base64[:20] + "...",
                         "content_type": "file",
                         "mime_type": "application/pdf",
                         "filename": pdf_filename,
-                        "data_url_prefix": pdf_data_url.split(",", maxsplit=1)[0]
+                        "data_url_prefix": pdf_data_url[:base64_start - 1]
                     }))
 
                     # Log the message structure for debugging
-                    self.logger.debug(json.dumps({
+                    self.logger.debug(LogPayload({
                         "log_message": "Created multimodal message for PDF",
                         "message_structure": messages[-1]
                     }))
                 else:
-                    self.logger.warning("Failed to encode PDF file, pdf_base64 is None")
+                    self.logger.warning("Failed to encode PDF file, pdf_data_url is None")
 
         # Handle PDF URL input
         if pdf_url:
@@ -367,7 +443,7 @@ class MessageBuilder:
                 question = None
 
                 # Log the message structure for debugging
-                self.logger.debug(json.dumps({
+                self.logger.debug(LogPayload({
                     "log_message": "Created multimodal message for PDF URL",
                     "message_structure": messages[-1]
                 }))
@@ -394,7 +470,8 @@ class MessageBuilder:
         # Add pattern-specific context if specified
         if pattern_id is not None:
             resolved_pattern_id = self._handle_pattern_context(
-                pattern_id, pattern_input, messages
+                pattern_id, pattern_input, messages,
+                pattern_data=pattern_data, interactive=interactive
             )
             if resolved_pattern_id is None:
                 return None, None
@@ -418,7 +495,8 @@ class MessageBuilder:
 
         return messages, resolved_pattern_id
 
-    def _handle_pattern_context(self, pattern_id, pattern_input, messages):
+    def _handle_pattern_context(self, pattern_id, pattern_input, messages,
+                                pattern_data=None, interactive=True):
         """Handle pattern-specific context and add to messages."""
         # Handle pattern selection if no specific ID was provided
         if pattern_id == 'new':
@@ -434,7 +512,8 @@ class MessageBuilder:
             "pattern": resolved_pattern_id
         }))
 
-        pattern_data = self.pattern_manager.get_pattern_content(resolved_pattern_id)
+        if pattern_data is None:
+            pattern_data = self.pattern_manager.get_pattern_content(resolved_pattern_id)
         if pattern_data is None:
             print(f"Pattern '{resolved_pattern_id}' does not exist")
             return None
@@ -442,7 +521,9 @@ class MessageBuilder:
         # Get and validate pattern data
         pattern_inputs = self.pattern_manager.process_pattern_inputs(
             pattern_id=resolved_pattern_id,
-            input_values=pattern_input
+            input_values=pattern_input,
+            interactive=interactive,
+            pattern_data=pattern_data
         )
         if pattern_inputs is None:
             return None
@@ -457,7 +538,6 @@ class MessageBuilder:
         # Check for special file inputs and handle them specially
         image_file_input = None
         pdf_file_input = None
-        image_base64 = None
         structured_inputs = dict(pattern_inputs)  # Make a copy to modify
 
         # Check if there are any special inputs to handle (image_file, pdf_file, image_url, pdf_url)
@@ -496,9 +576,10 @@ class MessageBuilder:
                     }))
 
                     # Encode the image to base64
-                    image_base64 = encode_file_to_base64(image_path)
+                    image_data_url = self._encode_attachment(image_path, f"image/{mime_type}",
+                                                             self._image_settings(pattern_data))
 
-                    if image_base64:
+                    if image_data_url:
                         # Find user question in pattern inputs or use default
                         user_question = "Please analyze this image based on the provided inputs."
 
@@ -510,13 +591,13 @@ class MessageBuilder:
                                 {
                                     "type": "image_url",
                                     "image_url": {
-                                        "url": f"data:image/{mime_type};base64,{image_base64}"
+                                        "url": image_data_url
                                     }
                                 }
                             ]
                         })
 
-                        self.logger.debug(json.dumps({
+                        self.logger.debug(LogPayload({
                             "log_message": "Created multimodal message for pattern image input",
                             "message_structure": "multimodal with image"
                         }))
@@ -539,14 +620,13 @@ class MessageBuilder:
                     }))
 
                     # Encode the PDF to base64
-                    pdf_base64 = encode_file_to_base64(pdf_path)
+                    pdf_data_url = self._encode_attachment(pdf_path, "application/pdf")
 
-                    if pdf_base64:
+                    if pdf_data_url:
                         # Find user question in pattern inputs or use default
                         user_question = "Please analyze this PDF document based on the provided inputs."
 
                         # Create multimodal message with PDF content
-                        pdf_data_url = f"data:application/pdf;base64,{pdf_base64}"
 
                         messages.append({
                             "role": "user",
@@ -562,7 +642,7 @@ class MessageBuilder:
                             ]
                         })
 
-                        self.logger.debug(json.dumps({
+                        self.logger.debug(LogPayload({
                             "log_message": "Created multimodal message for pattern PDF input",
                             "message_structure": "multimodal with PDF"
                         }))
@@ -603,7 +683,7 @@ class MessageBuilder:
                             ]
                         })
 
-                        self.logger.debug(json.dumps({
+                        self.logger.debug(LogPayload({
                             "log_message": "Created multimodal message for pattern PDF URL input",
                             "message_structure": "multimodal with PDF URL"
                         }))
@@ -644,7 +724,7 @@ class MessageBuilder:
                             ]
                         })
 
-                        self.logger.debug(json.dumps({
+                        self.logger.debug(LogPayload({
                             "log_message": "Created multimodal message for pattern image URL input",
                             "message_structure": "multimodal with image URL"
                         }))
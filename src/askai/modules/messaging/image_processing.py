@@ -0,0 +1,177 @@
+"""
+Optional pre-processing of image attachments.
+
+Images from ``-img`` and pattern ``image_file`` inputs are otherwise sent
+byte for byte. With Pillow installed and ``image_processing.enabled`` set,
+each image is downscaled to ``max_dimension``, re-encoded as JPEG or WebP
+at ``quality`` and stripped of metadata (EXIF, ICC profiles, comments)
+before it is base64 encoded. The processed image is only used when it is
+smaller than the original.
+
+Configured by the optional ``image_processing`` block, which patterns can
+override per key in their ``model`` configuration:
+
+    image_processing:
+      enabled: false          # Pre-process images before sending them
+      max_dimension: 1568     # Longest side in pixels after downscaling
+      format: "jpeg"          # Re-encode as "jpeg" or "webp"
+      quality: 85             # Encoder quality (1-95)
+      strip_metadata: true    # Drop EXIF/ICC metadata
+      min_bytes: 262144       # Smaller images are sent unchanged
+"""
+
+import binascii
+import io
+import json
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    from PIL import Image, ImageOps
+    PIL_AVAILABLE = True
+except ImportError:
+    Image = None
+    ImageOps = None
+    PIL_AVAILABLE = False
+
+DEFAULT_IMAGE_PROCESSING_SETTINGS: Dict[str, Any] = {
+    "enabled": False,
+    "max_dimension": 1568,
+    "format": "jpeg",
+    "quality": 85,
+    "strip_metadata": True,
+    "min_bytes": 256 * 1024,
+}
+
+OUTPUT_FORMATS = {"jpeg": "image/jpeg", "jpg": "image/jpeg", "webp": "image/webp"}
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Any] = {
+    "processed": 0,
+    "skipped": 0,
+    "bytes_in": 0,
+    "bytes_out": 0,
+    "processing_ms": 0.0,
+}
+
+
+def get_image_processing_settings(config: Optional[Dict[str, Any]] = None,
+                                  overrides: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Merge the ``image_processing`` config block and pattern overrides with the defaults.
+
+    Args:
+        config: Optional configuration dict
+        overrides: Optional per-pattern settings (``model.image_processing``)
+
+    Returns:
+        dict: Effective image processing settings
+    """
+    settings = dict(DEFAULT_IMAGE_PROCESSING_SETTINGS)
+    for block in ((config or {}).get("image_processing"), overrides):
+        if isinstance(block, dict):
+            for key in DEFAULT_IMAGE_PROCESSING_SETTINGS:
+                if block.get(key) is not None:
+                    settings[key] = block[key]
+    return settings
+
+
+def settings_variant(settings: Dict[str, Any]) -> str:
+    """Return a stable key for the settings that change the processed output."""
+    return json.dumps({key: settings[key] for key in sorted(settings) if key != "enabled"},
+                      sort_keys=True)
+
+
+def _record(**counters: Any) -> None:
+    """Add to the process-wide image processing counters."""
+    with _stats_lock:
+        for name, value in counters.items():
+            _stats[name] += value
+
+
+def get_image_processing_stats() -> Dict[str, Any]:
+    """Return a snapshot of the process-wide image processing counters."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_image_processing_stats() -> None:
+    """Reset the process-wide image processing counters (used in tests)."""
+    with _stats_lock:
+        for name in _stats:
+            _stats[name] = 0
+
+
+def process_image(file_path: str, settings: Dict[str, Any]) -> Optional[Tuple[bytes, str, Dict[str, Any]]]:
+    """Downscale, re-encode and strip an image according to settings.
+
+    Args:
+        file_path: Path to the image
+        settings: Effective image processing settings
+
+    Returns:
+        Optional[tuple]: (image bytes, MIME type, report) or None when the
+        original should be sent unchanged (Pillow missing, image too small,
+        animated, unreadable or not made smaller by processing)
+    """
+    if not PIL_AVAILABLE:
+        return None
+
+    output_mime = OUTPUT_FORMATS.get(str(settings["format"]).lower(), "image/jpeg")
+    max_dimension = int(settings["max_dimension"])
+    start = time.perf_counter()
+    try:
+        with open(file_path, "rb") as f:
+            original = f.read()
+        if len(original) < int(settings["min_bytes"]):
+            _record(skipped=1)
+            return None
+
+        with Image.open(io.BytesIO(original)) as opened:
+            if getattr(opened, "is_animated", False):
+                _record(skipped=1)
+                return None
+            original_dimensions = opened.size
+            # Apply the EXIF orientation before the EXIF data is dropped
+            image = ImageOps.exif_transpose(opened)
+            metadata = {} if settings["strip_metadata"] else {
+                key: opened.info[key] for key in ("exif", "icc_profile") if opened.info.get(key)
+            }
+            if max(image.size) > max_dimension > 0:
+                image.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+
+            if output_mime == "image/jpeg" and image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+            elif image.mode not in ("RGB", "RGBA", "L"):
+                image = image.convert("RGBA")
+
+            buffer = io.BytesIO()
+            image.save(buffer, format=output_mime.split("/")[1].upper(),
+                       quality=int(settings["quality"]), optimize=True, **metadata)
+            processed = buffer.getvalue()
+    except (OSError, ValueError, Image.DecompressionBombError):
+        _record(skipped=1)
+        return None
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if len(processed) >= len(original):
+        _record(skipped=1, processing_ms=elapsed_ms)
+        return None
+
+    report = {
+        "original_bytes": len(original),
+        "processed_bytes": len(processed),
+        "saved_bytes": len(original) - len(processed),
+        # Base64 grows the upload by 4/3, so that is what the request saves
+        "payload_saved_bytes": (len(original) - len(processed)) * 4 // 3,
+        "original_dimensions": list(original_dimensions),
+        "processed_dimensions": list(image.size),
+        "processing_ms": round(elapsed_ms, 1),
+    }
+    _record(processed=1, bytes_in=len(original), bytes_out=len(processed), processing_ms=elapsed_ms)
+    return processed, output_mime, report
+
+
+def bytes_to_data_url(data: bytes, mime_type: str) -> str:
+    """Return a base64 data URL for in-memory bytes."""
+    return f"data:{mime_type};base64," + binascii.b2a_base64(data, newline=False).decode("ascii")
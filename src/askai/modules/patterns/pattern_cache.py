@@ -0,0 +1,160 @@
+"""
+Process-wide cache of parsed pattern files.
+
+Parsing a pattern runs several YAML and markdown parsers, and a single
+pattern run asks for the same pattern several times (message building,
+model selection, output handling), while every API request creates a new
+PatternManager. Parsed patterns are therefore cached once per process,
+keyed by file path and validated against the file's mtime and size, so an
+edited pattern is re-parsed on its next use.
+
+The cache can optionally be persisted as a pickle so cold CLI starts skip
+parsing too. It is enabled in the ``patterns`` config block:
+
+    patterns:
+      compiled_cache: true
+      compiled_cache_path: "~/.askai/pattern_cache.pickle"
+"""
+
+import logging
+import os
+import pickle
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COMPILED_CACHE_PATH = "~/.askai/pattern_cache.pickle"
+
+# Bump when the structure of parsed pattern data changes
+COMPILED_CACHE_VERSION = 2
+
+
+def _signature(stat: os.stat_result) -> Tuple[int, int]:
+    """File identity used to detect edits."""
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ParsedPatternCache:
+    """Thread-safe mapping of pattern file path to its parsed content."""
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._loaded_files = set()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, file_path: str, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+        """Return the parsed content if the file is unchanged since it was cached.
+
+        Args:
+            file_path: Path of the pattern file
+            stat: Current ``os.stat`` result of the file
+
+        Returns:
+            Optional[Dict[str, Any]]: Parsed pattern content or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(file_path)
+            if entry is not None and entry[0] == _signature(stat):
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, file_path: str, stat: os.stat_result, parsed: Dict[str, Any]) -> None:
+        """Cache parsed content for the file version described by stat."""
+        with self._lock:
+            self._entries[file_path] = (_signature(stat), parsed)
+
+    def clear(self) -> None:
+        """Forget all cached patterns."""
+        with self._lock:
+            self._entries.clear()
+            self._loaded_files.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def load(self, cache_file: str) -> int:
+        """Merge a persisted cache file into memory (once per file and process).
+
+        Stale entries are harmless: they are validated against the pattern
+        file's mtime and size on use.
+
+        Args:
+            cache_file: Path of the pickle written by save()
+
+        Returns:
+            int: Number of entries loaded
+        """
+        cache_file = os.path.expanduser(cache_file)
+        with self._lock:
+            if cache_file in self._loaded_files:
+                return 0
+            self._loaded_files.add(cache_file)
+
+        try:
+            with open(cache_file, 'rb') as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return 0
+        except Exception as e:  # Corrupt or incompatible cache, rebuilt on next save
+            logger.debug("Ignoring unreadable pattern cache %s: %s", cache_file, str(e))
+            return 0
+
+        if not isinstance(data, dict) or data.get('version') != COMPILED_CACHE_VERSION:
+            return 0
+
+        entries = data.get('entries', {})
+        with self._lock:
+            for file_path, entry in entries.items():
+                self._entries.setdefault(file_path, entry)
+        return len(entries)
+
+    def save(self, cache_file: str) -> bool:
+        """Persist all cached patterns to cache_file atomically.
+
+        Args:
+            cache_file: Destination path of the pickle
+
+        Returns:
+            bool: True if the cache was written
+        """
+        cache_file = os.path.expanduser(cache_file)
+        with self._lock:
+            data = {'version': COMPILED_CACHE_VERSION, 'entries': dict(self._entries)}
+
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+            return True
+        except Exception as e:
+            logger.debug("Could not write pattern cache %s: %s", cache_file, str(e))
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+            return False
+
+
+# Shared by every PatternManager in the process
+parsed_pattern_cache = ParsedPatternCache()
+
+
+def get_compiled_cache_path(config: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """Return the persisted cache path if the compiled cache is enabled.
+
+    Args:
+        config: Optional configuration dict
+
+    Returns:
+        Optional[str]: Expanded cache file path or None when disabled
+    """
+    patterns_config = (config or {}).get('patterns') or {}
+    if not isinstance(patterns_config, dict) or not patterns_config.get('compiled_cache'):
+        return None
+    return os.path.expanduser(patterns_config.get('compiled_cache_path') or DEFAULT_COMPILED_CACHE_PATH)
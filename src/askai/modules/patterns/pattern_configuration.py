@@ -43,6 +43,7 @@ class ModelConfiguration:
     web_plugin: bool = False
     web_max_results: int = 5
     web_search_prompt: Optional[str] = None
+    image_processing: Optional[Dict[str, Any]] = None  # Overrides of the image_processing config block
 
     def __post_init__(self):
         """Convert provider to ModelProvider enum if it's a string."""
@@ -77,7 +78,8 @@ class ModelConfiguration:
             web_search_context=data.get('web_search_context', 'medium'),
             web_plugin=data.get('web_plugin', False),
             web_max_results=data.get('web_max_results', 5),
-            web_search_prompt=data.get('web_search_prompt')
+            web_search_prompt=data.get('web_search_prompt'),
+            image_processing=data.get('image_processing')
         )
 
     def get_web_search_options(self):
@@ -148,6 +150,7 @@ class PatternConfiguration:
     format_instructions: Optional[str] = None  # Custom formatting instructions for the AI
     example_conversation: Optional[List[Dict[str, str]]] = None  # Example interactions
     max_context_length: Optional[int] = None  # Maximum context length to maintain
+    map_reduce: Optional[Dict[str, Any]] = None  # Overrides of the map_reduce config block
 
     @classmethod
     def from_components(cls, purpose: PatternPurpose, functionality: PatternFunctionality,
@@ -169,5 +172,6 @@ class PatternConfiguration:
             model=model,
             format_instructions=format_instructions,
             example_conversation=example_conversation,
-            max_context_length=max_context_length
+            max_context_length=max_context_length,
+            map_reduce=(model_config or {}).get('map_reduce')
         )
@@ -0,0 +1,308 @@
+"""
+Persistent catalogue index of pattern files.
+
+Listing patterns used to open and read every pattern file on each call,
+which gets slow with several hundred private patterns and is repeated on
+every API request. The index keeps one summary entry per pattern file
+(id, name, purpose, functionality, input/output types, model, source) and
+updates incrementally: a file is only parsed again when its mtime or size
+changed. Entries are persisted as JSON so new processes start warm.
+
+Full-text search over names, purposes and functionality uses an inverted
+index with prefix matching, and results can be paged.
+
+The index location can be configured in the ``patterns`` config block:
+
+    patterns:
+      index_path: "~/.askai/pattern_index.json"   # "" keeps it in memory only
+"""
+
+import bisect
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = "~/.askai/pattern_index.json"
+
+# Bump when the structure of index entries changes
+INDEX_VERSION = 1
+
+_TOKEN_RE = re.compile(r"\w+")
+
+_indexes: Dict[Optional[str], "PatternIndex"] = {}
+_indexes_lock = threading.Lock()
+
+
+def _enum_value(value: Any) -> Any:
+    return value.value if hasattr(value, 'value') else value
+
+
+def _tokenize(text: str) -> Set[str]:
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+def summarize_input(input_obj: Any) -> Dict[str, Any]:
+    """Convert a PatternInput into a JSON-serializable summary."""
+    if isinstance(input_obj, dict):
+        return input_obj
+    return {
+        'name': input_obj.name,
+        'description': input_obj.description,
+        'type': _enum_value(input_obj.input_type),
+        'required': input_obj.required,
+        'default': input_obj.default,
+        'options': input_obj.options,
+        'min_value': input_obj.min_value,
+        'max_value': input_obj.max_value,
+        'group': input_obj.group
+    }
+
+
+def summarize_output(output_obj: Any) -> Dict[str, Any]:
+    """Convert a PatternOutput into a JSON-serializable summary."""
+    if isinstance(output_obj, dict):
+        return output_obj
+    return {
+        'name': output_obj.name,
+        'description': output_obj.description,
+        'type': _enum_value(output_obj.output_type),
+        'required': output_obj.required,
+        'example': output_obj.example,
+        'action': _enum_value(output_obj.action),
+        'write_to_file': output_obj.write_to_file,
+        'group': output_obj.group
+    }
+
+
+def build_index_entry(pattern_id: str, file_path: str, is_private: bool,
+                      parsed: Dict[str, Any]) -> Dict[str, Any]:
+    """Summarize parsed pattern content into an index entry.
+
+    Args:
+        pattern_id: Pattern identifier (file name without .md)
+        file_path: Path of the pattern file
+        is_private: Whether the file lives in the private patterns directory
+        parsed: Parsed pattern sections as returned by PatternManager
+
+    Returns:
+        Dict[str, Any]: Index entry
+    """
+    configuration = parsed.get('configuration')
+    purpose = getattr(configuration, 'purpose', None)
+    functionality = getattr(configuration, 'functionality', None)
+    model = getattr(configuration, 'model', None)
+
+    inputs = [summarize_input(input_obj) for input_obj in parsed.get('inputs', [])]
+    outputs = [summarize_output(output_obj) for output_obj in parsed.get('outputs', [])]
+
+    return {
+        'pattern_id': pattern_id,
+        'name': getattr(purpose, 'name', '') or pattern_id,
+        'file_path': file_path,
+        'is_private': is_private,
+        'source': 'private' if is_private else 'built-in',
+        'description': getattr(purpose, 'description', '') or '',
+        'functionality': list(getattr(functionality, 'features', None) or []),
+        'model': getattr(model, 'model_name', None),
+        'input_types': sorted({item['type'] for item in inputs if item.get('type')}),
+        'output_types': sorted({item['type'] for item in outputs if item.get('type')}),
+        'inputs': inputs,
+        'outputs': outputs,
+    }
+
+
+class PatternIndex:
+    """Incrementally maintained, searchable catalogue of pattern files."""
+
+    def __init__(self, index_path: Optional[str] = None):
+        """Initialize the index, loading persisted entries if available.
+
+        Args:
+            index_path: JSON file to persist the index to, or None for memory only
+        """
+        self.index_path = os.path.expanduser(index_path) if index_path else None
+        self._lock = threading.RLock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        self._vocabulary: List[str] = []
+        self._load()
+        self._rebuild_search()
+
+    def _load(self) -> None:
+        if not self.index_path:
+            return
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.debug("Ignoring unreadable pattern index %s: %s", self.index_path, str(e))
+            return
+        if isinstance(data, dict) and data.get('version') == INDEX_VERSION:
+            self._entries = data.get('entries', {})
+
+    def _save(self) -> None:
+        if not self.index_path:
+            return
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'entries': self._entries}, f, default=str)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.debug("Could not write pattern index %s: %s", self.index_path, str(e))
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _rebuild_search(self) -> None:
+        """Rebuild the inverted index from the current entries."""
+        postings: Dict[str, Set[str]] = {}
+        for file_path, entry in self._entries.items():
+            text = " ".join([
+                entry.get('pattern_id', ''), entry.get('name', ''),
+                entry.get('description', ''), " ".join(entry.get('functionality', []))
+            ])
+            for token in _tokenize(text):
+                postings.setdefault(token, set()).add(file_path)
+        self._postings = postings
+        self._vocabulary = sorted(postings)
+
+    def refresh(self, directories: Iterable[Tuple[str, bool]],
+                parse: Callable[[str], Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Bring the index up to date with the given directories.
+
+        Only new or changed files (by mtime and size) are parsed. Patterns in
+        earlier directories override patterns with the same id in later ones.
+
+        Args:
+            directories: (directory, is_private) pairs in priority order
+            parse: Callable returning parsed pattern sections for a file path
+
+        Returns:
+            List[Dict[str, Any]]: Visible entries sorted by name
+        """
+        visible: Dict[str, Dict[str, Any]] = {}
+        seen_paths = set()
+        changed = False
+
+        with self._lock:
+            for directory, is_private in directories:
+                try:
+                    with os.scandir(directory) as it:
+                        files = [entry for entry in it
+                                 if entry.name.endswith('.md') and not entry.name.startswith('_')]
+                except OSError:
+                    continue
+
+                for dir_entry in sorted(files, key=lambda item: item.name):
+                    pattern_id = dir_entry.name[:-len('.md')]
+                    file_path = dir_entry.path
+                    seen_paths.add(file_path)
+                    try:
+                        stat = dir_entry.stat()
+                    except OSError:
+                        continue
+
+                    entry = self._entries.get(file_path)
+                    if (entry is None or entry.get('mtime_ns') != stat.st_mtime_ns
+                            or entry.get('size') != stat.st_size
+                            or entry.get('is_private') != is_private):
+                        try:
+                            entry = build_index_entry(pattern_id, file_path, is_private, parse(file_path))
+                        except Exception as e:
+                            logger.warning("Error indexing pattern file %s: %s", file_path, str(e))
+                            self._entries.pop(file_path, None)
+                            continue
+                        entry['mtime_ns'] = stat.st_mtime_ns
+                        entry['size'] = stat.st_size
+                        self._entries[file_path] = entry
+                        changed = True
+
+                    # Private patterns (listed first) win over built-in ones
+                    visible.setdefault(pattern_id, entry)
+
+            # Forget deleted files that lived in the refreshed directories
+            refreshed_dirs = {os.path.abspath(directory) for directory, _ in directories}
+            for file_path in list(self._entries):
+                if (os.path.dirname(os.path.abspath(file_path)) in refreshed_dirs
+                        and file_path not in seen_paths):
+                    del self._entries[file_path]
+                    changed = True
+
+            if changed:
+                self._rebuild_search()
+                self._save()
+
+        return sorted(visible.values(), key=lambda entry: entry['name'])
+
+    def _match(self, query: str) -> Set[str]:
+        """Return file paths whose text contains every query token as a prefix."""
+        matches: Optional[Set[str]] = None
+        for token in _tokenize(query):
+            token_matches: Set[str] = set()
+            position = bisect.bisect_left(self._vocabulary, token)
+            while position < len(self._vocabulary) and self._vocabulary[position].startswith(token):
+                token_matches |= self._postings[self._vocabulary[position]]
+                position += 1
+            matches = token_matches if matches is None else matches & token_matches
+            if not matches:
+                return set()
+        return matches or set()
+
+    def search(self, entries: List[Dict[str, Any]], query: Optional[str] = None,
+               page: int = 1, page_size: Optional[int] = None) -> Dict[str, Any]:
+        """Filter entries by a full-text query and return one page.
+
+        Args:
+            entries: Visible entries as returned by refresh()
+            query: Optional search text; every word must prefix-match the
+                pattern id, name, purpose or functionality
+            page: One-based page number
+            page_size: Entries per page, or None for all
+
+        Returns:
+            dict: patterns, total, page and page_size
+        """
+        if query and query.strip():
+            with self._lock:
+                matches = self._match(query)
+            entries = [entry for entry in entries if entry['file_path'] in matches]
+
+        total = len(entries)
+        page = max(1, int(page))
+        if page_size:
+            start = (page - 1) * int(page_size)
+            entries = entries[start:start + int(page_size)]
+
+        return {'patterns': entries, 'total': total, 'page': page, 'page_size': page_size}
+
+
+def get_pattern_index(config: Optional[Dict[str, Any]] = None) -> PatternIndex:
+    """Return the process-wide pattern index for the configured location.
+
+    Args:
+        config: Optional configuration dict with a ``patterns`` block
+
+    Returns:
+        PatternIndex: Shared index instance
+    """
+    patterns_config = (config or {}).get('patterns') or {}
+    index_path = DEFAULT_INDEX_PATH
+    if isinstance(patterns_config, dict) and 'index_path' in patterns_config:
+        index_path = patterns_config.get('index_path') or None
+
+    with _indexes_lock:
+        index = _indexes.get(index_path)
+        if index is None:
+            index = PatternIndex(index_path)
+            _indexes[index_path] = index
+        return index
@@ -11,7 +11,9 @@ import os
 import logging
 from typing import List, Dict, Any, Optional, Union, Tuple
 import yaml
-from askai.shared.utils import print_error_or_warnings
+from askai.shared.utils import print_error_or_warnings, timed
+from .pattern_cache import get_compiled_cache_path, parsed_pattern_cache
+from .pattern_index import get_pattern_index
 from .pattern_inputs import PatternInput, InputGroup, InputType
 from .pattern_outputs import PatternOutput
 from .pattern_configuration import (
@@ -76,6 +78,14 @@ class PatternManager:
                             print("Continuing without private patterns directory.")
                         logger.warning("Private patterns directory not created: %s", expanded_path)
 
+        # Optional persisted parse cache for cold starts
+        self.compiled_cache_path = get_compiled_cache_path(config)
+        if self.compiled_cache_path:
+            parsed_pattern_cache.load(self.compiled_cache_path)
+
+        # Catalogue index used for listing and searching
+        self.pattern_index = get_pattern_index(config)
+
     def _get_pattern_directories(self) -> List[str]:
         """Get all pattern directories to search.
 
@@ -93,50 +103,39 @@ class PatternManager:
     def list_patterns(self) -> List[Dict[str, Any]]:
         """List all available pattern files from all directories.
 
+        Patterns are read from the shared pattern index, which only parses
+        files that are new or changed since the last listing.
+
         Returns:
             List[Dict[str, Any]]: List of pattern metadata
         """
-        patterns = []
-        seen_pattern_ids = set()
-
-        # Search all directories (private patterns first for priority)
-        for patterns_dir in self._get_pattern_directories():
-            if not os.path.exists(patterns_dir):
-                continue
-
-            for filename in os.listdir(patterns_dir):
-                if filename.endswith('.md') and not filename.startswith('_'):
-                    pattern_id = filename.removesuffix('.md')
-
-                    # Skip if we've already seen this pattern (private overrides built-in)
-                    if pattern_id in seen_pattern_ids:
-                        continue
-
-                    file_path = os.path.join(patterns_dir, filename)
-
-                    try:
-                        # Read first line of the file to get the pattern name
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            first_line = f.readline().strip()
-                            name = first_line.replace('# Pattern:', '').strip()
-
-                        # Determine if this is a private or built-in pattern
-                        is_private = patterns_dir == self.private_patterns_dir
-
-                        patterns.append({
-                            'pattern_id': pattern_id,
-                            'name': name,
-                            'file_path': file_path,
-                            'is_private': is_private,
-                            'source': 'private' if is_private else 'built-in'
-                        })
+        directories = [
+            (patterns_dir, patterns_dir == self.private_patterns_dir)
+            for patterns_dir in self._get_pattern_directories()
+        ]
+        parsed_before = parsed_pattern_cache.misses
+        patterns = self.pattern_index.refresh(
+            directories, lambda file_path: self._load_parsed_pattern(file_path, persist=False)
+        )
+        if self.compiled_cache_path and parsed_pattern_cache.misses != parsed_before:
+            parsed_pattern_cache.save(self.compiled_cache_path)
+        return patterns
 
-                        seen_pattern_ids.add(pattern_id)
+    def search_patterns(self, query: Optional[str] = None, page: int = 1,
+                        page_size: Optional[int] = None) -> Dict[str, Any]:
+        """Search patterns by name, purpose and functionality.
 
-                    except Exception as e:
-                        logger.warning("Error reading pattern file %s: %s", file_path, str(e))
+        Args:
+            query: Search text; every word must match the start of a word in
+                the pattern id, name, purpose or functionality
+            page: One-based page number
+            page_size: Patterns per page, or None for all matches
 
-        return sorted(patterns, key=lambda x: x['name'])
+        Returns:
+            Dict[str, Any]: 'patterns' for the requested page, 'total' matches,
+            'page' and 'page_size'
+        """
+        return self.pattern_index.search(self.list_patterns(), query, page, page_size)
 
     def _parse_pattern_inputs(self, content: str) -> Tuple[List[PatternInput], List[InputGroup]]:
         """Parse pattern inputs and input groups from markdown content.
@@ -371,9 +370,10 @@ class PatternManager:
             # Parse the YAML content
             config_data = yaml.safe_load(yaml_content)
 
-            # Get just the model configuration part
-            if isinstance(config_data, dict) and 'model' in config_data:
-                return {'model': config_data['model']}
+            # Get just the model and map-reduce configuration parts
+            if isinstance(config_data, dict):
+                parsed = {key: config_data[key] for key in ('model', 'map_reduce') if key in config_data}
+                return parsed or None
 
             return None
         except Exception as e:
@@ -437,9 +437,13 @@ class PatternManager:
 
         return "\n\n".join(sections)
 
+    @timed("patterns.load")
     def get_pattern_content(self, pattern_id: str) -> Optional[Dict[str, Any]]:
         """Get the content and metadata of a specific pattern file.
 
+        Parsed patterns are cached per process and re-parsed only when the
+        file's mtime or size changes.
+
         Args:
             pattern_id: The pattern identifier (filename without .md)
 
@@ -451,23 +455,13 @@ class PatternManager:
             file_path = os.path.join(patterns_dir, f"{pattern_id}.md")
             if os.path.exists(file_path):
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-
-                    inputs, input_groups = self._parse_pattern_inputs(content)
-                    outputs = self._parse_pattern_outputs(content)
-                    execution_config = self._parse_pattern_execution(content)
+                    parsed = self._load_parsed_pattern(file_path)
 
                     # Determine if this is a private pattern
                     is_private = patterns_dir == self.private_patterns_dir
 
                     return {
-                        'prompt_content': self._parse_pattern_prompt(content),
-                        'inputs': inputs,
-                        'input_groups': input_groups,
-                        'outputs': outputs,
-                        'configuration': self._parse_pattern_configuration(content),
-                        'execution': execution_config,
+                        **parsed,
                         'pattern_id': pattern_id,
                         'file_path': file_path,
                         'is_private': is_private,
@@ -479,6 +473,56 @@ class PatternManager:
 
         return None
 
+    def _load_parsed_pattern(self, file_path: str, persist: bool = True) -> Dict[str, Any]:
+        """Return the parsed sections of a pattern file, using the shared cache.
+
+        Args:
+            file_path: Path of the pattern markdown file
+            persist: Whether to save the compiled cache after a fresh parse
+
+        Returns:
+            Dict[str, Any]: Parsed prompt, inputs, outputs, configuration and execution
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            stat = None
+
+        if stat is not None:
+            parsed = parsed_pattern_cache.get(file_path, stat)
+            if parsed is not None:
+                return parsed
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        parsed = self._parse_pattern_file(content)
+
+        if stat is not None:
+            parsed_pattern_cache.put(file_path, stat, parsed)
+            if persist and self.compiled_cache_path:
+                parsed_pattern_cache.save(self.compiled_cache_path)
+        return parsed
+
+    @timed("patterns.parse")
+    def _parse_pattern_file(self, content: str) -> Dict[str, Any]:
+        """Parse all sections of a pattern file.
+
+        Args:
+            content: The markdown content to parse
+
+        Returns:
+            Dict[str, Any]: Parsed prompt, inputs, outputs, configuration and execution
+        """
+        inputs, input_groups = self._parse_pattern_inputs(content)
+        return {
+            'prompt_content': self._parse_pattern_prompt(content),
+            'inputs': inputs,
+            'input_groups': input_groups,
+            'outputs': self._parse_pattern_outputs(content),
+            'configuration': self._parse_pattern_configuration(content),
+            'execution': self._parse_pattern_execution(content),
+        }
+
     def _read_input_file(self, file_path: str) -> Optional[str]:
         """Read content from an input file.
 
@@ -497,18 +541,25 @@ class PatternManager:
 
     def process_pattern_inputs(self, pattern_id: str,
                             input_values: Optional[Dict[str, Any]] = None,
-                            interactive: bool = True) -> Optional[Dict[str, Any]]:
+                            interactive: bool = True,
+                            pattern_data: Optional[Dict[str, Any]] = None,
+                            read_files: bool = True) -> Optional[Dict[str, Any]]:
         """Process pattern inputs from JSON values or interactive input.
 
         Args:
             pattern_id: The pattern identifier
             input_values: Optional dictionary of input values (from -pi/--pattern-input)
             interactive: Whether to prompt for missing values
+            pattern_data: Optional already parsed pattern content to use
+                instead of reading the pattern file again
+            read_files: Whether prompted file inputs are replaced by the file
+                content; when False the path is kept so large files can be streamed
 
         Returns:
             Optional[Dict[str, Any]]: Processed input values or None if validation fails
         """
-        pattern_data = self.get_pattern_content(pattern_id)
+        if pattern_data is None:
+            pattern_data = self.get_pattern_content(pattern_id)
         if pattern_data is None:
             print_error_or_warnings(f"Pattern '{pattern_id}' does not exist")
             return None
@@ -608,7 +659,7 @@ class PatternManager:
 
                 # Now get values for each selected input
                 for selected_input in selections:
-                    self._get_input_value(selected_input, result)
+                    self._get_input_value(selected_input, result, read_files)
 
         # Handle remaining inputs that are not part of any group
         i = 0
@@ -645,7 +696,7 @@ class PatternManager:
                 continue
 
             # Interactive input for non-grouped inputs or in non-interactive mode
-            self._get_input_value(input_def, result)
+            self._get_input_value(input_def, result, read_files)
             i += 1
 
         # Validate group requirements
@@ -660,12 +711,14 @@ class PatternManager:
 
         return result
 
-    def _get_input_value(self, input_def: PatternInput, result: Dict[str, Any]) -> None:
+    def _get_input_value(self, input_def: PatternInput, result: Dict[str, Any],
+                         read_files: bool = True) -> None:
         """Get and validate a value for a specific input.
 
         Args:
             input_def: The input definition
             result: Dictionary to store the result in
+            read_files: Whether file inputs are replaced by the file content
         """
         while True:
             print(f"\n{input_def.description}")
@@ -690,7 +743,7 @@ class PatternManager:
                 continue
 
             # For FILE type inputs, read the file content after validation
-            if input_def.input_type == InputType.FILE:
+            if input_def.input_type == InputType.FILE and read_files:
                 content = self._read_input_file(value)
                 if content is None:
                     continue
@@ -761,7 +814,8 @@ class PatternManager:
                 print("Please enter a valid number or 'q' to quit")
 
     def process_pattern_response(
-        self, pattern_id: str, response: Union[str, Dict], output_handler
+        self, pattern_id: str, response: Union[str, Dict], output_handler,
+        pattern_data: Optional[Dict[str, Any]] = None
     ) -> Tuple[str, List[str]]:
         """Process a response for a specific pattern.
 
@@ -772,13 +826,15 @@ class PatternManager:
             pattern_id: ID of the pattern
             response: Response from the AI service
             output_handler: Instance of OutputCoordinator
+            pattern_data: Optional already parsed pattern content
 
         Returns:
             Tuple[str, List[str]]: (formatted output, list of created files)
         """
         logger.debug("Processing pattern response for %s", pattern_id)
 
-        pattern_data = self.get_pattern_content(pattern_id)
+        if pattern_data is None:
+            pattern_data = self.get_pattern_content(pattern_id)
         if not pattern_data:
             logger.warning("Pattern %s not found", pattern_id)
             return "Pattern not found", []
@@ -6,5 +6,7 @@ Handles standalone question processing and formatting.
 # Import main classes
 from .models import QuestionContext, QuestionResponse
 from .processor import QuestionProcessor
+from .batch import BatchQuestionProcessor, BatchPatternProcessor, DEFAULT_BATCH_CONCURRENCY
 
-__all__ = ['QuestionContext', 'QuestionResponse', 'QuestionProcessor']
+__all__ = ['QuestionContext', 'QuestionResponse', 'QuestionProcessor', 'BatchQuestionProcessor',
+           'BatchPatternProcessor', 'DEFAULT_BATCH_CONCURRENCY']
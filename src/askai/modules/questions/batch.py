@@ -0,0 +1,419 @@
+"""
+Batch processing for the AskAI CLI.
+Runs many questions from a JSONL file, or one pattern over a directory of
+input files, concurrently on a bounded worker pool.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, IO, Iterable, List, Optional, Tuple
+
+from askai.infrastructure.output.output_coordinator import OutputCoordinator
+from askai.modules.ai import AIService
+from askai.modules.messaging import MessageBuilder
+from askai.modules.patterns import InputType
+from .map_reduce import MapReduceProcessor, PatternJob, exceeds_chunk
+from .models import QuestionContext
+from .pool import run_bounded
+
+DEFAULT_BATCH_CONCURRENCY = 4
+
+# Fields of QuestionContext that may be given per JSONL line
+BATCH_ITEM_FIELDS = ("question", "file_input", "url", "image", "pdf", "image_url", "pdf_url", "model")
+
+# Pattern input types a directory file can be bound to
+BATCH_FILE_INPUT_TYPES = (InputType.FILE, InputType.IMAGE_FILE, InputType.PDF_FILE)
+
+BATCH_MANIFEST_FILENAME = "manifest.json"
+BATCH_RESPONSE_FILENAME = "response.md"
+
+
+class BatchQuestionProcessor:
+    """Processes a stream of JSONL question items concurrently."""
+
+    def __init__(self, config: dict, logger, debug: bool = False):
+        """Initialize the batch processor.
+
+        Args:
+            config: Configuration dictionary
+            logger: Logger instance
+            debug: Whether to enable debug logging for API calls
+        """
+        self.config = config
+        self.logger = logger
+        self.debug = debug
+
+        # Both are stateless per request and shared by all workers
+        self.message_builder = MessageBuilder(None, logger, config)
+        self.ai_service = AIService(logger)
+        self._write_lock = threading.Lock()
+
+    def process_batch(self, input_stream: Iterable[str], output_stream: IO[str],
+                      concurrency: int = DEFAULT_BATCH_CONCURRENCY) -> Dict[str, Any]:
+        """Process every JSONL line and write one JSONL result per item.
+
+        Results are written in completion order, tagged with the zero-based
+        line index of their input.
+
+        Args:
+            input_stream: Iterable of JSONL lines (blank lines are skipped)
+            output_stream: Writable text stream for JSONL results
+            concurrency: Maximum number of requests in flight
+
+        Returns:
+            dict: Summary with total, succeeded, failed and elapsed_seconds
+        """
+        concurrency = max(1, int(concurrency))
+        summary = {"total": 0, "succeeded": 0, "failed": 0}
+        started = time.perf_counter()
+
+        self.logger.info(json.dumps({
+            "log_message": "Batch processing started",
+            "concurrency": concurrency
+        }))
+
+        def items():
+            for index, line in enumerate(input_stream):
+                if not line.strip():
+                    continue
+                summary["total"] += 1
+                yield index, line
+
+        run_bounded(
+            items(), self._process_line, concurrency,
+            functools.partial(self._write_result, output_stream=output_stream, summary=summary)
+        )
+
+        summary["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+        self.logger.info(json.dumps({"log_message": "Batch processing finished", **summary}))
+        return summary
+
+    def _write_result(self, result: Dict[str, Any], output_stream: IO[str], summary: Dict[str, Any]) -> None:
+        """Write a finished result as JSONL and update the summary counters."""
+        summary["succeeded" if result["status"] == "ok" else "failed"] += 1
+        with self._write_lock:
+            output_stream.write(json.dumps(result, ensure_ascii=False) + "\n")
+            output_stream.flush()
+
+    def _process_line(self, index: int, line: str) -> Dict[str, Any]:
+        """Process one JSONL line, never raising."""
+        started = time.perf_counter()
+        result: Dict[str, Any] = {"index": index, "status": "ok"}
+
+        try:
+            context = self._create_item_context(json.loads(line))
+            content, response_meta = self._ask(context)
+            result.update(content=content, **response_meta)
+            if response_meta.get("error"):
+                result["status"] = "error"
+        except Exception as e:  # Each item reports its own failure
+            self.logger.error(json.dumps({
+                "log_message": "Batch item failed",
+                "index": index,
+                "error": str(e)
+            }))
+            result.update(status="error", error=str(e))
+
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+    def _create_item_context(self, item: Any) -> QuestionContext:
+        """Create a question context from a decoded JSONL item.
+
+        Args:
+            item: Decoded JSON object
+
+        Returns:
+            QuestionContext: Question processing context
+
+        Raises:
+            ValueError: If the item is not an object or has nothing to ask
+        """
+        if not isinstance(item, dict):
+            raise ValueError("Batch item must be a JSON object")
+
+        values = {field: item.get(field) for field in BATCH_ITEM_FIELDS}
+        if not any(values[field] for field in ("question", "url", "image", "pdf", "image_url", "pdf_url")):
+            raise ValueError("Batch item needs a question, url, image or pdf")
+
+        response_format = item.get("format", item.get("response_format", "rawtext"))
+        if response_format not in ("rawtext", "json", "md"):
+            raise ValueError(f"Invalid format: {response_format}")
+
+        return QuestionContext(response_format=response_format, **values)
+
+    def _ask(self, context: QuestionContext) -> Tuple[str, Dict[str, Any]]:
+        """Build messages for a context and request the completion."""
+        messages, _ = self.message_builder.build_messages(
+            question=context.question,
+            file_input=context.file_input,
+            pattern_id=None,
+            pattern_input=None,
+            response_format=context.response_format,
+            url=context.url,
+            image=context.image,
+            pdf=context.pdf,
+            image_url=context.image_url,
+            pdf_url=context.pdf_url,
+            use_piped_input=False
+        )
+        if not messages:
+            raise ValueError("No messages could be built for this item")
+
+        response = self.ai_service.get_ai_response(
+            messages=messages,
+            model_name=context.model,
+            debug=self.debug,
+            enable_url_search=context.url is not None,
+            show_spinner=False
+        )
+
+        full_response = response.get("full_response") or {}
+        meta = {
+            "model": full_response.get("model", context.model),
+            "usage": full_response.get("usage"),
+        }
+        if full_response.get("error"):
+            meta["error"] = full_response["error"]
+        return response.get("content", ""), meta
+
+
+class BatchPatternProcessor:
+    """Runs one pattern over every file in a directory concurrently."""
+
+    def __init__(self, pattern_manager, logger, debug: bool = False,
+                 config: Optional[Dict[str, Any]] = None,
+                 map_reduce_overrides: Optional[Dict[str, Any]] = None):
+        """Initialize the batch pattern processor.
+
+        Args:
+            pattern_manager: PatternManager used to look up the pattern
+            logger: Logger instance
+            debug: Whether to enable debug logging for API calls
+            config: Optional configuration dict (enables the attachment cache and
+                map-reduce settings)
+            map_reduce_overrides: Optional map-reduce settings from the CLI
+        """
+        self.pattern_manager = pattern_manager
+        self.logger = logger
+        self.debug = debug
+
+        self.message_builder = MessageBuilder(pattern_manager, logger, config)
+        self.ai_service = AIService(logger)
+        self.map_reduce = MapReduceProcessor(self.message_builder, self.ai_service, logger, config,
+                                             debug=debug, show_spinner=False,
+                                             overrides=map_reduce_overrides)
+
+    def process_directory(self, pattern_id: str, input_dir: str, output_dir: str,
+                          pattern_input: Optional[Dict[str, Any]] = None,
+                          concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+                          model_name: Optional[str] = None) -> Dict[str, Any]:
+        """Execute a pattern once per file in input_dir.
+
+        The pattern is parsed once. Each file is bound to the pattern's first
+        file-type input; pattern_input supplies the remaining inputs. Every
+        file gets its own subfolder of output_dir holding the raw response
+        and any files the pattern writes. Command outputs are never executed
+        in batch mode. A manifest with per-file timing and token usage is
+        written to output_dir.
+
+        Args:
+            pattern_id: ID of the pattern to execute
+            input_dir: Directory whose regular files are the inputs
+            output_dir: Directory for per-file output subfolders and the manifest
+            pattern_input: Optional values for the other pattern inputs
+            concurrency: Maximum number of requests in flight
+            model_name: Optional model override (pattern model configuration wins)
+
+        Returns:
+            dict: The manifest that was written to output_dir
+
+        Raises:
+            ValueError: If the pattern does not exist, has no file input,
+                or input_dir is not a directory
+        """
+        pattern_data = self.pattern_manager.get_pattern_content(pattern_id)
+        if pattern_data is None:
+            raise ValueError(f"Pattern '{pattern_id}' does not exist")
+
+        file_input = next((input_def for input_def in pattern_data.get('inputs', [])
+                           if input_def.input_type in BATCH_FILE_INPUT_TYPES), None)
+        if file_input is None:
+            raise ValueError(f"Pattern '{pattern_id}' has no file input to run over a directory")
+
+        if not os.path.isdir(input_dir):
+            raise ValueError(f"Not a directory: {input_dir}")
+
+        concurrency = max(1, int(concurrency))
+        os.makedirs(output_dir, exist_ok=True)
+        job = {
+            "pattern_id": pattern_id,
+            "pattern_data": pattern_data,
+            "file_input": file_input,
+            "pattern_input": dict(pattern_input or {}),
+            "model_name": model_name,
+            "map_reduce": self.map_reduce.settings_for(pattern_data),
+        }
+        files = self._list_input_files(input_dir)
+        manifest: Dict[str, Any] = {
+            "pattern_id": pattern_id,
+            "input_dir": os.path.abspath(input_dir),
+            "output_dir": os.path.abspath(output_dir),
+            "file_input": file_input.name,
+            "concurrency": concurrency,
+            "total": len(files),
+            "succeeded": 0,
+            "failed": 0,
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            "files": [],
+        }
+        started = time.perf_counter()
+
+        self.logger.info(json.dumps({
+            "log_message": "Batch pattern processing started",
+            "pattern": pattern_id,
+            "files": len(files),
+            "concurrency": concurrency
+        }))
+
+        items = ((path, os.path.join(output_dir, name)) for path, name in files)
+        run_bounded(
+            items, functools.partial(self._process_file, job), concurrency,
+            functools.partial(self._record_result, manifest=manifest)
+        )
+
+        manifest["files"].sort(key=lambda entry: entry["file"])
+        manifest["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+
+        with open(os.path.join(output_dir, BATCH_MANIFEST_FILENAME), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+        self.logger.info(json.dumps({
+            "log_message": "Batch pattern processing finished",
+            "pattern": pattern_id,
+            "succeeded": manifest["succeeded"],
+            "failed": manifest["failed"],
+            "elapsed_seconds": manifest["elapsed_seconds"]
+        }))
+        return manifest
+
+    @staticmethod
+    def _list_input_files(input_dir: str) -> List[Tuple[str, str]]:
+        """List visible regular files with a unique output subfolder name each."""
+        files = []
+        # Reserve the manifest's name so no output subfolder can shadow it
+        used_names = {BATCH_MANIFEST_FILENAME}
+        for filename in sorted(os.listdir(input_dir)):
+            path = os.path.join(input_dir, filename)
+            if filename.startswith('.') or not os.path.isfile(path):
+                continue
+
+            # Prefer the stem; fall back to the full name, then a numeric suffix, when names collide
+            name = os.path.splitext(filename)[0] or filename
+            if name in used_names:
+                name = filename.replace('.', '_')
+            base, suffix = name, 2
+            while name in used_names:
+                name = f"{base}_{suffix}"
+                suffix += 1
+            used_names.add(name)
+            files.append((path, name))
+        return files
+
+    @staticmethod
+    def _record_result(result: Dict[str, Any], manifest: Dict[str, Any]) -> None:
+        """Add a finished file result to the manifest counters."""
+        manifest["succeeded" if result["status"] == "ok" else "failed"] += 1
+        for key, value in (result.get("usage") or {}).items():
+            if key in manifest["usage"] and isinstance(value, (int, float)):
+                manifest["usage"][key] += value
+        manifest["files"].append(result)
+
+    def _process_file(self, job: Dict[str, Any], path: str, file_output_dir: str) -> Dict[str, Any]:
+        """Run the pattern on one file, never raising."""
+        started = time.perf_counter()
+        result: Dict[str, Any] = {
+            "file": os.path.basename(path),
+            "output_dir": file_output_dir,
+            "status": "ok",
+            "created_files": [],
+        }
+
+        try:
+            response = self._execute(job, path)
+            full_response = response.get("full_response") or {}
+            result.update(model=full_response.get("model"), usage=full_response.get("usage"))
+            if full_response.get("error"):
+                raise ValueError(full_response["error"])
+
+            result["created_files"] = self._write_outputs(job, response, file_output_dir)
+        except Exception as e:  # Each file reports its own failure
+            self.logger.error(json.dumps({
+                "log_message": "Batch pattern file failed",
+                "file": path,
+                "error": str(e)
+            }))
+            result.update(status="error", error=str(e))
+
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return result
+
+    def _execute(self, job: Dict[str, Any], path: str) -> Dict[str, Any]:
+        """Bind the file to the pattern's file input and request the completion."""
+        file_input = job["file_input"]
+        inputs = dict(job["pattern_input"])
+        settings = job["map_reduce"]
+        if file_input.input_type == InputType.FILE and settings["enabled"] and exceeds_chunk(path, settings):
+            # Streamed in chunks instead of being read whole
+            return self.map_reduce.process_pattern(
+                PatternJob(job["pattern_id"], job["pattern_data"], inputs, settings, file_input.name, path),
+                self.pattern_manager, job["model_name"]
+            )
+        if file_input.input_type == InputType.FILE:
+            # Text file inputs carry the content, like interactive input does
+            with open(path, 'r', encoding='utf-8') as f:
+                inputs[file_input.name] = f.read().strip()
+        else:
+            inputs[file_input.name] = path
+
+        messages, _ = self.message_builder.build_messages(
+            pattern_id=job["pattern_id"],
+            pattern_input=inputs,
+            use_piped_input=False,
+            pattern_data=job["pattern_data"],
+            interactive=False
+        )
+        if not messages:
+            raise ValueError("Pattern inputs are invalid for this file")
+
+        return self.ai_service.get_ai_response(
+            messages=messages,
+            model_name=job["model_name"],
+            pattern_id=job["pattern_id"],
+            debug=self.debug,
+            pattern_manager=self.pattern_manager,
+            show_spinner=False,
+            pattern_data=job["pattern_data"]
+        )
+
+    @staticmethod
+    def _write_outputs(job: Dict[str, Any], response: Dict[str, Any], file_output_dir: str) -> List[str]:
+        """Write the raw response and the pattern's file outputs to the subfolder."""
+        os.makedirs(file_output_dir, exist_ok=True)
+        response_path = os.path.join(file_output_dir, BATCH_RESPONSE_FILENAME)
+        with open(response_path, 'w', encoding='utf-8') as f:
+            f.write(response.get("content") or "")
+
+        pattern_data = job["pattern_data"]
+        output_handler = OutputCoordinator(output_dir=file_output_dir)
+        _, created_files = output_handler.process_output(
+            response=response,
+            output_config={'pattern_id': job["pattern_id"], 'execution': pattern_data.get('execution', {})},
+            console_output=False,
+            file_output=True,
+            pattern_outputs=pattern_data.get('outputs', [])
+        )
+        return [response_path] + list(created_files or [])
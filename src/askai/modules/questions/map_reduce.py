@@ -0,0 +1,499 @@
+"""
+Map-reduce execution of questions and patterns over oversized text inputs.
+
+A text input larger than one chunk (``-fi``, piped stdin or a pattern
+``file`` input) is streamed in token-bounded chunks instead of being inlined
+whole. The question or pattern runs on every chunk concurrently (map) and a
+final request combines the partial answers (reduce). Partial answers that do
+not fit one request together are first combined in groups.
+
+Configured by the optional ``map_reduce`` block. Patterns can override it
+with a ``map_reduce`` block in their ``## Model Configuration`` YAML, and
+``--map-reduce`` / ``--chunk-tokens`` override both:
+
+    map_reduce:
+      enabled: false          # Split inputs larger than one chunk
+      chunk_tokens: 12000     # Estimated tokens per chunk
+      concurrency: 4          # Chunk requests in flight
+      max_chunks: 200         # Refuse inputs that need more chunks
+"""
+
+import functools
+import itertools
+import json
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from askai.modules.patterns import InputType
+from askai.shared.utils import estimate_tokens, iter_token_chunks, tqdm_spinner
+from .pool import run_bounded
+
+DEFAULT_MAP_REDUCE_SETTINGS: Dict[str, Any] = {
+    "enabled": False,
+    "chunk_tokens": 12000,
+    "concurrency": 4,
+    "max_chunks": 200,
+}
+
+MAP_INSTRUCTION = (
+    "The input is too large for one request, so it was split into parts that are processed "
+    "separately. This is part {part}. Answer the request for this part only; the partial "
+    "answers are combined afterwards."
+)
+
+REDUCE_INSTRUCTION = (
+    "The input was too large for one request, so it was split into {parts} parts and the request "
+    "was answered for each part separately. Combine the partial answers into one complete answer "
+    "to the original request, as if the whole input had been processed at once. Merge duplicate "
+    "findings and keep every distinct one."
+)
+
+# Builds the messages of one request from an input text and an optional instruction
+MessagesFactory = Callable[[str, Optional[str]], List[Dict[str, Any]]]
+
+
+def get_map_reduce_settings(config: Optional[Dict[str, Any]] = None,
+                            overrides: Optional[List[Optional[Dict[str, Any]]]] = None) -> Dict[str, Any]:
+    """Merge the ``map_reduce`` config block and overrides with the defaults.
+
+    Args:
+        config: Optional configuration dict
+        overrides: Optional override blocks (pattern configuration, CLI flags),
+            later ones winning
+
+    Returns:
+        dict: Effective map-reduce settings
+    """
+    settings = dict(DEFAULT_MAP_REDUCE_SETTINGS)
+    for block in [(config or {}).get("map_reduce")] + list(overrides or []):
+        if isinstance(block, dict):
+            for key in DEFAULT_MAP_REDUCE_SETTINGS:
+                if block.get(key) is not None:
+                    settings[key] = block[key]
+    return settings
+
+
+def get_cli_overrides(args) -> Dict[str, Any]:
+    """Return the map-reduce settings given by --map-reduce and --chunk-tokens."""
+    overrides: Dict[str, Any] = {}
+    if getattr(args, 'map_reduce', False) is True:
+        overrides["enabled"] = True
+    if isinstance(getattr(args, 'chunk_tokens', None), int):
+        overrides["chunk_tokens"] = args.chunk_tokens
+    return overrides
+
+
+def _count_chunks(file_path: str, settings: Dict[str, Any], limit: int) -> int:
+    """Count the chunks iter_token_chunks() makes of a file, reading no further than limit + 1 chunks."""
+    with open_text_input(file_path) as stream:
+        chunks = iter_token_chunks(stream, int(settings["chunk_tokens"]))
+        return sum(1 for _ in itertools.islice(chunks, limit + 1))
+
+
+def exceeds_chunk(file_path: str, settings: Dict[str, Any]) -> bool:
+    """Return whether a file is larger than one chunk."""
+    try:
+        # Every estimated token takes at least one byte, so small files are answered by their size
+        if os.path.getsize(file_path) <= int(settings["chunk_tokens"]):
+            return False
+        return _count_chunks(file_path, settings, limit=1) > 1
+    except OSError:
+        return False
+
+
+def check_chunk_limit(file_path: str, settings: Dict[str, Any]) -> None:
+    """Refuse a file before any request is sent if it needs more than max_chunks chunks.
+
+    Raises:
+        ValueError: If the file splits into more than max_chunks chunks
+    """
+    max_chunks = int(settings["max_chunks"])
+    if _count_chunks(file_path, settings, limit=max_chunks) > max_chunks:
+        raise ValueError(
+            f"{file_path} needs more than {max_chunks} chunks of {settings['chunk_tokens']} tokens "
+            f"(map_reduce.max_chunks); raise it or --chunk-tokens"
+        )
+
+
+def open_text_input(file_path: str):
+    """Open a text input for streaming; undecodable bytes are replaced, as logs often contain some."""
+    return open(file_path, 'r', encoding='utf-8', errors='replace')
+
+
+@dataclass
+class PatternJob:
+    """A pattern run whose inputs were collected before choosing how to execute it."""
+    pattern_id: str
+    pattern_data: Dict[str, Any]
+    pattern_input: Optional[Dict[str, Any]]
+    settings: Dict[str, Any]
+    chunked_input: Optional[str] = None  # Name of the file input to split, if any
+    chunked_path: Optional[str] = None
+
+
+class MapReduceProcessor:
+    """Runs requests over chunked inputs and combines the partial answers."""
+
+    def __init__(self, message_builder, ai_service, logger, config: Optional[Dict[str, Any]] = None,
+                 debug: bool = False, show_spinner: bool = True,
+                 overrides: Optional[Dict[str, Any]] = None):
+        """Initialize the map-reduce processor.
+
+        Args:
+            message_builder: MessageBuilder used for every request
+            ai_service: AIService used for every request
+            logger: Logger instance
+            config: Optional configuration dict containing a ``map_reduce`` block
+            debug: Whether to enable debug logging for API calls
+            show_spinner: Whether to show the console spinner while chunks run
+            overrides: Optional settings that win over config and pattern
+                (e.g. ``{"enabled": True}`` from --map-reduce)
+        """
+        self.message_builder = message_builder
+        self.ai_service = ai_service
+        self.logger = logger
+        self.config = config
+        self.debug = debug
+        self.show_spinner = show_spinner
+        self.overrides = overrides or {}
+
+    def settings_for(self, pattern_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Return the effective settings, including the pattern's map_reduce block."""
+        configuration = (pattern_data or {}).get('configuration')
+        return get_map_reduce_settings(self.config, [getattr(configuration, 'map_reduce', None), self.overrides])
+
+    def process(self, chunks: Iterable[str], build_messages: MessagesFactory, settings: Dict[str, Any],
+                request: Optional[Dict[str, Any]] = None, on_delta=None,
+                finalize: Optional[Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]] = None
+                ) -> Dict[str, Any]:
+        """Answer a request over chunked input.
+
+        A single chunk is sent as one ordinary request. Otherwise every chunk
+        is mapped concurrently and the partial answers are reduced.
+
+        Args:
+            chunks: Iterable of input chunks (consumed lazily)
+            build_messages: Callable(text, instruction) returning the request messages
+            settings: Effective map-reduce settings
+            request: Extra keyword arguments for AIService.get_ai_response
+            on_delta: Optional delta callback, used for the final request only
+            finalize: Optional callable applied to the final request's messages
+                (e.g. to add chat history)
+
+        Returns:
+            dict: The final response; its usage covers all requests
+
+        Raises:
+            ValueError: If the input needs more than max_chunks chunks or every chunk failed
+        """
+        request = dict(request or {})
+        chunk_iter = iter(chunks)
+        head = list(itertools.islice(chunk_iter, 2))
+        if len(head) < 2:
+            messages = build_messages(head[0] if head else "", None)
+            return self._request(finalize(messages) if finalize else messages, request, on_delta)
+
+        usage_totals: Dict[str, Any] = {}
+        partials = self._map(itertools.chain(head, chunk_iter), build_messages, settings, request, usage_totals)
+        parts = len(partials)
+        texts = self._combine_groups(partials, build_messages, settings, request, usage_totals)
+
+        messages = build_messages(self._join(texts), REDUCE_INSTRUCTION.format(parts=parts))
+        response = self._request(finalize(messages) if finalize else messages, request, on_delta)
+        full_response = response.get("full_response") or {}
+        self._add_usage(usage_totals, full_response.get("usage"))
+        summary = {"chunks": parts, "failed": sum(1 for p in partials if p["error"])}
+        response["full_response"] = {**full_response, "usage": usage_totals, "map_reduce": summary}
+
+        self.logger.info(json.dumps({
+            "log_message": "Map-reduce finished",
+            **summary,
+            "usage": usage_totals
+        }))
+        return response
+
+    def _request(self, messages, request, on_delta=None, show_spinner=None):
+        """Send one request through the AI service."""
+        return self.ai_service.get_ai_response(
+            messages=messages,
+            debug=self.debug,
+            on_delta=on_delta,
+            show_spinner=self.show_spinner if show_spinner is None else show_spinner,
+            **request
+        )
+
+    def _map(self, chunks, build_messages, settings, request, usage_totals) -> List[Dict[str, Any]]:
+        """Run the request on every chunk concurrently; results are ordered by part."""
+        max_chunks = int(settings["max_chunks"])
+
+        def numbered():
+            for index, chunk in enumerate(chunks):
+                if index >= max_chunks:
+                    raise ValueError(
+                        f"Input needs more than {max_chunks} chunks of {settings['chunk_tokens']} tokens; "
+                        "raise map_reduce.max_chunks or --chunk-tokens"
+                    )
+                yield index, chunk
+
+        results: List[Dict[str, Any]] = []
+        stop_spinner = threading.Event()
+        spinner = threading.Thread(target=tqdm_spinner, args=(stop_spinner,))
+        if self.show_spinner:
+            spinner.start()
+        try:
+            run_bounded(
+                numbered(),
+                functools.partial(self._map_chunk, build_messages=build_messages, request=request),
+                max(1, int(settings["concurrency"])),
+                results.append
+            )
+        finally:
+            stop_spinner.set()
+            if self.show_spinner:
+                spinner.join()
+
+        results.sort(key=lambda result: result["index"])
+        for result in results:
+            self._add_usage(usage_totals, result["usage"])
+        if all(result["error"] for result in results):
+            raise ValueError(f"All {len(results)} chunks failed: {results[0]['error']}")
+        return results
+
+    def _map_chunk(self, index: int, chunk: str, build_messages: MessagesFactory,
+                   request: Dict[str, Any]) -> Dict[str, Any]:
+        """Answer the request for one chunk, never raising."""
+        result: Dict[str, Any] = {"index": index, "content": "", "usage": None, "error": None}
+        try:
+            messages = build_messages(chunk, MAP_INSTRUCTION.format(part=index + 1))
+            response = self._request(messages, request, show_spinner=False)
+            full_response = response.get("full_response") or {}
+            result.update(content=response.get("content") or "", usage=full_response.get("usage"),
+                          error=full_response.get("error"))
+        except Exception as e:  # Each chunk reports its own failure
+            result["error"] = str(e)
+
+        self.logger.info(json.dumps({
+            "log_message": "Map-reduce chunk processed",
+            "part": index + 1,
+            "estimated_tokens": estimate_tokens(chunk),
+            "error": result["error"]
+        }))
+        return result
+
+    def _combine_groups(self, partials, build_messages, settings, request, usage_totals) -> List[str]:
+        """Reduce partial answers in groups until they fit one request together."""
+        # (first part, last part, text) per answer
+        answers = [
+            (p["index"] + 1, p["index"] + 1,
+             f"Part {p['index'] + 1} could not be processed: {p['error']}" if p["error"]
+             else f"Part {p['index'] + 1}:\n{p['content']}")
+            for p in partials
+        ]
+        chunk_tokens = int(settings["chunk_tokens"])
+        while len(answers) > 1 and estimate_tokens(self._join([a[2] for a in answers])) > chunk_tokens:
+            groups: List[list] = [[]]
+            for answer in answers:
+                texts = [a[2] for a in groups[-1]] + [answer[2]]
+                if len(groups[-1]) >= 2 and estimate_tokens(self._join(texts)) > chunk_tokens:
+                    groups.append([])
+                groups[-1].append(answer)
+            if len(groups) == len(answers):
+                break  # Every answer is a chunk on its own; grouping cannot shrink them further
+
+            self.logger.info(json.dumps({
+                "log_message": "Map-reduce combining partial answers in groups",
+                "answers": len(answers),
+                "groups": len(groups)
+            }))
+            combined = []
+            for group in groups:
+                if len(group) == 1:
+                    combined.append(group[0])
+                    continue
+                first, last = group[0][0], group[-1][1]
+                instruction = REDUCE_INSTRUCTION.format(parts=last - first + 1)
+                response = self._request(build_messages(self._join([a[2] for a in group]), instruction),
+                                         request, show_spinner=False)
+                self._add_usage(usage_totals, (response.get("full_response") or {}).get("usage"))
+                combined.append((first, last, f"Parts {first}-{last}:\n{response.get('content') or ''}"))
+            answers = combined
+        return [answer[2] for answer in answers]
+
+    @staticmethod
+    def _join(texts: List[str]) -> str:
+        return "\n\n---\n\n".join(texts)
+
+    @staticmethod
+    def _add_usage(totals: Dict[str, Any], usage: Optional[Dict[str, Any]]) -> None:
+        """Add a response's token usage counters to the totals."""
+        for key, value in (usage or {}).items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                totals[key] = totals.get(key, 0) + value
+
+    # Question mode
+
+    def process_question(self, context, on_delta=None, finalize=None,
+                         enable_url_search: bool = False) -> Optional[Dict[str, Any]]:
+        """Answer a question over a large ``-fi`` file or piped input.
+
+        Args:
+            context: QuestionContext of the question
+            on_delta: Optional delta callback for the final request
+            finalize: Optional callable applied to the final request's messages
+            enable_url_search: Whether to enable web search for URL analysis
+
+        Returns:
+            Optional[dict]: The response, or None when no input needs splitting
+        """
+        settings = self.settings_for()
+        if not settings["enabled"]:
+            return None
+
+        piped = None
+        if context.file_input:
+            if not exceeds_chunk(context.file_input, settings):
+                return None
+            check_chunk_limit(context.file_input, settings)
+            label = f"The file content of {context.file_input} to work with"
+            stream = open_text_input(context.file_input)
+            # Piped output accompanies every part; it is read once here
+            piped = sys.stdin.read() if not sys.stdin.isatty() else None
+        elif not sys.stdin.isatty():
+            label = "Previous terminal output"
+            stream = sys.stdin
+        else:
+            return None
+
+        def build_messages(text, instruction):
+            messages, _ = self.message_builder.build_messages(
+                question=context.question or "Please analyze and summarize this input.",
+                response_format=context.response_format,
+                url=context.url,
+                image=context.image,
+                pdf=context.pdf,
+                image_url=context.image_url,
+                pdf_url=context.pdf_url,
+                use_piped_input=False
+            )
+            prefix = [{"role": "system", "content": f"Previous terminal output:\n{piped}"}] if piped else []
+            if text:
+                prefix.append({"role": "system", "content": f"{label}:\n{text}"})
+            if instruction:
+                prefix.append({"role": "system", "content": instruction})
+            return prefix + messages
+
+        try:
+            return self.process(
+                iter_token_chunks(stream, settings["chunk_tokens"]), build_messages, settings,
+                request={"model_name": context.model, "enable_url_search": enable_url_search},
+                on_delta=on_delta, finalize=finalize
+            )
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+    # Pattern mode
+
+    def prepare_pattern(self, pattern_manager, pattern_id: str,
+                        pattern_input: Optional[Dict[str, Any]] = None,
+                        interactive: bool = True) -> Optional[PatternJob]:
+        """Resolve a pattern and, when map-reduce applies to it, collect its inputs.
+
+        With map-reduce enabled, file inputs are collected as paths. The first
+        one larger than a chunk is marked for splitting; smaller ones are
+        read, as they would be without map-reduce.
+
+        Args:
+            pattern_manager: PatternManager used to look up the pattern
+            pattern_id: Pattern ID, or 'new' to select one interactively
+            pattern_input: Optional input values (from -pi)
+            interactive: Whether missing inputs may be prompted for
+
+        Returns:
+            Optional[PatternJob]: The job, or None if selection was cancelled,
+            the pattern does not exist or its inputs are invalid
+        """
+        if pattern_id == 'new':
+            pattern_id = pattern_manager.select_pattern()
+            if pattern_id is None:
+                print("Pattern selection cancelled.")
+                return None
+
+        pattern_data = pattern_manager.get_pattern_content(pattern_id)
+        if pattern_data is None:
+            print(f"Pattern '{pattern_id}' does not exist")
+            return None
+
+        settings = self.settings_for(pattern_data)
+        job = PatternJob(pattern_id, pattern_data, pattern_input, settings)
+        if not settings["enabled"]:
+            return job
+
+        inputs = pattern_manager.process_pattern_inputs(
+            pattern_id=pattern_id,
+            input_values=pattern_input,
+            interactive=interactive,
+            pattern_data=pattern_data,
+            read_files=False
+        )
+        if inputs is None:
+            return None
+
+        for input_def in pattern_data.get('inputs', []):
+            path = inputs.get(input_def.name)
+            if input_def.input_type != InputType.FILE or not isinstance(path, str) or not os.path.isfile(path):
+                continue
+            if job.chunked_input is None and exceeds_chunk(path, settings):
+                job.chunked_input, job.chunked_path = input_def.name, path
+                continue
+            with open_text_input(path) as f:
+                inputs[input_def.name] = f.read().strip()
+
+        job.pattern_input = inputs
+        return job
+
+    def process_pattern(self, job: PatternJob, pattern_manager=None, model_name: Optional[str] = None,
+                        on_delta=None) -> Dict[str, Any]:
+        """Run a pattern job whose file input is split into chunks.
+
+        Args:
+            job: PatternJob from prepare_pattern with a chunked input
+            pattern_manager: PatternManager passed on to the AI service
+            model_name: Optional model override (pattern model configuration wins)
+            on_delta: Optional delta callback for the final request
+
+        Returns:
+            dict: The final response
+        """
+        def build_messages(text, instruction):
+            inputs = dict(job.pattern_input or {})
+            inputs[job.chunked_input] = text
+            messages, _ = self.message_builder.build_messages(
+                pattern_id=job.pattern_id,
+                pattern_input=inputs,
+                use_piped_input=False,
+                pattern_data=job.pattern_data,
+                interactive=False
+            )
+            if not messages:
+                raise ValueError("Pattern inputs are invalid for this chunk")
+            if instruction:
+                # Right after the pattern prompt, before the inputs
+                messages.insert(1, {"role": "system", "content": instruction})
+            return messages
+
+        check_chunk_limit(job.chunked_path, job.settings)
+        with open_text_input(job.chunked_path) as stream:
+            return self.process(
+                iter_token_chunks(stream, job.settings["chunk_tokens"]), build_messages, job.settings,
+                request={
+                    "model_name": model_name,
+                    "pattern_id": job.pattern_id,
+                    "pattern_manager": pattern_manager,
+                    "pattern_data": job.pattern_data
+                },
+                on_delta=on_delta
+            )
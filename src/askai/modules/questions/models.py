@@ -28,6 +28,7 @@ class QuestionResponse:
     content: str
     created_files: Optional[list] = None
     chat_id: Optional[str] = None
+    streamed: bool = False  # Content was already shown incrementally
 
     def __post_init__(self):
         if self.created_files is None:
@@ -0,0 +1,29 @@
+"""
+Bounded worker pool shared by batch processing and map-reduce.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+
+def run_bounded(items: Iterable[Tuple], worker: Callable[..., Dict[str, Any]],
+                concurrency: int, on_result: Callable[[Dict[str, Any]], None]) -> None:
+    """Run worker(*item) for every item on a bounded thread pool.
+
+    At most ``concurrency * 2`` items are queued at once, so large inputs are
+    never fully buffered. on_result is called in completion order from the
+    calling thread.
+    """
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="askai-worker") as executor:
+        pending = set()
+        for item in items:
+            pending.add(executor.submit(worker, *item))
+            if len(pending) >= concurrency * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    on_result(future.result())
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                on_result(future.result())
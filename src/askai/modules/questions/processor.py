@@ -3,16 +3,20 @@ Question processor for the AskAI CLI.
 Handles standalone question processing separate from patterns.
 """
 
+import functools
 import json
 import os
 import sys
-from typing import Tuple
+from typing import Optional, Tuple
 
 from askai.modules.ai import AIService
-from askai.modules.chat import ChatManager
+from askai.modules.chat import ChatManager, ContextBudget, get_context_budget_settings
 from askai.modules.messaging import MessageBuilder
 from askai.modules.patterns import PatternManager
 from askai.infrastructure.output.output_coordinator import OutputCoordinator
+from askai.shared.logging import LogPayload
+from askai.shared.utils import TokenEstimator, print_error_or_warnings
+from .map_reduce import MapReduceProcessor, get_cli_overrides
 from .models import QuestionContext, QuestionResponse
 
 
@@ -33,16 +37,18 @@ class QuestionProcessor:
 
         # Initialize required components
         self.pattern_manager = PatternManager(base_path, config)
-        self.message_builder = MessageBuilder(self.pattern_manager, logger)
+        self.message_builder = MessageBuilder(self.pattern_manager, logger, config)
         self.chat_manager = ChatManager(config, logger)
         self.ai_service = AIService(logger)
         self.output_coordinator = OutputCoordinator()
 
-    def process_question(self, args) -> QuestionResponse:
+    def process_question(self, args, on_delta=None) -> QuestionResponse:
         """Process a standalone question.
 
         Args:
             args: CLI arguments namespace
+            on_delta: Optional callable receiving response deltas as they stream in.
+                Ignored for JSON responses, which are only useful once complete.
 
         Returns:
             QuestionResponse: The processed response
@@ -50,6 +56,37 @@ class QuestionProcessor:
         # Create question context from args
         context = self._create_question_context(args)
 
+        # Determine if web search should be enabled for URL analysis
+        enable_url_search = context.url is not None
+
+        # Stream only formats that can be displayed incrementally
+        streamed = on_delta is not None and context.response_format != 'json'
+
+        # Chat history is trimmed to the context of the model
+        budget = self._context_budget(context, args)
+
+        # Inputs larger than one chunk are split and answered with map-reduce
+        chat = {}
+
+        def add_chat_context(messages):
+            chat["chat_id"], chat["messages"] = self.chat_manager.handle_persistent_chat(args, messages, budget)
+            return chat["messages"]
+
+        map_reduce = MapReduceProcessor(
+            self.message_builder, self.ai_service, self.logger, self.config,
+            debug=getattr(args, 'debug', False), overrides=get_cli_overrides(args)
+        )
+        try:
+            response = map_reduce.process_question(
+                context, on_delta=on_delta if streamed else None, finalize=add_chat_context,
+                enable_url_search=enable_url_search
+            )
+        except ValueError as e:
+            print_error_or_warnings(f"Map-reduce failed: {e}")
+            sys.exit(1)
+        if response is not None:
+            return self._finish(response, chat["chat_id"], chat["messages"], context, args, streamed)
+
         # Build messages for the question
         messages, _ = self.message_builder.build_messages(
             question=context.question,
@@ -69,16 +106,19 @@ class QuestionProcessor:
             sys.exit(0)
 
         # Handle persistent chat setup and context loading
-        chat_id, messages = self.chat_manager.handle_persistent_chat(args, messages)
+        chat_id, messages = self.chat_manager.handle_persistent_chat(args, messages, budget)
 
         # Debug log the messages
-        self.logger.debug(json.dumps({
+        self.logger.debug(LogPayload({
             "log_message": "Question messages content",
             "messages": messages
         }))
-
-        # Determine if web search should be enabled for URL analysis
-        enable_url_search = context.url is not None
+        model_name = context.model or self.config.get('default_model')
+        self.logger.info(json.dumps({
+            "log_message": "Prompt token estimate",
+            "model": model_name,
+            "prompt_tokens": TokenEstimator.for_model(model_name, self.config).count_messages(messages)
+        }))
 
         # Get AI response
         response = self.ai_service.get_ai_response(
@@ -87,9 +127,51 @@ class QuestionProcessor:
             pattern_id=None,  # No pattern in question mode
             debug=getattr(args, 'debug', False),
             pattern_manager=None,  # No pattern manager needed
-            enable_url_search=enable_url_search
+            enable_url_search=enable_url_search,
+            on_delta=on_delta if streamed else None
+        )
+        return self._finish(response, chat_id, messages, context, args, streamed)
+
+    def _context_budget(self, context: QuestionContext, args) -> Optional[ContextBudget]:
+        """Create the token budget for the history of a persistent chat.
+
+        The context length comes from the chat.context_budget config or the
+        model metadata; older conversations are summarized if configured.
+        """
+        settings = get_context_budget_settings(self.config)
+        if getattr(args, 'persistent_chat', None) is None or not settings['enabled']:
+            return None
+
+        model_name = context.model or self.config.get('default_model')
+        context_length = int(settings['context_length']
+                             or self.ai_service.get_context_length(model_name, self.config)
+                             or settings['fallback_context_length'])
+
+        summarizer = (functools.partial(self._summarize_history, model_name=model_name,
+                                        debug=getattr(args, 'debug', False))
+                      if settings['summarize'] else None)
+
+        return ContextBudget(
+            context_length,
+            # Never reserve more than half of a small context for the response
+            min(int(settings['reserved_output_tokens']), context_length // 2),
+            estimator=TokenEstimator.for_model(model_name, self.config),
+            summarizer=summarizer,
+            summary_tokens=int(settings['summary_tokens']),
+            summary_cache=self.chat_manager.summary_cache,
+            logger=self.logger
+        )
+
+    def _summarize_history(self, messages, model_name, debug=False):
+        """Ask the model for a summary of older chat messages."""
+        response = self.ai_service.get_ai_response(
+            messages=messages, model_name=model_name, debug=debug, show_spinner=False
         )
+        return response.get('content') if isinstance(response, dict) else response
 
+    def _finish(self, response, chat_id, messages, context: QuestionContext, args,
+                streamed: bool) -> QuestionResponse:
+        """Store the chat conversation and process the output of a response."""
         # Store chat history if using persistent chat
         if chat_id:
             self.chat_manager.store_chat_conversation(
@@ -104,7 +186,8 @@ class QuestionProcessor:
         return QuestionResponse(
             content=formatted_output,
             created_files=created_files,
-            chat_id=chat_id
+            chat_id=chat_id,
+            streamed=streamed
         )
 
     def _create_question_context(self, args) -> QuestionContext:
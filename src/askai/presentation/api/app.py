@@ -23,6 +23,7 @@ from .routes.health import health_ns
 from .routes.patterns import patterns_ns
 from .routes.openrouter import openrouter_ns
 from .routes.config import config_ns
+from .routes.metrics import metrics_ns, init_metrics
 
 
 def get_application_logger():
@@ -55,6 +56,10 @@ def create_app(config=None):
         'SECRET_KEY': os.environ.get('SECRET_KEY', 'dev-secret-key'),
         'DEBUG': os.environ.get('FLASK_DEBUG', 'False').lower() == 'true',
         'TESTING': os.environ.get('FLASK_TESTING', 'False').lower() == 'true',
+        # Directory that batch pattern inputs and outputs must stay within (batch API disabled if unset)
+        'BATCH_ROOT': os.environ.get('ASKAI_BATCH_ROOT'),
+        # Highest concurrency a batch request may ask for (routes default to MAX_BATCH_CONCURRENCY)
+        'BATCH_MAX_CONCURRENCY': int(os.environ.get('ASKAI_BATCH_MAX_CONCURRENCY') or 0),
     })
 
     # Override with provided config
@@ -97,6 +102,10 @@ def create_app(config=None):
     api.add_namespace(patterns_ns)
     api.add_namespace(openrouter_ns)
     api.add_namespace(config_ns)
+    api.add_namespace(metrics_ns)
+
+    # Time requests and count in-flight requests for /api/v1/metrics
+    init_metrics(app)
 
     # Add custom root endpoints as regular Flask routes
     @app.route('/', endpoint='api_root')
@@ -120,6 +129,7 @@ def create_app(config=None):
                 'patterns': '/api/v1/patterns/',
                 'openrouter': '/api/v1/openrouter/',
                 'config': '/api/v1/config/',
+                'metrics': '/api/v1/metrics',
                 'documentation': '/docs/',
                 'api_spec': '/api/v1/swagger.json'
             },
@@ -152,7 +162,8 @@ def create_app(config=None):
                 'questions': '/api/v1/questions/',
                 'patterns': '/api/v1/patterns/',
                 'openrouter': '/api/v1/openrouter/',
-                'config': '/api/v1/config/'
+                'config': '/api/v1/config/',
+                'metrics': '/api/v1/metrics'
             },
             'suggestion': 'Visit /docs/ for interactive API documentation'
         }), 404
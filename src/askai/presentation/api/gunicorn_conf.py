@@ -0,0 +1,19 @@
+"""
+Gunicorn server hooks for the AskAI API.
+
+Usage: gunicorn --config src/askai/presentation/api/gunicorn_conf.py ...
+"""
+import os
+import shutil
+
+
+def on_starting(server):  # pylint: disable=unused-argument
+    """Start every server with an empty metrics directory.
+
+    Workers write their metrics to ASKAI_METRICS_DIR; files left over from a
+    previous server would otherwise be merged into the new server's counters.
+    """
+    directory = os.environ.get('ASKAI_METRICS_DIR')
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
@@ -12,7 +12,7 @@ sys.path.insert(0, project_root)
 sys.path.insert(0, os.path.join(project_root, "src"))
 
 # pylint: disable=wrong-import-position
-from askai.shared.config.loader import load_config, CONFIG_PATH, ASKAI_DIR
+from askai.shared.config.loader import get_config_snapshot, CONFIG_PATH, ASKAI_DIR
 
 # Create namespace
 config_ns = Namespace('config', description='Configuration management operations')
@@ -75,7 +75,7 @@ class Configuration(Resource):
         """
         try:
             # Load configuration
-            config = load_config()
+            config = get_config_snapshot()
 
             if not config:
                 return {'error': 'Failed to load configuration'}, 500
@@ -123,7 +123,7 @@ class ConfigurationStatus(Resource):
             configured = True
             config = None
             try:
-                config = load_config()
+                config = get_config_snapshot()
                 if not config:
                     configured = False
                     issues.append("Configuration file is empty or invalid")
@@ -177,7 +177,7 @@ class ConfigurationValidation(Resource):
             suggestions = []
 
             # Load configuration
-            config = load_config()
+            config = get_config_snapshot()
 
             if not config:
                 issues.append("Configuration could not be loaded")
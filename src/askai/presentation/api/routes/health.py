@@ -4,6 +4,9 @@ Health check and status endpoints for the AskAI API.
 from flask import current_app
 from flask_restx import Namespace, Resource, fields
 
+from askai.modules.ai.response_cache import get_cache_settings, get_cache_stats
+from askai.shared.config.loader import get_config_snapshot
+
 # Create namespace
 health_ns = Namespace('health', description='Health check and status operations')
 
@@ -19,6 +22,7 @@ status_response = health_ns.model('StatusResponse', {
     'api': fields.String(required=True, description='API status', example='running'),
     'database': fields.String(description='Database status', example='connected'),
     'dependencies': fields.Raw(description='Dependency status'),
+    'response_cache': fields.Raw(description='Response cache state and hit/miss counters for this process'),
 })
 
 
@@ -70,7 +74,11 @@ class Status(Resource):
             return {
                 'api': 'running',
                 'database': 'not_applicable',
-                'dependencies': dependencies
+                'dependencies': dependencies,
+                'response_cache': {
+                    'enabled': get_cache_settings(get_config_snapshot())['enabled'],
+                    **get_cache_stats()
+                }
             }
         except Exception as e:
             current_app.logger.error(f"Status check failed: {e}")
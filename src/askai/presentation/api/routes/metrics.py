@@ -0,0 +1,62 @@
+"""
+Prometheus metrics endpoint and request instrumentation for the AskAI API.
+
+Metrics are aggregated across gunicorn workers through the directory named
+by ASKAI_METRICS_DIR; without it each worker reports only its own requests.
+"""
+import os
+import time
+
+from flask import Response, g, request
+from flask_restx import Namespace, Resource
+
+from askai.shared.metrics import enable_metrics, get_metrics_registry, inc, observe
+
+# Create namespace
+metrics_ns = Namespace('metrics', path='/metrics', description='Prometheus metrics')
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@metrics_ns.route('')
+class Metrics(Resource):
+    """Prometheus scrape endpoint."""
+
+    @metrics_ns.doc('metrics')
+    def get(self):
+        """Get request, upstream, token, pattern and cache metrics of all workers.
+
+        Returns the Prometheus text exposition format.
+        """
+        registry = get_metrics_registry()
+        return Response(registry.render() if registry else '', mimetype=None, content_type=CONTENT_TYPE)
+
+
+def init_metrics(app):
+    """Enable metrics and time every request handled by the app.
+
+    Args:
+        app: Flask application
+    """
+    enable_metrics(os.environ.get('ASKAI_METRICS_DIR') or None)
+
+    @app.before_request
+    def start_request_timer():  # type: ignore[reportUnusedFunction]
+        g.metrics_started = time.perf_counter()
+        inc('askai_api_requests_in_flight')
+
+    @app.after_request
+    def observe_request(response):  # type: ignore[reportUnusedFunction]
+        started = g.pop('metrics_started', None)
+        if started is not None:
+            observe('askai_api_request_duration_seconds', time.perf_counter() - started, {
+                # The URL rule keeps path parameters out of the label values
+                'route': request.url_rule.rule if request.url_rule else 'unmatched',
+                'method': request.method,
+                'status': response.status_code
+            })
+        return response
+
+    @app.teardown_request
+    def end_request(_error=None):  # type: ignore[reportUnusedFunction]
+        inc('askai_api_requests_in_flight', amount=-1)
@@ -11,8 +11,9 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..
 sys.path.insert(0, project_root)
 sys.path.insert(0, os.path.join(project_root, "src"))
 
+from askai.modules.ai.credits_monitor import get_credits_monitor
 from askai.modules.ai.openrouter_client import OpenRouterClient
-from askai.shared.config.loader import load_config
+from askai.shared.config.loader import get_config_snapshot
 
 # Create namespace
 openrouter_ns = Namespace('openrouter', description='OpenRouter API management operations')
@@ -37,7 +38,9 @@ credits_response = openrouter_ns.model('CreditsResponse', {
     'limit': fields.Float(description='Credit limit (same as total credits)'),
     'usage': fields.Float(description='Credits used'),
     'remaining': fields.Float(description='Remaining credits available'),
-    'label': fields.String(description='API key label')
+    'label': fields.String(description='API key label'),
+    'updated_at': fields.Float(description='Unix time the balance was fetched (cached balances may be older)'),
+    'spend_rate': fields.Float(description='Credits spent per hour over the recent usage series')
 })
 
 api_test_response = openrouter_ns.model('ApiTestResponse', {
@@ -62,7 +65,7 @@ class OpenRouterModels(Resource):
         """
         try:
             # Load configuration
-            config = load_config()
+            config = get_config_snapshot()
 
             if not config:
                 return {'error': 'Failed to load configuration'}, 500
@@ -116,7 +119,7 @@ class OpenRouterCredits(Resource):
         """
         try:
             # Load configuration
-            config = load_config()
+            config = get_config_snapshot()
 
             if not config:
                 return {'error': 'Failed to load configuration'}, 500
@@ -138,12 +141,17 @@ class OpenRouterCredits(Resource):
             total_credits = credits_info.get('total_credits', 0.0)
             total_usage = credits_info.get('total_usage', 0.0)
 
+            monitor = get_credits_monitor(config)
+            latest = monitor.latest() if monitor else None
+
             return {
                 'credits': total_credits,
                 'limit': total_credits,  # Total credits available
                 'usage': total_usage,
                 'remaining': total_credits - total_usage,
-                'label': credits_info.get('label', 'Unknown')
+                'label': credits_info.get('label', 'Unknown'),
+                'updated_at': latest.get('fetched_at') if latest else None,
+                'spend_rate': monitor.spend_rate() if monitor else None
             }
 
         except Exception as e:
@@ -165,7 +173,7 @@ class OpenRouterTest(Resource):
         """
         try:
             # Load configuration
-            config = load_config()
+            config = get_config_snapshot()
 
             if not config:
                 return {
@@ -198,9 +206,9 @@ class OpenRouterTest(Resource):
                 'models_count': 0
             }
 
-            # Test credit balance
+            # Test credit balance (bypassing the cache to contact OpenRouter)
             try:
-                credits_info = client.get_credit_balance()
+                credits_info = client.get_credit_balance(refresh=True)
                 if credits_info:
                     total_credits = credits_info.get('total_credits', 0.0)
                     total_usage = credits_info.get('total_usage', 0.0)
@@ -212,7 +220,7 @@ class OpenRouterTest(Resource):
 
             # Test model availability
             try:
-                models = client.get_available_models(debug=False)
+                models = client.get_available_models(debug=False, refresh=True)
                 if models:
                     test_results['models_count'] = len(models)
                 else:
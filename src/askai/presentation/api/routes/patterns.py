@@ -21,9 +21,13 @@ sys.path.insert(0, os.path.join(project_root, "src"))
 from askai.modules.ai.ai_service import AIService
 from askai.modules.messaging.builder import MessageBuilder
 from askai.modules.patterns.pattern_manager import PatternManager
-from askai.shared.config.loader import load_config
+from askai.modules.questions.batch import BatchPatternProcessor, DEFAULT_BATCH_CONCURRENCY
+from askai.shared.config.loader import get_config_snapshot
 from askai.shared.logging import get_logger
 
+# Upper bound for the concurrency of one batch request (ASKAI_BATCH_MAX_CONCURRENCY overrides it)
+MAX_BATCH_CONCURRENCY = 16
+
 # Create namespace
 patterns_ns = Namespace('patterns', description='Pattern management operations')
 
@@ -149,7 +153,9 @@ pattern_info = patterns_ns.model('PatternInfo', {
 
 patterns_list = patterns_ns.model('PatternsList', {
     'patterns': fields.List(fields.Nested(pattern_info), description='List of available patterns'),
-    'count': fields.Integer(description='Total number of patterns')
+    'count': fields.Integer(description='Total number of matching patterns'),
+    'page': fields.Integer(description='Current page number'),
+    'page_size': fields.Integer(description='Patterns per page (null when not paged)')
 })
 
 # Input models for pattern execution
@@ -184,6 +190,45 @@ pattern_execution_response = patterns_ns.model('PatternExecutionResponse', {
     'details': fields.String(description='Additional error details')
 })
 
+# Batch execution models
+pattern_batch_request = patterns_ns.model('PatternBatchRequest', {
+    'pattern_id': fields.String(required=True, description='ID of the pattern to execute'),
+    'directory': fields.String(required=True,
+                               description='Directory whose files are the inputs, relative to ASKAI_BATCH_ROOT'),
+    'output_dir': fields.String(description='Output directory within ASKAI_BATCH_ROOT (default: <directory>-output)'),
+    'inputs': fields.Raw(description='Values for the non-file pattern inputs'),
+    'concurrency': fields.Integer(default=DEFAULT_BATCH_CONCURRENCY,
+                                  description='Number of files processed in parallel (at most '
+                                              'ASKAI_BATCH_MAX_CONCURRENCY)'),
+    'debug': fields.Boolean(default=False, description='Enable debug mode for execution'),
+    'model_name': fields.String(description='Override model name for this execution')
+})
+
+pattern_batch_file_result = patterns_ns.model('PatternBatchFileResult', {
+    'file': fields.String(description='Input file name'),
+    'output_dir': fields.String(description='Output subfolder for this file'),
+    'status': fields.String(description='ok or error'),
+    'model': fields.String(description='Model that answered'),
+    'usage': fields.Raw(description='Token usage reported by the API'),
+    'latency_ms': fields.Float(description='Time spent on this file in milliseconds'),
+    'created_files': fields.List(fields.String, description='Files written for this input'),
+    'error': fields.String(description='Error message if this file failed')
+})
+
+pattern_batch_response = patterns_ns.model('PatternBatchResponse', {
+    'success': fields.Boolean(required=True, description='Whether every file succeeded'),
+    'pattern_id': fields.String(description='ID of the executed pattern'),
+    'output_dir': fields.String(description='Directory holding the outputs and manifest.json'),
+    'total': fields.Integer(description='Number of input files'),
+    'succeeded': fields.Integer(description='Number of files processed successfully'),
+    'failed': fields.Integer(description='Number of files that failed'),
+    'elapsed_seconds': fields.Float(description='Wall-clock time for the whole batch'),
+    'usage': fields.Raw(description='Token usage summed over all files'),
+    'files': fields.List(fields.Nested(pattern_batch_file_result), description='Per-file results'),
+    'error': fields.String(description='Error message if the batch could not run'),
+    'details': fields.String(description='Additional error details')
+})
+
 # Template models
 pattern_template = patterns_ns.model('PatternTemplate', {
     'pattern_id': fields.String(required=True, description='Pattern ID'),
@@ -196,99 +241,51 @@ class PatternsList(Resource):
     """List available patterns."""
 
     @patterns_ns.doc('list_patterns')
+    @patterns_ns.param('q', 'Search text matched against pattern names, purposes and functionality')
+    @patterns_ns.param('page', 'Page number, starting at 1', type=int, default=1)
+    @patterns_ns.param('page_size', 'Patterns per page (all patterns if omitted)', type=int)
     @patterns_ns.marshal_with(patterns_list)
     def get(self):
         """Get list of all available patterns.
 
-        Returns a list of all patterns available in the system.
+        Returns the patterns available in the system, optionally filtered by a
+        search query and paged. Pattern metadata comes from the pattern index,
+        so unchanged pattern files are not parsed again.
         """
         try:
             # Load configuration
-            config = load_config()
+            config = get_config_snapshot()
 
             if not config:
                 return {'error': 'Failed to load configuration'}, 500
 
+            page = request.args.get('page', 1, type=int)
+            page_size = request.args.get('page_size', None, type=int)
+            if page < 1 or (page_size is not None and page_size < 1):
+                return {'error': 'page and page_size must be positive integers'}, 400
+
             # Initialize pattern manager
             pattern_manager = PatternManager(project_root, config)
 
-            # Get all patterns
-            available_patterns = pattern_manager.list_patterns()
-            patterns = []
-
-            for pattern_data in available_patterns:
-                try:
-                    pattern_id = pattern_data.get('pattern_id', '')
-                    pattern_content = pattern_manager.get_pattern_content(pattern_id)
-
-                    if pattern_content:
-                        # Convert PatternInput objects to dictionaries for JSON serialization
-                        inputs = []
-                        for input_obj in pattern_content.get('inputs', []):
-                            if hasattr(input_obj, 'name'):  # It's a PatternInput object
-                                input_type_value = (
-                                    input_obj.input_type.value
-                                    if hasattr(input_obj.input_type, 'value')
-                                    else str(input_obj.input_type)
-                                )
-                                input_dict = {
-                                    'name': input_obj.name,
-                                    'description': input_obj.description,
-                                    'type': input_type_value,
-                                    'required': input_obj.required,
-                                    'default': input_obj.default,
-                                    'options': input_obj.options,
-                                    'min_value': input_obj.min_value,
-                                    'max_value': input_obj.max_value,
-                                    'group': input_obj.group
-                                }
-                                inputs.append(input_dict)
-                            else:  # It's already a dictionary
-                                inputs.append(input_obj)
-
-                        # Convert PatternOutput objects to dictionaries for JSON serialization
-                        outputs = []
-                        for output_obj in pattern_content.get('outputs', []):
-                            if hasattr(output_obj, 'name'):  # It's a PatternOutput object
-                                output_type_value = (
-                                    output_obj.output_type.value
-                                    if hasattr(output_obj.output_type, 'value')
-                                    else str(output_obj.output_type)
-                                )
-                                action_value = (
-                                    output_obj.action.value
-                                    if hasattr(output_obj.action, 'value')
-                                    else str(output_obj.action)
-                                )
-                                output_dict = {
-                                    'name': output_obj.name,
-                                    'description': output_obj.description,
-                                    'type': output_type_value,
-                                    'required': output_obj.required,
-                                    'example': output_obj.example,
-                                    'action': action_value,
-                                    'write_to_file': output_obj.write_to_file,
-                                    'group': output_obj.group
-                                }
-                                outputs.append(output_dict)
-                            else:  # It's already a dictionary
-                                outputs.append(output_obj)
-
-                        patterns.append({
-                            'id': pattern_id,
-                            'name': pattern_data.get('name', pattern_id),
-                            'description': pattern_data.get('description', ''),
-                            'category': pattern_data.get('category', 'general'),
-                            'inputs': inputs,
-                            'outputs': outputs
-                        })
-                except Exception as e:
-                    current_app.logger.warning(f"Failed to load pattern {pattern_data}: {e}")
-                    continue
+            # Search the pattern index
+            result = pattern_manager.search_patterns(request.args.get('q'), page, page_size)
+            patterns = [
+                {
+                    'id': pattern_data['pattern_id'],
+                    'name': pattern_data.get('name', pattern_data['pattern_id']),
+                    'description': pattern_data.get('description', ''),
+                    'category': pattern_data.get('category', 'general'),
+                    'inputs': pattern_data.get('inputs', []),
+                    'outputs': pattern_data.get('outputs', [])
+                }
+                for pattern_data in result['patterns']
+            ]
 
             return {
                 'patterns': patterns,
-                'count': len(patterns)
+                'count': result['total'],
+                'page': result['page'],
+                'page_size': result['page_size']
             }
 
         except Exception as e:
@@ -310,7 +307,7 @@ class PatternDetail(Resource):
         """
         try:
             # Load configuration
-            config = load_config()
+            config = get_config_snapshot()
 
             if not config:
                 return {'error': 'Failed to load configuration'}, 500
@@ -402,7 +399,7 @@ class PatternCategories(Resource):
         """
         try:
             # Load configuration
-            config = load_config()
+            config = get_config_snapshot()
 
             if not config:
                 return {'error': 'Failed to load configuration'}, 500
@@ -410,20 +407,11 @@ class PatternCategories(Resource):
             # Initialize pattern manager
             pattern_manager = PatternManager(project_root, config)
 
-            # Get all patterns and extract categories
-            available_patterns = pattern_manager.list_patterns()
-            categories = set()
-
-            for pattern_data in available_patterns:
-                try:
-                    pattern_id = pattern_data.get('pattern_id', '')
-                    pattern_content = pattern_manager.get_pattern_content(pattern_id)
-
-                    if pattern_content:
-                        category = pattern_content.get('category', 'general')
-                        categories.add(category)
-                except Exception:
-                    continue
+            # Extract categories from the pattern index
+            categories = {
+                pattern_data.get('category', 'general')
+                for pattern_data in pattern_manager.list_patterns()
+            }
 
             return {
                 'categories': sorted(list(categories)),
@@ -463,7 +451,7 @@ class PatternExecution(Resource):
                 return {'error': 'pattern_id is required', 'success': False}, 400
 
             # Load configuration
-            config = load_config()
+            config = get_config_snapshot()
             if not config:
                 return {'error': 'Failed to load configuration', 'success': False}, 500
 
@@ -517,7 +505,7 @@ class PatternExecution(Resource):
 
             # Execute pattern
             result = self._execute_pattern(
-                pattern_manager, pattern_id, validated_inputs, debug_mode, model_name
+                pattern_manager, config, pattern_id, validated_inputs, debug_mode, model_name
             )
             return result
 
@@ -532,12 +520,13 @@ class PatternExecution(Resource):
                 'pattern_id': data.get('pattern_id', 'unknown') if 'data' in locals() else 'unknown'
             }, 500
 
-    def _execute_pattern(self, pattern_manager, pattern_id, inputs, debug_mode, model_name):
+    def _execute_pattern(self, pattern_manager, config, pattern_id, inputs, debug_mode, model_name):
         """Common pattern execution logic."""
         logger = get_logger()
         logger.info("Executing pattern '%s'", pattern_id)
 
-        message_builder = MessageBuilder(pattern_manager, logger)        # Build messages for the pattern
+        # Build messages for the pattern
+        message_builder = MessageBuilder(pattern_manager, logger, config)
         messages, resolved_pattern_id = message_builder.build_messages(
             question=None,
             file_input=None,
@@ -662,7 +651,7 @@ class PatternFileExecution(Resource):
             )
 
             # Load configuration
-            config = load_config()
+            config = get_config_snapshot()
             if not config:
                 return {'error': 'Failed to load configuration', 'success': False}, 500
 
@@ -728,7 +717,7 @@ class PatternFileExecution(Resource):
                         logger.info("Mapped PDF input '%s' -> pdf: %s", input_obj.name, file_path)
 
             # Build messages using message builder with proper file parameters
-            message_builder = MessageBuilder(pattern_manager, logger)
+            message_builder = MessageBuilder(pattern_manager, logger, config)
 
             # Build messages for the pattern with file support
             messages, resolved_pattern_id = message_builder.build_messages(
@@ -814,6 +803,93 @@ class PatternFileExecution(Resource):
                 _cleanup_temp_file(temp_file)
 
 
+def _resolve_batch_path(root, path):
+    """Resolve a request path against the batch root.
+
+    Args:
+        root: Configured batch root directory
+        path: Path from the request, relative to the root or absolute
+
+    Returns:
+        str or None: The real path, or None if it lies outside the root
+    """
+    real_root = os.path.realpath(root)
+    resolved = os.path.realpath(os.path.join(real_root, path))
+    if os.path.commonpath([real_root, resolved]) != real_root:
+        return None
+    return resolved
+
+
+@patterns_ns.route('/execute/batch')
+class PatternBatchExecution(Resource):
+    """Execute a pattern once per file in a server-side directory."""
+
+    @patterns_ns.doc('execute_pattern_batch')
+    @patterns_ns.expect(pattern_batch_request, validate=True)
+    @patterns_ns.marshal_with(pattern_batch_response)
+    def post(self):
+        """Run a file-input pattern over every file in a directory.
+
+        Each file is bound to the pattern's file input and processed on a
+        concurrent worker pool. Results go to one subfolder per file, and a
+        manifest.json with per-file timing and token usage is written to the
+        output directory. Both directories must lie within the directory set
+        by ASKAI_BATCH_ROOT; without it the endpoint is disabled.
+        """
+        data = request.get_json() or {}
+        pattern_id = data.get('pattern_id')
+        directory = data.get('directory')
+
+        if not pattern_id or not directory:
+            return {'error': 'pattern_id and directory are required', 'success': False}, 400
+
+        concurrency = data.get('concurrency') or DEFAULT_BATCH_CONCURRENCY
+        max_concurrency = current_app.config.get('BATCH_MAX_CONCURRENCY') or MAX_BATCH_CONCURRENCY
+        if not isinstance(concurrency, int) or not 1 <= concurrency <= max_concurrency:
+            return {'error': f'concurrency must be between 1 and {max_concurrency}', 'success': False,
+                    'pattern_id': pattern_id}, 400
+
+        batch_root = current_app.config.get('BATCH_ROOT')
+        if not batch_root:
+            return {'error': 'Batch execution is disabled (ASKAI_BATCH_ROOT is not set)', 'success': False,
+                    'pattern_id': pattern_id}, 403
+
+        directory = _resolve_batch_path(batch_root, directory)
+        output_dir = data.get('output_dir') or f"{directory}-output"
+        output_dir = _resolve_batch_path(batch_root, output_dir) if directory else None
+        if not directory or not output_dir:
+            return {'error': 'directory and output_dir must be within the batch root', 'success': False,
+                    'pattern_id': pattern_id}, 403
+
+        try:
+            config = get_config_snapshot()
+            if not config:
+                return {'error': 'Failed to load configuration', 'success': False}, 500
+
+            pattern_manager = PatternManager(project_root, config)
+            processor = BatchPatternProcessor(pattern_manager, get_logger(), debug=data.get('debug', False),
+                                              config=config)
+            manifest = processor.process_directory(
+                pattern_id, directory, output_dir,
+                pattern_input=data.get('inputs') or {},
+                concurrency=concurrency,
+                model_name=data.get('model_name')
+            )
+        except ValueError as e:
+            return {'error': str(e), 'success': False, 'pattern_id': pattern_id}, 400
+        except Exception as e:
+            current_app.logger.error(f"Error executing pattern batch: {e}")
+            current_app.logger.debug(f"Pattern batch error details: {traceback.format_exc()}")
+            return {
+                'error': 'Failed to execute pattern batch',
+                'details': str(e),
+                'success': False,
+                'pattern_id': pattern_id
+            }, 500
+
+        return {'success': manifest['failed'] == 0, **manifest}
+
+
 @patterns_ns.route('/<string:pattern_id>/template')
 class PatternTemplate(Resource):
     """Get JSON template for pattern inputs."""
@@ -831,7 +907,7 @@ class PatternTemplate(Resource):
         """
         try:
             # Load configuration
-            config = load_config()
+            config = get_config_snapshot()
             if not config:
                 return {'error': 'Failed to load configuration'}, 500
 
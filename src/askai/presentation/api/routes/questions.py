@@ -1,9 +1,12 @@
 """
 Question processing endpoints for the AskAI API.
 """
+import json
 import os
+import queue
 import sys
-from flask import request, current_app
+import threading
+from flask import Response, request, current_app, stream_with_context
 from flask_restx import Namespace, Resource, fields
 
 # Add project paths for imports
@@ -12,7 +15,7 @@ sys.path.insert(0, project_root)
 sys.path.insert(0, os.path.join(project_root, "src"))
 
 from askai.modules.questions.processor import QuestionProcessor
-from askai.shared.config.loader import load_config
+from askai.shared.config.loader import get_config_snapshot
 from askai.shared.logging.setup import setup_logger
 
 # Create namespace
@@ -45,6 +48,46 @@ error_response = questions_ns.model('ErrorResponse', {
 })
 
 
+class MockArgs:
+    """CLI-compatible argument object built from a request payload."""
+
+    def __init__(self, data):
+        self.question = data.get('question')
+        self.file_input = data.get('file_input')
+        self.url = data.get('url')
+        self.format = data.get('response_format', 'rawtext')  # Use 'format' not 'response_format'
+        self.response_format = data.get('response_format', 'rawtext')  # Keep both for compatibility
+        self.model = data.get('model')
+        self.pattern_id = data.get('pattern_id')
+        self.output_file = None
+        self.output = None  # Output file path
+        self.plain_md = False  # Plain markdown flag
+        self.save = False  # Save to file flag
+        self.verbose = False
+        self.debug = False
+        # Image and PDF attributes
+        self.image = None
+        self.pdf = None
+        self.image_url = None
+        self.pdf_url = None
+        # Chat-related attributes
+        self.persistent_chat = data.get('persistent_chat')  # None, 'new', or chat_id
+        self.list_chats = False
+        self.view_chat = None
+        self.manage_chats = False
+        # Pattern-related attributes
+        self.pattern = None
+        self.use_pattern = None
+        self.list_patterns = False
+        self.view_pattern = None
+        self.pattern_input = None
+        # Other CLI attributes that might be needed
+        self.tui = False
+        self.enable_url_search = data.get('url') is not None
+        self.openrouter = None
+        self.config = None
+
+
 @questions_ns.route('/ask')
 class AskQuestion(Resource):
     """Process a question using AskAI."""
@@ -66,7 +109,7 @@ class AskQuestion(Resource):
                 return {'error': 'Question is required', 'code': 'MISSING_QUESTION'}, 400
 
             # Load configuration
-            config = load_config()
+            config = get_config_snapshot()
 
             if not config:
                 return {'error': 'Failed to load configuration', 'code': 'CONFIG_ERROR'}, 500
@@ -78,44 +121,6 @@ class AskQuestion(Resource):
             base_path = os.path.join(project_root)
             processor = QuestionProcessor(config, logger, base_path)
 
-            # Create mock args object for compatibility
-            class MockArgs:
-                def __init__(self, data):
-                    self.question = data.get('question')
-                    self.file_input = data.get('file_input')
-                    self.url = data.get('url')
-                    self.format = data.get('response_format', 'rawtext')  # Use 'format' not 'response_format'
-                    self.response_format = data.get('response_format', 'rawtext')  # Keep both for compatibility
-                    self.model = data.get('model')
-                    self.pattern_id = data.get('pattern_id')
-                    self.output_file = None
-                    self.output = None  # Output file path
-                    self.plain_md = False  # Plain markdown flag
-                    self.save = False  # Save to file flag
-                    self.verbose = False
-                    self.debug = False
-                    # Image and PDF attributes
-                    self.image = None
-                    self.pdf = None
-                    self.image_url = None
-                    self.pdf_url = None
-                    # Chat-related attributes
-                    self.persistent_chat = data.get('persistent_chat')  # None, 'new', or chat_id
-                    self.list_chats = False
-                    self.view_chat = None
-                    self.manage_chats = False
-                    # Pattern-related attributes
-                    self.pattern = None
-                    self.use_pattern = None
-                    self.list_patterns = False
-                    self.view_pattern = None
-                    self.pattern_input = None
-                    # Other CLI attributes that might be needed
-                    self.tui = False
-                    self.enable_url_search = data.get('url') is not None
-                    self.openrouter = None
-                    self.config = None
-
             args = MockArgs(data)
 
             # Process the question
@@ -140,6 +145,68 @@ class AskQuestion(Resource):
             return {'error': 'Internal server error', 'details': str(e), 'code': 'INTERNAL_ERROR'}, 500
 
 
+@questions_ns.route('/ask/stream')
+class AskQuestionStream(Resource):
+    """Process a question and stream the AI response as server-sent events."""
+
+    @questions_ns.doc('ask_question_stream')
+    @questions_ns.expect(question_request)
+    @questions_ns.produces(['text/event-stream'])
+    def post(self):
+        """Process a question and stream the answer as it is generated.
+
+        Emits ``delta`` events with partial content, then a single ``done``
+        event with the final response (or an ``error`` event on failure).
+        """
+        data = request.get_json()
+
+        # Validate required fields
+        if not data or not data.get('question'):
+            return {'error': 'Question is required', 'code': 'MISSING_QUESTION'}, 400
+
+        config = get_config_snapshot()
+        if not config:
+            return {'error': 'Failed to load configuration', 'code': 'CONFIG_ERROR'}, 500
+
+        logger = setup_logger(config)
+        processor = QuestionProcessor(config, logger, project_root)
+        args = MockArgs(data)
+        app_logger = current_app.logger
+
+        # The processor reports deltas through a callback; a worker thread
+        # feeds them into a queue that the response generator drains.
+        events = queue.Queue()
+
+        def worker():
+            try:
+                response = processor.process_question(args, on_delta=lambda delta: events.put(('delta', delta)))
+                events.put(('done', {
+                    'content': response.content,
+                    'created_files': response.created_files or [],
+                    'chat_id': response.chat_id
+                }))
+            except Exception as e:
+                app_logger.error(f"Error streaming question: {e}")
+                events.put(('error', {'error': 'Internal server error', 'details': str(e),
+                                      'code': 'INTERNAL_ERROR'}))
+
+        def generate():
+            threading.Thread(target=worker, daemon=True).start()
+            while True:
+                event, payload = events.get()
+                if event == 'delta':
+                    payload = {'content': payload}
+                yield f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+                if event != 'delta':
+                    break
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+
 @questions_ns.route('/validate')
 class ValidateQuestion(Resource):
     """Validate a question request."""
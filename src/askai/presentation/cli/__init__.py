@@ -6,6 +6,14 @@ of user commands from the terminal.
 """
 from .banner_argument_parser import BannerArgumentParser
 from .cli_parser import CLIParser
-from .command_handler import CommandHandler
 
-__all__ = ['BannerArgumentParser', 'CLIParser', 'CommandHandler']
+# CommandHandler is resolved lazily by __getattr__ below
+__all__ = ['BannerArgumentParser', 'CLIParser', 'CommandHandler']  # pylint: disable=undefined-all-variable
+
+
+def __getattr__(name):
+    """Import CommandHandler on first use so parsing arguments stays cheap."""
+    if name == 'CommandHandler':
+        from .command_handler import CommandHandler  # pylint: disable=import-outside-toplevel
+        return CommandHandler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
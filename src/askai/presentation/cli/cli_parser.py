@@ -9,6 +9,9 @@ from askai.shared.utils import print_error_or_warnings
 from askai import __version__, get_full_version
 from .banner_argument_parser import BannerArgumentParser
 
+# Smallest --chunk-tokens value; smaller chunks leave too little context per request
+MIN_CHUNK_TOKENS = 256
+
 
 class CLIParser:
     """Handles command-line argument parsing and validation."""
@@ -45,6 +48,9 @@ class CLIParser:
                            action='store_true',
                            help='If used with -f md, outputs raw markdown as plain text instead of rendering')
         question_group.add_argument('-m', '--model', help='Override default AI model')
+        question_group.add_argument('--stream',
+                           action='store_true',
+                           help='Print the answer token by token as it arrives (not used with -f json)')
 
         # Chat persistence options as a subgroup under Question logic
         chat_group = parser.add_argument_group(
@@ -102,6 +108,37 @@ class CLIParser:
         #                     metavar='COMMAND',
         #                     help='Azure OpenAI API commands: check-quota, list-deployments [FILTER...]')
 
+        # Batch processing
+        batch_group = parser.add_argument_group('Batch processing')
+        batch_group.add_argument('--batch',
+                           metavar='FILE',
+                           help='Run questions from a JSONL file (one {"question": ...} object per line, '
+                                '"-" for stdin) and write JSONL results')
+        batch_group.add_argument('--concurrency',
+                           type=int,
+                           default=4,
+                           metavar='N',
+                           help='Number of batch requests to run in parallel (default: 4)')
+        batch_group.add_argument('--batch-dir',
+                           metavar='DIR',
+                           help='Run the pattern given with -up once per file in DIR '
+                                '(other pattern inputs via -pi)')
+        batch_group.add_argument('--batch-output',
+                           metavar='PATH',
+                           help='Write batch results to FILE instead of stdout; with --batch-dir, '
+                                'the output directory (default: DIR-output)')
+
+        # Large inputs
+        large_input_group = parser.add_argument_group('Large inputs')
+        large_input_group.add_argument('--map-reduce',
+                           action='store_true',
+                           help='Split -fi, piped or pattern file inputs larger than one chunk, answer each '
+                                'chunk in parallel and combine the answers (also map_reduce.enabled in config)')
+        large_input_group.add_argument('--chunk-tokens',
+                           type=int,
+                           metavar='N',
+                           help='Estimated tokens per map-reduce chunk (default: map_reduce.chunk_tokens, 12000)')
+
         # Configuration management
         config_group = parser.add_argument_group('Configuration management')
         config_group.add_argument('--config',
@@ -114,12 +151,23 @@ class CLIParser:
         debug_group.add_argument('--debug',
                            action='store_true',
                            help='Enable debug logging for this session')
+        debug_group.add_argument('--profile',
+                           action='store_true',
+                           help='Print the time spent per stage (config, patterns, messages, HTTP, output) '
+                                'when the command finishes')
+        debug_group.add_argument('--profile-dump',
+                           metavar='FILE',
+                           help='Also write a cProfile dump of the run to FILE (read it with python -m pstats)')
 
         # TUI (Terminal User Interface) options
         tui_group = parser.add_argument_group('Interface mode')
         tui_group.add_argument('--interactive', '-i',
                           action='store_true',
                           help='Launch interactive terminal interface')
+        tui_group.add_argument('--daemon',
+                          action='store_true',
+                          help='Run a background daemon that keeps AskAI warm; later askai commands '
+                               'are forwarded to it (set ASKAI_NO_DAEMON=1 to bypass)')
 
         return parser
 
@@ -139,7 +187,7 @@ class CLIParser:
         # Check if user is using any command that doesn't require a question
         has_command = (args.list_patterns or args.view_pattern is not None or
                       args.list_chats or args.view_chat is not None or
-                      args.openrouter is not None)
+                      args.openrouter is not None or getattr(args, 'batch', None) is not None)
 
         # Allow URL, image, or PDF without question (for simple analysis)
         has_url = args.url is not None
@@ -218,6 +266,37 @@ class CLIParser:
                 )
                 sys.exit(1)
 
+        # Validate batch options
+        batch_dir = getattr(args, 'batch_dir', None)
+        if batch_dir is not None and not using_pattern:
+            logger.error(json.dumps({
+                "log_message": "User provided --batch-dir without a pattern"
+            }))
+            print_error_or_warnings(text="--batch-dir requires a pattern with -up")
+            sys.exit(1)
+
+        if batch_dir is not None and getattr(args, 'batch', None) is not None:
+            logger.error(json.dumps({
+                "log_message": "User combined --batch and --batch-dir"
+            }))
+            print_error_or_warnings(text="--batch and --batch-dir cannot be used together")
+            sys.exit(1)
+
+        if (getattr(args, 'batch', None) is not None or batch_dir is not None) and args.concurrency < 1:
+            logger.error(json.dumps({
+                "log_message": f"User provided invalid batch concurrency: {args.concurrency}"
+            }))
+            print_error_or_warnings(text="--concurrency must be at least 1")
+            sys.exit(1)
+
+        chunk_tokens = getattr(args, 'chunk_tokens', None)
+        if chunk_tokens is not None and chunk_tokens < MIN_CHUNK_TOKENS:
+            logger.error(json.dumps({
+                "log_message": f"User provided invalid chunk size: {chunk_tokens}"
+            }))
+            print_error_or_warnings(text=f"--chunk-tokens must be at least {MIN_CHUNK_TOKENS}")
+            sys.exit(1)
+
         if args.plain_md and args.format != "md":
             logger.warning(json.dumps({
                 "log_message": "User used --plain-md without -f md"
@@ -5,8 +5,7 @@ Handles all CLI commands like listing, viewing systems and chats.
 
 import json
 import os
-from askai.modules.ai import OpenRouterClient
-from askai.modules.questions.processor import QuestionProcessor
+from datetime import datetime
 from askai.shared.config.loader import load_config
 from askai.shared.utils import print_error_or_warnings
 from askai.shared.config import (
@@ -15,22 +14,8 @@ from askai.shared.config import (
     get_config_path, is_test_environment, create_test_config_from_production
 )
 
-# TUI imports only for interactive mode
-try:
-    from askai.presentation.tui import is_tui_available
-    from askai.presentation.tui.apps.tabbed_tui_app import run_tabbed_tui
-    TUI_IMPORTS_AVAILABLE = True
-except ImportError:
-    TUI_IMPORTS_AVAILABLE = False
-    def is_tui_available() -> bool:
-        """
-        Fallback function when TUI imports are not available.
-
-        Returns:
-            bool: Always False when TUI dependencies are missing
-        """
-        return False
-
+# The AI client, question processor and TUI are imported inside the commands
+# that use them, so listing and viewing commands start quickly.
 
 
 class CommandHandler:
@@ -55,7 +40,15 @@ class CommandHandler:
         if not getattr(args, 'interactive', False):
             return False
 
-        if not TUI_IMPORTS_AVAILABLE or not is_tui_available():
+        # pylint: disable=import-outside-toplevel
+        from askai.presentation.tui import is_tui_available
+        try:
+            from askai.presentation.tui.apps.tabbed_tui_app import run_tabbed_tui
+            tui_imports_available = True
+        except ImportError:
+            tui_imports_available = False
+
+        if not tui_imports_available or not is_tui_available():
             print("Interactive TUI mode is not available. Falling back to CLI.")
             return False
 
@@ -66,6 +59,7 @@ class CommandHandler:
             question_processor = self.question_processor
             if question_processor is None:
                 # Create a question processor on-demand
+                from askai.modules.questions.processor import QuestionProcessor  # pylint: disable=import-outside-toplevel
                 config = load_config()
                 base_path = os.path.abspath('.')
                 question_processor = QuestionProcessor(config, self.logger, base_path)
@@ -322,6 +316,8 @@ class CommandHandler:
         if args.openrouter is None:
             return False
 
+        from askai.modules.ai import OpenRouterClient, get_credits_monitor  # pylint: disable=import-outside-toplevel
+
         command = args.openrouter[0]
         command_args = args.openrouter[1:] if len(args.openrouter) > 1 else []
 
@@ -329,7 +325,8 @@ class CommandHandler:
             self.logger.info(json.dumps({"log_message": "User requested OpenRouter credit balance"}))
             try:
                 client = OpenRouterClient(logger=self.logger)
-                credit_data = client.get_credit_balance(debug=getattr(args, 'debug', False))
+                # The process exits right away, so a stale balance is refreshed before printing
+                credit_data = client.get_credit_balance(debug=getattr(args, 'debug', False), background=False)
 
                 total_credits = credit_data.get('total_credits', 0)
                 total_usage = credit_data.get('total_usage', 0)
@@ -340,6 +337,15 @@ class CommandHandler:
                 print(f"Total Credits:     ${total_credits:.4f}")
                 print(f"Total Usage:       ${total_usage:.4f}")
                 print(f"Remaining Credits: ${remaining_credits:.4f}")
+
+                monitor = get_credits_monitor(client.config)
+                latest = monitor.latest() if monitor else None
+                if latest and latest.get("fetched_at"):
+                    updated = datetime.fromtimestamp(latest["fetched_at"]).strftime('%Y-%m-%d %H:%M:%S')
+                    print(f"Updated:           {updated}")
+                    spend_rate = monitor.spend_rate()
+                    if spend_rate is not None:
+                        print(f"Spend Rate:        ${spend_rate:.4f}/hour")
                 print("-" * 40)
 
             except Exception as e:
@@ -350,7 +356,7 @@ class CommandHandler:
             self.logger.info(json.dumps({"log_message": "User requested OpenRouter available models"}))
             try:
                 client = OpenRouterClient(logger=self.logger)
-                models = client.get_available_models(debug=getattr(args, 'debug', False))
+                models = client.get_available_models(debug=getattr(args, 'debug', False), background=False)
 
                 if not models:
                     print("No models found.")
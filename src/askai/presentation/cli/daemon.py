@@ -0,0 +1,436 @@
+"""
+Warm background daemon for the AskAI CLI.
+
+``askai --daemon`` starts a long-running process that listens on a Unix
+domain socket (``~/.askai/askai.sock``, or ``$ASKAI_DAEMON_SOCKET``). It
+imports the AI, pattern, chat and output modules once, loads the config,
+fills the pattern caches and keeps the pooled OpenRouter session open.
+
+Every later ``askai`` invocation first tries the socket. If a daemon
+answers, the CLI acts as a thin client: it forwards argv, cwd and piped
+stdin, and prints the stdout/stderr frames the daemon streams back, so
+``--stream`` output still arrives token by token. If no daemon is running
+(or ``ASKAI_NO_DAEMON`` is set), the command runs in-process as before.
+
+Commands that prompt on the terminal or take it over (interactive TUI,
+patterns, chat management, selection menus, config commands) always run
+in-process. The daemon runs one command at a time because commands
+change process-wide state (cwd, argv, standard streams); a client that
+connects while a command runs is told the daemon is busy and runs its
+command in-process, so concurrent invocations never queue behind each
+other. Piped stdin larger than MAX_FORWARDED_STDIN bytes, or not valid
+UTF-8, is not forwarded either: the command runs in-process and streams
+the input as usual.
+
+Wire format: newline-delimited JSON. On accepting a connection the daemon
+sends ``{"ready": true}`` or ``{"busy": true}``. After ``ready`` the client
+sends one request ``{"argv": [...], "cwd": "...", "stdin": "..." | null}``
+(or closes the connection to run in-process) and receives
+``{"stdout": "..."}`` / ``{"stderr": "..."}`` frames followed by
+``{"exit": code}``.
+"""
+
+import io
+import json
+import os
+import signal
+import socket
+import stat
+import sys
+import threading
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple
+
+from askai.shared.config import is_test_environment
+from askai.shared.utils import print_error_or_warnings
+
+DEFAULT_SOCKET_PATH = "~/.askai/askai.sock"
+SOCKET_PATH_ENV = "ASKAI_DAEMON_SOCKET"
+DISABLE_ENV = "ASKAI_NO_DAEMON"
+
+# Seconds to wait for a daemon to accept the connection before running in-process
+CONNECT_TIMEOUT = 0.5
+
+# Largest piped stdin (in bytes) sent to the daemon; larger input runs in-process
+MAX_FORWARDED_STDIN = 1024 * 1024
+
+
+def get_socket_path() -> str:
+    """Return the daemon socket path."""
+    return os.path.expanduser(os.environ.get(SOCKET_PATH_ENV) or DEFAULT_SOCKET_PATH)
+
+
+def can_forward(args) -> bool:
+    """Whether a parsed command can run in the daemon.
+
+    Commands that may prompt for input or need the terminal run in-process.
+    """
+    if args.interactive or args.manage_chats or args.config is not None:
+        return False
+    # Patterns may ask for inputs or confirm commands before running them
+    if args.use_pattern is not None or args.batch_dir is not None:
+        return False
+    # Without an ID these show a selection menu
+    if args.view_pattern == '' or args.view_chat == '' or args.persistent_chat == 'new':
+        return False
+    return True
+
+
+class _StreamWriter(io.TextIOBase):
+    """Text stream that sends everything written to it as a frame."""
+
+    def __init__(self, send: Callable[[Dict[str, Any]], None], name: str):
+        super().__init__()
+        self._send = send
+        self._name = name
+
+    @property
+    def encoding(self):
+        """Encoding of the frames sent to the client."""
+        return 'utf-8'
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if text:
+            self._send({self._name: text})
+        return len(text)
+
+
+class _ForwardedStdin(io.StringIO):
+    """The client's piped stdin, or an empty terminal if it had none."""
+
+    def __init__(self, data: Optional[str]):
+        super().__init__(data or '')
+        self._isatty = data is None
+
+    def isatty(self):
+        return self._isatty
+
+
+class _PrefixedReader(io.RawIOBase):
+    """Binary stream that replays bytes already read before the rest of another stream."""
+
+    def __init__(self, prefix: bytes, rest):
+        super().__init__()
+        self._prefix = memoryview(prefix)
+        self._rest = rest
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if self._prefix:
+            size = min(len(b), len(self._prefix))
+            b[:size] = self._prefix[:size]
+            self._prefix = self._prefix[size:]
+            return size
+        return self._rest.readinto(b)
+
+
+def _read_stdin(limit: int = MAX_FORWARDED_STDIN) -> Tuple[bool, Optional[str]]:
+    """Read piped stdin for forwarding, unless it is too large or not valid UTF-8.
+
+    When the input is not forwarded, sys.stdin is replaced by a stream that
+    still yields all of it, so the in-process run sees the whole input.
+
+    Returns:
+        tuple: (forward, data); data is None when stdin is a terminal
+    """
+    stdin = sys.stdin
+    if stdin is None or stdin.isatty():
+        return True, None
+    try:
+        info = os.fstat(stdin.fileno())
+        if stat.S_ISREG(info.st_mode) and info.st_size > limit:
+            return False, None
+    except (OSError, ValueError, io.UnsupportedOperation):
+        pass
+
+    buffer = getattr(stdin, 'buffer', None)
+    if buffer is None:
+        # Already a text stream in memory (e.g. set by an embedding caller)
+        data = stdin.read()
+        if len(data) <= limit:
+            return True, data
+        sys.stdin = io.StringIO(data)
+        return False, None
+
+    data = buffer.read(limit + 1)
+    if len(data) <= limit:
+        try:
+            return True, data.decode('utf-8')
+        except UnicodeDecodeError:
+            pass
+    sys.stdin = io.TextIOWrapper(io.BufferedReader(_PrefixedReader(data, buffer)),
+                                 encoding=stdin.encoding, errors=stdin.errors)
+    return False, None
+
+
+class AskAIDaemon:
+    """Serves CLI invocations from a Unix domain socket, one at a time."""
+
+    def __init__(self, entry_point: Callable[[], Any], socket_path: Optional[str] = None, logger=None):
+        """Create the daemon.
+
+        Args:
+            entry_point: Function running one CLI invocation from sys.argv (askai.main.main)
+            socket_path: Socket to listen on, defaults to get_socket_path()
+            logger: Optional logger instance
+        """
+        self.entry_point = entry_point
+        self.socket_path = socket_path or get_socket_path()
+        self.logger = logger
+        self._server: Optional[socket.socket] = None
+        self._busy = threading.Lock()
+
+    def bind(self) -> None:
+        """Create the listening socket, readable and writable by the current user only.
+
+        Raises:
+            RuntimeError: If another daemon already listens on the socket
+        """
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+                raise RuntimeError(f"An AskAI daemon is already running on {self.socket_path}")
+            except OSError:
+                # Stale socket of a daemon that did not shut down cleanly
+                os.unlink(self.socket_path)
+            finally:
+                probe.close()
+
+        os.makedirs(os.path.dirname(self.socket_path) or '.', exist_ok=True)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            server.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        server.listen(16)
+        self._server = server
+
+    def serve_forever(self) -> None:
+        """Accept and run commands until interrupted, then remove the socket.
+
+        Commands run on a worker thread, one at a time; clients connecting
+        while one runs get a busy frame and run their command in-process.
+        """
+        if self._server is None:
+            self.bind()
+        try:
+            while True:
+                self.accept()
+        finally:
+            self.close()
+
+    def accept(self) -> None:
+        """Accept one connection and start its command, or answer busy if one is running."""
+        conn, _ = self._server.accept()
+        # Released by _serve_connection once the command finished
+        if not self._busy.acquire(blocking=False):  # pylint: disable=consider-using-with
+            with conn:
+                try:
+                    _send_frame(conn, {'busy': True})
+                except OSError:
+                    pass
+            return
+        threading.Thread(target=self._serve_connection, args=(conn,), name="askai-daemon-command",
+                         daemon=True).start()
+
+    def _serve_connection(self, conn: socket.socket) -> None:
+        try:
+            with conn:
+                self.handle(conn)
+        finally:
+            self._busy.release()
+
+    def close(self) -> None:
+        """Stop listening and remove the socket file."""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+            try:
+                os.unlink(self.socket_path)
+            except OSError:
+                pass
+
+    def handle(self, conn: socket.socket) -> None:
+        """Run the command of one client connection."""
+        def send(frame):
+            _send_frame(conn, frame)
+
+        try:
+            send({'ready': True})
+            with conn.makefile('r', encoding='utf-8') as reader:
+                line = reader.readline()
+            if not line:
+                # The client decided to run the command in-process
+                return
+            request = json.loads(line)
+            argv = [str(arg) for arg in request['argv']]
+            cwd = request['cwd']
+            stdin_data = request.get('stdin')
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            if self.logger:
+                self.logger.warning(json.dumps({"log_message": "Invalid daemon request", "error": str(e)}))
+            return
+
+        try:
+            exit_code = self.run_command(argv, cwd, stdin_data, send)
+            send({'exit': exit_code})
+        except OSError as e:
+            # The client went away; nothing left to report to
+            if self.logger:
+                self.logger.info(json.dumps({"log_message": "Daemon client disconnected", "error": str(e)}))
+
+    def run_command(self, argv: List[str], cwd: str, stdin_data: Optional[str],
+                    send: Callable[[Dict[str, Any]], None]) -> int:
+        """Run the CLI entry point with the client's argv, cwd and streams.
+
+        Returns:
+            int: Exit code of the command
+        """
+        saved = (os.getcwd(), sys.argv, sys.stdin, sys.stdout, sys.stderr)
+        stdout = _StreamWriter(send, 'stdout')
+        stderr = _StreamWriter(send, 'stderr')
+        exit_code = 0
+        try:
+            os.chdir(cwd)
+            sys.argv = ['askai'] + argv
+            sys.stdin = _ForwardedStdin(stdin_data)
+            sys.stdout, sys.stderr = stdout, stderr
+            try:
+                self.entry_point()
+            except SystemExit as e:
+                if isinstance(e.code, int):
+                    exit_code = e.code
+                elif e.code is not None:
+                    print(e.code, file=stderr)
+                    exit_code = 1
+            except EOFError:
+                # A prompt found no input; the client gets an error instead of a hang
+                print_error_or_warnings("This command needs a terminal; run it with ASKAI_NO_DAEMON=1")
+                exit_code = 1
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                print_error_or_warnings(f"Daemon command failed: {e}")
+                exit_code = 1
+        finally:
+            os.chdir(saved[0])
+            sys.argv, sys.stdin, sys.stdout, sys.stderr = saved[1:]
+        return exit_code
+
+
+def _send_frame(conn: socket.socket, frame: Dict[str, Any]) -> None:
+    conn.sendall((json.dumps(frame) + '\n').encode('utf-8'))
+
+
+def _connect(socket_path: str) -> Optional[Tuple[socket.socket, IO[str]]]:
+    """Connect to a daemon that is ready to run a command.
+
+    Returns:
+        Optional[tuple]: The socket and a reader for its frames, or None if no
+            daemon answered in time or it is busy with another command
+    """
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    conn.settimeout(CONNECT_TIMEOUT)
+    reader = None
+    try:
+        conn.connect(socket_path)
+        reader = conn.makefile('r', encoding='utf-8')
+        greeting = json.loads(reader.readline() or 'null')
+        if isinstance(greeting, dict) and greeting.get('ready'):
+            conn.settimeout(None)
+            return conn, reader
+    except (OSError, ValueError):
+        pass
+    # No daemon, or another command is running in it
+    if reader is not None:
+        reader.close()
+    conn.close()
+    return None
+
+
+def forward(argv: List[str], socket_path: Optional[str] = None) -> Optional[int]:
+    """Run a command in a running daemon and print its output.
+
+    Args:
+        argv: Command line arguments (without the program name)
+        socket_path: Socket of the daemon, defaults to get_socket_path()
+
+    Returns:
+        Optional[int]: Exit code of the command, or None if no daemon is available
+            and the command should run in-process
+    """
+    socket_path = socket_path or get_socket_path()
+    if (not hasattr(socket, 'AF_UNIX') or os.environ.get(DISABLE_ENV) or is_test_environment()
+            or not os.path.exists(socket_path)):
+        return None
+    connection = _connect(socket_path)
+    if connection is None:
+        return None
+
+    conn, reader = connection
+    with conn, reader:
+        # Only read stdin once a daemon accepted, so the in-process fallback still has it
+        forwardable, stdin_data = _read_stdin()
+        if not forwardable:
+            return None
+        request = {'argv': argv, 'cwd': os.getcwd(), 'stdin': stdin_data}
+
+        try:
+            _send_frame(conn, request)
+            for line in reader:
+                frame = json.loads(line)
+                if 'exit' in frame:
+                    return frame['exit']
+                for name, stream in (('stdout', sys.stdout), ('stderr', sys.stderr)):
+                    if name in frame:
+                        stream.write(frame[name])
+                        stream.flush()
+        except (OSError, ValueError) as e:
+            print_error_or_warnings(f"Lost connection to the AskAI daemon: {e}")
+            return 1
+
+    print_error_or_warnings("The AskAI daemon closed the connection before the command finished")
+    return 1
+
+
+def serve(entry_point: Callable[[], Any], warm_up: Optional[Callable[[], Any]] = None,
+          socket_path: Optional[str] = None) -> int:
+    """Run the daemon in the foreground until SIGINT/SIGTERM.
+
+    Args:
+        entry_point: Function running one CLI invocation from sys.argv
+        warm_up: Optional function that imports and initializes shared state once;
+            returns the logger to use
+        socket_path: Socket to listen on, defaults to get_socket_path()
+
+    Returns:
+        int: Exit code
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        print_error_or_warnings("The AskAI daemon needs Unix domain sockets, which this platform lacks")
+        return 1
+
+    # Commands run by the daemon must not forward to the daemon again
+    os.environ[DISABLE_ENV] = '1'
+    logger = warm_up() if warm_up else None
+
+    daemon = AskAIDaemon(entry_point, socket_path, logger)
+    try:
+        daemon.bind()
+    except (RuntimeError, OSError) as e:
+        print_error_or_warnings(str(e))
+        return 1
+
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print(f"AskAI daemon listening on {daemon.socket_path} (Ctrl+C to stop)", file=sys.stderr)
+    if logger:
+        logger.info(json.dumps({"log_message": "AskAI daemon listening", "socket_path": daemon.socket_path}))
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
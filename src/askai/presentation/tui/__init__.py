@@ -6,17 +6,13 @@ chat browsing, and other AskAI features. It gracefully falls back to the traditi
 CLI interface when Textual is unavailable or the terminal is incompatible.
 """
 
+import importlib.util
 import os
 import sys
 
-try:
-    import textual  # noqa: F401 # pylint: disable=unused-import # type: ignore[reportUnusedImport]
-    TEXTUAL_AVAILABLE = True
-    # Store reference to avoid unused import warning
-    _TEXTUAL_MODULE = textual
-except ImportError:
-    TEXTUAL_AVAILABLE = False
-    _TEXTUAL_MODULE = None
+# Only check that Textual is installed; importing it takes long enough to
+# slow down every CLI start, so it is imported when a TUI is launched.
+TEXTUAL_AVAILABLE = importlib.util.find_spec('textual') is not None
 
 
 def is_tui_available() -> bool:
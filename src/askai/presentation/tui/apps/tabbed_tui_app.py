@@ -6,8 +6,10 @@ Each tab is now a separate, reusable component.
 
 from typing import TYPE_CHECKING
 
+from askai.modules.ai import close_async_http_clients
+
 # Import our components and common styles
-from ..common import COMMON_STYLES
+from ..common import COMMON_STYLES, work
 from ..components import QuestionTab, PatternTab, ChatTab, ModelTab, CreditsTab
 
 try:
@@ -229,6 +231,10 @@ if TEXTUAL_AVAILABLE:
             if hasattr(self, 'credits_tab') and self.credits_tab:
                 await self.credits_tab.initialize()
 
+        async def on_unmount(self) -> None:
+            """Close the connections the tabs shared on the app's event loop."""
+            await close_async_http_clients()
+
         # Message handlers for component interactions
         async def on_question_tab_question_submitted(self, event) -> None:
             """Handle question submission from QuestionTab."""
@@ -265,23 +271,46 @@ if TEXTUAL_AVAILABLE:
 
                 args = SimpleArgs(question_data)
 
-                # Process the question
-                response = self.question_processor.process_question(args)
-
-                if response and response.content:
-                    # Display the answer
-                    if self.question_tab:
-                        self.question_tab.display_answer(response.content)
-                        self.question_tab.update_status("✅ Question processed successfully!")
-                else:
-                    if self.question_tab:
-                        self.question_tab.update_status("❌ No response received")
+                # Run the model call off the event loop and stream into the answer panel
+                if self.question_tab:
+                    self.question_tab.begin_streaming_answer()
+                self._process_question_worker(args)
 
             except Exception as e:
                 if self.question_tab:
                     self.question_tab.update_status(f"❌ Error processing question: {str(e)}")
                     self.question_tab.display_answer(f"Error: {str(e)}")
 
+        @work(thread=True, exclusive=True, group="question")
+        def _process_question_worker(self, args) -> None:
+            """Process a question in a worker thread, streaming deltas to the UI."""
+            def on_delta(delta):
+                if self.question_tab:
+                    self.call_from_thread(self.question_tab.append_answer, delta)
+
+            try:
+                response = self.question_processor.process_question(args, on_delta=on_delta)
+                self.call_from_thread(self._show_question_response, response)
+            except Exception as e:
+                self.call_from_thread(self._show_question_error, e)
+
+        def _show_question_response(self, response) -> None:
+            """Display the final question response."""
+            if not self.question_tab:
+                return
+            if response and response.content:
+                # Replace the raw stream with the formatted answer
+                self.question_tab.display_answer(response.content)
+                self.question_tab.update_status("✅ Question processed successfully!")
+            else:
+                self.question_tab.update_status("❌ No response received")
+
+        def _show_question_error(self, error: Exception) -> None:
+            """Display a question processing error."""
+            if self.question_tab:
+                self.question_tab.update_status(f"❌ Error processing question: {str(error)}")
+                self.question_tab.display_answer(f"Error: {str(error)}")
+
         async def on_pattern_tab_pattern_selected(self, event) -> None:
             """Handle pattern selection from PatternTab."""
             pattern_data = event.pattern_data
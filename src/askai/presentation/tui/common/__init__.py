@@ -6,7 +6,7 @@ Common package for shared TUI utilities and imports.
 from .textual_imports import (
     TEXTUAL_AVAILABLE, TEXTUAL_EXTENDED_AVAILABLE, TEXTUAL_SCREEN_AVAILABLE,
     Static, Button, ListView, ListItem, Label,
-    TextArea, Input, Select, ProgressBar,
+    TextArea, Input, Select, ProgressBar, OptionList, Option,
     Vertical, Horizontal, VerticalScroll,
     Message, ModalScreen, work
 )
@@ -26,7 +26,7 @@ __all__ = [
     # Textual imports
     'TEXTUAL_AVAILABLE', 'TEXTUAL_EXTENDED_AVAILABLE', 'TEXTUAL_SCREEN_AVAILABLE',
     'Static', 'Button', 'ListView', 'ListItem', 'Label',
-    'TextArea', 'Input', 'Select', 'ProgressBar',
+    'TextArea', 'Input', 'Select', 'ProgressBar', 'OptionList', 'Option',
     'Vertical', 'Horizontal', 'VerticalScroll',
     'Message', 'ModalScreen', 'work',
     # Utilities
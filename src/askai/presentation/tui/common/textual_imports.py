@@ -25,7 +25,8 @@ except ImportError:
 
 # Extended imports for more complex components
 try:
-    from textual.widgets import TextArea, Input, Select, ProgressBar
+    from textual.widgets import TextArea, Input, Select, ProgressBar, OptionList
+    from textual.widgets.option_list import Option
     from textual.containers import VerticalScroll
     TEXTUAL_EXTENDED_AVAILABLE = True
 except ImportError:
@@ -35,6 +36,8 @@ except ImportError:
         Input = object
         Select = object
         ProgressBar = object
+        OptionList = object
+        Option = object
         VerticalScroll = object
 
 # Screen-related imports
@@ -54,8 +57,9 @@ except ImportError:
 if TYPE_CHECKING:
     from textual.widgets import (
         Static, Button, ListView, ListItem, Label,
-        TextArea, Input, Select, ProgressBar
+        TextArea, Input, Select, ProgressBar, OptionList
     )
+    from textual.widgets.option_list import Option
     from textual.containers import Vertical, Horizontal, VerticalScroll
     from textual.message import Message
     from textual.screen import ModalScreen
@@ -63,7 +67,7 @@ if TYPE_CHECKING:
 __all__ = [
     'TEXTUAL_AVAILABLE', 'TEXTUAL_EXTENDED_AVAILABLE', 'TEXTUAL_SCREEN_AVAILABLE',
     'Static', 'Button', 'ListView', 'ListItem', 'Label',
-    'TextArea', 'Input', 'Select', 'ProgressBar',
+    'TextArea', 'Input', 'Select', 'ProgressBar', 'OptionList', 'Option',
     'Vertical', 'Horizontal', 'VerticalScroll',
     'Message', 'ModalScreen', 'work'
 ]
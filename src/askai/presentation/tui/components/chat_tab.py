@@ -94,8 +94,7 @@ class ChatTab(BaseTabComponent, StatusMixin):
                 self.chat_list.append(list_item)
 
             # Add corrupted files
-            for corrupted in corrupted_files:
-                filename = corrupted.get('filename', 'Unknown')
+            for filename in corrupted_files:
                 label = f"🚫 {filename} (corrupted)"
                 list_item = ListItem(Label(label), name=f"corrupted_{filename}")
                 self.chat_list.append(list_item)
@@ -123,9 +122,11 @@ class ChatTab(BaseTabComponent, StatusMixin):
             return
 
         try:
-            # Get chat details
-            chats = self.chat_manager.list_chats()
-            selected_chat = next((c for c in chats if c.get('chat_id') == chat_id), None)
+            # Get chat details without listing every chat
+            try:
+                selected_chat = self.chat_manager.get_chat_info(chat_id)
+            except ValueError:
+                selected_chat = None
 
             if selected_chat:
                 self.selected_chat = selected_chat
@@ -9,14 +9,14 @@ from .base_tab import BaseTabComponent
 
 from ..common import (
     Static, Button, ProgressBar, Vertical, Horizontal,
-    VerticalScroll, StatusMixin
+    VerticalScroll, StatusMixin, work
 )
 
 try:
-    from askai.modules.ai import OpenRouterClient
+    from askai.modules.ai import AsyncOpenRouterClient
 except ImportError:
     if not TYPE_CHECKING:
-        OpenRouterClient = object
+        AsyncOpenRouterClient = object
 
         def load_config():
             """Fallback config loader."""
@@ -25,7 +25,10 @@ except ImportError:
 if TYPE_CHECKING:
     from textual.widgets import Static, Button, ProgressBar
     from textual.containers import Vertical, Horizontal, VerticalScroll
-    from askai.modules.ai import OpenRouterClient
+    from askai.modules.ai import AsyncOpenRouterClient
+
+# How often the tab re-reads the balance kept fresh by the background poller
+DISPLAY_REFRESH_SECONDS = 30
 
 
 class CreditsTab(BaseTabComponent, StatusMixin):
@@ -36,13 +39,14 @@ class CreditsTab(BaseTabComponent, StatusMixin):
         super().__init__("Credits", *args, **kwargs)
         self.openrouter_client = None
         self.credit_data = None
+        self.credits_monitor = None
         self._initialize_openrouter_client()
 
     def _initialize_openrouter_client(self):
         """Initialize the OpenRouter client with configuration."""
         try:
-            # Use the same pattern as CLI - let OpenRouterClient load its own config
-            self.openrouter_client = OpenRouterClient()
+            # Use the same pattern as CLI - let the client load its own config
+            self.openrouter_client = AsyncOpenRouterClient()
         except Exception:
             self.openrouter_client = None
 
@@ -86,11 +90,32 @@ class CreditsTab(BaseTabComponent, StatusMixin):
         yield Static("✅ Ready to check credits", id="status-display", classes="status-text")
 
     async def initialize(self):
-        """Initialize the credits tab."""
+        """Initialize the credits tab and start polling the balance in the background."""
         self.call_after_refresh(self._load_credits)
-
-    def _load_credits(self):
-        """Load credit information from OpenRouter API."""
+        if self.openrouter_client:
+            self.credits_monitor = self.openrouter_client.start_credit_polling()
+            if self.credits_monitor:
+                self.set_interval(DISPLAY_REFRESH_SECONDS, self._show_cached_credits)
+
+    def on_unmount(self) -> None:
+        """Stop the background poller with the tab."""
+        if self.credits_monitor:
+            self.credits_monitor.stop_polling()
+
+    def _show_cached_credits(self):
+        """Show the latest polled balance if it changed."""
+        latest = self.credits_monitor.latest()
+        if latest and latest["data"] != self.credit_data:
+            self.credit_data = latest["data"]
+            self._update_credit_display()
+
+    @work(exclusive=True, group="credits")
+    async def _load_credits(self, refresh=False):
+        """Load credit information from OpenRouter API without blocking the UI.
+
+        Args:
+            refresh: Fetch the balance instead of using the cached one
+        """
         try:
             status_display = self.query_one("#status-display", Static)
             status_display.update("🔄 Loading credit information...")
@@ -102,7 +127,7 @@ class CreditsTab(BaseTabComponent, StatusMixin):
 
             try:
                 # Load credit data from OpenRouter API
-                self.credit_data = self.openrouter_client.get_credit_balance()
+                self.credit_data = await self.openrouter_client.get_credit_balance(refresh=refresh)
 
                 if self.credit_data and ('total_credits' in self.credit_data or 'data' in self.credit_data):
                     self._update_credit_display()
@@ -190,11 +215,21 @@ class CreditsTab(BaseTabComponent, StatusMixin):
                 account_status.update("⚠️  Low Balance - Add Credits Soon")
 
             last_updated = self.query_one("#last-updated", Static)
-            last_updated.update(f"Last Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+            last_updated.update(self._describe_freshness())
 
         except Exception:
             pass  # Widget not available yet
 
+    def _describe_freshness(self):
+        """Describe when the balance was fetched and the recent spend rate."""
+        latest = self.credits_monitor.latest() if self.credits_monitor else None
+        fetched_at = datetime.fromtimestamp(latest["fetched_at"]) if latest else datetime.now()
+        text = f"Last Updated: {fetched_at.strftime('%Y-%m-%d %H:%M:%S')}"
+        spend_rate = self.credits_monitor.spend_rate() if self.credits_monitor else None
+        if spend_rate is not None:
+            text += f"\nSpend Rate: ${spend_rate:.4f}/hour"
+        return text
+
     def _show_error_state(self):
         """Show error state when credit data cannot be loaded."""
         try:
@@ -216,7 +251,7 @@ class CreditsTab(BaseTabComponent, StatusMixin):
     async def on_button_pressed(self, event) -> None:
         """Handle button presses."""
         if event.button.id == "refresh-credits-button":
-            self._load_credits()
+            self._load_credits(refresh=True)
         elif event.button.id == "usage-history-button":
             # Placeholder for future usage history functionality
             status_display = self.query_one("#status-display", Static)
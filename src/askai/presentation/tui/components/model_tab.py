@@ -3,25 +3,31 @@ Model Browser Tab Component.
 Handles AI model browsing and selection.
 """
 
+import functools
 from typing import TYPE_CHECKING
 from .base_tab import BaseTabComponent
 
 from ..common import (
-    Static, Button, ListView, ListItem, Label, Input,
-    Vertical, Horizontal, VerticalScroll, Message, StatusMixin
+    Static, Button, OptionList, Option, Input,
+    Vertical, Horizontal, VerticalScroll, Message, StatusMixin, work
 )
 
 try:
-    from askai.modules.ai import OpenRouterClient
+    from askai.modules.ai import AsyncOpenRouterClient, ModelSearchIndex
 except ImportError:
     if not TYPE_CHECKING:
-        OpenRouterClient = object
+        AsyncOpenRouterClient = object
+        ModelSearchIndex = None
 
 if TYPE_CHECKING:
-    from textual.widgets import Static, Button, ListView, ListItem, Label, Input
+    from textual.widgets import Static, Button, OptionList, Input
+    from textual.widgets.option_list import Option
     from textual.containers import Vertical, Horizontal, VerticalScroll
     from textual.message import Message
-    from askai.modules.ai import OpenRouterClient
+    from askai.modules.ai import AsyncOpenRouterClient, ModelSearchIndex
+
+# Pause in typing before the search is applied
+SEARCH_DEBOUNCE_SECONDS = 0.15
 
 
 class ModelTab(BaseTabComponent, StatusMixin):
@@ -40,6 +46,8 @@ class ModelTab(BaseTabComponent, StatusMixin):
         self.models_data = []  # Store the full model data from OpenRouter
         self.selected_model = None
         self.filter_text = ""
+        self.search_index = None
+        self._search_timer = None
         self.openrouter_client = None
         self._initialize_openrouter_client()
 
@@ -58,7 +66,7 @@ class ModelTab(BaseTabComponent, StatusMixin):
 
                 # Scrollable model list container with border
                 with VerticalScroll(id="model-list-scroll", classes="pattern-list-box"):
-                    yield ListView(id="model-list")
+                    yield OptionList(id="model-list")
 
                 # Action buttons
                 with Horizontal(classes="button-row"):
@@ -83,14 +91,15 @@ class ModelTab(BaseTabComponent, StatusMixin):
     def _initialize_openrouter_client(self):
         """Initialize the OpenRouter client with configuration."""
         try:
-            # Use the same pattern as CLI - let OpenRouterClient load its own config
-            self.openrouter_client = OpenRouterClient()
+            # Use the same pattern as CLI - let the client load its own config
+            self.openrouter_client = AsyncOpenRouterClient()
         except Exception:
             self.openrouter_client = None
             # We'll handle this in the UI by showing an error message
 
-    def _load_models(self):
-        """Load models into the list."""
+    @work(exclusive=True, group="models")
+    async def _load_models(self):
+        """Load models into the list without blocking the UI."""
         try:
             # Query for the widgets using their IDs
             status_display = self.query_one("#status-display", Static)
@@ -103,10 +112,9 @@ class ModelTab(BaseTabComponent, StatusMixin):
 
             # Load models from OpenRouter API
             try:
-                models_data = self.openrouter_client.get_available_models()
+                models_data = await self.openrouter_client.get_available_models()
                 if models_data:
-                    self.models_data = models_data
-                    self._update_model_list(models_data)
+                    self._set_models(models_data)
                     status_display.update(f"✅ Loaded {len(models_data)} models from OpenRouter")
                 else:
                     status_display.update("❌ No models available from OpenRouter")
@@ -154,15 +162,17 @@ class ModelTab(BaseTabComponent, StatusMixin):
             }
         ]
 
-        self.models_data = fallback_models
-        self._update_model_list(fallback_models)
+        self._set_models(fallback_models)
         status_display.update(f"⚠️ Using fallback models ({len(fallback_models)} available)")
 
     def _update_model_list(self, models):
-        """Update the model list display."""
+        """Update the model list display.
+
+        The OptionList renders only the rows scrolled into view.
+        """
         try:
-            model_list = self.query_one("#model-list", ListView)
-            model_list.clear()
+            model_list = self.query_one("#model-list", OptionList)
+            options = []
 
             for model in models:
                 model_id = model.get('id', 'unknown')
@@ -176,32 +186,42 @@ class ModelTab(BaseTabComponent, StatusMixin):
                     context_str = str(context)
 
                 label = f"🤖 {name} ({context_str} ctx)"
-                list_item = ListItem(Label(label), name=model_id)
-                model_list.append(list_item)
+                options.append(Option(label, id=model_id))
+
+            model_list.clear_options()
+            model_list.add_options(options)
         except Exception:
             pass  # Widget not available yet
 
+    def _set_models(self, models):
+        """Store the models, index them for search and show them."""
+        self.models_data = models
+        if ModelSearchIndex is None:
+            self._update_model_list(models)
+            return
+        self.search_index = ModelSearchIndex(models)
+        self._update_model_list(self.search_index.search(self.filter_text))
+
     async def on_input_changed(self, event) -> None:
-        """Handle search input changes."""
+        """Handle search input changes once typing pauses."""
         if event.input.id == "model-search":
-            search_term = event.value.lower()
-            if search_term:
-                filtered_models = [
-                    model for model in self.models_data
-                    if search_term in model.get('name', '').lower() or
-                       search_term in model.get('id', '').lower() or
-                       search_term in model.get('description', '').lower()
-                ]
-            else:
-                filtered_models = self.models_data
-
-            self._update_model_list(filtered_models)
-
-    async def on_list_view_selected(self, event) -> None:
+            if self._search_timer is not None:
+                self._search_timer.stop()
+            self._search_timer = self.set_timer(
+                SEARCH_DEBOUNCE_SECONDS, functools.partial(self._apply_search, event.value)
+            )
+
+    def _apply_search(self, search_term):
+        """Show the models matching every word of the search as a word prefix."""
+        self._search_timer = None
+        self.filter_text = search_term
+        if self.search_index is not None:
+            self._update_model_list(self.search_index.search(search_term))
+
+    async def on_option_list_option_selected(self, event) -> None:
         """Handle model selection."""
-        if event.list_view.id == "model-list" and event.item:
-            model_id = event.item.name
-            await self._display_model_info(model_id)
+        if event.option_list.id == "model-list" and event.option.id:
+            await self._display_model_info(event.option.id)
 
     async def _display_model_info(self, model_id: str):
         """Display information about the selected model."""
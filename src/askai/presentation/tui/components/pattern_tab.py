@@ -42,6 +42,10 @@ class PatternTab(BaseTabComponent, StatusMixin):
             with Vertical(classes="pattern-list-panel"):
                 yield Static("Available Patterns", classes="panel-subtitle")
 
+                # Search input
+                yield Static("Search:")
+                yield Input(placeholder="Search patterns...", id="pattern-search")
+
                 # Scrollable pattern list container with border
                 with VerticalScroll(id="pattern-list-scroll", classes="pattern-list-box"):
                     yield ListView(id="pattern-list")
@@ -71,8 +75,8 @@ class PatternTab(BaseTabComponent, StatusMixin):
         # Use call_after_refresh to ensure widgets are properly mounted
         self.call_after_refresh(self._load_patterns)
 
-    def _load_patterns(self):
-        """Load patterns into the list."""
+    def _load_patterns(self, query: Optional[str] = None):
+        """Load patterns into the list, optionally filtered by a search query."""
         if not self.pattern_manager:
             return
 
@@ -81,7 +85,10 @@ class PatternTab(BaseTabComponent, StatusMixin):
             pattern_list = self.query_one("#pattern-list", ListView)
             status_display = self.query_one("#status-display", Static)
 
-            patterns = self.pattern_manager.list_patterns()
+            if query:
+                patterns = self.pattern_manager.search_patterns(query)['patterns']
+            else:
+                patterns = self.pattern_manager.list_patterns()
             pattern_list.clear()
 
             for pattern in patterns:
@@ -98,7 +105,10 @@ class PatternTab(BaseTabComponent, StatusMixin):
                 self.patterns_data[pattern_id] = pattern
                 pattern_list.append(list_item)
 
-            status_display.update(f"✅ Loaded {len(patterns)} patterns")
+            if query:
+                status_display.update(f"✅ Found {len(patterns)} patterns matching '{query}'")
+            else:
+                status_display.update(f"✅ Loaded {len(patterns)} patterns")
 
         except Exception as e:
             try:
@@ -107,6 +117,11 @@ class PatternTab(BaseTabComponent, StatusMixin):
             except Exception:
                 pass  # Widget not available yet
 
+    async def on_input_changed(self, event) -> None:
+        """Handle search input changes."""
+        if event.input.id == "pattern-search":
+            self._load_patterns(event.value.strip())
+
     async def on_list_view_selected(self, event: ListView.Selected) -> None:
         """Handle pattern selection."""
         try:
@@ -154,10 +169,10 @@ class PatternTab(BaseTabComponent, StatusMixin):
             if self.pattern_manager:
                 pattern_content = self.pattern_manager.get_pattern_content(pattern_id)
                 if pattern_content:
-                    # Get description from pattern content first, fallback to pattern metadata
+                    # Get description from pattern content first, fallback to the index entry
                     description = pattern_content.get(
                         'description',
-                        pattern.get('description', 'No description available')
+                        pattern.get('description') or 'No description available'
                     )
                     inputs = pattern_content.get('inputs', [])
                     outputs = pattern_content.get('outputs', [])
@@ -259,7 +274,11 @@ class PatternTab(BaseTabComponent, StatusMixin):
         if event.button.id == "execute-pattern-button":
             await self._execute_pattern()
         elif event.button.id == "refresh-button":
-            self._load_patterns()
+            try:
+                query = self.query_one("#pattern-search", Input).value.strip()
+            except Exception:
+                query = None
+            self._load_patterns(query)
 
     async def _execute_pattern(self) -> None:
         """Execute the selected pattern with collected input values."""
@@ -29,6 +29,7 @@ class QuestionTab(BaseTabComponent, StatusMixin):
     def __init__(self, *args, question_processor=None, **kwargs):
         super().__init__("Question Builder", *args, **kwargs)
         self.question_processor = question_processor
+        self._answer_chunks = []
 
     def compose(self):
         """Compose the question builder interface."""
@@ -140,3 +141,17 @@ class QuestionTab(BaseTabComponent, StatusMixin):
             answer_display.update(answer)
         except Exception:
             pass
+
+    def begin_streaming_answer(self) -> None:
+        """Reset the answer panel before streamed deltas arrive."""
+        self._answer_chunks = []
+        self.display_answer("")
+
+    def append_answer(self, delta: str) -> None:
+        """Append a streamed delta to the answer panel."""
+        self._answer_chunks.append(delta)
+        self.display_answer("".join(self._answer_chunks))
+        try:
+            self.query_one("#answer-scroll", VerticalScroll).scroll_end(animate=False)
+        except Exception:
+            pass
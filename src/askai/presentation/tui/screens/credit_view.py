@@ -1,11 +1,14 @@
 """Credit balance view screen for the TUI."""
 
+from datetime import datetime
+
 from textual.app import ComposeResult
 from textual.containers import Horizontal, Container
 from textual.widgets import Header, Footer, Static, Button
 from textual.binding import Binding
 
-from askai.modules.ai.openrouter_client import OpenRouterClient
+from askai.modules.ai.async_openrouter_client import AsyncOpenRouterClient
+from askai.modules.ai.credits_monitor import get_credits_monitor
 from askai.presentation.tui.styles.styled_components import StyledStatic
 from askai.presentation.tui.screens.base_screen import BaseScreen
 
@@ -73,6 +76,7 @@ class CreditViewScreen(BaseScreen):
     def __init__(self):
         super().__init__()
         self.credit_data = None
+        self.credits_monitor = None
 
     def compose(self) -> ComposeResult:
         """Create child widgets for the app."""
@@ -97,10 +101,14 @@ class CreditViewScreen(BaseScreen):
 
     async def action_refresh(self) -> None:
         """Refresh credit data."""
-        await self.load_credit_data()
+        await self.load_credit_data(refresh=True)
 
-    async def load_credit_data(self) -> None:
-        """Load credit balance data from OpenRouter."""
+    async def load_credit_data(self, refresh: bool = False) -> None:
+        """Load credit balance data from OpenRouter.
+
+        Args:
+            refresh: Fetch the balance instead of using the cached one
+        """
         try:
             content_widget = self.query_one("#credit-content", Static)
             content_widget.update("[cyan]Loading credit information...[/cyan]")
@@ -108,8 +116,9 @@ class CreditViewScreen(BaseScreen):
             content_widget.add_class("loading-text")
 
             # Create OpenRouter client
-            client = OpenRouterClient()
-            self.credit_data = client.get_credit_balance()
+            async with AsyncOpenRouterClient() as client:
+                self.credit_data = await client.get_credit_balance(refresh=refresh)
+                self.credits_monitor = get_credits_monitor(client.config)
 
             # Format the credit information
             await self.display_credit_info()
@@ -135,6 +144,13 @@ class CreditViewScreen(BaseScreen):
         filled_length = int(bar_length * usage_percentage / 100)
         progress_bar = "█" * filled_length + "░" * (bar_length - filled_length)
 
+        latest = self.credits_monitor.latest() if self.credits_monitor else None
+        last_updated = "Just now"
+        if latest:
+            last_updated = datetime.fromtimestamp(latest["fetched_at"]).strftime('%Y-%m-%d %H:%M:%S')
+        spend_rate = self.credits_monitor.spend_rate() if self.credits_monitor else None
+        spend_rate_line = f"\n  Spend Rate:        ${spend_rate:.4f}/hour" if spend_rate is not None else ""
+
         # Create detailed credit display with better formatting
         credit_display = f"""
 [bold cyan]OpenRouter Account Information[/bold cyan]
@@ -151,7 +167,7 @@ class CreditViewScreen(BaseScreen):
 
   Progress: [{progress_bar}] {usage_percentage:.1f}%
 
-  Credits Used:      {total_usage:.4f} / {total_credits:.4f}
+  Credits Used:      {total_usage:.4f} / {total_credits:.4f}{spend_rate_line}
 
 [bold cyan]Account Details[/bold cyan]
   • Credit value is in USD
@@ -161,7 +177,7 @@ class CreditViewScreen(BaseScreen):
 
 [green]━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━[/green]
 
-[dim]Last updated: Just now[/dim]
+[dim]Last updated: {last_updated}[/dim]
         """.strip()
 
         content_widget = self.query_one("#credit-content", Static)
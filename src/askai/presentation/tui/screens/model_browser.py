@@ -1,17 +1,30 @@
 """Model browser screen for the TUI."""
 
+import functools
+
 from textual.app import ComposeResult
 from textual.containers import Vertical, Horizontal, Container
-from textual.widgets import Header, Footer, Static, Input, ListView, ListItem, Label, RichLog
+from textual.widgets import Header, Footer, Static, Input, OptionList, RichLog
+from textual.widgets.option_list import Option
 from textual.binding import Binding
 
-from askai.modules.ai.openrouter_client import OpenRouterClient
+from askai.modules.ai.async_openrouter_client import AsyncOpenRouterClient
+from askai.modules.ai.model_catalog import ModelSearchIndex
 from askai.presentation.tui.styles.styled_components import StyledButton, StyledStatic, StyledInput
 from askai.presentation.tui.screens.base_screen import BaseScreen
 
 
+# Pause in typing before the filter is applied
+FILTER_DEBOUNCE_SECONDS = 0.15
+
+
 class ModelBrowserScreen(BaseScreen):
-    """Screen for browsing and filtering OpenRouter models."""
+    """Screen for browsing and filtering OpenRouter models.
+
+    The list is an OptionList, which renders only the visible rows, and the
+    filter runs against a token index built once per load, after typing
+    pauses for FILTER_DEBOUNCE_SECONDS.
+    """
 
     BINDINGS = BaseScreen.BINDINGS + [
         Binding("r", "refresh", "Refresh", show=True),
@@ -116,7 +129,7 @@ class ModelBrowserScreen(BaseScreen):
             overflow-y: auto;
         }
 
-        ListView {
+        OptionList {
             overflow-x: hidden;
             overflow-y: auto;
             height: 1fr;
@@ -181,6 +194,8 @@ class ModelBrowserScreen(BaseScreen):
         self.filtered_models = []
         self.selected_model = None
         self.model_index_map = {}  # Maps list item index to model data
+        self.search_index = ModelSearchIndex([])
+        self._filter_timer = None
 
     def compose(self) -> ComposeResult:
         """Create child widgets for the app."""
@@ -200,7 +215,7 @@ class ModelBrowserScreen(BaseScreen):
                     # Status as small caption above the list
                     yield Static("[cyan]Models: Loading...[/cyan]", id="status", classes="status-caption")
 
-                    yield ListView(id="model-list", classes="model-list")
+                    yield OptionList(id="model-list", classes="model-list")
 
                     # Buttons moved to left panel
                     with Horizontal(classes="button-container"):
@@ -229,7 +244,7 @@ class ModelBrowserScreen(BaseScreen):
 
     async def action_refresh(self) -> None:
         """Refresh model data."""
-        await self.load_models()
+        await self.load_models(refresh=True)
 
     async def action_focus_search(self) -> None:
         """Focus the filter input."""
@@ -238,26 +253,30 @@ class ModelBrowserScreen(BaseScreen):
 
     async def action_select_model(self) -> None:
         """Select the currently highlighted model."""
-        model_list = self.query_one("#model-list", ListView)
-        if model_list.highlighted_child:
+        model_list = self.query_one("#model-list", OptionList)
+        if model_list.highlighted is not None:
             # Get the highlighted index and trigger selection manually
-            selected_index = model_list.index
-            model_data = self.model_index_map.get(selected_index)
+            model_data = self.model_index_map.get(model_list.highlighted)
             if model_data:
                 self.selected_model = model_data
                 await self.display_model_details()
 
-    async def load_models(self) -> None:
-        """Load available models from OpenRouter."""
+    async def load_models(self, refresh: bool = False) -> None:
+        """Load available models from OpenRouter.
+
+        Args:
+            refresh: Revalidate the cached model catalogue first
+        """
         try:
             status_widget = self.query_one("#status", Static)
             status_widget.update("[cyan]Models: Loading...[/cyan]")
             status_widget.add_class("loading-text")
 
             # Create OpenRouter client
-            client = OpenRouterClient()
-            self.models = client.get_available_models()
-            self.filtered_models = self.models.copy()
+            async with AsyncOpenRouterClient() as client:
+                self.models = await client.get_available_models(refresh=refresh)
+            self.search_index = ModelSearchIndex(self.models)
+            self.filtered_models = self.search_index.search(self.query_one("#model-filter", Input).value)
 
             await self.populate_model_list()
 
@@ -277,11 +296,10 @@ class ModelBrowserScreen(BaseScreen):
 
     async def populate_model_list(self) -> None:
         """Populate the model list with filtered models."""
-        model_list = self.query_one("#model-list", ListView)
-        await model_list.clear()
-        self.model_index_map.clear()
+        model_list = self.query_one("#model-list", OptionList)
+        options = []
 
-        for index, model in enumerate(self.filtered_models):
+        for model in self.filtered_models:
             model_id = model.get('id', 'Unknown')
             model_name = model.get('name', model_id)
 
@@ -294,9 +312,12 @@ class ModelBrowserScreen(BaseScreen):
                 else:
                     display_name += f"\n{model_name[:47]}..."
 
-            list_item = ListItem(Label(display_name), classes="model-item")
-            self.model_index_map[index] = model
-            await model_list.append(list_item)
+            options.append(Option(display_name))
+
+        # One bulk update; rows are rendered only when scrolled into view
+        model_list.clear_options()
+        model_list.add_options(options)
+        self.model_index_map = dict(enumerate(self.filtered_models))
 
         # Update status to show current filter state
         self.update_status()
@@ -323,33 +344,27 @@ class ModelBrowserScreen(BaseScreen):
             print(f"Status update error: {e}")
 
     async def on_input_changed(self, event: Input.Changed) -> None:
-        """Handle filter input changes."""
+        """Handle filter input changes once typing pauses."""
         if event.input.id == "model-filter":
-            filter_text = event.value.lower()
-
-            if not filter_text:
-                self.filtered_models = self.models.copy()
-            else:
-                self.filtered_models = [
-                    model for model in self.models
-                    if filter_text in model.get('id', '').lower() or
-                       filter_text in model.get('name', '').lower()
-                ]
-
-            await self.populate_model_list()
-
-    async def on_list_view_selected(self, _event: ListView.Selected) -> None:
+            if self._filter_timer is not None:
+                self._filter_timer.stop()
+            self._filter_timer = self.set_timer(
+                FILTER_DEBOUNCE_SECONDS, functools.partial(self.apply_filter, event.value)
+            )
+
+    async def apply_filter(self, filter_text: str) -> None:
+        """Show the models matching every word of the filter as a word prefix."""
+        self._filter_timer = None
+        self.filtered_models = self.search_index.search(filter_text)
+        await self.populate_model_list()
+
+    async def on_option_list_option_selected(self, event: OptionList.OptionSelected) -> None:
         """Handle model selection."""
-        model_list = self.query_one("#model-list", ListView)
-        if model_list.highlighted_child:
-            # Get the index of the highlighted item
-            selected_index = model_list.index
-
-            # Get the model data from our mapping
-            model_data = self.model_index_map.get(selected_index)
-            if model_data:
-                self.selected_model = model_data
-                await self.display_model_details()
+        # Get the model data from our mapping
+        model_data = self.model_index_map.get(event.option_index)
+        if model_data:
+            self.selected_model = model_data
+            await self.display_model_details()
 
     async def display_model_details(self) -> None:
         """Display detailed information about the selected model."""
@@ -432,6 +447,7 @@ Model Browser Help:
 • Ctrl+Q - Quit application
 • F1 - Show this help
 
-Filter by typing model names (gpt, claude, llama, etc.)
+Filter by typing the start of words in model ids, names or descriptions
+(gpt, claude, llama, etc.)
 Select models to view detailed pricing and specifications.
         """.strip()
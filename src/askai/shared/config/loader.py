@@ -5,13 +5,17 @@ Supports proper ~/.askai directory structure with initialization and setup wizar
 """
 
 # Standard library imports
+import copy
 import os
 import sys
 import tempfile
+import threading
 
 # Third-party imports
 import yaml
 
+from askai.shared.utils.timing import timed
+
 # Configuration paths
 ASKAI_DIR = os.path.expanduser("~/.askai")
 CONFIG_PATH = os.path.join(ASKAI_DIR, "config.yml")
@@ -24,6 +28,10 @@ TEST_CONFIG_PATH = os.path.join(TEST_DIR, "config.yml")
 TEST_CHATS_DIR = os.path.join(TEST_DIR, "chats")
 TEST_LOGS_DIR = os.path.join(TEST_DIR, "logs")
 
+# Process-wide config cache: (file state, parsed config), see get_config_snapshot()
+_config_cache = None
+_config_cache_lock = threading.Lock()
+
 def is_test_environment():
     """
     Check if we're running in a test environment.
@@ -281,6 +289,7 @@ def create_test_config_from_production():
         # Write the modified test config
         with open(TEST_CONFIG_PATH, "w", encoding="utf-8") as f:
             yaml.safe_dump(config, f, default_flow_style=False, sort_keys=False)
+        invalidate_config_cache()
 
         print(f"Test configuration created at {TEST_CONFIG_PATH}")
         print("Modified settings for testing:")
@@ -348,6 +357,7 @@ def ensure_askai_setup():
         try:
             with open(CONFIG_PATH, "w", encoding="utf-8") as f:
                 yaml.safe_dump(config, f, default_flow_style=False, sort_keys=False)
+            invalidate_config_cache()
             print("Configuration saved successfully!")
             return True
         except Exception as e:
@@ -369,9 +379,91 @@ def get_config_path():
 
 def load_config():
     """
-    Load and parse the YAML configuration file.
+    Load the configuration.
     Automatically ensures setup is complete and uses appropriate config for environment.
 
+    The YAML file is only parsed again when it changed (see get_config_snapshot);
+    every call returns a private copy the caller may modify.
+
+    Returns:
+        dict: The parsed configuration as a dictionary
+
+    Raises:
+        SystemExit: If setup is incomplete or configuration cannot be loaded
+    """
+    return copy.deepcopy(get_config_snapshot())
+
+
+@timed("config.load")
+def get_config_snapshot():
+    """
+    Get the process-wide cached configuration.
+
+    The config file is parsed on first use and again only when its mtime or
+    size changed (in test mode, the test and the production config are both
+    watched). The returned dict is shared by all callers and threads, so treat
+    it as read-only; use load_config() for a copy that may be modified. A
+    reload replaces the cached dict instead of changing it, so a snapshot
+    never changes while it is being read.
+
+    Returns:
+        dict: The parsed configuration as a dictionary
+
+    Raises:
+        SystemExit: If setup is incomplete or configuration cannot be loaded
+    """
+    global _config_cache  # pylint: disable=global-statement
+
+    state = _config_file_state()
+    cached = _config_cache
+    if cached is not None and cached[0] == state:
+        return cached[1]
+
+    with _config_cache_lock:
+        # Another thread may have reloaded while we waited
+        cached = _config_cache
+        if cached is not None and cached[0] == state:
+            return cached[1]
+        config = _read_config()
+        _config_cache = (state, config)
+        return config
+
+
+def invalidate_config_cache():
+    """
+    Drop the cached configuration so the next load parses the file again.
+
+    Called after AskAI writes a config file; needed only for edits that keep
+    the file's mtime and size.
+    """
+    global _config_cache  # pylint: disable=global-statement
+    with _config_cache_lock:
+        _config_cache = None
+
+
+def _config_file_state():
+    """
+    Get what identifies the current config files: environment, mtime and size.
+
+    Returns:
+        tuple: Comparable state of the config files load_config reads
+    """
+    test_mode = is_test_environment()
+    paths = (TEST_CONFIG_PATH, CONFIG_PATH) if test_mode else (CONFIG_PATH,)
+    state = [test_mode]
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            state.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            state.append((path, None, None))
+    return tuple(state)
+
+
+def _read_config():
+    """
+    Read and parse the configuration file for the current environment.
+
     Returns:
         dict: The parsed configuration as a dictionary
 
@@ -5,7 +5,8 @@ import logging
 
 # Import main functions for backward compatibility
 
-from .setup import setup_logger, LOGGER_NAME
+from .setup import setup_logger, stop_logging, LOGGER_NAME
+from .payload import LogPayload, redact
 
 def get_logger() -> logging.Logger:
     """Get the application logger instance.
@@ -18,4 +19,4 @@ def get_logger() -> logging.Logger:
     """
     return logging.getLogger(LOGGER_NAME)
 
-__all__ = ['setup_logger', 'get_logger', 'LOGGER_NAME']
+__all__ = ['setup_logger', 'stop_logging', 'get_logger', 'LOGGER_NAME', 'LogPayload', 'redact']
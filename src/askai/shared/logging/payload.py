@@ -0,0 +1,56 @@
+"""
+Lazily serialized, redacted log payloads.
+
+Passing a LogPayload instead of json.dumps(...) to a logger defers the
+serialization until a handler emits the record, so debug payloads cost
+nothing when debug logging is off and are formatted on the logging thread
+when it is on. Data URLs, file data and long strings are shortened on the
+way out, so attachments never reach the log file.
+"""
+import json
+import re
+from typing import Any
+
+# Longest string written to the log before it is truncated
+MAX_LOG_STRING = 2000
+
+# Keys holding inline file contents
+BINARY_KEYS = {'file_data', 'data', 'base64', 'image_data'}
+
+_DATA_URL = re.compile(r'data:([\w.+-]+/[\w.+-]+)?(;[\w=.-]+)*;base64,')
+
+
+def redact(value: Any, max_string: int = MAX_LOG_STRING, key: str = '') -> Any:
+    """Return a copy of value with data URLs, binary data and long strings shortened."""
+    if isinstance(value, dict):
+        return {k: redact(v, max_string, str(k)) for k, v in list(value.items())}
+    if isinstance(value, (list, tuple)):
+        return [redact(item, max_string) for item in list(value)]
+    if isinstance(value, (bytes, bytearray)):
+        return f"<{len(value)} bytes>"
+    if isinstance(value, str):
+        match = _DATA_URL.match(value)
+        if match:
+            return f"{match.group(0)}<{len(value) - match.end()} chars redacted>"
+        if key in BINARY_KEYS and len(value) > 64:
+            return f"<{len(value)} chars redacted>"
+        if len(value) > max_string:
+            return f"{value[:max_string]}...<{len(value) - max_string} more chars>"
+    return value
+
+
+class LogPayload:
+    """Log message serialized to redacted JSON only when the record is emitted."""
+
+    __slots__ = ('payload',)
+
+    def __init__(self, payload: Any):
+        self.payload = payload
+
+    def __str__(self) -> str:
+        try:
+            return json.dumps(redact(self.payload), default=str)
+        except RuntimeError:
+            # The payload was changed by another thread while it was serialized
+            log_message = self.payload.get('log_message') if isinstance(self.payload, dict) else None
+            return json.dumps({"log_message": log_message, "error": "payload changed while logging"})
@@ -3,12 +3,18 @@ Logger module for AskAI CLI application.
 
 Configures application-wide logging with JSON formatting,
 log rotation, and configurable log levels.
+
+By default records are handed to a queue and formatted and written by a
+background listener thread, so logging never blocks on file I/O.
 """
+import atexit
 import logging
 import os
 import json
-from typing import Dict, Any
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+from typing import Dict, Any, Optional
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 # Constants for logger configuration
 LOGGER_NAME = 'askai'
@@ -19,6 +25,59 @@ MAX_LOG_SIZE_MB = 5
 MAX_LOG_SIZE_BYTES = MAX_LOG_SIZE_MB * 1024 * 1024
 JSON_LOG_FORMAT = '{"timestamp": "%(asctime)s", "log_level": "%(levelname)s", "log_entry": %(message)s}'
 
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Queue handler that leaves formatting to the listener thread.
+
+    The standard QueueHandler formats each record on the logging thread;
+    here records are queued as they are, so LogPayload messages are only
+    serialized in the background. After a fork, the child process gets its
+    own queue and listener, as the parent's thread does not exist there.
+    """
+
+    def __init__(self, target: logging.Handler):
+        super().__init__(queue.SimpleQueue())
+        self.target = target
+        self.pid = None
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.pid != os.getpid():
+            self.start()
+        super().enqueue(record)
+
+    def start(self) -> None:
+        """Start a listener writing the queued records to the target handler."""
+        global _listener  # pylint: disable=global-statement
+        with _listener_lock:
+            if self.pid == os.getpid():
+                return
+            self.queue = queue.SimpleQueue()
+            _listener = QueueListener(self.queue, self.target, respect_handler_level=True)
+            _listener.start()
+            self.pid = os.getpid()
+
+
+def stop_logging() -> None:
+    """Write all queued log records and stop the listener thread."""
+    global _listener  # pylint: disable=global-statement
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+            logger = logging.getLogger(LOGGER_NAME)
+            for handler in logger.handlers:
+                if isinstance(handler, DeferredQueueHandler):
+                    handler.pid = None
+
+
+atexit.register(stop_logging)
+
 
 def get_log_level(level_name: str) -> int:
     """Convert string log level to logging constant.
@@ -57,6 +116,7 @@ def setup_logger(config: Dict[str, Any], debug: bool = False) -> logging.Logger:
         - log_path: str (default: ~/.askai/askai.log)
         - log_level: str (default: INFO)
         - log_rotation: int (default: 5)
+        - log_async: bool (default: True), write the log from a background thread
     """
     # Return dummy logger if logging is disabled
     if not config.get('enable_logging', True):
@@ -79,19 +139,21 @@ def setup_logger(config: Dict[str, Any], debug: bool = False) -> logging.Logger:
         logger.setLevel(logging.DEBUG)
         logger.debug(json.dumps({"log_message": "Debug mode activated via CLI"}))
 
-    # Configure rotating file handler
-    handler = RotatingFileHandler(
-        log_path,
-        maxBytes=MAX_LOG_SIZE_BYTES,
-        backupCount=log_rotation
-    )
-
-    # Set up JSON formatter
-    formatter = logging.Formatter(JSON_LOG_FORMAT)
-    handler.setFormatter(formatter)
-
     # Add handler if not already present
     if not logger.handlers:
+        # Configure rotating file handler
+        handler = RotatingFileHandler(
+            log_path,
+            maxBytes=MAX_LOG_SIZE_BYTES,
+            backupCount=log_rotation
+        )
+
+        # Set up JSON formatter
+        formatter = logging.Formatter(JSON_LOG_FORMAT)
+        handler.setFormatter(formatter)
+
+        if config.get('log_async', True):
+            handler = DeferredQueueHandler(handler)
         logger.addHandler(handler)
 
     return logger
@@ -0,0 +1,6 @@
+"""
+Metrics for the AskAI API server, exposed in the Prometheus text format.
+"""
+from .registry import (MetricsRegistry, enable_metrics, get_metrics_registry, inc, observe)
+
+__all__ = ['MetricsRegistry', 'enable_metrics', 'get_metrics_registry', 'inc', 'observe']
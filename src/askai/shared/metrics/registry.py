@@ -0,0 +1,235 @@
+"""
+Process-wide metrics with Prometheus text exposition.
+
+Values are kept in memory per process. With a metrics directory, a
+background thread writes them to <directory>/metrics-<pid>.json about once
+a second and a scrape merges the files of all processes, so the gunicorn
+workers of one server report as one. Counters and histograms of exited
+workers are kept; gauges count only for live processes.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+FLUSH_INTERVAL = 1.0
+
+# name -> (type, help)
+METRICS = {
+    "askai_api_request_duration_seconds": (
+        "histogram", "API request latency by route, method and status"),
+    "askai_api_requests_in_flight": (
+        "gauge", "API requests currently being handled"),
+    "askai_upstream_request_duration_seconds": (
+        "histogram", "OpenRouter request latency by endpoint and status code"),
+    "askai_upstream_retries_total": (
+        "counter", "OpenRouter completions sent again by reason (status code or connection)"),
+    "askai_upstream_hedges_total": (
+        "counter", "Duplicate OpenRouter completions sent because the first was slow"),
+    "askai_tokens_total": (
+        "counter", "Tokens reported in OpenRouter usage by model and type"),
+    "askai_pattern_executions_total": (
+        "counter", "AI requests made for patterns by pattern and outcome"),
+    "askai_cache_events_total": (
+        "counter", "Response and attachment cache events (hits, misses, stores, evictions)"),
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, Any]]) -> LabelKey:
+    return tuple(sorted((str(k), str(v)) for k, v in (labels or {}).items()))
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass  # e.g. no permission to signal it; the process exists
+    return True
+
+
+class MetricsRegistry:
+    """Counters, gauges and histograms of one process, merged with its siblings on collect."""
+
+    def __init__(self, directory: Optional[str] = None, flush_interval: float = FLUSH_INTERVAL,
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.buckets = buckets
+        self._values: Dict[Tuple[str, LabelKey], Any] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._flusher_pid: Optional[int] = None
+
+    def inc(self, name: str, labels: Optional[Dict[str, Any]] = None, amount: float = 1.0) -> None:
+        """Add to a counter or gauge; use a negative amount to decrease a gauge."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+            self._dirty = True
+        self._ensure_flusher()
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        """Record a histogram observation."""
+        key = (name, _label_key(labels))
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                # Per-bucket counts, the +Inf bucket, then sum and count
+                series = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+            self._dirty = True
+        self._ensure_flusher()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return this process's values in the file format."""
+        with self._lock:
+            series = [[name, list(labels), value[:] if isinstance(value, list) else value]
+                      for (name, labels), value in self._values.items()]
+        return {"pid": os.getpid(), "series": series}
+
+    def flush(self) -> None:
+        """Write this process's values to its file in the metrics directory."""
+        if not self.directory:
+            return
+        with self._lock:
+            self._dirty = False
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"metrics-{os.getpid()}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def collect(self) -> Dict[Tuple[str, LabelKey], Any]:
+        """Merge the values of this process with the files of the other processes."""
+        snapshots = [self.snapshot()]
+        if self.directory and os.path.isdir(self.directory):
+            own_file = f"metrics-{os.getpid()}.json"
+            for filename in os.listdir(self.directory):
+                if not filename.startswith("metrics-") or not filename.endswith(".json") or filename == own_file:
+                    continue
+                try:
+                    with open(os.path.join(self.directory, filename), 'r', encoding='utf-8') as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+
+        merged: Dict[Tuple[str, LabelKey], Any] = {}
+        for snapshot in snapshots:
+            live = snapshot.get("pid") == os.getpid() or _pid_alive(int(snapshot.get("pid", 0)))
+            for name, labels, value in snapshot.get("series", []):
+                if METRICS.get(name, ("counter",))[0] == "gauge" and not live:
+                    continue
+                key = (name, tuple(tuple(pair) for pair in labels))
+                if isinstance(value, list):
+                    current = merged.get(key)
+                    merged[key] = [a + b for a, b in zip(current, value)] if current else list(value)
+                else:
+                    merged[key] = merged.get(key, 0.0) + value
+        return merged
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text exposition format."""
+        by_name: Dict[str, List[Tuple[LabelKey, Any]]] = {}
+        for (name, labels), value in sorted(self.collect().items()):
+            by_name.setdefault(name, []).append((labels, value))
+
+        lines = []
+        for name, series in by_name.items():
+            metric_type, help_text = METRICS.get(name, ("untyped", name))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in series:
+                if isinstance(value, list):
+                    cumulative = 0
+                    bounds = [_format_number(bound) for bound in self.buckets] + ["+Inf"]
+                    for bound, count in zip(bounds, value):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(labels + (('le', bound),))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_number(value[-2])}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {value[-1]}")
+                else:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def _ensure_flusher(self) -> None:
+        """Start the background writer in this process (again after a fork)."""
+        if not self.directory or self._flusher_pid == os.getpid():
+            return
+        with self._lock:
+            if self._flusher_pid == os.getpid():
+                return
+            self._flusher_pid = os.getpid()
+        threading.Thread(target=self._flush_loop, name="askai-metrics", daemon=True).start()
+
+    def _flush_loop(self) -> None:
+        pid = os.getpid()
+        while self._flusher_pid == pid:
+            time.sleep(self.flush_interval)
+            if self._dirty:
+                try:
+                    self.flush()
+                except OSError:
+                    pass  # Retried on the next tick
+
+
+def _format_number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _format_labels(labels: LabelKey) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels:
+        value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+_registry: Optional[MetricsRegistry] = None
+
+
+def enable_metrics(directory: Optional[str] = None) -> MetricsRegistry:
+    """Start recording metrics in this process (the API server calls this).
+
+    Args:
+        directory: Directory shared by all worker processes, or None to
+            report this process only
+
+    Returns:
+        MetricsRegistry: The process-wide registry
+    """
+    global _registry  # pylint: disable=global-statement
+    if _registry is None or _registry.directory != directory:
+        _registry = MetricsRegistry(directory)
+    return _registry
+
+
+def get_metrics_registry() -> Optional[MetricsRegistry]:
+    """Return the registry, or None if metrics are not enabled."""
+    return _registry
+
+
+def inc(name: str, labels: Optional[Dict[str, Any]] = None, amount: float = 1.0) -> None:
+    """Add to a counter or gauge if metrics are enabled."""
+    registry = _registry
+    if registry is not None:
+        registry.inc(name, labels, amount)
+
+
+def observe(name: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+    """Record a histogram observation if metrics are enabled."""
+    registry = _registry
+    if registry is not None:
+        registry.observe(name, value, labels)
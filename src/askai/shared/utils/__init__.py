@@ -8,19 +8,32 @@ from .helpers import (
     get_piped_input,
     get_file_input,
     encode_file_to_base64,
+    encode_file_to_data_url,
     build_format_instruction,
     generate_output_format_template,
     capture_command_output,
     tqdm_spinner
 )
+from .tokens import CHARS_PER_TOKEN, TokenEstimator, estimate_tokens, iter_token_chunks
+from .timing import span, timed, get_span_summary, reset_spans, format_span_report
 
 __all__ = [
     'print_error_or_warnings',
     'get_piped_input',
     'get_file_input',
     'encode_file_to_base64',
+    'encode_file_to_data_url',
     'build_format_instruction',
     'generate_output_format_template',
     'capture_command_output',
-    'tqdm_spinner'
+    'tqdm_spinner',
+    'CHARS_PER_TOKEN',
+    'estimate_tokens',
+    'iter_token_chunks',
+    'TokenEstimator',
+    'span',
+    'timed',
+    'get_span_summary',
+    'reset_spans',
+    'format_span_report'
 ]
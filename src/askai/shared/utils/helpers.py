@@ -7,20 +7,21 @@ Contains core util            # Open and read the file in binary mode
                 return file_contentdling, command execution, and formatting.
 """
 
-import base64
+import binascii
 import itertools
 import json
+import mmap
 import os
 import shlex
 import subprocess
 import sys
 import time
 from termcolor import colored, cprint
-from tqdm import tqdm
 
 
 def tqdm_spinner(stop_event):
     """Displays a rotating spinner using tqdm."""
+    from tqdm import tqdm  # pylint: disable=import-outside-toplevel
     # Check if we're running in a test environment
     in_test_env = os.environ.get('ASKAI_TESTING', '').lower() in ('true', '1', 'yes')
 
@@ -58,76 +59,109 @@ def get_file_input(file_path):
     return None
 
 
-def encode_file_to_base64(file_path):
+# Bytes encoded per step; a multiple of 3 so the chunk encodings concatenate without padding
+BASE64_CHUNK_SIZE = 3 * 256 * 1024
+
+
+def _encode_base64_into_buffer(file, size, prefix):
     """
-    Reads any file and encodes it to base64.
+    Base64-encode an open binary file in one pass.
+
+    The output is written into a single preallocated buffer after the prefix.
+    The file is memory-mapped when possible (so no copy of it is held in memory)
+    and read chunk by chunk otherwise.
+
+    Returns:
+        bytearray: prefix followed by the base64 encoding of the file
+    """
+    out = bytearray(len(prefix) + 4 * ((size + 2) // 3))
+    out[:len(prefix)] = prefix
+    pos = len(prefix)
+
+    try:
+        source = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError):
+        source = None
+
+    if source is not None:
+        with source:
+            view = memoryview(source)
+            try:
+                for start in range(0, min(size, len(source)), BASE64_CHUNK_SIZE):
+                    encoded = binascii.b2a_base64(view[start:min(start + BASE64_CHUNK_SIZE, size)], newline=False)
+                    out[pos:pos + len(encoded)] = encoded
+                    pos += len(encoded)
+            finally:
+                view.release()
+    else:
+        remaining = size
+        while remaining > 0:
+            chunk = file.read(min(BASE64_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            encoded = binascii.b2a_base64(chunk, newline=False)
+            out[pos:pos + len(encoded)] = encoded
+            pos += len(encoded)
+            remaining -= len(chunk)
+
+    # The file shrank while it was read
+    del out[pos:]
+    return out
+
+
+def encode_file_to_data_url(file_path, mime_type=None):
+    """
+    Reads any file and encodes it to base64, optionally as a data URL.
+
+    The file is streamed (memory-mapped or read in chunks) straight into the
+    final string, so a large PDF is not held in memory several times over.
 
     Args:
         file_path: Path to the file
+        mime_type: MIME type for a ``data:<mime_type>;base64,`` URL, or None for plain base64
 
     Returns:
-        str: Base64 encoded string or None if file doesn't exist
+        str: Data URL (or base64 string) or None if the file doesn't exist or can't be read
     """
-    # Check if file exists at the provided path
-    if os.path.exists(file_path):
-        try:
-            # Check if the file is readable
-            if not os.access(file_path, os.R_OK):
-                print_error_or_warnings(f"No read permissions for file: {file_path}")
-                return None
+    if not os.path.exists(file_path):
+        print_error_or_warnings(f"File does not exist at path: {file_path}", warning_only=True)
+        return None
+
+    try:
+        # Check if the file is readable
+        if not os.access(file_path, os.R_OK):
+            print_error_or_warnings(f"No read permissions for file: {file_path}")
+            return None
 
+        with open(file_path, "rb") as file:
             # Get file size to verify it's not empty
-            file_size = os.path.getsize(file_path)
+            file_size = os.fstat(file.fileno()).st_size
             if not file_size:
                 print_error_or_warnings(f"File is empty: {file_path}", warning_only=True)
                 return None
 
-            # Open and read the file in binary mode
-            with open(file_path, "rb") as file:
-                file_content = file.read()
-                # file_content is always bytes when reading in binary mode
+            prefix = f"data:{mime_type};base64," if mime_type else ""
+            encoded = _encode_base64_into_buffer(file, file_size, prefix.encode("ascii"))
+        return encoded.decode("ascii")
+    except PermissionError:
+        print_error_or_warnings(f"Permission denied when reading file: {file_path}")
+        return None
+    except (IOError, OSError, ValueError) as e:
+        print_error_or_warnings(f"Error encoding file: {file_path} - {str(e)}")
+        return None
 
-                # Encode the file content to base64
-                encoded_string = base64.b64encode(file_content).decode('utf-8')
-
-                # Ensure there are no whitespace, newlines or invalid chars
-                encoded_string = ''.join(c for c in encoded_string if c.isalnum() or c in '+/=')
-
-                # Verify we actually got an encoded string and it's valid
-                if encoded_string:
-                    # Validate that it's a proper base64 string
-                    try:
-                        # Try to decode to verify it's valid base64
-                        test_decode = base64.b64decode(encoded_string)
-                        # Make sure we can encode it back to the same string
-                        test_reencode = base64.b64encode(test_decode).decode('utf-8')
-                        if test_reencode != encoded_string:
-                            print_error_or_warnings(
-                                "Base64 re-encode test failed, may be an encoding issue",
-                                warning_only=True
-                            )
-                        return encoded_string
-                    except (ValueError, TypeError) as e:
-                        print_error_or_warnings(f"Generated invalid base64 string: {str(e)}")
-                        return None
-                else:
-                    print_error_or_warnings(f"Failed to encode file to base64: {file_path}")
-                    return None
-        except PermissionError:
-            print_error_or_warnings(f"Permission denied when reading file: {file_path}")
-            return None
-        except (IOError, OSError, ValueError) as e:
-            print_error_or_warnings(f"Error encoding file: {file_path} - {str(e)}")
-            return None
-    else:
-        print_error_or_warnings(f"File does not exist at path: {file_path}", warning_only=True)
-        # Try to resolve relative paths
-        cwd = os.getcwd()
-        potential_path = os.path.join(cwd, file_path)
-        if os.path.exists(potential_path):
-            print(f"Found file at absolute path, trying again: {potential_path}")
-            return encode_file_to_base64(potential_path)
-    return None
+
+def encode_file_to_base64(file_path):
+    """
+    Reads any file and encodes it to base64.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        str: Base64 encoded string or None if file doesn't exist
+    """
+    return encode_file_to_data_url(file_path)
 
 
 def build_format_instruction(format_type):
@@ -0,0 +1,82 @@
+"""
+Lightweight per-stage timing.
+
+Stages are timed with the span() context manager or the timed() decorator
+and aggregated per process by name, so recording costs two clock reads and
+a dictionary update. A run reports the aggregate with --profile and logs it
+as structured fields, so stage times can be compared across runs.
+"""
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+_spans: Dict[str, Dict[str, float]] = {}
+_spans_lock = threading.Lock()
+
+
+def _record(name: str, elapsed_ms: float) -> None:
+    with _spans_lock:
+        stats = _spans.get(name)
+        if stats is None:
+            stats = _spans[name] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+        stats["count"] += 1
+        stats["total_ms"] += elapsed_ms
+        stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block as the stage name."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(name, (time.perf_counter() - start) * 1000)
+
+
+def timed(name: str) -> Callable:
+    """Decorator timing every call of a function as the stage name."""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record(name, (time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorator
+
+
+def get_span_summary() -> Dict[str, Dict[str, float]]:
+    """Return count, total_ms and max_ms per stage, in the order stages first ran."""
+    with _spans_lock:
+        return {
+            name: {"count": int(stats["count"]), "total_ms": round(stats["total_ms"], 2),
+                   "max_ms": round(stats["max_ms"], 2)}
+            for name, stats in _spans.items()
+        }
+
+
+def reset_spans() -> None:
+    """Forget all recorded stage times (at the start of a run)."""
+    with _spans_lock:
+        _spans.clear()
+
+
+def format_span_report(summary: Dict[str, Dict[str, float]], wall_ms: Optional[float] = None) -> str:
+    """Format a span summary as a table for the terminal.
+
+    Stage times are inclusive: a stage that calls another (e.g. ai.response
+    around http.completion) contains its time.
+    """
+    lines = [f"{'Stage':<24}{'Calls':>7}{'Total ms':>12}{'Max ms':>11}{'Share':>8}"]
+    for name, stats in summary.items():
+        share = f"{stats['total_ms'] / wall_ms:.0%}" if wall_ms else ""
+        lines.append(f"{name:<24}{stats['count']:>7}{stats['total_ms']:>12.1f}{stats['max_ms']:>11.1f}{share:>8}")
+    if wall_ms is not None:
+        lines.append(f"{'wall':<24}{'':>7}{wall_ms:>12.1f}")
+    return "\n".join(lines)
@@ -0,0 +1,136 @@
+"""
+Token estimation and token-bounded splitting of large text inputs.
+"""
+
+import re
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+# Average characters per token of common BPE tokenizers on English text and code
+CHARS_PER_TOKEN = 4
+
+# Fixed per-message cost of chat formatting (role markers and separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Rough cost of an image or file attachment; their data URLs are not text
+ATTACHMENT_TOKENS = 1024
+
+# Words, punctuation runs and line breaks, the units BPE tokenizers rarely merge across
+_PIECES = re.compile(r"\w+|[^\w\s]+|\n+")
+
+
+def estimate_tokens(text: str, chars_per_token: float = CHARS_PER_TOKEN) -> int:
+    """Estimate the number of tokens in text without a tokenizer.
+
+    Words, punctuation runs and line breaks are counted separately and
+    longer pieces cost about one token per chars_per_token characters, which
+    tracks real tokenizers on code and markup far better than dividing
+    the length of the text.
+    """
+    return sum(_piece_tokens(piece, chars_per_token) for piece in _PIECES.findall(text))
+
+
+def _piece_tokens(piece: str, chars_per_token: float = CHARS_PER_TOKEN) -> int:
+    return max(1, int((len(piece) + chars_per_token / 2) // chars_per_token))
+
+
+class TokenEstimator:
+    """Fast local token count approximation with per-model calibration."""
+
+    def __init__(self, chars_per_token: float = CHARS_PER_TOKEN):
+        self.chars_per_token = chars_per_token
+
+    @classmethod
+    def for_model(cls, model_name: Optional[str], config: Optional[Dict[str, Any]] = None) -> 'TokenEstimator':
+        """Create an estimator using the token_estimation block of the config.
+
+        Per-model overrides are matched by the longest model name prefix,
+        e.g. "anthropic/" for all Anthropic models.
+        """
+        settings = (config or {}).get('token_estimation') or {}
+        chars_per_token = settings.get('chars_per_token') or CHARS_PER_TOKEN
+        overrides = settings.get('models') or {}
+        matches = [prefix for prefix in overrides if model_name and model_name.startswith(prefix)]
+        if matches:
+            chars_per_token = overrides[max(matches, key=len)]
+        return cls(float(chars_per_token))
+
+    def count(self, text: str) -> int:
+        """Estimate the tokens of a text."""
+        return estimate_tokens(text or "", self.chars_per_token)
+
+    def count_messages(self, messages: List[Dict[str, Any]]) -> int:
+        """Estimate the prompt tokens of chat messages, attachments included."""
+        tokens = 0
+        for message in messages:
+            tokens += MESSAGE_OVERHEAD_TOKENS
+            content = message.get('content')
+            if isinstance(content, str):
+                tokens += self.count(content)
+                continue
+            for part in content or []:
+                if part.get('type') == 'text':
+                    tokens += self.count(part.get('text', ''))
+                else:
+                    tokens += ATTACHMENT_TOKENS
+        return tokens
+
+
+def _bounded_lines(stream: IO[str], max_chars: int) -> Iterator[str]:
+    """Read lines of at most max_chars, cutting longer lines after whitespace where possible."""
+    carry = ""
+    while True:
+        line = carry + stream.readline(max_chars - len(carry))
+        carry = ""
+        if not line:
+            return
+        if len(line) >= max_chars and not line.endswith("\n"):
+            # Keep the word at the cut whole, so its parts are not estimated as two words
+            cut = max(line.rfind(" "), line.rfind("\t")) + 1
+            if cut:
+                line, carry = line[:cut], line[cut:]
+        yield line
+
+
+def _split_to_budget(text: str, max_tokens: int) -> Iterator[Tuple[str, int]]:
+    """Split text between estimator pieces into parts of at most max_tokens, with their estimates."""
+    start, tokens = 0, 0
+    for match in _PIECES.finditer(text):
+        cost = _piece_tokens(match.group())
+        if tokens and tokens + cost > max_tokens:
+            yield text[start:match.start()], tokens
+            start, tokens = match.start(), 0
+        tokens += cost
+    yield text[start:], tokens
+
+
+def iter_token_chunks(stream: IO[str], max_tokens: int) -> Iterator[str]:
+    """Split a text stream into chunks of at most max_tokens estimated tokens.
+
+    Chunks are measured with estimate_tokens() and end on line boundaries
+    where possible; lines longer than a chunk are split. The stream is read
+    line by line with a bounded line length, so memory use stays at about
+    one chunk however large the input is. Whitespace-only chunks are skipped.
+
+    Args:
+        stream: Text stream such as an open file or sys.stdin
+        max_tokens: Token budget of a chunk
+
+    Yields:
+        str: The next chunk of text
+    """
+    max_tokens = max(1, int(max_tokens))
+    parts: List[str] = []
+    tokens = 0
+    for line in _bounded_lines(stream, max_tokens * CHARS_PER_TOKEN):
+        for part, cost in _split_to_budget(line, max_tokens):
+            if parts and tokens + cost > max_tokens:
+                chunk = "".join(parts)
+                if chunk.strip():
+                    yield chunk
+                parts, tokens = [], 0
+            parts.append(part)
+            tokens += cost
+
+    chunk = "".join(parts)
+    if chunk.strip():
+        yield chunk
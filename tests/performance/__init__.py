@@ -0,0 +1,6 @@
+"""
+Performance benchmarks for askai-cli.
+
+Benchmarks are standalone scripts (not picked up by the unit test runner)
+that run against local stub servers so results do not depend on the network.
+"""
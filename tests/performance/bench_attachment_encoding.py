@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark base64 encoding of large image/PDF attachments.
+
+Encodes the same file into a ``data:application/pdf;base64,...`` URL twice:
+
+- "legacy":    read the whole file, b64encode, filter it character by
+               character, decode and re-encode to validate, then build the
+               data URL with an f-string (the old encode_file_to_base64 path)
+- "streaming": encode_file_to_data_url, which memory-maps the file and
+               encodes it chunk by chunk into one preallocated buffer
+
+and reports wall time and peak Python heap (tracemalloc) per variant.
+
+Usage:
+    python tests/performance/bench_attachment_encoding.py [--size-mb 30] [--runs 3] [--file PATH]
+
+Pages of a memory-mapped file belong to the page cache, not the Python
+heap, so they do not show up in the streaming peak.
+"""
+import argparse
+import base64
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.join(project_root, "src"))
+
+# pylint: disable=wrong-import-position,import-error
+from askai.shared.utils import encode_file_to_data_url
+
+
+def legacy_data_url(file_path):
+    """The pre-streaming encoding path, without its error handling."""
+    with open(file_path, "rb") as file:
+        file_content = file.read()
+    encoded_string = base64.b64encode(file_content).decode("utf-8")
+    encoded_string = "".join(c for c in encoded_string if c.isalnum() or c in "+/=")
+    test_decode = base64.b64decode(encoded_string)
+    if base64.b64encode(test_decode).decode("utf-8") != encoded_string:
+        raise ValueError("re-encode mismatch")
+    return f"data:application/pdf;base64,{encoded_string}"
+
+
+def streaming_data_url(file_path):
+    """The streaming encoder used by MessageBuilder."""
+    return encode_file_to_data_url(file_path, "application/pdf")
+
+
+def measure(func, file_path, runs):
+    """Return (median seconds, peak heap MB, result) over runs."""
+    times, peaks, result = [], [], None
+    for _ in range(runs):
+        result = None
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = func(file_path)
+        times.append(time.perf_counter() - start)
+        peaks.append(tracemalloc.get_traced_memory()[1] / (1024 * 1024))
+        tracemalloc.stop()
+    return statistics.median(times), max(peaks), result
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark attachment base64 encoding")
+    parser.add_argument("--size-mb", type=float, default=30, help="Size of the generated test file")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per variant")
+    parser.add_argument("--file", help="Encode this file instead of a generated one")
+    args = parser.parse_args()
+
+    temp_path = None
+    file_path = args.file
+    if not file_path:
+        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as temp:
+            temp.write(os.urandom(int(args.size_mb * 1024 * 1024)))
+            temp_path = file_path = temp.name
+
+    try:
+        size_mb = os.path.getsize(file_path) / (1024 * 1024)
+        print(f"File: {file_path} ({size_mb:.1f} MB, {args.runs} runs per variant)")
+        legacy_time, legacy_peak, legacy = measure(legacy_data_url, file_path, args.runs)
+        print(f"legacy     median={legacy_time * 1000:8.1f} ms  peak heap={legacy_peak:7.1f} MB")
+        stream_time, stream_peak, streamed = measure(streaming_data_url, file_path, args.runs)
+        print(f"streaming  median={stream_time * 1000:8.1f} ms  peak heap={stream_peak:7.1f} MB")
+        print(f"Identical output: {legacy == streamed}  "
+              f"speedup: {legacy_time / stream_time:.1f}x  memory: {legacy_peak / stream_peak:.1f}x less")
+        return 0 if legacy == streamed else 1
+    finally:
+        if temp_path:
+            os.unlink(temp_path)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark pooled keep-alive sessions against per-call connections.
+
+Starts a local HTTP/1.1 stub of the OpenRouter API and times the same
+number of completion/credits/models calls twice:
+
+- "per-call": module-level ``requests.post``/``requests.get`` (old behaviour)
+- "pooled":   OpenRouterClient using the shared keep-alive session
+
+Usage:
+    python tests/performance/bench_http_session.py [--requests 200] [--delay-ms 0]
+
+The stub only measures TCP setup on localhost; against the real API each
+avoided connection also saves a TLS handshake, so real savings are larger.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock
+
+import requests
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.join(project_root, "src"))
+
+# pylint: disable=wrong-import-position,import-error
+from askai.modules.ai.openrouter_client import OpenRouterClient
+from askai.modules.ai.http_session import close_sessions
+
+
+COMPLETION_BODY = json.dumps({
+    "choices": [{"message": {"role": "assistant", "content": "pong"}}]
+}).encode()
+CREDITS_BODY = json.dumps({"data": {"total_credits": 10, "total_usage": 1}}).encode()
+MODELS_BODY = json.dumps({"data": [{"id": "stub/model", "name": "Stub"}]}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Minimal keep-alive OpenRouter stub."""
+
+    protocol_version = "HTTP/1.1"
+    # Avoid Nagle/delayed-ACK stalls on reused connections
+    disable_nagle_algorithm = True
+    delay = 0.0
+
+    def _reply(self, body):
+        if self.delay:
+            time.sleep(self.delay)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Serve chat completions."""
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self._reply(COMPLETION_BODY)
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Serve credits and models."""
+        self._reply(CREDITS_BODY if self.path.endswith("credits") else MODELS_BODY)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        """Silence request logging."""
+
+
+def time_calls(func, count):
+    """Run func count times and return per-call latencies in milliseconds."""
+    latencies = []
+    for i in range(count):
+        start = time.perf_counter()
+        func(i)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(name, latencies):
+    """Print a single benchmark line and return the mean latency."""
+    mean = statistics.mean(latencies)
+    p95 = sorted(latencies)[int(len(latencies) * 0.95) - 1]
+    print(f"{name:<10} mean={mean:7.3f} ms  median={statistics.median(latencies):7.3f} ms  p95={p95:7.3f} ms")
+    return mean
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark the pooled OpenRouter HTTP session")
+    parser.add_argument("--requests", type=int, default=200, help="Calls per variant")
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="Artificial server latency")
+    args = parser.parse_args()
+
+    StubHandler.delay = args.delay_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    config = {"base_url": base_url, "api_key": "bench", "default_model": "stub/model"}
+    headers = {"Authorization": "Bearer bench", "Content-Type": "application/json"}
+    payload = {"model": "stub/model", "messages": [{"role": "user", "content": "ping"}]}
+
+    def per_call(i):
+        if i % 3 == 0:
+            requests.post(f"{base_url}chat/completions", headers=headers, json=payload, timeout=30)
+        elif i % 3 == 1:
+            requests.get(f"{base_url}credits", headers=headers, timeout=30)
+        else:
+            requests.get(f"{base_url}models", headers=headers, timeout=30)
+
+    client = OpenRouterClient(config=config, logger=Mock())
+
+    def pooled(i):
+        if i % 3 == 0:
+            client.request_completion(payload["messages"])
+        elif i % 3 == 1:
+            client.get_credit_balance()
+        else:
+            client.get_available_models()
+
+    # Warm up both paths so imports and the first pooled connect are excluded
+    per_call(0)
+    pooled(0)
+
+    print(f"Stub server: {base_url} ({args.requests} calls per variant)")
+    baseline = summarize("per-call", time_calls(per_call, args.requests))
+    optimized = summarize("pooled", time_calls(pooled, args.requests))
+    print(f"Saved per request: {baseline - optimized:.3f} ms ({(1 - optimized / baseline) * 100:.1f}%)")
+
+    close_sessions()
+    server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark CLI cold start per command.
+
+Runs ``python -X importtime src/askai/main.py <command>`` in fresh
+processes and reports, per command, the median wall time, the total import
+time and the slowest imports (self time, like ``python -X importtime``).
+
+Usage:
+    python tests/performance/bench_startup.py [--runs 5] [--top 8]
+    python tests/performance/bench_startup.py --json > startup.json
+    python tests/performance/bench_startup.py --baseline startup.json [--tolerance 0.25]
+
+With --baseline the script exits with status 1 if the median wall time of
+any command grew by more than the tolerance (a fraction, default 25%), so it
+can guard against import regressions, e.g. a heavy top-level import in
+``main.py`` or ``presentation/cli``.
+
+Commands run with ASKAI_TESTING=1 so no setup wizard is started and the
+user's chats and logs are not touched.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+MAIN_SCRIPT = os.path.join(project_root, "src", "askai", "main.py")
+
+COMMANDS = {
+    "help": ["-h"],
+    "version": ["--version"],
+    "list-patterns": ["-lp"],
+    "list-chats": ["-lc"],
+}
+
+
+def parse_importtime(stderr):
+    """Return {module: self time in microseconds} from -X importtime output."""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, _, module = line[len("import time:"):].split("|", 2)
+            timings[module.strip()] = int(self_us)
+        except ValueError:
+            continue
+    return timings
+
+
+def run_command(args):
+    """Run the CLI once and return (wall time in ms, import self times)."""
+    env = dict(os.environ, ASKAI_TESTING="1", PYTHONDONTWRITEBYTECODE="1")
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", MAIN_SCRIPT] + args,
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        env=env, cwd=project_root, timeout=120, check=False, text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    return wall_ms, parse_importtime(result.stderr)
+
+
+def bench_command(args, runs, top):
+    """Benchmark one command and return its result dict."""
+    # One warm-up run so .pyc compilation is not measured
+    run_command(args)
+    walls, imports = [], []
+    for _ in range(runs):
+        wall_ms, timings = run_command(args)
+        walls.append(wall_ms)
+        imports.append(timings)
+
+    modules = set().union(*imports)
+    median_self = {module: statistics.median(t.get(module, 0) for t in imports) for module in modules}
+    slowest = sorted(median_self.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "args": args,
+        "median_ms": round(statistics.median(walls), 1),
+        "min_ms": round(min(walls), 1),
+        "import_ms": round(sum(median_self.values()) / 1000, 1),
+        "modules": len(modules),
+        "slowest_imports": [{"module": module, "self_ms": round(us / 1000, 1)} for module, us in slowest],
+    }
+
+
+def print_results(results):
+    """Print a human readable report."""
+    for name, result in results.items():
+        print(f"{name:<14} median={result['median_ms']:7.1f} ms  min={result['min_ms']:7.1f} ms  "
+              f"imports={result['import_ms']:6.1f} ms ({result['modules']} modules)  "
+              f"[askai {' '.join(result['args'])}]")
+        for entry in result["slowest_imports"]:
+            print(f"{'':<16}{entry['self_ms']:6.1f} ms  {entry['module']}")
+
+
+def compare(results, baseline, tolerance):
+    """Return the commands whose median wall time regressed beyond the tolerance."""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["median_ms"]
+        if result["median_ms"] > before * (1 + tolerance):
+            regressions.append(f"{name}: {before:.1f} ms -> {result['median_ms']:.1f} ms")
+    return regressions
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark AskAI CLI startup time per command")
+    parser.add_argument("--runs", type=int, default=5, help="Measured runs per command")
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports to report per command")
+    parser.add_argument("--command", action="append", choices=sorted(COMMANDS),
+                        help="Only benchmark this command (repeatable)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown against the baseline as a fraction")
+    args = parser.parse_args()
+
+    names = args.command or list(COMMANDS)
+    results = {name: bench_command(COMMANDS[name], args.runs, args.top) for name in names}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("Startup regressions:\n  " + "\n  ".join(regressions), file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,7 @@ Unit tests for AI service functionality.
 """
 import os
 import sys
+import tempfile
 from unittest.mock import Mock, patch
 
 # Setup paths for imports
@@ -13,7 +14,9 @@ sys.path.insert(0, os.path.join(project_root, "tests"))
 
 # pylint: disable=wrong-import-position,import-error
 from unit.test_base import BaseUnitTest
+from askai.modules.ai import ai_service as ai_service_module
 from askai.modules.ai.ai_service import AIService
+from askai.modules.ai.model_catalog import ModelCatalog
 
 
 class TestAIService(BaseUnitTest):
@@ -25,6 +28,8 @@ class TestAIService(BaseUnitTest):
         self.test_get_ai_response_success()
         self.test_get_ai_response_failure()
         self.test_model_configuration()
+        self.test_context_length_retries_failed_fetch()
+        self.test_context_length_from_catalog()
         return self.results
 
     def test_ai_service_initialization(self):
@@ -238,3 +243,36 @@ class TestAIService(BaseUnitTest):
 
         except Exception as e:
             self.add_result("model_configuration_error", False, f"Model configuration test failed: {e}")
+
+    def test_context_length_retries_failed_fetch(self):
+        """Test that without the catalogue a failed model list fetch is tried again."""
+        config = {"model_catalog": {"enabled": False}}
+        client = Mock()
+        client.get_available_models.side_effect = [RuntimeError("offline"),
+                                                   [{"id": "test/model", "context_length": 8192}]]
+        with patch.object(ai_service_module, "_context_lengths", {}), \
+             patch.object(ai_service_module, "_context_lengths_loaded", False), \
+             patch.object(ai_service_module, "OpenRouterClient", return_value=client):
+            service = AIService(Mock())
+            failed = service.get_context_length("test/model", config)
+            loaded = service.get_context_length("test/model", config)
+            cached = service.get_context_length("test/model", config)
+
+        self.assert_equal(None, failed, "context_length_fetch_failed", "A failed fetch gives no length")
+        self.assert_equal(8192, loaded, "context_length_retried", "The next call fetches the list again")
+        self.assert_equal(8192, cached, "context_length_cached", "A loaded list is kept")
+        self.assert_equal(2, client.get_available_models.call_count, "context_length_fetches",
+                          "The list is not fetched again once loaded")
+
+    def test_context_length_from_catalog(self):
+        """Test that a fresh model catalogue answers without fetching the list."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            catalog = ModelCatalog(os.path.join(temp_dir, "models.json"), ttl_seconds=3600)
+            catalog.refresh(lambda _validators: ([{"id": "test/model", "context_length": 4096}], {}))
+            with patch.object(ai_service_module, "get_model_catalog", return_value=catalog), \
+                 patch.object(ai_service_module, "OpenRouterClient") as client_class:
+                length = AIService(Mock()).get_context_length("test/model", {})
+
+        self.assert_equal(4096, length, "context_length_catalog", "The length comes from the catalogue index")
+        self.assert_false(client_class.called, "context_length_catalog_no_fetch",
+                          "A fresh catalogue is not fetched again")
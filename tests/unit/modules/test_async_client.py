@@ -0,0 +1,172 @@
+"""
+Unit tests for the async OpenRouter client and AIService async entry point.
+"""
+import asyncio
+import os
+import sys
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.modules.ai import async_openrouter_client
+from askai.modules.ai.ai_service import AIService
+from askai.modules.ai.async_openrouter_client import AsyncOpenRouterClient
+
+
+class _FakeHTTPResponse:
+    """Minimal stand-in for an httpx response."""
+
+    def __init__(self, status_code, data):
+        self.status_code = status_code
+        self.headers = {}
+        self.is_success = 200 <= status_code < 300
+        self.text = str(data)
+        self._data = data
+
+    def json(self):
+        """Return the decoded body."""
+        return self._data
+
+
+class _FakeHTTPClient:
+    """Records requests and answers with canned responses per endpoint."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+        self.closed = False
+
+    async def request(self, method, url, headers=None, json=None):  # pylint: disable=redefined-outer-name
+        """Record the request and return the canned response."""
+        self.requests.append((method, url, json))
+        return self.responses[url.rsplit("/", 1)[-1]]
+
+    async def aclose(self):
+        """Mark the client closed."""
+        self.closed = True
+
+
+class TestAsyncOpenRouterClient(BaseUnitTest):
+    """Test native async and executor fallback request paths."""
+
+    def __init__(self):
+        super().__init__()
+        self.config = {
+            "base_url": "https://test.api.com",
+            "api_key": "test-key",
+            "default_model": "test/model",
+            # Exercise the HTTP paths rather than the on-disk model catalogue and credits cache
+            "model_catalog": {"enabled": False},
+            "credits": {"enabled": False}
+        }
+
+    def run(self):
+        """Run all async client tests."""
+        self.test_native_async_requests()
+        self.test_native_async_error()
+        self.test_executor_fallback_runs_concurrently()
+        self.test_ai_service_async_entry_point()
+        self.test_http_client_shared_per_loop()
+        return self.results
+
+    def test_native_async_requests(self):
+        """Test completion, credits and models on an injected async HTTP client."""
+        http_client = _FakeHTTPClient({
+            "completions": _FakeHTTPResponse(200, {"choices": [{"message": {"content": "hi"}}]}),
+            "credits": _FakeHTTPResponse(200, {"data": {"total_credits": 3}}),
+            "models": _FakeHTTPResponse(200, {"data": [{"id": "a/b"}]})
+        })
+        client = AsyncOpenRouterClient(config=self.config, logger=Mock(), http_client=http_client)
+
+        async def scenario():
+            return await asyncio.gather(
+                client.request_completion([{"role": "user", "content": "hello"}]),
+                client.get_credit_balance(),
+                client.get_available_models()
+            )
+
+        completion, credits, models = asyncio.run(scenario())
+
+        self.assert_equal("hi", completion["content"], "async_completion", "Completion content returned")
+        self.assert_equal({"total_credits": 3}, credits, "async_credits", "Credit data unwrapped")
+        self.assert_equal([{"id": "a/b"}], models, "async_models", "Model list unwrapped")
+        self.assert_equal("test/model", http_client.requests[0][2]["model"], "async_payload_shared",
+                          "Payload built by the shared sync logic")
+
+    def test_native_async_error(self):
+        """Test that HTTP errors raise like the synchronous client."""
+        http_client = _FakeHTTPClient({"credits": _FakeHTTPResponse(401, "Unauthorized")})
+        client = AsyncOpenRouterClient(config=self.config, logger=Mock(), http_client=http_client)
+
+        self.assert_raises(Exception, lambda: asyncio.run(client.get_credit_balance()),
+                           "async_credits_error", "Non-2xx credits response raises")
+
+    def test_executor_fallback_runs_concurrently(self):
+        """Test that without httpx calls run in the executor without blocking each other."""
+        def slow_get(*_args, **_kwargs):
+            time.sleep(0.2)
+            response = Mock(ok=True)
+            response.json.return_value = {"data": []}
+            return response
+
+        with patch.object(async_openrouter_client, "HTTPX_AVAILABLE", False):
+            client = AsyncOpenRouterClient(config=self.config, logger=Mock())
+            client._sync_client.session = Mock(get=slow_get)  # pylint: disable=protected-access
+
+            async def scenario():
+                start = time.perf_counter()
+                results = await asyncio.gather(*(client.get_available_models() for _ in range(3)))
+                return results, time.perf_counter() - start
+
+            results, elapsed = asyncio.run(scenario())
+            self.assert_false(client.uses_native_async, "async_fallback_mode", "Executor fallback selected")
+
+        self.assert_equal([[], [], []], results, "async_fallback_results", "Fallback returns model lists")
+        self.assert_true(elapsed < 0.5, "async_fallback_concurrent",
+                         f"Three 0.2s calls overlap ({elapsed:.2f}s)")
+
+    def test_ai_service_async_entry_point(self):
+        """Test AIService.get_ai_response_async awaits the async client."""
+        async def fake_completion(**_kwargs):
+            return {"content": "async answer", "annotations": [], "full_response": {}}
+
+        with patch('askai.modules.ai.ai_service.load_config', return_value=dict(self.config)), \
+             patch('askai.modules.ai.ai_service.AsyncOpenRouterClient') as mock_client_class:
+            mock_client = mock_client_class.return_value
+            mock_client.request_completion.side_effect = fake_completion
+
+            response = asyncio.run(AIService(Mock()).get_ai_response_async(
+                messages=[{"role": "user", "content": "hi"}]
+            ))
+
+        self.assert_equal("async answer", response["content"], "ai_service_async",
+                          "Async entry point returns the completion")
+
+    def test_http_client_shared_per_loop(self):
+        """Test that clients on one loop share an HTTP pool that is closed on request."""
+        # pylint: disable=protected-access
+        async def scenario():
+            first = AsyncOpenRouterClient(config=self.config, logger=Mock())._get_http_client()
+            second = AsyncOpenRouterClient(config=self.config, logger=Mock())._get_http_client()
+            await async_openrouter_client.close_async_http_clients()
+            third = AsyncOpenRouterClient(config=self.config, logger=Mock())._get_http_client()
+            await async_openrouter_client.close_async_http_clients()
+            return first, second, third
+
+        with patch.object(async_openrouter_client, "HTTPX_AVAILABLE", True), \
+             patch.object(async_openrouter_client, "httpx") as mock_httpx:
+            mock_httpx.AsyncClient.side_effect = lambda **_kwargs: Mock(aclose=AsyncMock())
+            first, second, third = asyncio.run(scenario())
+            other_loop = asyncio.run(scenario())[0]
+
+        self.assert_true(first is second, "async_pool_shared", "Clients on one loop share the HTTP client")
+        self.assert_true(first.aclose.called, "async_pool_closed", "Closing releases the loop's HTTP client")
+        self.assert_true(third is not first, "async_pool_recreated", "A closed pool is replaced on next use")
+        self.assert_true(other_loop is not first, "async_pool_per_loop", "Each event loop gets its own pool")
@@ -0,0 +1,125 @@
+"""
+Unit tests for the encoded attachment cache.
+"""
+import os
+import shutil
+import sys
+import tempfile
+from unittest.mock import Mock, patch
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.modules.messaging import MessageBuilder, AttachmentCache, get_attachment_cache_stats
+from askai.modules.messaging import attachment_cache
+from askai.shared.utils import encode_file_to_data_url
+
+
+class TestAttachmentCache(BaseUnitTest):
+    """Test the path and content fast paths, LRU eviction and MessageBuilder use."""
+
+    def run(self):
+        """Run all attachment cache tests."""
+        self.test_path_and_content_hits()
+        self.test_lru_eviction()
+        self.test_message_builder_uses_cache()
+        return self.results
+
+    @staticmethod
+    def _write(path, data):
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def test_path_and_content_hits(self):
+        """Test that unchanged and copied files skip encoding."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = AttachmentCache(os.path.join(temp_dir, "cache"))
+            pdf = os.path.join(temp_dir, "report.pdf")
+            self._write(pdf, b"%PDF-1.4 report")
+            copy = os.path.join(temp_dir, "copy.pdf")
+
+            with patch.object(attachment_cache, "encode_file_to_data_url",
+                              side_effect=encode_file_to_data_url) as encode, \
+                 patch.object(attachment_cache, "hash_file", side_effect=attachment_cache.hash_file) as hashed:
+                first = cache.get_data_url(pdf, "application/pdf")
+                hashes_after_miss = hashed.call_count
+                second = cache.get_data_url(pdf, "application/pdf")
+                hashes_after_path_hit = hashed.call_count
+                shutil.copy(pdf, copy)
+                copied = cache.get_data_url(copy, "application/pdf")
+                self._write(pdf, b"%PDF-1.4 edited report")
+                edited = cache.get_data_url(pdf, "application/pdf")
+
+        self.assert_equal(first, second, "attachment_path_hit_value", "Cached data URL is returned")
+        self.assert_equal(hashes_after_miss, hashes_after_path_hit, "attachment_path_hit_no_read",
+                          "Unchanged file is not read again")
+        self.assert_equal(first, copied, "attachment_content_hit", "Identical content is reused")
+        self.assert_true(edited != first and edited.startswith("data:application/pdf;base64,"),
+                         "attachment_edited", "Edited file is encoded again")
+        self.assert_equal(2, encode.call_count, "attachment_encode_count",
+                          "Only new content is encoded")
+
+    def test_lru_eviction(self):
+        """Test that least recently used entries are evicted with their references."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_dir = os.path.join(temp_dir, "cache")
+            # Each entry is about 250 bytes, so two fit and a third forces an eviction
+            cache = AttachmentCache(cache_dir, max_bytes=600)
+            paths = {}
+            for name in ("a", "b", "c"):
+                paths[name] = os.path.join(temp_dir, f"{name}.png")
+                self._write(paths[name], name.encode() * 90)
+
+            cache.get_data_url(paths["a"], "image/png")
+            cache.get_data_url(paths["b"], "image/png")
+            for age, entry in enumerate(sorted(os.listdir(cache_dir))):
+                if entry.endswith(".att"):
+                    os.utime(os.path.join(cache_dir, entry), (age + 1, age + 1))
+            attachment_cache.reset_attachment_cache_stats()
+            cache.get_data_url(paths["a"], "image/png")
+            cache.get_data_url(paths["c"], "image/png")
+            after_eviction = get_attachment_cache_stats()
+            entries = [name for name in os.listdir(cache_dir) if name.endswith(".att")]
+            refs = os.listdir(os.path.join(cache_dir, "refs"))
+            cache.get_data_url(paths["a"], "image/png")
+            cache.get_data_url(paths["b"], "image/png")
+            final = get_attachment_cache_stats()
+
+        self.assert_equal(1, after_eviction["evictions"], "attachment_lru_evictions", "One entry is evicted")
+        self.assert_equal(2, len(entries), "attachment_lru_entries", "Cache is kept under max_bytes")
+        self.assert_equal(2, len(refs), "attachment_lru_refs", "References to evicted entries are pruned")
+        self.assert_equal(2, final["path_hits"], "attachment_lru_recent_kept",
+                          "Recently read entry survives eviction")
+        self.assert_equal(2, final["misses"], "attachment_lru_oldest_evicted",
+                          "Least recently used entry is encoded again")
+
+    def test_message_builder_uses_cache(self):
+        """Test that -img attachments go through the configured cache."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            image = os.path.join(temp_dir, "screen.png")
+            self._write(image, b"\x89PNG screenshot")
+            config = {"attachment_cache": {"path": os.path.join(temp_dir, "cache")}}
+            builder = MessageBuilder(None, Mock(), config)
+            disabled = MessageBuilder(None, Mock(), {"attachment_cache": {"enabled": False}})
+
+            attachment_cache.reset_attachment_cache_stats()
+            messages = []
+            for _ in range(2):
+                messages, _ = builder.build_messages(question="What is shown?", image=image,
+                                                     use_piped_input=False, interactive=False)
+            stats = get_attachment_cache_stats()
+            expected_url = encode_file_to_data_url(image, "image/png")
+
+        multimodal = [m for m in messages if isinstance(m["content"], list)]
+        url = multimodal[0]["content"][1]["image_url"]["url"]
+        self.assert_equal(expected_url, url,
+                          "attachment_builder_url", "Image data URL is built")
+        self.assert_equal((1, 1), (stats["misses"], stats["path_hits"]), "attachment_builder_stats",
+                          "Second run is answered from the cache")
+        self.assert_equal(None, disabled.attachment_cache, "attachment_builder_disabled",
+                          "attachment_cache.enabled: false bypasses the cache")
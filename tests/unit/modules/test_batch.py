@@ -0,0 +1,212 @@
+"""
+Unit tests for batch question and pattern processing.
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from unittest.mock import Mock
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.modules.patterns import PatternManager
+from askai.modules.questions.batch import BatchPatternProcessor, BatchQuestionProcessor
+
+
+class TestBatchQuestionProcessor(BaseUnitTest):
+    """Test concurrent JSONL batch processing."""
+
+    def run(self):
+        """Run all batch tests."""
+        self.test_results_in_completion_order()
+        self.test_item_errors_are_reported()
+        self.test_concurrency_is_bounded()
+        return self.results
+
+    def _processor(self, fake_response):
+        """Create a processor whose AI calls go to fake_response."""
+        processor = BatchQuestionProcessor({}, Mock())
+        processor.ai_service = Mock()
+        processor.ai_service.get_ai_response.side_effect = fake_response
+        return processor
+
+    @staticmethod
+    def _run(processor, lines, concurrency):
+        output = io.StringIO()
+        summary = processor.process_batch(lines, output, concurrency)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        return summary, results
+
+    def test_results_in_completion_order(self):
+        """Test that slow items are written after fast ones, tagged by index."""
+        def fake_response(messages, **_kwargs):
+            question = messages[-1]["content"]
+            time.sleep(0.3 if "slow" in question else 0.01)
+            return {"content": f"answer to {question}", "full_response": {"model": "m", "usage": {"total_tokens": 7}}}
+
+        lines = [
+            json.dumps({"question": "slow one"}) + "\n",
+            "\n",
+            json.dumps({"question": "fast one", "model": "x/y"}) + "\n",
+        ]
+        summary, results = self._run(self._processor(fake_response), lines, 2)
+
+        self.assert_equal([2, 0], [r["index"] for r in results], "batch_completion_order",
+                          "Fast item written first, blank lines skipped")
+        self.assert_equal("answer to fast one", results[0]["content"], "batch_content",
+                          "Content returned per item")
+        self.assert_equal({"total_tokens": 7}, results[0]["usage"], "batch_usage", "Token usage reported")
+        self.assert_true(all("latency_ms" in r for r in results), "batch_latency", "Latency recorded per item")
+        self.assert_equal(2, summary["succeeded"], "batch_summary_ok", "Summary counts successes")
+
+    def test_item_errors_are_reported(self):
+        """Test that bad lines and API errors become error results."""
+        def fake_response(messages, **_kwargs):
+            if "boom" in messages[-1]["content"]:
+                raise RuntimeError("upstream down")
+            return {"content": "Error: bad", "full_response": {"error": "OpenRouter API Error (400): bad"}}
+
+        lines = [
+            "not json\n",
+            json.dumps({"file_input": "only-a-file.txt"}) + "\n",
+            json.dumps({"question": "boom"}) + "\n",
+            json.dumps({"question": "api error"}) + "\n",
+        ]
+        summary, results = self._run(self._processor(fake_response), lines, 4)
+        by_index = {r["index"]: r for r in results}
+
+        self.assert_equal(4, summary["failed"], "batch_summary_failed", "All failures counted")
+        self.assert_in("needs a question", by_index[1]["error"], "batch_missing_question",
+                       "Items without a question are rejected")
+        self.assert_equal("upstream down", by_index[2]["error"], "batch_exception_error",
+                          "Exceptions are reported per item")
+        self.assert_in("400", by_index[3]["error"], "batch_api_error", "API errors mark the item failed")
+
+    def test_concurrency_is_bounded(self):
+        """Test that no more than the configured number of calls run at once."""
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def fake_response(*_args, **_kwargs):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return {"content": "ok", "full_response": {}}
+
+        lines = [json.dumps({"question": f"q{i}"}) + "\n" for i in range(20)]
+        summary, _ = self._run(self._processor(fake_response), lines, 3)
+
+        self.assert_equal(20, summary["succeeded"], "batch_all_processed", "Every line processed")
+        self.assert_true(1 < state["peak"] <= 3, "batch_concurrency_bound",
+                         f"Peak concurrency {state['peak']} within limit")
+
+
+class TestBatchPatternProcessor(BaseUnitTest):
+    """Test running a pattern over a directory of input files."""
+
+    def run(self):
+        """Run all batch pattern tests."""
+        self.test_directory_run_writes_outputs_and_manifest()
+        self.test_pattern_without_file_input_is_rejected()
+        self.test_output_names_are_unique()
+        self.test_output_names_avoid_manifest()
+        return self.results
+
+    @staticmethod
+    def _pattern_manager():
+        """Create a pattern manager over the repository's built-in patterns."""
+        return PatternManager(project_root, {"patterns": {}})
+
+    def test_directory_run_writes_outputs_and_manifest(self):
+        """Test per-file subfolders, manifest totals and parse-once behaviour."""
+        pattern_manager = self._pattern_manager()
+        pattern_data = pattern_manager.get_pattern_content("log_interpretation")
+        pattern_manager.get_pattern_content = Mock(return_value=pattern_data)
+
+        def fake_response(messages, **_kwargs):
+            sent = json.dumps(messages)
+            if "CRASH-LINE" in sent:
+                raise RuntimeError("upstream down")
+            return {
+                "content": "analysis of " + ("app" if "APP-LINE" in sent else "db"),
+                "full_response": {"model": "m", "usage": {"prompt_tokens": 3, "completion_tokens": 2,
+                                                          "total_tokens": 5}}
+            }
+
+        processor = BatchPatternProcessor(pattern_manager, Mock())
+        processor.ai_service = Mock()
+        processor.ai_service.get_ai_response.side_effect = fake_response
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_dir = os.path.join(temp_dir, "logs")
+            output_dir = os.path.join(temp_dir, "out")
+            os.makedirs(input_dir)
+            for name, content in (("app.log", "APP-LINE"), ("db.log", "DB-LINE"),
+                                  ("crash.log", "CRASH-LINE"), (".hidden", "skip")):
+                with open(os.path.join(input_dir, name), "w", encoding="utf-8") as f:
+                    f.write(content)
+
+            manifest = processor.process_directory(
+                "log_interpretation", input_dir, output_dir,
+                pattern_input={"log_level": "ERROR"}, concurrency=2
+            )
+            with open(os.path.join(output_dir, "app", "response.md"), encoding="utf-8") as f:
+                app_response = f.read()
+            with open(os.path.join(output_dir, "manifest.json"), encoding="utf-8") as f:
+                written_manifest = json.load(f)
+
+        by_file = {entry["file"]: entry for entry in manifest["files"]}
+        self.assert_equal(["app.log", "crash.log", "db.log"], sorted(by_file), "pattern_batch_files",
+                          "Hidden files are skipped")
+        self.assert_equal("analysis of app", app_response, "pattern_batch_subfolder",
+                          "Each file's response is written to its own subfolder")
+        self.assert_equal(10, manifest["usage"]["total_tokens"], "pattern_batch_usage",
+                          "Token usage is summed over successful files")
+        self.assert_equal("upstream down", by_file["crash.log"]["error"], "pattern_batch_error",
+                          "Failures are recorded per file")
+        self.assert_equal(manifest["failed"], written_manifest["failed"], "pattern_batch_manifest",
+                          "Manifest is written to the output directory")
+        self.assert_equal(1, pattern_manager.get_pattern_content.call_count, "pattern_batch_parse_once",
+                          "Pattern is parsed once for the whole batch")
+
+    def test_pattern_without_file_input_is_rejected(self):
+        """Test that patterns without a file input cannot run over a directory."""
+        processor = BatchPatternProcessor(self._pattern_manager(), Mock())
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.assert_raises(ValueError, lambda: processor.process_directory(
+                "linux_cli_command_generation", temp_dir, os.path.join(temp_dir, "out")
+            ), "pattern_batch_no_file_input", "Patterns without a file input are rejected")
+
+    def test_output_names_are_unique(self):
+        """Test that colliding stems and fallback names still get distinct output subfolders."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for name in ("a.md", "a.txt", "a_txt"):
+                with open(os.path.join(temp_dir, name), "w", encoding="utf-8") as f:
+                    f.write(name)
+            files = BatchPatternProcessor._list_input_files(temp_dir)  # pylint: disable=protected-access
+
+        self.assert_equal(["a", "a_txt", "a_txt_2"], [name for _, name in files], "pattern_batch_unique_names",
+                          "A fallback name that is already taken gets a numeric suffix")
+
+    def test_output_names_avoid_manifest(self):
+        """Test that an input named after the manifest gets a different output subfolder."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with open(os.path.join(temp_dir, "manifest.json.txt"), "w", encoding="utf-8") as f:
+                f.write("input")
+            files = BatchPatternProcessor._list_input_files(temp_dir)  # pylint: disable=protected-access
+
+        self.assert_equal(["manifest_json_txt"], [name for _, name in files], "pattern_batch_manifest_name",
+                          "The manifest file name is never used as an output subfolder")
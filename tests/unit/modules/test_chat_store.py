@@ -0,0 +1,113 @@
+"""
+Unit tests for the append-only chat store.
+"""
+import json
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.modules.chat import ChatManager, JsonlChatStore
+from askai.modules.chat import chat_store
+
+
+class TestJsonlChatStore(BaseUnitTest):
+    """Test appends, tail reads, crash recovery and legacy migration."""
+
+    def run(self):
+        """Run all chat store tests."""
+        self.test_append_and_tail()
+        self.test_torn_line_recovery()
+        self.test_legacy_migration()
+        return self.results
+
+    @staticmethod
+    def _add(chat_manager, chat_id, number):
+        chat_manager.add_conversation(chat_id, [{"role": "user", "content": f"question {number}"}],
+                                      f"answer {number}")
+
+    def test_append_and_tail(self):
+        """Test that conversations are appended and context reads only the tail."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            chat_manager = ChatManager({"chat": {"storage_path": temp_dir, "max_history": 2}})
+            chat_id = chat_manager.create_chat()
+            for number in range(50):
+                self._add(chat_manager, chat_id, number)
+
+            with open(os.path.join(temp_dir, f"{chat_id}.jsonl"), "rb") as f:
+                line_count = len(f.read().splitlines())
+
+            # A tiny block size makes the tail read span several blocks
+            with patch.object(chat_store, "TAIL_BLOCK_SIZE", 64), \
+                 patch.object(chat_store.json, "loads", side_effect=json.loads) as loads:
+                context = chat_manager.build_context_messages(chat_id)
+            chats = chat_manager.list_chats()
+
+        self.assert_equal(50, line_count, "chat_store_one_line_each", "One log line per conversation")
+        self.assert_equal(
+            ["question 48", "answer 48", "question 49", "answer 49"],
+            [message["content"] for message in context],
+            "chat_store_tail_context", "Context holds the last max_history conversations"
+        )
+        self.assert_equal(2, loads.call_count, "chat_store_tail_parses", "Only the tail is parsed")
+        self.assert_equal(50, chats[0]["conversation_count"], "chat_store_header_count",
+                          "Header tracks the conversation count")
+
+    def test_torn_line_recovery(self):
+        """Test that a torn last line does not break reads, appends or listing."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            chat_manager = ChatManager({"chat": {"storage_path": temp_dir, "max_history": 10}})
+            chat_id = chat_manager.create_chat()
+            self._add(chat_manager, chat_id, 1)
+            with open(os.path.join(temp_dir, f"{chat_id}.jsonl"), "ab") as f:
+                f.write(b'{"timestamp": "crash')
+
+            torn_tail = chat_manager.store.read(chat_id, last=1)
+            corrupted = chat_manager.scan_corrupted_chat_files()
+            self._add(chat_manager, chat_id, 2)
+            history = chat_manager.get_chat_history(chat_id)
+            count = chat_manager.list_chats()[0]["conversation_count"]
+            repaired = chat_manager.repair_chat_file(chat_id)
+            backup_exists = os.path.exists(os.path.join(temp_dir, f"{chat_id}.jsonl.bak"))
+
+        self.assert_equal(["answer 1"], [conv["response"] for conv in torn_tail], "chat_store_torn_tail",
+                          "A torn last line does not count toward the requested tail")
+        self.assert_equal([chat_id], corrupted, "chat_store_torn_detected", "Torn line is reported")
+        self.assert_equal(["answer 1", "answer 2"], [conv["response"] for conv in history],
+                          "chat_store_torn_skipped", "Valid conversations survive a torn line")
+        self.assert_equal(2, count, "chat_store_torn_count", "Header is rebuilt after the crash")
+        self.assert_true(repaired and backup_exists, "chat_store_repair", "Repair keeps a backup")
+
+    def test_legacy_migration(self):
+        """Test that whole-file JSON chats are migrated on first use."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            legacy = {
+                "chat_id": "legacy01",
+                "created_at": "2025-01-01T10:00:00",
+                "conversations": [
+                    {"timestamp": "2025-01-01T10:00:01", "messages": [{"role": "user", "content": "hi"}],
+                     "response": "hello"}
+                ]
+            }
+            with open(os.path.join(temp_dir, "legacy01.json"), "w", encoding="utf-8") as f:
+                json.dump(legacy, f)
+
+            store = JsonlChatStore(temp_dir)
+            history = store.read("legacy01")
+            header = store.get_header("legacy01")
+            files = sorted(os.listdir(temp_dir))
+
+        self.assert_equal(legacy["conversations"], history, "chat_store_migrated_history",
+                          "Conversations are carried over")
+        self.assert_equal("2025-01-01T10:00:00", header["created_at"], "chat_store_migrated_header",
+                          "Creation time is carried over")
+        self.assert_equal(["legacy01.json.migrated", "legacy01.jsonl", "legacy01.meta"], files,
+                          "chat_store_migrated_files", "Legacy file is kept as a migrated backup")
@@ -0,0 +1,117 @@
+"""
+Unit tests for token estimation and the chat history context budget.
+"""
+import os
+import sys
+import tempfile
+from argparse import Namespace
+from unittest.mock import Mock, patch
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.modules.chat import ChatManager, ContextBudget, get_context_budget_settings
+from askai.modules.chat.context_budget import SUMMARY_PREFIX
+from askai.shared.utils import TokenEstimator, estimate_tokens
+
+
+class TestContextBudget(BaseUnitTest):
+    """Test token estimates, history trimming and cached summaries."""
+
+    def run(self):
+        """Run all context budget tests."""
+        self.test_estimates()
+        self.test_newest_turns_are_kept()
+        self.test_summary_is_cached_and_extended()
+        self.test_persistent_chat_is_trimmed()
+        return self.results
+
+    @staticmethod
+    def _turns(count, size=400):
+        return [{
+            "user": {"role": "user", "content": f"question {number}"},
+            "assistant": {"role": "assistant", "content": f"answer {number} " + "word " * (size // 5)},
+            "timestamp": f"2024-01-01T00:00:{number:02d}"
+        } for number in range(count)]
+
+    def test_estimates(self):
+        """Test the estimator on text, messages and per-model overrides."""
+        config = {"token_estimation": {"chars_per_token": 4, "models": {"anthropic/": 3, "anthropic/claude-x": 2}}}
+        message = [{"role": "user", "content": [
+            {"type": "text", "text": "hello world"},
+            {"type": "image_url", "image_url": {"url": "data:image/png;base64," + "A" * 100000}}
+        ]}]
+
+        self.assert_equal(3, estimate_tokens("hello, world"), "tokens_words", "Words and punctuation are counted")
+        self.assert_equal(3, estimate_tokens("x" * 10), "tokens_long_word", "Long words cost several tokens")
+        self.assert_equal(2.0, TokenEstimator.for_model("anthropic/claude-x-1", config).chars_per_token,
+                          "tokens_model_override", "Longest matching prefix wins")
+        self.assert_equal(4.0, TokenEstimator.for_model("openai/gpt", config).chars_per_token,
+                          "tokens_model_default", "Other models use the default ratio")
+        self.assert_true(TokenEstimator().count_messages(message) < 1100, "tokens_attachment",
+                         "Data URLs are not counted as text")
+
+    def test_newest_turns_are_kept(self):
+        """Test that only the newest turns that fit are kept, in order."""
+        budget = ContextBudget(1000, 200)
+        fixed = [{"role": "system", "content": "Be brief"}, {"role": "user", "content": "next question"}]
+        messages, report = budget.fit(self._turns(10), fixed)
+
+        self.assert_true(0 < report.kept_turns < 10, "budget_trimmed", "Some turns are dropped")
+        self.assert_true(report.prompt_tokens <= budget.prompt_budget, "budget_fits", "Prompt fits the budget")
+        self.assert_equal("question 9", messages[-2]["content"], "budget_newest", "Newest turn is kept")
+        self.assert_equal(f"question {10 - report.kept_turns}", messages[0]["content"], "budget_contiguous",
+                          "Kept turns are contiguous")
+        self.assert_equal(10, budget.fit(self._turns(10), fixed)[1].turns, "budget_turns", "All turns reported")
+        self.assert_false(ContextBudget(100000, 200).fit(self._turns(10), fixed)[1].trimmed,
+                          "budget_untrimmed", "Everything fits a large context")
+
+    def test_summary_is_cached_and_extended(self):
+        """Test that dropped turns are summarized once and the summary is extended later."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            chat_manager = ChatManager({"chat": {"storage_path": temp_dir}})
+            summarizer = Mock(side_effect=["summary one", "summary two"])
+            budget = ContextBudget(1000, 200, summarizer=summarizer, summary_tokens=100,
+                                   summary_cache=chat_manager.summary_cache)
+            fixed = [{"role": "user", "content": "next question"}]
+
+            first, report = budget.fit(self._turns(10), fixed, "chat1")
+            budget.fit(self._turns(10), fixed, "chat1")
+            second, _ = budget.fit(self._turns(12), fixed, "chat1")
+
+        extension = summarizer.call_args_list[1].args[0][1]["content"]
+        self.assert_equal(SUMMARY_PREFIX + "summary one", first[0]["content"], "summary_message",
+                          "Summary precedes the kept turns")
+        self.assert_equal(10 - report.kept_turns, report.summarized_turns, "summary_report", "Summarized turns")
+        self.assert_equal(2, summarizer.call_count, "summary_cached", "Unchanged history is not summarized again")
+        self.assert_true(extension.startswith(SUMMARY_PREFIX + "summary one") and "question 0" not in extension,
+                         "summary_extended", "Only newly dropped turns are added to the cached summary")
+        self.assert_equal(SUMMARY_PREFIX + "summary two", second[0]["content"], "summary_updated",
+                          "Extended summary is used")
+
+    def test_persistent_chat_is_trimmed(self):
+        """Test that persistent chats send only the history that fits the budget."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            chat_manager = ChatManager({"chat": {"storage_path": temp_dir, "max_history": 20}})
+            chat_id = chat_manager.create_chat()
+            for turn in self._turns(10):
+                chat_manager.add_conversation(chat_id, [turn["user"]], turn["assistant"]["content"])
+            args = Namespace(persistent_chat=chat_id)
+            question = [{"role": "user", "content": "next question"}]
+
+            with patch("builtins.print") as printed:
+                _, untrimmed = chat_manager.handle_persistent_chat(args, question)
+                _, trimmed = chat_manager.handle_persistent_chat(args, question, ContextBudget(1000, 200))
+
+        self.assert_equal(21, len(untrimmed), "chat_budget_none", "Without a budget max_history applies")
+        self.assert_true(len(trimmed) < len(untrimmed), "chat_budget_trimmed", "Budget trims the history")
+        self.assert_equal("next question", trimmed[-1]["content"], "chat_budget_question", "Question is last")
+        self.assert_true(any("Context: newest" in str(call) for call in printed.call_args_list),
+                         "chat_budget_reported", "Trimming is reported with the token estimate")
+        self.assert_equal(8192, get_context_budget_settings({})["fallback_context_length"],
+                          "chat_budget_defaults", "Defaults apply without a config block")
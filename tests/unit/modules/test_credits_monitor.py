@@ -0,0 +1,149 @@
+"""
+Unit tests for the shared credits monitor.
+"""
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import Mock
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.modules.ai.credits_monitor import CreditsMonitor, get_credits_monitor
+from askai.modules.ai.openrouter_client import OpenRouterClient
+
+
+def _credits(usage, credits=10.0):
+    return {"total_credits": credits, "total_usage": usage}
+
+
+class TestCreditsMonitor(BaseUnitTest):
+    """Test the shared balance file, background refresh, spend rate and client integration."""
+
+    def run(self):
+        """Run all credits monitor tests."""
+        self.test_fetch_once_then_disk()
+        self.test_stale_balance_refreshes_in_background()
+        self.test_stale_balance_refreshed_before_returning()
+        self.test_file_per_api_key()
+        self.test_spend_rate()
+        self.test_polling()
+        self.test_client_uses_monitor()
+        return self.results
+
+    def test_fetch_once_then_disk(self):
+        """Test that only the first read fetches and another process reads the file."""
+        fetch = Mock(return_value=_credits(1.0))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "credits.json")
+            first = CreditsMonitor(path).get_balance(fetch)
+            other = CreditsMonitor(path)
+            second = other.get_balance(fetch)
+            latest = other.latest()
+
+        self.assert_equal(1, fetch.call_count, "credits_single_fetch", "The balance is fetched once")
+        self.assert_equal(first, second, "credits_from_disk", "Another process reads the same balance")
+        self.assert_true(latest["fetched_at"] <= time.time(), "credits_timestamp", "The fetch time is kept")
+
+    def test_stale_balance_refreshes_in_background(self):
+        """Test that a stale balance is returned at once and refreshed for the next read."""
+        fetch = Mock(side_effect=[_credits(1.0), _credits(2.0)])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            monitor = CreditsMonitor(os.path.join(temp_dir, "credits.json"), poll_interval_seconds=0)
+            monitor.get_balance(fetch)
+            time.sleep(0.01)
+            stale = monitor.get_balance(fetch)
+            monitor._refresh_thread.join(5)  # pylint: disable=protected-access
+
+            self.assert_equal(_credits(1.0), stale, "credits_stale_served", "Stale balance is returned without waiting")
+            self.assert_equal(_credits(2.0), monitor.latest()["data"], "credits_refreshed",
+                              "The background refresh updates the cache")
+            self.assert_equal(2, len(monitor.history()), "credits_history", "Each refresh adds a usage sample")
+
+    def test_stale_balance_refreshed_before_returning(self):
+        """Test that short-lived callers get a stale balance refreshed synchronously."""
+        fetch = Mock(side_effect=[_credits(1.0), _credits(2.0)])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            monitor = CreditsMonitor(os.path.join(temp_dir, "credits.json"), poll_interval_seconds=0)
+            monitor.get_balance(fetch)
+            time.sleep(0.01)
+            balance = monitor.get_balance(fetch, background=False)
+
+        self.assert_equal(_credits(2.0), balance, "credits_sync_refresh", "The fresh balance is returned")
+        self.assert_equal(None, monitor._refresh_thread, "credits_sync_no_thread",  # pylint: disable=protected-access
+                          "No background refresh is started")
+
+    def test_file_per_api_key(self):
+        """Test that each API key gets its own cache file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            credits_config = {"path": os.path.join(temp_dir, "credits.json")}
+            first = get_credits_monitor({"api_key": "key-one", "credits": credits_config})
+            second = get_credits_monitor({"api_key": "key-two", "credits": credits_config})
+            again = get_credits_monitor({"api_key": "key-one", "credits": credits_config})
+
+        self.assert_true(first.path != second.path, "credits_file_per_key", "Keys do not share a balance file")
+        self.assert_true(first is again, "credits_monitor_per_key", "One monitor is shared per key")
+        self.assert_true(os.path.basename(first.path).startswith("credits-"), "credits_keyed_name",
+                         "The key hash is added to the configured name")
+
+    def test_spend_rate(self):
+        """Test the spend rate over the series, its window and the history cap."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            monitor = CreditsMonitor(os.path.join(temp_dir, "credits.json"), history_size=3)
+            self.assert_equal(None, monitor.spend_rate(), "credits_rate_empty", "No rate without samples")
+
+            monitor._state = {"data": _credits(3.0), "fetched_at": 7200,  # pylint: disable=protected-access
+                              "history": [[0, 0.0, 10.0], [3600, 1.0, 10.0], [7200, 3.0, 10.0]]}
+            self.assert_equal(1.5, monitor.spend_rate(), "credits_rate", "Spend per hour over the series")
+            self.assert_equal(2.0, monitor.spend_rate(window_seconds=3600), "credits_rate_window",
+                              "Only samples within the window count")
+
+            monitor.refresh(Mock(return_value=_credits(4.0)))
+            self.assert_equal(3, len(monitor.history()), "credits_history_cap", "Old samples are dropped")
+
+    def test_polling(self):
+        """Test that the poller fetches a missing balance and stops on request."""
+        fetch = Mock(return_value=_credits(1.0))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            monitor = CreditsMonitor(os.path.join(temp_dir, "credits.json"), poll_interval_seconds=60)
+            monitor.start_polling(fetch)
+            monitor.start_polling(fetch)
+            deadline = time.time() + 5
+            while monitor.latest() is None and time.time() < deadline:
+                time.sleep(0.01)
+            monitor.stop_polling()
+            monitor._poller.join(5)  # pylint: disable=protected-access
+
+        self.assert_equal(1, fetch.call_count, "credits_poll_fetch", "One poller fetches the missing balance")
+        self.assert_false(monitor._poller.is_alive(), "credits_poll_stop",  # pylint: disable=protected-access
+                          "The poller stops on request")
+
+    def test_client_uses_monitor(self):
+        """Test that the client answers from the shared file and refreshes on request."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = {
+                "base_url": "https://test.api.com/",
+                "api_key": "test-key",
+                "default_model": "test/model",
+                "credits": {"path": os.path.join(temp_dir, "credits.json")}
+            }
+            session = Mock()
+            session.get.side_effect = [
+                Mock(ok=True, status_code=200, **{"json.return_value": {"data": _credits(1.0)}}),
+                Mock(ok=True, status_code=200, **{"json.return_value": {"data": _credits(2.0)}})
+            ]
+            client = OpenRouterClient(config=config, logger=Mock(), session=session)
+            first = client.get_credit_balance()
+            cached = client.get_credit_balance()
+            refreshed = client.get_credit_balance(refresh=True)
+
+        self.assert_equal(_credits(1.0), cached, "credits_client_cached", "A fresh balance is not fetched again")
+        self.assert_equal(first, cached, "credits_client_same", "Both reads return the same balance")
+        self.assert_equal(_credits(2.0), refreshed, "credits_client_refresh", "Refresh fetches a new balance")
+        self.assert_equal(2, session.get.call_count, "credits_client_calls", "Only the refresh hits the API")
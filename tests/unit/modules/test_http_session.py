@@ -0,0 +1,110 @@
+"""
+Unit tests for the shared OpenRouter HTTP session.
+"""
+import os
+import sys
+from unittest.mock import Mock, patch
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.modules.ai import http_session
+from askai.modules.ai.openrouter_client import OpenRouterClient
+
+
+class TestHTTPSession(BaseUnitTest):
+    """Test pooled session creation and reuse."""
+
+    def __init__(self):
+        super().__init__()
+        self.config = {
+            "base_url": "https://test.api.com",
+            "api_key": "test-key",
+            "default_model": "test/model",
+            # Credit lookups must reach the (mocked) session, not the shared cache
+            "credits": {"enabled": False}
+        }
+
+    def run(self):
+        """Run all HTTP session tests."""
+        http_session.close_sessions()
+        self.test_settings_defaults_and_overrides()
+        self.test_session_is_shared()
+        self.test_pool_configuration()
+        self.test_client_uses_shared_session()
+        self.test_client_accepts_injected_session()
+        http_session.close_sessions()
+        return self.results
+
+    def test_settings_defaults_and_overrides(self):
+        """Test merging of the http config block with defaults."""
+        defaults = http_session.get_http_settings({})
+        self.assert_equal(http_session.DEFAULT_HTTP_SETTINGS, defaults,
+                          "http_settings_defaults", "Defaults used without http block")
+
+        settings = http_session.get_http_settings({"http": {"pool_maxsize": 32, "max_retries": None}})
+        self.assert_equal(32, settings["pool_maxsize"], "http_settings_override",
+                          "Configured pool size overrides default")
+        self.assert_equal(http_session.DEFAULT_HTTP_SETTINGS["max_retries"], settings["max_retries"],
+                          "http_settings_null_ignored", "Null values fall back to defaults")
+
+    def test_session_is_shared(self):
+        """Test that equal pool settings return the same session."""
+        first = http_session.get_session(self.config)
+        second = http_session.get_session(dict(self.config))
+        other = http_session.get_session({**self.config, "http": {"pool_maxsize": 4}})
+
+        self.assert_true(first is second, "session_shared", "Same settings reuse one session")
+        self.assert_false(first is other, "session_per_pool_config",
+                          "Different pool settings get their own session")
+
+    def test_pool_configuration(self):
+        """Test that adapters carry pool sizing and idempotent-only retries."""
+        session = http_session.get_session({**self.config, "http": {"pool_maxsize": 16, "max_retries": 3}})
+        adapter = session.get_adapter("https://openrouter.ai/api/v1/models")
+
+        self.assert_equal(16, adapter._pool_maxsize, "adapter_pool_maxsize",  # pylint: disable=protected-access
+                          "Adapter uses configured pool size")
+        self.assert_equal(3, adapter.max_retries.total, "adapter_retries", "Adapter uses configured retries")
+        self.assert_false("POST" in adapter.max_retries.allowed_methods, "adapter_no_post_retry",
+                          "Completions are never retried")
+        self.assert_equal(0, adapter.max_retries.connect, "adapter_no_connect_retry",
+                          "Connect errors are left to the resilience layer")
+
+    def test_client_uses_shared_session(self):
+        """Test that separate clients reuse the pooled session for requests."""
+        client_a = OpenRouterClient(config=self.config, logger=Mock())
+        client_b = OpenRouterClient(config=self.config, logger=Mock())
+        self.assert_true(client_a.session is client_b.session, "client_session_shared",
+                         "Clients share the process-wide session")
+
+        response = Mock(ok=True)
+        response.json.return_value = {"data": {"total_credits": 5}}
+        with patch.object(client_a.session, "get", return_value=response) as mock_get, \
+             patch("requests.get") as module_get:
+            result = client_a.get_credit_balance()
+
+        self.assert_equal({"total_credits": 5}, result, "client_credits_via_session",
+                          "Credit lookup returns parsed data")
+        self.assert_true(mock_get.called and not module_get.called, "client_no_module_requests",
+                         "Requests go through the session, not module-level helpers")
+
+    def test_client_accepts_injected_session(self):
+        """Test completion requests with an injected session."""
+        session = Mock()
+        response = Mock(ok=True)
+        response.json.return_value = {"choices": [{"message": {"content": "hi"}}]}
+        session.post.return_value = response
+
+        client = OpenRouterClient(config=self.config, logger=Mock(), session=session)
+        result = client.request_completion([{"role": "user", "content": "hello"}])
+
+        self.assert_equal("hi", result["content"], "client_injected_session",
+                          "Completion uses the injected session")
+        self.assert_equal("https://test.api.com/chat/completions", session.post.call_args[0][0],
+                          "client_completion_url", "Completion posts to the chat endpoint")
@@ -0,0 +1,118 @@
+"""
+Unit tests for optional image pre-processing.
+"""
+import io
+import os
+import sys
+import tempfile
+from unittest.mock import Mock, patch
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.modules.messaging import MessageBuilder, builder as builder_module, image_processing
+from askai.modules.patterns import ModelConfiguration
+from askai.shared.utils import encode_file_to_data_url
+
+
+class TestImageProcessing(BaseUnitTest):
+    """Test image processing settings, the Pillow fallback and cached processed encodings."""
+
+    def run(self):
+        """Run all image processing tests."""
+        self.test_settings_and_pattern_overrides()
+        self.test_without_pillow()
+        self.test_processed_images_are_cached()
+        if image_processing.PIL_AVAILABLE:
+            self.test_downscale_and_strip()
+        return self.results
+
+    def test_settings_and_pattern_overrides(self):
+        """Test that pattern model overrides win over the config block and defaults."""
+        model = ModelConfiguration.from_dict({
+            "model_name": "vision-model",
+            "image_processing": {"max_dimension": 768, "format": "webp"}
+        })
+        config = {"image_processing": {"enabled": True, "quality": 70, "max_dimension": 1024}}
+        builder = MessageBuilder(None, Mock(), config)
+
+        settings = builder._image_settings({"configuration": Mock(model=model)})  # pylint: disable=protected-access
+        defaults = builder._image_settings()  # pylint: disable=protected-access
+
+        self.assert_equal({"enabled": True, "max_dimension": 768, "format": "webp", "quality": 70,
+                           "strip_metadata": True, "min_bytes": 256 * 1024}, settings,
+                          "image_settings_override", "Pattern overrides are merged per key")
+        self.assert_equal(1024, defaults["max_dimension"], "image_settings_config", "Config block applies")
+        self.assert_true(image_processing.settings_variant(settings) != image_processing.settings_variant(defaults),
+                         "image_settings_variant", "Different settings give different cache variants")
+        self.assert_false(image_processing.get_image_processing_settings()["enabled"],
+                          "image_settings_default", "Processing is opt-in")
+
+    def test_without_pillow(self):
+        """Test that without Pillow images are sent unchanged with a single warning."""
+        logger = Mock()
+        builder = MessageBuilder(None, logger)
+        settings = image_processing.get_image_processing_settings({"image_processing": {"enabled": True}})
+        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as temp:
+            temp.write(b"\x89PNG image")
+        try:
+            with patch.object(builder_module, "PIL_AVAILABLE", False):
+                first = builder._encode_attachment(temp.name, "image/png", settings)  # pylint: disable=protected-access
+                builder._encode_attachment(temp.name, "image/png", settings)  # pylint: disable=protected-access
+            expected = encode_file_to_data_url(temp.name, "image/png")
+        finally:
+            os.unlink(temp.name)
+
+        self.assert_equal(expected, first, "image_no_pillow_unchanged", "Original image is sent")
+        self.assert_equal(1, logger.warning.call_count, "image_no_pillow_warning", "Missing Pillow is logged once")
+
+    def test_processed_images_are_cached(self):
+        """Test that processed encodings are stored in the attachment cache per settings variant."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            image = os.path.join(temp_dir, "photo.jpg")
+            with open(image, "wb") as f:
+                f.write(b"\xff\xd8 large photo" * 100)
+            config = {
+                "attachment_cache": {"path": os.path.join(temp_dir, "cache")},
+                "image_processing": {"enabled": True},
+            }
+            builder = MessageBuilder(None, Mock(), config)
+            settings = builder._image_settings()  # pylint: disable=protected-access
+            report = {"original_bytes": 1500, "processed_bytes": 5, "saved_bytes": 1495}
+            with patch.object(builder_module, "PIL_AVAILABLE", True), \
+                 patch.object(builder_module, "process_image",
+                              return_value=(b"small", "image/webp", report)) as process:
+                first = builder._encode_attachment(image, "image/jpeg", settings)  # pylint: disable=protected-access
+                second = builder._encode_attachment(image, "image/jpeg", settings)  # pylint: disable=protected-access
+                plain = builder._encode_attachment(image, "image/jpeg")  # pylint: disable=protected-access
+
+        self.assert_equal("data:image/webp;base64,c21hbGw=", first, "image_processed_url",
+                          "Processed bytes are sent with their MIME type")
+        self.assert_equal(first, second, "image_processed_cached", "Processed encoding is reused")
+        self.assert_equal(1, process.call_count, "image_processed_once", "Image is processed once")
+        self.assert_true(plain.startswith("data:image/jpeg;base64,"), "image_variant_separate",
+                         "Unprocessed encoding is cached separately")
+
+    def test_downscale_and_strip(self):
+        """Test that Pillow downscales, re-encodes and strips large images."""
+        from PIL import Image  # pylint: disable=import-outside-toplevel
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "photo.png")
+            Image.effect_noise((2000, 1000), 64).convert("RGB").save(path, format="PNG")
+            settings = image_processing.get_image_processing_settings(
+                {"image_processing": {"enabled": True, "max_dimension": 500, "min_bytes": 0}})
+            data, mime_type, report = image_processing.process_image(path, settings)
+
+        with Image.open(io.BytesIO(data)) as processed:
+            size = processed.size
+            exif = processed.info.get("exif")
+        self.assert_equal("image/jpeg", mime_type, "image_pillow_format", "Re-encoded as JPEG")
+        self.assert_equal((500, 250), size, "image_pillow_downscale", "Longest side is max_dimension")
+        self.assert_true(report["saved_bytes"] > 0, "image_pillow_saved", "Savings are reported")
+        self.assert_equal(None, exif, "image_pillow_stripped", "Metadata is stripped")
@@ -0,0 +1,246 @@
+"""
+Unit tests for token-bounded chunking and map-reduce execution.
+"""
+import io
+import os
+import sys
+import tempfile
+from unittest.mock import Mock, patch
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.modules.messaging import MessageBuilder
+from askai.modules.patterns import PatternManager
+from askai.modules.questions import QuestionContext
+from askai.modules.questions.map_reduce import MapReduceProcessor, REDUCE_INSTRUCTION
+from askai.shared.utils import CHARS_PER_TOKEN, estimate_tokens, iter_token_chunks
+
+PATTERN = """# Pattern: Log Reader
+
+## Purpose
+Interpret application logs
+
+## Functionality
+* Finds root causes
+
+## Pattern Inputs
+
+```yaml
+inputs:
+  - name: log_file
+    description: Path to the log file
+    type: file
+    required: true
+```
+
+## Model Configuration
+
+```yaml
+model:
+  provider: openrouter
+  model_name: test/model
+
+map_reduce:
+  enabled: true
+  chunk_tokens: 300
+```
+"""
+
+
+class _FakeAIService:
+    """Answers every request with a numbered reply and fixed usage."""
+
+    def __init__(self):
+        self.requests = []
+
+    def get_ai_response(self, messages, **kwargs):
+        """Record the request and answer it."""
+        self.requests.append({"messages": messages, **kwargs})
+        return {
+            "content": f"answer {len(self.requests)}",
+            "full_response": {"usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12}}
+        }
+
+
+class TestMapReduce(BaseUnitTest):
+    """Test chunking, the map and reduce steps and the question and pattern entry points."""
+
+    def run(self):
+        """Run all map-reduce tests."""
+        self.test_chunks_are_bounded()
+        self.test_log_chunks_fit_estimate()
+        self.test_single_chunk_is_one_request()
+        self.test_map_and_reduce()
+        self.test_partials_are_combined_in_groups()
+        self.test_question_file_input()
+        self.test_pattern_file_input()
+        self.test_chunk_limit()
+        return self.results
+
+    @staticmethod
+    def _processor(ai_service, config=None, message_builder=None):
+        return MapReduceProcessor(message_builder or Mock(), ai_service, Mock(), config, show_spinner=False)
+
+    @staticmethod
+    def _build(text, instruction):
+        return [{"role": "system", "content": instruction or ""}, {"role": "user", "content": text}]
+
+    def test_chunks_are_bounded(self):
+        """Test that chunks stay within budget, prefer line ends and keep all text."""
+        text = "".join(f"line {i} " + "x" * (i % 30) + "\n" for i in range(200)) + "y" * 500 + "\n"
+        chunks = list(iter_token_chunks(io.StringIO(text), 50))
+
+        self.assert_true(all(estimate_tokens(chunk) <= 50 for chunk in chunks), "chunks_bounded",
+                         "No chunk exceeds the token budget")
+        self.assert_true(all(chunk.endswith("\n") for chunk in chunks[:-4]), "chunks_line_boundaries",
+                         "Chunks end on line boundaries")
+        self.assert_equal(text, "".join(chunks), "chunks_complete", "Chunks reassemble the input")
+
+    def test_log_chunks_fit_estimate(self):
+        """Test that chunks of typical log lines stay within the budget of the token estimator."""
+        log = "".join(f"2024-01-01T12:00:{i % 60:02d}.123Z ERROR [worker-{i % 8}] db.pool: timeout after "
+                      f"30s (conn={i}, retries=3) -> /api/v1/items?id={i}&x=y\n" for i in range(2000))
+        text = log + "token " * 3000 + "\n" + "z" * 9000 + "\n"
+        chunks = list(iter_token_chunks(io.StringIO(text), 1000))
+        log_chunks = list(iter_token_chunks(io.StringIO(log), 1000))
+
+        self.assert_true(all(estimate_tokens(chunk) <= 1000 for chunk in chunks), "chunks_estimate_bounded",
+                         "estimate_tokens(chunk) never exceeds chunk_tokens, long lines included")
+        self.assert_true(min(estimate_tokens(chunk) for chunk in log_chunks[:-1]) > 900, "chunks_estimate_filled",
+                         "Chunks of short lines use most of their budget")
+        self.assert_equal(text, "".join(chunks), "chunks_estimate_complete", "Chunks reassemble the input")
+
+    def test_single_chunk_is_one_request(self):
+        """Test that an input of one chunk is sent as an ordinary request."""
+        ai_service = _FakeAIService()
+        response = self._processor(ai_service).process(
+            iter(["small input"]), self._build, {"chunk_tokens": 100, "concurrency": 2, "max_chunks": 10}
+        )
+
+        self.assert_equal(1, len(ai_service.requests), "map_reduce_single_request", "One request")
+        self.assert_equal("", ai_service.requests[0]["messages"][0]["content"], "map_reduce_single_plain",
+                          "No map-reduce instruction for a single chunk")
+        self.assert_equal("answer 1", response["content"], "map_reduce_single_response", "Response returned")
+
+    def test_map_and_reduce(self):
+        """Test that every chunk is answered and the answers are reduced in order."""
+        ai_service = _FakeAIService()
+        chunks = [f"chunk {i}" for i in range(5)]
+        response = self._processor(ai_service).process(
+            iter(chunks), self._build, {"chunk_tokens": 1000, "concurrency": 3, "max_chunks": 10},
+            request={"model_name": "test/model"}
+        )
+
+        mapped = sorted(r["messages"][1]["content"] for r in ai_service.requests[:-1])
+        final = ai_service.requests[-1]["messages"]
+        self.assert_equal(chunks, mapped, "map_reduce_all_chunks", "Every chunk is requested once")
+        self.assert_equal(REDUCE_INSTRUCTION.format(parts=5), final[0]["content"], "map_reduce_reduce_instruction",
+                          "Final request combines the parts")
+        self.assert_true(final[1]["content"].index("Part 1:") < final[1]["content"].index("Part 5:"),
+                         "map_reduce_reduce_order", "Partial answers are combined in order")
+        self.assert_equal("test/model", ai_service.requests[0]["model_name"], "map_reduce_request_kwargs",
+                          "Request options are passed through")
+        self.assert_equal({"prompt_tokens": 60, "completion_tokens": 12, "total_tokens": 72},
+                          response["full_response"]["usage"], "map_reduce_usage", "Usage covers all requests")
+        self.assert_equal({"chunks": 5, "failed": 0}, response["full_response"]["map_reduce"],
+                          "map_reduce_summary", "Summary is attached to the response")
+
+    def test_partials_are_combined_in_groups(self):
+        """Test that partial answers too large for one request are reduced in groups first."""
+        ai_service = _FakeAIService()
+        ai_service.get_ai_response = Mock(side_effect=lambda messages, **kwargs: {
+            "content": "z" * 150, "full_response": {}
+        })
+        self._processor(ai_service).process(
+            iter(["a", "b", "c", "d", "e", "f"]), self._build,
+            {"chunk_tokens": 100, "concurrency": 2, "max_chunks": 10}
+        )
+
+        calls = [call.kwargs["messages"] for call in ai_service.get_ai_response.call_args_list]
+        group_inputs = [messages[1]["content"] for messages in calls[6:-1]]
+        final_input = calls[-1][1]["content"]
+        # Six answers of ~40 tokens reduce in pairs, then the first two pairs once more
+        self.assert_equal(6 + 3 + 1 + 1, len(calls), "map_reduce_group_requests",
+                          "Map requests, group reduces and the final reduce")
+        self.assert_true(group_inputs[0].startswith("Part 1:") and "Part 2:" in group_inputs[0],
+                         "map_reduce_groups", "Partial answers are reduced in groups")
+        self.assert_true(final_input.startswith("Parts 1-4:") and "Parts 5-6:" in final_input,
+                         "map_reduce_group_labels", "Combined answers keep their part ranges")
+
+    def test_question_file_input(self):
+        """Test that a large -fi file is streamed in chunks and small files are left alone."""
+        ai_service = _FakeAIService()
+        builder = MessageBuilder(None, Mock())
+        processor = MapReduceProcessor(builder, ai_service, Mock(), {"map_reduce": {"enabled": True}},
+                                       show_spinner=False, overrides={"chunk_tokens": 300})
+        with tempfile.TemporaryDirectory() as temp_dir:
+            large = os.path.join(temp_dir, "large.log")
+            small = os.path.join(temp_dir, "small.log")
+            with open(large, "w", encoding="utf-8") as f:
+                f.write("".join(f"2024-01-01 INFO event {i}\n" for i in range(400)))
+            with open(small, "w", encoding="utf-8") as f:
+                f.write("one line\n")
+
+            with patch("sys.stdin.isatty", return_value=True):
+                skipped = processor.process_question(QuestionContext(question="Errors?", file_input=small))
+                response = processor.process_question(QuestionContext(question="Errors?", file_input=large))
+
+        file_messages = [m["content"] for r in ai_service.requests[:-1] for m in r["messages"]
+                         if m["content"].startswith(f"The file content of {large}")]
+        self.assert_equal(None, skipped, "map_reduce_question_small", "Small files use the normal path")
+        self.assert_true(len(ai_service.requests) > 3, "map_reduce_question_chunks", "Large file is split")
+        self.assert_equal(len(ai_service.requests) - 1, len(file_messages), "map_reduce_question_chunk_message",
+                          "Each map request carries one chunk of the file")
+        self.assert_true(all(estimate_tokens(m) < 300 + 50 for m in file_messages),
+                         "map_reduce_question_bounded", "No request carries the whole file")
+        self.assert_equal(f"answer {len(ai_service.requests)}", response["content"], "map_reduce_question_final",
+                          "The reduce answer is returned")
+
+    def test_pattern_file_input(self):
+        """Test that a pattern enabling map-reduce splits its file input."""
+        ai_service = _FakeAIService()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            os.makedirs(os.path.join(temp_dir, "patterns"))
+            with open(os.path.join(temp_dir, "patterns", "log_reader.md"), "w", encoding="utf-8") as f:
+                f.write(PATTERN)
+            log_path = os.path.join(temp_dir, "app.log")
+            with open(log_path, "w", encoding="utf-8") as f:
+                f.write("".join(f"2024-01-01 ERROR failure {i}\n" for i in range(300)))
+
+            manager = PatternManager(temp_dir, {"patterns": {"index_path": ""}})
+            processor = MapReduceProcessor(MessageBuilder(manager, Mock()), ai_service, Mock(), {},
+                                           show_spinner=False)
+            job = processor.prepare_pattern(manager, "log_reader", {"log_file": log_path}, interactive=False)
+            response = processor.process_pattern(job, manager)
+
+        first = ai_service.requests[0]
+        self.assert_equal(("log_file", log_path), (job.chunked_input, job.chunked_path), "map_reduce_pattern_job",
+                          "Large file input is marked for splitting")
+        self.assert_true(first["messages"][1]["content"].startswith("The input is too large"),
+                         "map_reduce_pattern_instruction", "Map instruction follows the pattern prompt")
+        self.assert_equal("log_reader", first["pattern_id"], "map_reduce_pattern_request",
+                          "Pattern configuration is used for every request")
+        self.assert_true(response["full_response"]["map_reduce"]["chunks"] > 1, "map_reduce_pattern_chunks",
+                         "Pattern ran over several chunks")
+
+    def test_chunk_limit(self):
+        """Test that files needing more than max_chunks chunks are refused before any request."""
+        ai_service = _FakeAIService()
+        processor = MapReduceProcessor(Mock(), ai_service, Mock(), {"map_reduce": {
+            "enabled": True, "chunk_tokens": 256, "max_chunks": 2
+        }}, show_spinner=False)
+        with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as temp:
+            temp.write("x" * 256 * CHARS_PER_TOKEN * 3)
+        try:
+            self.assert_raises(ValueError, lambda: processor.process_question(QuestionContext(file_input=temp.name)),
+                               "map_reduce_chunk_limit", "Too many chunks are refused")
+        finally:
+            os.unlink(temp.name)
+        self.assert_equal(0, len(ai_service.requests), "map_reduce_chunk_limit_no_requests",
+                          "No request is sent")
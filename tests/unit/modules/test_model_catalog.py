@@ -0,0 +1,136 @@
+"""
+Unit tests for the persistent model catalogue.
+"""
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import Mock
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.modules.ai.model_catalog import ModelCatalog, ModelSearchIndex
+from askai.modules.ai.openrouter_client import OpenRouterClient
+
+MODELS = [
+    {"id": "anthropic/claude-x", "name": "Claude X", "description": "Careful Writer", "context_length": 200000,
+     "pricing": {"prompt": "0.000003", "completion": "0.000015"}},
+    {"id": "openai/gpt-y", "name": "GPT Y", "description": "Fast coder", "context_length": 128000,
+     "pricing": {"prompt": "0.000001", "completion": "0.000002"}},
+]
+
+
+def _http_response(status_code, data=None, headers=None):
+    response = Mock(ok=status_code < 400, status_code=status_code, headers=headers or {})
+    response.json.return_value = data
+    return response
+
+
+class TestModelCatalog(BaseUnitTest):
+    """Test disk persistence, background revalidation, indexes and client integration."""
+
+    def run(self):
+        """Run all model catalogue tests."""
+        self.test_fetch_once_then_disk()
+        self.test_stale_list_revalidates_in_background()
+        self.test_stale_list_revalidated_before_returning()
+        self.test_indexes()
+        self.test_search_index_prefix_matching()
+        self.test_client_conditional_request()
+        return self.results
+
+    def test_fetch_once_then_disk(self):
+        """Test that only the first listing fetches and a new process reads the file."""
+        fetch = Mock(return_value=(MODELS, {"etag": '"v1"', "last_modified": None}))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "models.json")
+            first = ModelCatalog(path).get_models(fetch)
+            second = ModelCatalog(path).get_models(fetch)
+
+        self.assert_equal(1, fetch.call_count, "catalog_single_fetch", "The list is fetched once")
+        self.assert_equal(first, second, "catalog_from_disk", "Another process reads the same list from disk")
+
+    def test_stale_list_revalidates_in_background(self):
+        """Test that a stale list is returned at once and revalidated with its ETag."""
+        fetch = Mock(side_effect=[(MODELS, {"etag": '"v1"', "last_modified": None}),
+                                  (None, {"etag": '"v1"', "last_modified": None})])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            catalog = ModelCatalog(os.path.join(temp_dir, "models.json"), ttl_seconds=0)
+            catalog.get_models(fetch)
+            time.sleep(0.01)
+            stale = catalog.get_models(fetch)
+            catalog._refresh_thread.join(5)  # pylint: disable=protected-access
+
+            self.assert_equal(MODELS, stale, "catalog_stale_served", "Stale list is returned without waiting")
+            self.assert_equal({"etag": '"v1"', "last_modified": None}, fetch.call_args[0][0],
+                              "catalog_validators_sent", "Revalidation sends the stored validators")
+            self.assert_equal(MODELS, catalog.search(""), "catalog_304_keeps_list", "An unchanged (304) list is kept")
+
+    def test_stale_list_revalidated_before_returning(self):
+        """Test that short-lived callers get a stale list revalidated synchronously."""
+        newer = MODELS[:1]
+        fetch = Mock(side_effect=[(MODELS, {"etag": '"v1"', "last_modified": None}),
+                                  (newer, {"etag": '"v2"', "last_modified": None})])
+        with tempfile.TemporaryDirectory() as temp_dir:
+            catalog = ModelCatalog(os.path.join(temp_dir, "models.json"), ttl_seconds=0)
+            catalog.get_models(fetch)
+            time.sleep(0.01)
+            models = catalog.get_models(fetch, background=False)
+
+        self.assert_equal(newer, models, "catalog_sync_revalidate", "The revalidated list is returned")
+        self.assert_equal(None, catalog._refresh_thread, "catalog_sync_no_thread",  # pylint: disable=protected-access
+                          "No background revalidation is started")
+
+    def test_indexes(self):
+        """Test search text and context-length and pricing lookups."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            catalog = ModelCatalog(os.path.join(temp_dir, "models.json"))
+            catalog.get_models(Mock(return_value=(MODELS, {})))
+
+            self.assert_equal(["openai/gpt-y"], [m["id"] for m in catalog.search("FAST gpt")],
+                              "catalog_search", "All query words must match, case-insensitively")
+            self.assert_equal(2, len(catalog.search("")), "catalog_search_empty", "Empty query lists all")
+            self.assert_equal(200000, catalog.context_length("anthropic/claude-x"), "catalog_context_length",
+                              "Context length is looked up by id")
+            self.assert_equal({"prompt": 0.000001, "completion": 0.000002}, catalog.pricing("openai/gpt-y"),
+                              "catalog_pricing", "Prices are parsed to floats")
+
+    def test_search_index_prefix_matching(self):
+        """Test that every query word must prefix a word and results keep list order."""
+        index = ModelSearchIndex(MODELS + [{"id": "openai/gpt-z", "name": "GPT Z", "description": "Careful"}])
+
+        self.assert_equal(["anthropic/claude-x", "openai/gpt-z"], [m["id"] for m in index.search("care")],
+                          "catalog_index_prefix", "Word prefixes match in list order")
+        self.assert_equal(["openai/gpt-z"], [m["id"] for m in index.search("Careful GPT")],
+                          "catalog_index_all_words", "Every word must match")
+        self.assert_equal([], index.search("laude"), "catalog_index_no_infix", "Matches start at word boundaries")
+        self.assert_equal(3, len(index.search("  ")), "catalog_index_blank", "A blank query matches everything")
+
+    def test_client_conditional_request(self):
+        """Test that the client sends validators and keeps the list on a 304."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = {
+                "base_url": "https://test.api.com/",
+                "api_key": "test-key",
+                "default_model": "test/model",
+                "model_catalog": {"path": os.path.join(temp_dir, "models.json")}
+            }
+            session = Mock()
+            session.get.side_effect = [
+                _http_response(200, {"data": MODELS}, {"ETag": '"v1"'}),
+                _http_response(304)
+            ]
+            client = OpenRouterClient(config=config, logger=Mock(), session=session)
+            first = client.get_available_models()
+            refreshed = client.get_available_models(refresh=True)
+
+        self.assert_equal(MODELS, refreshed, "catalog_client_304", "Refresh answered by 304 keeps the list")
+        self.assert_equal(first, refreshed, "catalog_client_same", "Both calls return the same list")
+        self.assert_equal('"v1"', session.get.call_args[1]["headers"].get("If-None-Match"),
+                          "catalog_client_etag", "Refresh sends If-None-Match")
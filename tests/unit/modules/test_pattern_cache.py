@@ -0,0 +1,101 @@
+"""
+Unit tests for the shared parsed-pattern cache.
+"""
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.modules.patterns import PatternManager
+from askai.modules.patterns.pattern_cache import ParsedPatternCache, parsed_pattern_cache
+
+PATTERN_TEMPLATE = """# Pattern: Cached
+
+## Pattern Inputs
+
+```yaml
+inputs:
+  - name: {input_name}
+    description: Text to work on
+    type: text
+    required: true
+```
+
+## Prompt
+Summarize the input.
+"""
+
+
+class TestParsedPatternCache(BaseUnitTest):
+    """Test in-process reuse, mtime invalidation and persistence."""
+
+    def run(self):
+        """Run all pattern cache tests."""
+        self.test_parsed_once_across_managers()
+        self.test_edit_invalidates_entry()
+        self.test_compiled_cache_round_trip()
+        return self.results
+
+    @staticmethod
+    def _write_pattern(base_dir, input_name):
+        patterns_dir = os.path.join(base_dir, "patterns")
+        os.makedirs(patterns_dir, exist_ok=True)
+        with open(os.path.join(patterns_dir, "cached.md"), "w", encoding="utf-8") as f:
+            f.write(PATTERN_TEMPLATE.format(input_name=input_name))
+
+    def test_parsed_once_across_managers(self):
+        """Test that repeated lookups from new managers reuse one parse."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self._write_pattern(temp_dir, "text")
+            with patch.object(PatternManager, "_parse_pattern_file",
+                              autospec=True, side_effect=PatternManager._parse_pattern_file) as parse:
+                first = PatternManager(temp_dir).get_pattern_content("cached")
+                second = PatternManager(temp_dir).get_pattern_content("cached")
+
+        self.assert_equal(1, parse.call_count, "pattern_cache_parse_once",
+                          "Second manager reuses the cached parse")
+        self.assert_equal("text", second["inputs"][0].name, "pattern_cache_content",
+                          "Cached content matches the file")
+        self.assert_true(first is not second, "pattern_cache_fresh_dict",
+                         "Callers get their own top-level dict")
+
+    def test_edit_invalidates_entry(self):
+        """Test that a changed file is parsed again."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self._write_pattern(temp_dir, "text")
+            manager = PatternManager(temp_dir)
+            manager.get_pattern_content("cached")
+
+            self._write_pattern(temp_dir, "renamed_input")
+            edited = manager.get_pattern_content("cached")
+
+        self.assert_equal("renamed_input", edited["inputs"][0].name, "pattern_cache_invalidation",
+                          "Edited pattern is re-parsed")
+
+    def test_compiled_cache_round_trip(self):
+        """Test that a persisted cache serves a fresh process without parsing."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self._write_pattern(temp_dir, "text")
+            cache_file = os.path.join(temp_dir, "compiled.pickle")
+            config = {"patterns": {"compiled_cache": True, "compiled_cache_path": cache_file}}
+
+            parsed_pattern_cache.clear()
+            PatternManager(temp_dir, config).get_pattern_content("cached")
+
+            # A new cache stands in for the cache of a new process
+            cold_cache = ParsedPatternCache()
+            loaded = cold_cache.load(cache_file)
+            pattern_path = os.path.join(temp_dir, "patterns", "cached.md")
+            entry = cold_cache.get(pattern_path, os.stat(pattern_path))
+
+        self.assert_equal(1, loaded, "pattern_cache_persisted",
+                          "Compiled cache written and loaded")
+        self.assert_not_none(entry, "pattern_cache_persisted_hit", "Persisted entry is valid for the file")
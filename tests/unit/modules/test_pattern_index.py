@@ -0,0 +1,137 @@
+"""
+Unit tests for the pattern catalogue index.
+"""
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.modules.patterns import PatternManager
+from askai.modules.patterns.pattern_index import PatternIndex
+
+PATTERN_TEMPLATE = """# Pattern: {name}
+
+## Purpose
+{purpose}
+
+## Functionality
+* {feature}
+
+## Pattern Inputs
+
+```yaml
+inputs:
+  - name: text
+    description: Text to work on
+    type: text
+    required: true
+```
+
+## Prompt
+Do the work.
+"""
+
+
+class TestPatternIndex(BaseUnitTest):
+    """Test incremental indexing, search, paging and persistence."""
+
+    def run(self):
+        """Run all pattern index tests."""
+        self.test_incremental_refresh()
+        self.test_search_and_paging()
+        self.test_persisted_index_is_reused()
+        return self.results
+
+    @staticmethod
+    def _write_pattern(patterns_dir, pattern_id, name, purpose="General helper", feature="Helps"):
+        with open(os.path.join(patterns_dir, f"{pattern_id}.md"), "w", encoding="utf-8") as f:
+            f.write(PATTERN_TEMPLATE.format(name=name, purpose=purpose, feature=feature))
+
+    @staticmethod
+    def _manager(base_dir, index_path=""):
+        return PatternManager(base_dir, {"patterns": {"index_path": index_path}})
+
+    def _make_patterns(self, base_dir):
+        patterns_dir = os.path.join(base_dir, "patterns")
+        os.makedirs(patterns_dir)
+        self._write_pattern(patterns_dir, "log_reader", "Log Reader", "Interpret application logs",
+                            "Finds root causes")
+        self._write_pattern(patterns_dir, "summary", "Summary", "Summarize long documents",
+                            "Produces short abstracts")
+        self._write_pattern(patterns_dir, "splunk", "Splunk Query", "Write SPL queries for logs",
+                            "Generates searches")
+        return patterns_dir
+
+    def test_incremental_refresh(self):
+        """Test that only new or changed files are parsed and deleted files drop out."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            patterns_dir = self._make_patterns(temp_dir)
+            manager = self._manager(temp_dir)
+            first = manager.list_patterns()
+
+            with patch.object(PatternManager, "_load_parsed_pattern", autospec=True,
+                              side_effect=PatternManager._load_parsed_pattern) as load:
+                manager.list_patterns()
+                unchanged_loads = load.call_count
+
+                self._write_pattern(patterns_dir, "summary", "Summary v2", "Summarize long documents")
+                os.remove(os.path.join(patterns_dir, "splunk.md"))
+                updated = manager.list_patterns()
+
+        self.assert_equal(["Log Reader", "Splunk Query", "Summary"], [p["name"] for p in first],
+                          "pattern_index_sorted", "Patterns are listed sorted by name")
+        self.assert_equal("Interpret application logs", first[0]["description"],
+                          "pattern_index_purpose", "Entries carry the pattern purpose")
+        self.assert_equal(["text"], first[0]["input_types"], "pattern_index_input_types",
+                          "Entries carry input types")
+        self.assert_equal(0, unchanged_loads, "pattern_index_unchanged",
+                          "Unchanged files are not parsed again")
+        self.assert_equal(1, load.call_count, "pattern_index_changed_only",
+                          "Only the edited file is parsed again")
+        self.assert_equal(["Log Reader", "Summary v2"], [p["name"] for p in updated],
+                          "pattern_index_updated", "Edits are picked up and deleted files removed")
+
+    def test_search_and_paging(self):
+        """Test prefix search over purpose and functionality, and paging."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self._make_patterns(temp_dir)
+            manager = self._manager(temp_dir)
+
+            logs = manager.search_patterns("log")
+            both = manager.search_patterns("logs queries")
+            feature = manager.search_patterns("abstract")
+            page = manager.search_patterns(None, page=2, page_size=2)
+
+        self.assert_equal(["log_reader", "splunk"], [p["pattern_id"] for p in logs["patterns"]],
+                          "pattern_index_search_prefix", "Prefix search matches names and purposes")
+        self.assert_equal(["splunk"], [p["pattern_id"] for p in both["patterns"]],
+                          "pattern_index_search_and", "All query words must match")
+        self.assert_equal(["summary"], [p["pattern_id"] for p in feature["patterns"]],
+                          "pattern_index_search_functionality", "Functionality is searchable")
+        self.assert_equal(3, page["total"], "pattern_index_page_total", "Total counts all matches")
+        self.assert_equal(["summary"], [p["pattern_id"] for p in page["patterns"]],
+                          "pattern_index_page", "Second page holds the remaining pattern")
+
+    def test_persisted_index_is_reused(self):
+        """Test that a new process loads the index from disk without parsing."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            patterns_dir = self._make_patterns(temp_dir)
+            index_path = os.path.join(temp_dir, "pattern_index.json")
+            self._manager(temp_dir, index_path).list_patterns()
+
+            # A new index stands in for the index of a new process
+            cold_index = PatternIndex(index_path)
+            parsed = []
+            entries = cold_index.refresh([(patterns_dir, False)], parsed.append)
+
+        self.assert_equal(3, len(entries), "pattern_index_persisted", "Persisted entries are loaded")
+        self.assert_equal([], parsed, "pattern_index_persisted_no_parse",
+                          "Persisted entries need no parsing")
@@ -0,0 +1,214 @@
+"""
+Unit tests for completion retries, backoff and hedging.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from email.utils import formatdate
+from unittest.mock import Mock, patch
+
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError, ProtocolError
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.modules.ai.openrouter_client import OpenRouterClient
+from askai.modules.ai.resilience import (
+    ResiliencePolicy, RetryBudget, get_resilience_settings, parse_retry_after
+)
+
+COMPLETION = {"choices": [{"message": {"content": "Hello"}}]}
+
+
+def _http_response(status_code, data=None, headers=None):
+    response = Mock(ok=status_code < 400, status_code=status_code, headers=headers or {}, text=str(data))
+    response.json.return_value = data
+    return response
+
+
+def _connection_error(reason):
+    return requests.exceptions.ConnectionError(MaxRetryError(None, "/chat/completions", reason))
+
+
+def _policy(**overrides):
+    settings = get_resilience_settings({"resilience": overrides})
+    return ResiliencePolicy(settings)
+
+
+class TestResilience(BaseUnitTest):
+    """Test timeouts, retries, Retry-After, the retry budget and hedged requests."""
+
+    def run(self):
+        """Run all resilience tests."""
+        self.test_client_retries_bad_gateway()
+        self.test_retry_after()
+        self.test_connection_errors()
+        self.test_retry_budget()
+        self.test_backoff_jitter()
+        self.test_hedged_request()
+        self.test_hedged_request_async()
+        return self.results
+
+    def _client(self, session, **resilience):
+        config = {
+            "base_url": "https://test.api.com/",
+            "api_key": "test-key",
+            "default_model": "test/model",
+            "resilience": dict({"backoff_base": 0}, **resilience)
+        }
+        return OpenRouterClient(config=config, logger=Mock(), session=session)
+
+    def test_client_retries_bad_gateway(self):
+        """Test that a 502 is retried with the configured timeouts and a 400 is not."""
+        session = Mock()
+        session.post.side_effect = [_http_response(502, "Bad gateway"), _http_response(200, COMPLETION)]
+        result = self._client(session, connect_timeout=3, read_timeout=90).request_completion(
+            [{"role": "user", "content": "Hi"}])
+
+        self.assert_equal("Hello", result["content"], "resilience_502_retried", "The retry's answer is returned")
+        self.assert_equal(2, session.post.call_count, "resilience_502_attempts", "One retry was made")
+        self.assert_equal((3.0, 90.0), session.post.call_args[1]["timeout"], "resilience_timeouts",
+                          "Connect and read timeouts come from config")
+
+        session = Mock()
+        session.post.return_value = _http_response(400, "Bad request")
+        result = self._client(session).request_completion([{"role": "user", "content": "Hi"}])
+        self.assert_equal(1, session.post.call_count, "resilience_400_not_retried", "Client errors are final")
+        self.assert_true(result["content"].startswith("Error:"), "resilience_400_error", "The error is returned")
+
+    def test_retry_after(self):
+        """Test that Retry-After replaces the backoff and a too long one gives up."""
+        self.assert_equal(7.0, parse_retry_after("7"), "resilience_retry_after_seconds", "Seconds are parsed")
+        in_a_minute = parse_retry_after(formatdate(time.time() + 60, usegmt=True))
+        self.assert_true(55 <= in_a_minute <= 60, "resilience_retry_after_date", "HTTP dates are parsed")
+        self.assert_equal(None, parse_retry_after("soon"), "resilience_retry_after_invalid", "Garbage is ignored")
+
+        session = Mock()
+        session.post.side_effect = [_http_response(429, "Slow down", {"Retry-After": "2"}),
+                                    _http_response(200, COMPLETION)]
+        with patch("askai.modules.ai.resilience.time.sleep") as sleep:
+            self._client(session).request_completion([{"role": "user", "content": "Hi"}])
+        self.assert_equal(2.0, sleep.call_args[0][0], "resilience_retry_after_honored", "Waits as asked")
+
+        session = Mock()
+        session.post.return_value = _http_response(429, "Slow down", {"Retry-After": "3600"})
+        result = self._client(session).request_completion([{"role": "user", "content": "Hi"}])
+        self.assert_equal(1, session.post.call_count, "resilience_retry_after_too_long",
+                          "A Retry-After beyond backoff_max is not waited for")
+        self.assert_true(result["content"].startswith("Error:"), "resilience_429_error", "The 429 is returned")
+
+    def test_connection_errors(self):
+        """Test that failed connects are retried until max_attempts, errors after sending are not."""
+        refused = NewConnectionError(None, "Connection refused")
+        session = Mock()
+        session.post.side_effect = [_connection_error(refused), requests.exceptions.ConnectTimeout("connect"),
+                                    _http_response(200, COMPLETION)]
+        result = self._client(session).request_completion([{"role": "user", "content": "Hi"}])
+        self.assert_equal("Hello", result["content"], "resilience_connection_retried", "Failed connects retry")
+
+        session = Mock()
+        session.post.side_effect = _connection_error(ProtocolError("Connection aborted.", ConnectionResetError()))
+        self.assert_raises(Exception, lambda: self._client(session).request_completion(
+            [{"role": "user", "content": "Hi"}]), "resilience_dropped_raises", "Dropped connections are raised")
+        self.assert_equal(1, session.post.call_count, "resilience_dropped_not_retried",
+                          "A request that may have reached OpenRouter is not sent twice")
+
+        session = Mock()
+        session.post.side_effect = _connection_error(refused)
+        self.assert_raises(Exception, lambda: self._client(session, max_attempts=2).request_completion(
+            [{"role": "user", "content": "Hi"}]), "resilience_connection_gives_up", "The last error is raised")
+        self.assert_equal(2, session.post.call_count, "resilience_max_attempts", "Stops after max_attempts")
+
+        session = Mock()
+        session.post.side_effect = requests.exceptions.ReadTimeout("slow")
+        self.assert_raises(Exception, lambda: self._client(session).request_completion(
+            [{"role": "user", "content": "Hi"}]), "resilience_read_timeout_raises", "Read timeouts are raised")
+        self.assert_equal(1, session.post.call_count, "resilience_read_timeout_not_retried",
+                          "A completion that may be generating is not sent twice")
+
+    def test_retry_budget(self):
+        """Test that retries stop when the budget is spent and resume as requests earn tokens."""
+        budget = RetryBudget(ratio=0.5, burst=1)
+        self.assert_true(budget.withdraw(), "resilience_budget_burst", "The burst is available at once")
+        self.assert_false(budget.withdraw(), "resilience_budget_exhausted", "An empty budget refuses")
+        budget.deposit()
+        budget.deposit()
+        self.assert_true(budget.withdraw(), "resilience_budget_earned", "Requests earn retries back")
+
+        policy = _policy(backoff_base=0, retry_budget_burst=0, retry_budget_ratio=0)
+        send = Mock(return_value=_http_response(503, "Unavailable"))
+        response = policy.call(send, Mock())
+        self.assert_equal(503, response.status_code, "resilience_budget_no_retry", "No budget, no retry")
+        self.assert_equal(1, send.call_count, "resilience_budget_single_attempt", "Only one attempt was made")
+
+    def test_backoff_jitter(self):
+        """Test that backoff is full jitter below an exponentially growing, capped ceiling."""
+        policy = _policy(backoff_base=1, backoff_max=5)
+        delays = [policy.backoff(3) for _ in range(200)]
+        self.assert_true(all(0 <= d <= 4 for d in delays), "resilience_backoff_ceiling", "Third retry waits <= 4s")
+        self.assert_true(len(set(delays)) > 1, "resilience_backoff_jitter", "Delays are randomized")
+        self.assert_true(all(policy.backoff(10) <= 5 for _ in range(50)), "resilience_backoff_max",
+                         "Backoff is capped at backoff_max")
+
+    def test_hedged_request(self):
+        """Test that a request slower than the latency percentile is hedged and the first answer wins."""
+        policy = _policy(hedge=True, hedge_min_samples=5)
+        for _ in range(5):
+            policy.latencies.record("test/model", 0.05)
+
+        first_call = threading.Event()
+        slow_done = threading.Event()
+
+        def send():
+            if not first_call.is_set():
+                first_call.set()
+                time.sleep(1)
+                slow_done.set()
+                return _http_response(200, "slow")
+            return _http_response(200, "fast")
+
+        start = time.perf_counter()
+        response = policy.call(send, Mock(), key="test/model", hedge=True)
+        elapsed = time.perf_counter() - start
+        self.assert_equal("fast", response.json(), "resilience_hedge_winner", "The hedge answers first")
+        self.assert_true(elapsed < 0.9, "resilience_hedge_latency", "The slow request is not waited for")
+        slow_done.wait(2)
+
+        unhedged = _policy(hedge=True, hedge_min_samples=5)
+        send = Mock(return_value=_http_response(200, "only"))
+        unhedged.call(send, Mock(), key="test/model", hedge=True)
+        self.assert_equal(1, send.call_count, "resilience_hedge_needs_samples", "No hedge without latency samples")
+
+    def test_hedged_request_async(self):
+        """Test that the async policy hedges and cancels the losing request."""
+        policy = _policy(hedge=True, hedge_min_samples=1)
+        policy.latencies.record("test/model", 0.05)
+        cancelled = []
+
+        async def send():
+            if not cancelled:
+                cancelled.append(False)
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    cancelled[0] = True
+                    raise
+                return _http_response(200, "slow")
+            return _http_response(200, "fast")
+
+        async def scenario():
+            response = await policy.call_async(send, Mock(), key="test/model", hedge=True)
+            await asyncio.sleep(0)
+            return response
+
+        response = asyncio.run(scenario())
+        self.assert_equal("fast", response.json(), "resilience_async_hedge_winner", "The hedge answers first")
+        self.assert_true(cancelled[0], "resilience_async_hedge_cancelled", "The slow request is cancelled")
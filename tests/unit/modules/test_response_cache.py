@@ -0,0 +1,107 @@
+"""
+Unit tests for the content-addressed response cache.
+"""
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import Mock
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.modules.ai import response_cache
+from askai.modules.ai.openrouter_client import OpenRouterClient
+from askai.modules.ai.response_cache import ResponseCache, payload_key
+
+
+class TestResponseCache(BaseUnitTest):
+    """Test cache keys, temperature gating, TTL, LRU eviction and client integration."""
+
+    def run(self):
+        """Run all response cache tests."""
+        response_cache.reset_cache_stats()
+        self.test_payload_key_is_canonical()
+        self.test_temperature_gating()
+        self.test_ttl_and_lru_eviction()
+        self.test_client_serves_repeat_from_cache()
+        response_cache.reset_cache_stats()
+        return self.results
+
+    def test_payload_key_is_canonical(self):
+        """Test that key order does not change the key but content does."""
+        first = payload_key({"model": "a", "messages": [{"role": "user", "content": "hi"}]})
+        reordered = payload_key({"messages": [{"content": "hi", "role": "user"}], "model": "a"})
+        different = payload_key({"model": "b", "messages": [{"role": "user", "content": "hi"}]})
+
+        self.assert_equal(first, reordered, "cache_key_canonical", "Dict order does not affect the key")
+        self.assert_true(first != different, "cache_key_model", "Model is part of the key")
+
+    def test_temperature_gating(self):
+        """Test that sampling requests bypass the cache unless forced."""
+        cache = ResponseCache(tempfile.gettempdir())
+        forced = ResponseCache(tempfile.gettempdir(), force=True)
+
+        self.assert_true(cache.accepts({"temperature": 0}), "cache_temperature_zero", "Greedy requests cached")
+        self.assert_false(cache.accepts({"temperature": 0.7}), "cache_temperature_positive",
+                          "Sampling requests skipped")
+        self.assert_false(cache.accepts({}), "cache_temperature_default",
+                          "Provider default temperature counts as sampling")
+        self.assert_true(forced.accepts({"temperature": 0.7}), "cache_temperature_forced",
+                         "Force caches sampling requests")
+
+    def test_ttl_and_lru_eviction(self):
+        """Test that expired entries miss and old entries are evicted by size."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ResponseCache(temp_dir, ttl_seconds=60, max_bytes=250)
+            result = {"content": "x" * 50, "annotations": [], "full_response": {}}
+
+            cache.put("old", result)
+            cache.put("recent", result)
+            old_time = time.time() - 30
+            os.utime(os.path.join(temp_dir, "old.json"), (old_time, old_time))
+            self.assert_equal(result, cache.get("old"), "cache_hit", "Stored result is returned")
+
+            # Reading "old" made it most recent, so "recent" is evicted first
+            os.utime(os.path.join(temp_dir, "recent.json"), (old_time - 10, old_time - 10))
+            cache.put("newest", result)
+
+            self.assert_true(cache.get("recent") is None, "cache_lru_evicted",
+                             "Least recently used entry evicted above max_bytes")
+            self.assert_true(cache.get("old") is not None, "cache_lru_kept", "Recently read entry kept")
+
+            expired = time.time() - 120
+            os.utime(os.path.join(temp_dir, "newest.json"), (expired, expired))
+            self.assert_true(cache.get("newest") is None, "cache_ttl_expired", "Expired entry misses")
+
+    def test_client_serves_repeat_from_cache(self):
+        """Test that OpenRouterClient answers an identical second request from the cache."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = {
+                "base_url": "https://test.api.com",
+                "api_key": "test-key",
+                "default_model": "test/model",
+                "cache": {"enabled": True, "path": temp_dir, "force": True}
+            }
+            http_response = Mock(ok=True, status_code=200)
+            http_response.json.return_value = {"choices": [{"message": {"content": "cached answer"}}]}
+            session = Mock()
+            session.post.return_value = http_response
+
+            client = OpenRouterClient(config=config, logger=Mock(), session=session)
+            messages = [{"role": "user", "content": "explain this failure"}]
+            first = client.request_completion(messages)
+            second = client.request_completion(messages)
+            streamed = "".join(client.stream_completion(messages))
+
+        stats = response_cache.get_cache_stats()
+        self.assert_equal(1, session.post.call_count, "cache_client_single_call",
+                          "Only the first request reaches the API")
+        self.assert_equal(first, second, "cache_client_same_result", "Cached result matches the original")
+        self.assert_equal("cached answer", streamed, "cache_client_stream", "Streams replay cached results")
+        self.assert_true(stats["bytes_saved"] > 0, "cache_stats_bytes", "Bytes saved are counted")
@@ -0,0 +1,167 @@
+"""
+Unit tests for the SQLite chat store.
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.modules.chat import ChatManager
+from askai.modules.chat.sqlite_store import SqliteChatStore
+
+
+class TestSqliteChatStore(BaseUnitTest):
+    """Test paged listing, history, full-text search and importing chat files."""
+
+    def run(self):
+        """Run all SQLite chat store tests."""
+        self.test_listing_and_history()
+        self.test_full_text_search()
+        self.test_import_existing_files()
+        self.test_import_leaves_stale_header()
+        self.test_concurrent_appends()
+        return self.results
+
+    @staticmethod
+    def _manager(temp_dir, max_history=10):
+        config = {"chat": {"storage_path": temp_dir, "max_history": max_history, "backend": "sqlite"}}
+        return ChatManager(config)
+
+    def test_listing_and_history(self):
+        """Test paged listing, tail history and round-tripping conversation data."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            chat_manager = self._manager(temp_dir, max_history=2)
+            chat_ids = [chat_manager.create_chat() for _ in range(5)]
+            for number in range(4):
+                chat_manager.add_conversation(
+                    chat_ids[0],
+                    [{"role": "system", "content": "Be brief"},
+                     {"role": "user", "content": [{"type": "text", "text": f"question {number}"}]}],
+                    f"answer {number}", outputs=[{"name": "summary", "type": "text"}]
+                )
+
+            page = chat_manager.list_chats(page=2, page_size=2)
+            history = chat_manager.get_chat_history(chat_ids[0], 1)
+            context = chat_manager.build_context_messages(chat_ids[0])
+            info = chat_manager.get_chat_info(chat_ids[0])
+            count = chat_manager.count_chats()
+            chat_manager.store.close()
+
+        self.assert_true(isinstance(chat_manager.store, SqliteChatStore), "sqlite_backend_selected",
+                         "chat.backend selects the SQLite store")
+        self.assert_equal(2, len(page), "sqlite_list_page", "Listing returns one page")
+        self.assert_equal(5, count, "sqlite_count", "All chats are counted")
+        self.assert_equal(4, info["conversation_count"], "sqlite_info_count", "Conversation count tracked")
+        self.assert_equal(
+            {"timestamp": history[0]["timestamp"],
+             "messages": [{"role": "system", "content": "Be brief"},
+                          {"role": "user", "content": [{"type": "text", "text": "question 3"}]}],
+             "response": "answer 3",
+             "outputs": [{"name": "summary", "type": "text"}]},
+            history[0], "sqlite_history_round_trip", "Conversation data is stored losslessly"
+        )
+        self.assert_equal(["answer 2", "answer 3"],
+                          [message["content"] for message in context if message["role"] == "assistant"],
+                          "sqlite_context_tail", "Context holds the last max_history conversations")
+
+    def test_full_text_search(self):
+        """Test that questions and responses are searchable with paging."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            chat_manager = self._manager(temp_dir)
+            chat_id = chat_manager.create_chat()
+            for number in range(6):
+                chat_manager.add_conversation(chat_id, [{"role": "user", "content": f"kubernetes pod {number}"}],
+                                              "restart the deployment" if number == 3 else "check the logs")
+
+            prefix = chat_manager.search_chats("kube", page=2, page_size=4)
+            response = chat_manager.search_chats("deploy")
+            chat_manager.delete_chat(chat_id)
+            deleted = chat_manager.search_chats("kube")
+            chat_manager.store.close()
+
+        self.assert_equal(6, prefix["total"], "sqlite_search_total", "Prefix search counts all matches")
+        self.assert_equal(2, len(prefix["results"]), "sqlite_search_page", "Second page holds the rest")
+        self.assert_equal(["kubernetes pod 3"], [result["question"] for result in response["results"]],
+                          "sqlite_search_response", "Responses are searchable")
+        self.assert_equal(0, deleted["total"], "sqlite_search_deleted", "Deleted chats leave the index")
+
+    def test_import_existing_files(self):
+        """Test that a new database imports JSONL and legacy JSON chat files."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_manager = ChatManager({"chat": {"storage_path": temp_dir}})
+            log_chat = file_manager.create_chat()
+            file_manager.add_conversation(log_chat, [{"role": "user", "content": "from the log"}], "ok")
+            with open(os.path.join(temp_dir, "legacy01.json"), "w", encoding="utf-8") as f:
+                json.dump({"chat_id": "legacy01", "created_at": "2025-01-01T10:00:00", "conversations": [
+                    {"timestamp": "2025-01-01T10:00:01", "messages": [{"role": "user", "content": "old"}],
+                     "response": "from the legacy file"}
+                ]}, f)
+
+            chat_manager = self._manager(temp_dir)
+            chats = {chat["chat_id"]: chat["conversation_count"] for chat in chat_manager.list_chats()}
+            legacy_history = chat_manager.get_chat_history("legacy01")
+            legacy_file_kept = os.path.exists(os.path.join(temp_dir, "legacy01.json"))
+            chat_manager.store.close()
+
+        self.assert_equal({log_chat: 1, "legacy01": 1}, chats, "sqlite_import_chats", "Chat files imported")
+        self.assert_equal("from the legacy file", legacy_history[0]["response"], "sqlite_import_legacy",
+                          "Legacy JSON conversations imported")
+        self.assert_true(legacy_file_kept, "sqlite_import_files_untouched", "Imported files are left in place")
+
+    def test_import_leaves_stale_header(self):
+        """Test that importing a log whose header is out of date does not rewrite the header."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_manager = ChatManager({"chat": {"storage_path": temp_dir}})
+            chat_id = file_manager.create_chat()
+            file_manager.add_conversation(chat_id, [{"role": "user", "content": "first"}], "ok")
+            header_path = os.path.join(temp_dir, f"{chat_id}.meta")
+            with open(header_path, "rb") as f:
+                header = f.read()
+            with open(os.path.join(temp_dir, f"{chat_id}.jsonl"), "ab") as f:
+                f.write(json.dumps({"messages": [{"role": "user", "content": "second"}],
+                                    "response": "ok"}).encode("utf-8") + b"\n")
+
+            chat_manager = self._manager(temp_dir)
+            count = chat_manager.get_chat_info(chat_id)["conversation_count"]
+            chat_manager.store.close()
+            with open(header_path, "rb") as f:
+                header_after = f.read()
+
+        self.assert_equal(2, count, "sqlite_import_recounted", "The stale header is recounted for the import")
+        self.assert_equal(header, header_after, "sqlite_import_header_untouched", "The header file is not rewritten")
+
+    def test_concurrent_appends(self):
+        """Test that appends through separate connections get distinct positions."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            database_path = os.path.join(temp_dir, "chats.db")
+            stores = [SqliteChatStore(database_path) for _ in range(4)]
+            stores[0].create("shared")
+
+            def append(store, number):
+                for index in range(10):
+                    store.append("shared", {"messages": [{"role": "user", "content": f"q{number}.{index}"}],
+                                            "response": "ok"})
+
+            threads = [threading.Thread(target=append, args=(store, number)) for number, store in enumerate(stores)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            positions = [row[0] for row in stores[0]._conn.execute(  # pylint: disable=protected-access
+                "SELECT position FROM conversations WHERE chat_id = 'shared' ORDER BY position")]
+            count = stores[0].get_header("shared")["conversation_count"]
+            for store in stores:
+                store.close()
+
+        self.assert_equal(list(range(40)), positions, "sqlite_concurrent_positions",
+                          "Each append claims its own position")
+        self.assert_equal(40, count, "sqlite_concurrent_count", "No append is lost")
@@ -0,0 +1,144 @@
+"""
+Unit tests for streamed (SSE) completions.
+"""
+import json
+import os
+import sys
+from unittest.mock import Mock, patch
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.modules.ai.ai_service import AIService
+from askai.modules.ai.openrouter_client import OpenRouterClient
+from askai.modules.ai.streaming import CompletionStream
+
+
+def _sse_lines(*chunks):
+    """Build raw SSE lines as returned by Response.iter_lines()."""
+    lines = [b": OPENROUTER PROCESSING", b""]
+    for chunk in chunks:
+        lines.append(f"data: {json.dumps(chunk)}".encode("utf-8"))
+        lines.append(b"")
+    lines.append(b"data: [DONE]")
+    return lines
+
+
+def _stream_response(*chunks):
+    """Create a mock streaming response."""
+    response = Mock(ok=True)
+    response.iter_lines.return_value = iter(_sse_lines(*chunks))
+    return response
+
+
+CHUNKS = (
+    {"id": "gen-1", "model": "test/model", "choices": [{"delta": {"role": "assistant", "content": "Hel"}}]},
+    {"id": "gen-1", "choices": [{"delta": {"content": "lo ü"}}]},
+    {"id": "gen-1", "choices": [{"delta": {"annotations": [{"type": "url_citation"}]}, "finish_reason": "stop"}],
+     "usage": {"prompt_tokens": 3, "completion_tokens": 2}},
+)
+
+
+class TestStreaming(BaseUnitTest):
+    """Test SSE parsing, the streaming client path and AIService callbacks."""
+
+    def __init__(self):
+        super().__init__()
+        self.config = {
+            "base_url": "https://test.api.com",
+            "api_key": "test-key",
+            "default_model": "test/model"
+        }
+
+    def run(self):
+        """Run all streaming tests."""
+        self.test_stream_deltas_and_result()
+        self.test_stream_error_event()
+        self.test_client_stream_completion()
+        self.test_client_stream_http_error()
+        self.test_ai_service_on_delta()
+        return self.results
+
+    def test_stream_deltas_and_result(self):
+        """Test that deltas are yielded and the final result is assembled."""
+        stream = CompletionStream(_stream_response(*CHUNKS), Mock())
+        deltas = list(stream)
+        result = stream.result
+
+        self.assert_equal(["Hel", "lo ü"], deltas, "stream_deltas", "Content deltas yielded in order")
+        self.assert_equal("Hello ü", result["content"], "stream_result_content",
+                          "Final content assembled from deltas")
+        self.assert_equal(1, len(result["annotations"]), "stream_result_annotations",
+                          "Annotations collected from deltas")
+        full = result["full_response"]
+        self.assert_equal("stop", full["choices"][0]["finish_reason"], "stream_finish_reason",
+                          "Finish reason recorded")
+        self.assert_equal(2, full["usage"]["completion_tokens"], "stream_usage", "Usage recorded")
+        self.assert_equal("test/model", full["model"], "stream_model", "Model recorded")
+
+    def test_stream_error_event(self):
+        """Test that mid-stream errors surface as error content."""
+        stream = CompletionStream(_stream_response(
+            {"choices": [{"delta": {"content": "partial"}}]},
+            {"error": {"code": 502, "message": "Provider disconnected"}}
+        ), Mock())
+        result = stream.result
+
+        self.assert_in("Error: Provider disconnected", result["content"], "stream_error_content",
+                       "Error message appended to content")
+        self.assert_equal("Provider disconnected", result["full_response"]["error"], "stream_error_recorded",
+                          "Error recorded in full response")
+
+    def test_client_stream_completion(self):
+        """Test that the client requests a stream and returns a CompletionStream."""
+        session = Mock()
+        session.post.return_value = _stream_response(*CHUNKS)
+        client = OpenRouterClient(config=self.config, logger=Mock(), session=session)
+
+        stream = client.stream_completion([{"role": "user", "content": "hi"}])
+        content = "".join(stream)
+
+        kwargs = session.post.call_args[1]
+        self.assert_true(kwargs["json"].get("stream"), "client_stream_payload", "Payload sets stream=true")
+        self.assert_true(kwargs["stream"], "client_stream_response", "Response body is streamed")
+        self.assert_equal("Hello ü", content, "client_stream_content", "Client stream yields content")
+
+    def test_client_stream_http_error(self):
+        """Test that HTTP errors reuse the regular error handling."""
+        session = Mock()
+        session.post.return_value = Mock(ok=False, status_code=401, text="Unauthorized")
+        client = OpenRouterClient(config=self.config, logger=Mock(), session=session)
+
+        stream = client.stream_completion([{"role": "user", "content": "hi"}])
+        deltas = list(stream)
+
+        self.assert_equal(["Error: Unauthorized"], deltas, "client_stream_error_delta",
+                          "Error content yielded once")
+        self.assert_in("401", stream.result["full_response"]["error"], "client_stream_error_result",
+                       "Error result matches non-streaming shape")
+
+    def test_ai_service_on_delta(self):
+        """Test that AIService forwards deltas and returns the assembled response."""
+        mock_config = dict(self.config)
+        received = []
+
+        with patch('askai.modules.ai.ai_service.load_config', return_value=mock_config), \
+             patch('askai.modules.ai.ai_service.OpenRouterClient') as mock_client_class:
+            mock_client = mock_client_class.return_value
+            mock_client.stream_completion.return_value = CompletionStream(_stream_response(*CHUNKS), Mock())
+
+            response = AIService(Mock()).get_ai_response(
+                messages=[{"role": "user", "content": "hi"}],
+                on_delta=received.append
+            )
+
+        self.assert_equal(["Hel", "lo ü"], received, "ai_service_on_delta", "Deltas forwarded to callback")
+        self.assert_equal("Hello ü", response["content"], "ai_service_stream_result",
+                          "Assembled response returned")
+        self.assert_false(mock_client.request_completion.called, "ai_service_stream_only",
+                          "Non-streaming request not issued")
@@ -0,0 +1,72 @@
+"""
+Unit tests for the batch pattern API path restrictions.
+"""
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.presentation.api.app import create_app
+from askai.presentation.api.routes.patterns import _resolve_batch_path
+
+
+class TestAPIBatch(BaseUnitTest):
+    """Test that batch inputs and outputs must stay within the batch root."""
+
+    def run(self):
+        """Run all batch API tests."""
+        self.test_resolve_batch_path()
+        self.test_endpoint_rejects_paths()
+        return self.results
+
+    def test_resolve_batch_path(self):
+        """Test relative, absolute, traversal and symlinked paths."""
+        with tempfile.TemporaryDirectory() as root, tempfile.TemporaryDirectory() as outside:
+            real_root = os.path.realpath(root)
+            os.symlink(outside, os.path.join(root, "link"))
+
+            self.assert_equal(os.path.join(real_root, "logs"), _resolve_batch_path(root, "logs"),
+                              "batch_path_relative", "Relative paths resolve against the root")
+            self.assert_equal(os.path.join(real_root, "logs"), _resolve_batch_path(root, os.path.join(root, "logs")),
+                              "batch_path_absolute_inside", "Absolute paths within the root are accepted")
+            self.assert_equal(None, _resolve_batch_path(root, "../etc"), "batch_path_traversal",
+                              "Parent traversal is rejected")
+            self.assert_equal(None, _resolve_batch_path(root, "/etc"), "batch_path_absolute_outside",
+                              "Absolute paths outside the root are rejected")
+            self.assert_equal(None, _resolve_batch_path(root, "link"), "batch_path_symlink",
+                              "Symlinks leading out of the root are rejected")
+            self.assert_equal(None, _resolve_batch_path(root, real_root + "-evil"), "batch_path_prefix",
+                              "Siblings sharing the root's name prefix are rejected")
+
+    def test_endpoint_rejects_paths(self):
+        """Test that the endpoint is disabled without a root and refuses paths outside it."""
+        body = {"pattern_id": "log_interpretation", "directory": "/etc"}
+        with patch("askai.presentation.api.app.load_config", return_value={}):
+            with tempfile.TemporaryDirectory() as root:
+                disabled = create_app({"TESTING": True, "BATCH_ROOT": None}).test_client()
+                enabled = create_app({"TESTING": True, "BATCH_ROOT": root}).test_client()
+
+                response = disabled.post("/api/v1/patterns/execute/batch", json=body)
+                self.assert_equal(403, response.status_code, "batch_api_disabled", "No root, no batch execution")
+
+                response = enabled.post("/api/v1/patterns/execute/batch", json=body)
+                self.assert_equal(403, response.status_code, "batch_api_directory_outside",
+                                  "Input directories outside the root are refused")
+
+                body = {"pattern_id": "log_interpretation", "directory": "logs", "output_dir": "/tmp"}
+                response = enabled.post("/api/v1/patterns/execute/batch", json=body)
+                self.assert_equal(403, response.status_code, "batch_api_output_outside",
+                                  "Output directories outside the root are refused")
+
+                body = {"pattern_id": "log_interpretation", "directory": "logs", "concurrency": 10000}
+                response = enabled.post("/api/v1/patterns/execute/batch", json=body)
+                self.assert_equal(400, response.status_code, "batch_api_concurrency_limit",
+                                  "Concurrency above the server limit is refused")
@@ -0,0 +1,148 @@
+"""
+Unit tests for the CLI daemon and its thin client.
+"""
+import io
+import os
+import socket
+import sys
+import tempfile
+import threading
+from contextlib import redirect_stdout
+from unittest.mock import Mock, patch
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.presentation.cli import CLIParser
+from askai.presentation.cli import daemon as cli_daemon
+
+
+def _serve_one(askai_daemon):
+    """Accept and run a single client connection."""
+    conn, _ = askai_daemon._server.accept()  # pylint: disable=protected-access
+    with conn:
+        askai_daemon.handle(conn)
+
+
+class TestCLIDaemon(BaseUnitTest):
+    """Test command forwarding, streamed output and the in-process fallback."""
+
+    def run(self):
+        """Run all daemon tests."""
+        self.test_forwardable_commands()
+        self.test_forward_round_trip()
+        self.test_fallback_without_daemon()
+        self.test_fallback_when_busy()
+        self.test_large_or_binary_stdin_stays_local()
+        return self.results
+
+    def test_forwardable_commands(self):
+        """Test that prompting and terminal commands stay in-process."""
+        parser = CLIParser().parser
+        forwarded = [cli_daemon.can_forward(parser.parse_args(argv))
+                     for argv in (["-q", "hi"], ["-lp"], ["-vc", "abc"], ["-or", "check-credits"],
+                                  ["-q", "hi", "-pc", "abc"])]
+        local = [cli_daemon.can_forward(parser.parse_args(argv))
+                 for argv in (["-i"], ["-up", "summary"], ["-vc"], ["--config"], ["--manage-chats"],
+                              ["-q", "hi", "-pc"])]
+
+        self.assert_equal([True] * 5, forwarded, "daemon_forwardable", "Non-interactive commands are forwarded")
+        self.assert_equal([False] * 6, local, "daemon_local", "Prompting commands run in-process")
+
+    def test_forward_round_trip(self):
+        """Test that argv, cwd and stdin reach the daemon and output and exit code come back."""
+        seen = {}
+
+        def entry_point():
+            seen["argv"] = sys.argv[1:]
+            seen["cwd"] = os.getcwd()
+            seen["stdin"] = sys.stdin.read()
+            print("answer", end="")
+            print(" streamed")
+            print("warning", file=sys.stderr)
+            sys.exit(3)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            socket_path = os.path.join(temp_dir, "askai.sock")
+            # A stale socket file of a crashed daemon is replaced
+            stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            stale.bind(socket_path)
+            stale.close()
+
+            askai_daemon = cli_daemon.AskAIDaemon(entry_point, socket_path)
+            askai_daemon.bind()
+            server = threading.Thread(target=_serve_one, args=(askai_daemon,))
+            server.start()
+
+            stdout = io.StringIO()
+            with patch.object(cli_daemon, "is_test_environment", return_value=False), \
+                 patch.dict(os.environ, {cli_daemon.DISABLE_ENV: ""}), \
+                 patch.object(sys, "stdin", io.StringIO("piped input")), \
+                 patch.object(sys, "stderr", io.StringIO()) as stderr, \
+                 redirect_stdout(stdout):
+                exit_code = cli_daemon.forward(["-q", "hello"], socket_path)
+            server.join(5)
+            askai_daemon.close()
+            socket_removed = not os.path.exists(socket_path)
+
+        self.assert_equal(3, exit_code, "daemon_exit_code", "Exit code is returned to the client")
+        self.assert_equal({"argv": ["-q", "hello"], "cwd": os.getcwd(), "stdin": "piped input"}, seen,
+                          "daemon_request", "argv, cwd and piped stdin are forwarded")
+        self.assert_equal("answer streamed\n", stdout.getvalue(), "daemon_stdout", "stdout is streamed back")
+        self.assert_equal("warning\n", stderr.getvalue(), "daemon_stderr", "stderr is streamed back")
+        self.assert_true(socket_removed, "daemon_socket_removed", "Socket is removed on close")
+
+    def test_fallback_without_daemon(self):
+        """Test that commands run in-process when no daemon answers."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch.object(cli_daemon, "is_test_environment", return_value=False), \
+                 patch.dict(os.environ, {cli_daemon.DISABLE_ENV: ""}):
+                missing = cli_daemon.forward(["-lp"], os.path.join(temp_dir, "askai.sock"))
+                with patch.dict(os.environ, {cli_daemon.DISABLE_ENV: "1"}):
+                    disabled = cli_daemon.forward(["-lp"], os.path.join(temp_dir, "askai.sock"))
+
+        self.assert_equal(None, missing, "daemon_fallback_missing", "No socket means in-process")
+        self.assert_equal(None, disabled, "daemon_fallback_disabled", "ASKAI_NO_DAEMON forces in-process")
+
+    def test_fallback_when_busy(self):
+        """Test that a client runs in-process while the daemon runs another command."""
+        entry_point = Mock()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            socket_path = os.path.join(temp_dir, "askai.sock")
+            askai_daemon = cli_daemon.AskAIDaemon(entry_point, socket_path)
+            askai_daemon.bind()
+            busy = askai_daemon._busy  # pylint: disable=protected-access
+            server = threading.Thread(target=askai_daemon.accept)
+            server.start()
+
+            stdin = io.StringIO("piped input")
+            with busy, \
+                 patch.object(cli_daemon, "is_test_environment", return_value=False), \
+                 patch.dict(os.environ, {cli_daemon.DISABLE_ENV: ""}), \
+                 patch.object(sys, "stdin", stdin):
+                exit_code = cli_daemon.forward(["-q", "hello"], socket_path)
+            server.join(5)
+            askai_daemon.close()
+
+        self.assert_equal(None, exit_code, "daemon_busy_fallback", "A busy daemon sends the command in-process")
+        self.assert_equal("piped input", stdin.read(), "daemon_busy_stdin", "stdin is left for the local run")
+        self.assert_false(entry_point.called, "daemon_busy_no_run", "The daemon does not run a second command")
+
+    def test_large_or_binary_stdin_stays_local(self):
+        """Test that oversized or non-UTF-8 stdin is not forwarded but stays readable in full."""
+        results = []
+        for data in (b"x" * 20, b"\xff\xfe binary"):
+            with patch.object(sys, "stdin", io.TextIOWrapper(io.BytesIO(data), encoding="utf-8")):
+                forwardable, forwarded = cli_daemon._read_stdin(limit=16)  # pylint: disable=protected-access
+                results.append((forwardable, forwarded, sys.stdin.buffer.read()))
+        with patch.object(sys, "stdin", io.TextIOWrapper(io.BytesIO(b"small"), encoding="utf-8")):
+            small = cli_daemon._read_stdin(limit=16)  # pylint: disable=protected-access
+
+        self.assert_equal([(False, None, b"x" * 20), (False, None, b"\xff\xfe binary")], results,
+                          "daemon_stdin_local", "Large or binary input runs in-process with all of its bytes")
+        self.assert_equal((True, "small"), small, "daemon_stdin_forwarded", "Small text input is forwarded")
@@ -0,0 +1,106 @@
+"""
+Unit tests for the process-wide configuration cache.
+"""
+import os
+import sys
+import tempfile
+import threading
+from unittest.mock import patch
+
+import yaml
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.shared.config import loader
+
+
+class TestConfigCache(BaseUnitTest):
+    """Test that the config file is parsed once and reloaded when it changes."""
+
+    def run(self):
+        """Run all config cache tests."""
+        self.test_parsed_once()
+        self.test_reload_on_change()
+        self.test_concurrent_reload()
+        return self.results
+
+    @staticmethod
+    def _write(path, model):
+        with open(path, "w", encoding="utf-8") as f:
+            yaml.safe_dump({"api_key": "key", "default_model": model, "chat": {"max_history": 5}}, f)
+
+    def _run_with_config(self, check):
+        """Run check(config_path, safe_load_mock) against a temporary production config."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_path = os.path.join(temp_dir, "config.yml")
+            self._write(config_path, "model-a")
+            loader.invalidate_config_cache()
+            try:
+                with patch.object(loader, "CONFIG_PATH", config_path), \
+                     patch.object(loader, "is_test_environment", return_value=False), \
+                     patch.object(loader, "ensure_askai_setup", return_value=True), \
+                     patch.object(loader.yaml, "safe_load", side_effect=yaml.safe_load) as safe_load:
+                    check(config_path, safe_load)
+            finally:
+                loader.invalidate_config_cache()
+
+    def test_parsed_once(self):
+        """Test that repeated loads share one parse and copies stay private."""
+        def check(_config_path, safe_load):
+            first = loader.load_config()
+            first["chat"]["max_history"] = 99
+            second = loader.load_config()
+            snapshot = loader.get_config_snapshot()
+
+            self.assert_equal(1, safe_load.call_count, "config_cache_parsed_once", "File parsed once")
+            self.assert_equal(5, second["chat"]["max_history"], "config_cache_private_copy",
+                              "load_config returns a copy the caller may modify")
+            self.assert_true(snapshot is loader.get_config_snapshot(), "config_cache_shared_snapshot",
+                             "Snapshots are shared without copying")
+
+        self._run_with_config(check)
+
+    def test_reload_on_change(self):
+        """Test that a changed file or an invalidation triggers a new parse."""
+        def check(config_path, safe_load):
+            before = loader.get_config_snapshot()
+            self._write(config_path, "model-bb")
+            after = loader.get_config_snapshot()
+            loader.invalidate_config_cache()
+            loader.get_config_snapshot()
+
+            self.assert_equal("model-a", before["default_model"], "config_cache_before", "Initial config")
+            self.assert_equal("model-bb", after["default_model"], "config_cache_reloaded",
+                              "Edited file is picked up")
+            self.assert_equal("model-a", before["default_model"], "config_cache_snapshot_stable",
+                              "Earlier snapshots are not changed by a reload")
+            self.assert_equal(3, safe_load.call_count, "config_cache_invalidate", "Invalidation forces a parse")
+
+        self._run_with_config(check)
+
+    def test_concurrent_reload(self):
+        """Test that threads asking at the same time share a single parse."""
+        def check(_config_path, safe_load):
+            results = []
+            start = threading.Barrier(8)
+
+            def worker():
+                start.wait()
+                results.append(loader.get_config_snapshot()["default_model"])
+
+            threads = [threading.Thread(target=worker) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self.assert_equal(["model-a"] * 8, results, "config_cache_threads", "All threads see the config")
+            self.assert_equal(1, safe_load.call_count, "config_cache_threads_parse", "One parse for all threads")
+
+        self._run_with_config(check)
@@ -0,0 +1,99 @@
+"""
+Unit tests for the queued logging pipeline and lazy, redacted log payloads.
+"""
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+from unittest.mock import patch
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.shared.logging import LOGGER_NAME, LogPayload, redact, setup_logger, stop_logging
+from askai.shared.logging import payload as payload_module
+
+
+class _ThreadRecordingPayload(LogPayload):
+    """Payload remembering the thread that serialized it."""
+
+    threads = []
+
+    def __str__(self):
+        self.threads.append(threading.current_thread())
+        return super().__str__()
+
+
+class TestLogging(BaseUnitTest):
+    """Test redaction, lazy serialization and the background log writer."""
+
+    def run(self):
+        """Run all logging tests."""
+        self.test_redaction()
+        self.test_payload_is_lazy()
+        self.test_queued_file_logging()
+        return self.results
+
+    def test_redaction(self):
+        """Test that data URLs, file data, bytes and long strings are shortened."""
+        data_url = "data:application/pdf;base64," + "A" * 5000
+        redacted = redact({
+            "messages": [{"role": "user", "content": [{"type": "file", "file": {"file_data": data_url}}]}],
+            "file_data": "B" * 100,
+            "raw": b"\x00" * 10,
+            "text": "x" * 3000,
+            "short": "kept"
+        })
+
+        self.assert_equal("data:application/pdf;base64,<5000 chars redacted>",
+                          redacted["messages"][0]["content"][0]["file"]["file_data"],
+                          "log_redact_data_url", "Data URLs keep only their prefix")
+        self.assert_equal("<100 chars redacted>", redacted["file_data"], "log_redact_file_data",
+                          "File data is redacted")
+        self.assert_equal("<10 bytes>", redacted["raw"], "log_redact_bytes", "Bytes are summarized")
+        self.assert_true(redacted["text"].endswith("<1000 more chars>"), "log_redact_truncate",
+                         "Long strings are truncated")
+        self.assert_equal("kept", redacted["short"], "log_redact_short", "Short strings are kept")
+
+    def test_payload_is_lazy(self):
+        """Test that payloads of disabled levels are never serialized."""
+        logger = logging.getLogger("askai.test.lazy")
+        logger.setLevel(logging.INFO)
+        with patch.object(payload_module.json, "dumps") as dumps:
+            logger.debug(LogPayload({"log_message": "Large", "messages": ["x" * 100000]}))
+
+        self.assert_equal(0, dumps.call_count, "log_payload_lazy", "Disabled debug payloads cost nothing")
+
+    def test_queued_file_logging(self):
+        """Test that records are formatted on the listener thread and written as JSON."""
+        logger = logging.getLogger(LOGGER_NAME)
+        saved_handlers, saved_level = logger.handlers[:], logger.level
+        logger.handlers = []
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                log_path = os.path.join(temp_dir, "askai.log")
+                setup_logger({"log_path": log_path, "log_level": "DEBUG"})
+                logger.debug(_ThreadRecordingPayload({
+                    "log_message": "Image message",
+                    "url": "data:image/png;base64," + "A" * 4000
+                }))
+                stop_logging()
+                for handler in logger.handlers:
+                    handler.target.close()
+                with open(log_path, "r", encoding="utf-8") as f:
+                    entry = json.loads(f.read().strip().splitlines()[-1])
+        finally:
+            logger.handlers = saved_handlers
+            logger.setLevel(saved_level)
+
+        self.assert_equal("data:image/png;base64,<4000 chars redacted>", entry["log_entry"]["url"],
+                          "log_queue_written", "Queued record is written redacted")
+        self.assert_true(threading.main_thread() not in _ThreadRecordingPayload.threads,
+                         "log_queue_background", "Payload is serialized on the listener thread")
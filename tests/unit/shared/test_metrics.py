@@ -0,0 +1,82 @@
+"""
+Unit tests for the multi-process metrics registry.
+"""
+import json
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.shared.metrics import MetricsRegistry, get_metrics_registry, inc
+from askai.shared.metrics import registry as registry_module
+
+
+def _write_worker_file(directory, pid, series):
+    """Write the metrics file of another (fake) worker process."""
+    with open(os.path.join(directory, f"metrics-{pid}.json"), "w", encoding="utf-8") as f:
+        json.dump({"pid": pid, "series": series}, f)
+
+
+class TestMetrics(BaseUnitTest):
+    """Test recording, cross-process merging and Prometheus rendering."""
+
+    def run(self):
+        """Run all metrics tests."""
+        self.test_workers_are_merged()
+        self.test_histogram_rendering()
+        self.test_disabled_metrics_are_no_ops()
+        return self.results
+
+    def test_workers_are_merged(self):
+        """Test that counters of all workers add up and gauges of exited workers are dropped."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            registry = MetricsRegistry(temp_dir, flush_interval=3600)
+            registry.inc("askai_tokens_total", {"model": "m", "type": "prompt"}, 10)
+            registry.inc("askai_api_requests_in_flight")
+            _write_worker_file(temp_dir, 111, [
+                ["askai_tokens_total", [["model", "m"], ["type", "prompt"]], 5],
+                ["askai_api_requests_in_flight", [], 2],
+            ])
+            _write_worker_file(temp_dir, 222, [
+                ["askai_tokens_total", [["model", "m"], ["type", "prompt"]], 1],
+                ["askai_api_requests_in_flight", [], 7],
+            ])
+            with patch.object(registry_module, "_pid_alive", side_effect=lambda pid: pid == 111):
+                merged = registry.collect()
+
+        self.assert_equal(16, merged[("askai_tokens_total", (("model", "m"), ("type", "prompt")))],
+                          "metrics_counter_merge", "Counters of live and exited workers are summed")
+        self.assert_equal(3, merged[("askai_api_requests_in_flight", ())], "metrics_gauge_live",
+                          "Gauges of exited workers are dropped")
+
+    def test_histogram_rendering(self):
+        """Test cumulative buckets, sum and count in the exposition format."""
+        registry = MetricsRegistry(buckets=(0.1, 1.0))
+        labels = {"route": "/api/v1/questions/ask", "method": "POST", "status": 200}
+        registry.observe("askai_api_request_duration_seconds", 0.05, labels)
+        registry.observe("askai_api_request_duration_seconds", 0.5, labels)
+        registry.observe("askai_api_request_duration_seconds", 3.0, labels)
+        lines = registry.render().splitlines()
+
+        prefix = 'askai_api_request_duration_seconds_bucket{method="POST",route="/api/v1/questions/ask",status="200",'
+        self.assert_in("# TYPE askai_api_request_duration_seconds histogram", lines, "metrics_type",
+                       "Metric type is declared")
+        self.assert_in(prefix + 'le="1"} 2', lines, "metrics_bucket_cumulative", "Buckets are cumulative")
+        self.assert_in(prefix + 'le="+Inf"} 3', lines, "metrics_bucket_inf", "+Inf bucket counts everything")
+        self.assert_true(any(line.startswith("askai_api_request_duration_seconds_sum{") and line.endswith(" 3.55")
+                             for line in lines), "metrics_sum", "Sum of observations is reported")
+
+    def test_disabled_metrics_are_no_ops(self):
+        """Test that nothing is recorded before metrics are enabled."""
+        with patch.object(registry_module, "_registry", None):
+            inc("askai_cache_events_total", {"cache": "response", "event": "hits"})
+            self.assert_true(get_metrics_registry() is None, "metrics_disabled",
+                             "Recording without an enabled registry is a no-op")
@@ -0,0 +1,74 @@
+"""
+Unit tests for per-stage timing spans.
+"""
+import os
+import sys
+from unittest.mock import patch
+
+# Setup paths for imports
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+sys.path.insert(0, project_root)
+sys.path.insert(0, os.path.join(project_root, "src"))
+sys.path.insert(0, os.path.join(project_root, "tests"))
+
+# pylint: disable=wrong-import-position,import-error
+from unit.test_base import BaseUnitTest
+from askai.shared.utils import format_span_report, get_span_summary, reset_spans, span, timed
+from askai.shared.utils import timing
+
+
+class TestTiming(BaseUnitTest):
+    """Test span recording, aggregation and the report table."""
+
+    def run(self):
+        """Run all timing tests."""
+        self.test_spans_are_aggregated()
+        self.test_failures_are_timed()
+        self.test_report()
+        return self.results
+
+    def test_spans_are_aggregated(self):
+        """Test that spans and decorated calls are aggregated per stage name."""
+        reset_spans()
+
+        @timed("test.decorated")
+        def work(value):
+            return value * 2
+
+        clock = iter([0.0, 0.010, 1.0, 1.030, 2.0, 2.005])
+        with patch.object(timing.time, "perf_counter", side_effect=lambda: next(clock)):
+            result = work(21)
+            work(1)
+            with span("test.block"):
+                pass
+        summary = get_span_summary()
+        reset_spans()
+
+        self.assert_equal(42, result, "timing_result", "Decorated function returns its result")
+        self.assert_equal({"count": 2, "total_ms": 40.0, "max_ms": 30.0}, summary["test.decorated"],
+                          "timing_aggregate", "Calls are counted, summed and the slowest kept")
+        self.assert_equal(["test.decorated", "test.block"], list(summary), "timing_order",
+                          "Stages are reported in the order they first ran")
+        self.assert_equal({}, get_span_summary(), "timing_reset", "Reset forgets all stages")
+
+    def test_failures_are_timed(self):
+        """Test that a stage raising an exception is still recorded."""
+        reset_spans()
+
+        @timed("test.failing")
+        def fail():
+            raise ValueError("boom")
+
+        self.assert_raises(ValueError, fail, "timing_reraises", "Exceptions propagate")
+        self.assert_equal(1, get_span_summary()["test.failing"]["count"], "timing_failure_recorded",
+                          "Failed calls are timed")
+        reset_spans()
+
+    def test_report(self):
+        """Test the terminal report with shares of the wall time."""
+        report = format_span_report({"http.completion": {"count": 1, "total_ms": 750.0, "max_ms": 750.0}}, 1000.0)
+        lines = report.splitlines()
+
+        self.assert_true(lines[1].startswith("http.completion") and lines[1].endswith("75%"),
+                         "timing_report_share", "Stage line shows its share of the run")
+        self.assert_true(lines[-1].startswith("wall"), "timing_report_wall", "Wall time closes the table")
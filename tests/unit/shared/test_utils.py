@@ -1,8 +1,10 @@
 """
 Unit tests for shared utilities - comprehensive coverage with mocking.
 """
+import base64
 import os
 import sys
+import tempfile
 from unittest.mock import Mock, patch
 
 # Setup paths for imports
@@ -15,6 +17,7 @@ sys.path.insert(0, os.path.join(project_root, "tests"))
 from unit.test_base import BaseUnitTest
 from askai.shared.utils import print_error_or_warnings
 import askai.shared.utils as shared_utils
+from askai.shared.utils import helpers
 
 
 class TestProgressSpinner(BaseUnitTest):
@@ -258,3 +261,51 @@ class TestFileUtilities(BaseUnitTest):
 
         except Exception as e:
             self.add_result("path_manipulation_error", False, f"Path manipulation failed: {e}")
+
+
+class TestAttachmentEncoding(BaseUnitTest):
+    """Test the streaming base64 encoder used for image and PDF attachments."""
+
+    def run(self):
+        """Run all attachment encoding tests."""
+        self.test_matches_base64()
+        self.test_data_url()
+        return self.results
+
+    def test_matches_base64(self):
+        """Test that chunked encoding equals base64 for sizes around chunk boundaries."""
+        mismatches = []
+        with tempfile.TemporaryDirectory() as temp_dir, patch.object(helpers, "BASE64_CHUNK_SIZE", 6):
+            for size in (1, 2, 3, 5, 6, 7, 12, 13, 100):
+                file_path = os.path.join(temp_dir, f"{size}.bin")
+                data = os.urandom(size)
+                with open(file_path, "wb") as f:
+                    f.write(data)
+                expected = base64.b64encode(data).decode("ascii")
+                if shared_utils.encode_file_to_base64(file_path) != expected:
+                    mismatches.append(("mmap", size))
+                # Files that cannot be memory-mapped are read chunk by chunk
+                with patch.object(helpers.mmap, "mmap", side_effect=OSError):
+                    if shared_utils.encode_file_to_base64(file_path) != expected:
+                        mismatches.append(("read", size))
+
+        self.assert_equal([], mismatches, "base64_chunked_matches", "Chunked encoding equals base64")
+
+    def test_data_url(self):
+        """Test data URL output and files that cannot be encoded."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "doc.pdf")
+            with open(file_path, "wb") as f:
+                f.write(b"%PDF")
+            empty_path = os.path.join(temp_dir, "empty.pdf")
+            open(empty_path, "wb").close()  # pylint: disable=consider-using-with
+
+            with patch("askai.shared.utils.helpers.print_error_or_warnings"):
+                data_url = shared_utils.encode_file_to_data_url(file_path, "application/pdf")
+                empty = shared_utils.encode_file_to_data_url(empty_path, "application/pdf")
+                missing = shared_utils.encode_file_to_data_url(os.path.join(temp_dir, "none.pdf"))
+
+        self.assert_equal("data:application/pdf;base64,JVBERg==", data_url, "data_url_format",
+                          "Data URL has the MIME prefix")
+        self.assert_equal([None, None], [empty, missing], "data_url_unreadable",
+                          "Empty and missing files are rejected")